@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark YAML/JSON encoding of merged configurations.
+
+Loads the example project configs (examples/local_projects and
+examples/merged_projects at the repository root), plus one large config
+made of all of them side by side repeated --scale times. Each is encoded
+with every available backend, and the script reports the median encode
+time and the output size.
+
+Usage:
+    python examples/encoding_benchmark.py [--repeat N] [--scale N] [config.yml ...]
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from ai_sdlc_config import HierarchyStreamer, YAMLLoader
+from ai_sdlc_config.serializers import dump_json, dump_yaml, to_data
+from ai_sdlc_config.serializers import encoders
+
+
+EXAMPLES = Path(__file__).parent.parent.parent / "examples"
+
+
+def _encoders(root):
+    """(name, encode) pairs; encode takes the plain data."""
+    candidates = [
+        ("yaml.dump (pure Dumper)", lambda data: yaml.dump(data, default_flow_style=False, sort_keys=False)),
+        ("yaml SafeDumper", lambda data: yaml.dump(data, Dumper=yaml.SafeDumper, default_flow_style=False, sort_keys=False)),
+        (f"dump_yaml ({encoders.YAML_BACKEND})", dump_yaml),
+        ("HierarchyStreamer (from tree)", lambda data: HierarchyStreamer().page(root).text),
+        ("json.dumps indent=2", lambda data: json.dumps(data, indent=2)),
+        ("json.dumps compact", lambda data: json.dumps(data, separators=(",", ":"))),
+    ]
+    if encoders.orjson is not None:
+        candidates += [
+            ("dump_json (orjson)", dump_json),
+            ("dump_json compact (orjson)", lambda data: dump_json(data, compact=True)),
+        ]
+    return candidates
+
+
+def _time(encode, data, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = encode(data)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000, len(output.encode("utf-8"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("configs", nargs="*", type=Path, help="Config files (default: the example projects)")
+    parser.add_argument("--repeat", type=int, default=50, help="Encodes per measurement (median reported)")
+    parser.add_argument("--scale", type=int, default=20, help="Copies of every config in the combined one")
+    args = parser.parse_args()
+
+    configs = args.configs or sorted(EXAMPLES.glob("*_projects/*/config/*.yml"))
+    if not configs:
+        parser.error(f"No configs found under {EXAMPLES}")
+
+    loader = YAMLLoader()
+    trees = [(path.parent.parent.name, loader.load(str(path))) for path in configs]
+
+    combined_yaml = {
+        f"{name}_{copy}": yaml.safe_load(path.read_text())
+        for copy in range(args.scale)
+        for (name, _), path in zip(trees, configs)
+    }
+    trees.append((f"combined x{args.scale}", loader.load_from_string(yaml.safe_dump(combined_yaml))))
+
+    print(f"YAML backend: {encoders.YAML_BACKEND}, JSON backend: {encoders.JSON_BACKEND}\n")
+    for name, root in trees:
+        data = to_data(root)
+        print(f"{name}")
+        for label, encode in _encoders(root):
+            ms, size = _time(encode, data, args.repeat)
+            print(f"  {label:32} {ms:9.3f} ms {size:10,d} bytes")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -13,8 +13,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 # Import after path adjustment
 from mcp_service.server.main import TOOLS, handle_tool_call
 from mcp_service.storage.project_repository import ProjectRepository
-from mcp_service.server.context_tools import ContextManager
-from mcp_service.server.persona_manager import PersonaManager
+from mcp_service.server.sessions import SessionManager
 import asyncio
 
 
@@ -32,8 +31,7 @@ async def test_tools():
     personas_path = Path.cwd() / "personas"
 
     main_module.repo = ProjectRepository(repo_path)
-    main_module.context_manager = ContextManager(main_module.repo)
-    main_module.persona_manager = PersonaManager(personas_path)
+    main_module.sessions = SessionManager(main_module.repo, personas_path)
 
     print(f"\n✅ Initialized:")
     print(f"   - Repository: {repo_path}")
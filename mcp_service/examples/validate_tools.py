@@ -85,26 +85,13 @@ print("\n" + "=" * 80)
 print("HANDLER VALIDATION")
 print("=" * 80)
 
-handler_keywords = [
-    "elif name == \"load_context\":",
-    "elif name == \"switch_context\":",
-    "elif name == \"query_context\":",
-    "elif name == \"get_current_context\":",
-    "elif name == \"get_full_context_state\":",
-    "elif name == \"list_personas\":",
-    "elif name == \"load_persona\":",
-    "elif name == \"apply_persona_to_context\":",
-    "elif name == \"switch_persona\":",
-    "elif name == \"get_persona_checklist\":",
-]
-
-print("\nChecking new tool handlers:")
-for handler in handler_keywords:
-    if handler in content:
-        tool_name = handler.split('"')[1]
-        print(f"   ✅ {tool_name} handler implemented")
-    else:
-        print(f"   ❌ {handler} - NOT FOUND")
+print("\nChecking tool handlers:")
+for tools in expected_tools.values():
+    for tool_name in tools:
+        if f'@dispatcher.handler("{tool_name}")' in content:
+            print(f"   ✅ {tool_name} handler registered")
+        else:
+            print(f"   ❌ {tool_name} - NO HANDLER")
 
 print("\n" + "=" * 80)
 print("✅ VALIDATION COMPLETE")
@@ -3,9 +3,180 @@ Enhanced MCP tools for dynamic context management.
 
 These tools enable Claude to load, switch, and query project contexts dynamically.
 """
-from typing import Dict, Any, List, Optional
+import copy
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 from pathlib import Path
 
+from ai_sdlc_config import tracing
+from ai_sdlc_config.mergers import HierarchyChange, diff_hierarchies
+
+
+class FrozenDict(dict):
+    """
+    Read-only dict, for contexts shared through the context cache.
+
+    Reads, iteration and JSON encoding work as for a dict; mutation raises
+    TypeError. copy.deepcopy() returns plain (mutable) dicts and lists.
+    """
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError(f"{type(self).__name__} is read-only")
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __copy__(self) -> Dict[Any, Any]:
+        return dict(self)
+
+    def __deepcopy__(self, memo) -> Dict[Any, Any]:
+        return {key: copy.deepcopy(value, memo) for key, value in self.items()}
+
+    def __reduce__(self):
+        return (type(self), (dict(self),))
+
+
+class FrozenList(list):
+    """Read-only list, the FrozenDict counterpart for sequences."""
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError(f"{type(self).__name__} is read-only")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = pop = remove = clear = sort = reverse = _read_only
+
+    def __copy__(self) -> List[Any]:
+        return list(self)
+
+    def __deepcopy__(self, memo) -> List[Any]:
+        return [copy.deepcopy(value, memo) for value in self]
+
+    def __reduce__(self):
+        return (type(self), (list(self),))
+
+
+def freeze(value: Any) -> Any:
+    """Recursively convert dicts and lists to FrozenDict and FrozenList."""
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return FrozenList(freeze(item) for item in value)
+    return value
+
+
+class ContextCache:
+    """
+    Built project contexts, shared by context managers (e.g. one per session).
+
+    Entries are keyed by (project, metadata revision, config version), so
+    a context is rebuilt whenever the project's metadata or any of its
+    layers changed. Entries are also dropped on the repository's change
+    events for the project or one of its base projects, so stale contexts
+    don't linger until evicted. Policy and document previews are read
+    when the context is built and are not re-read while it is cached.
+
+    Contexts are stored frozen (FrozenDict): callers share them and cannot
+    modify them; copy.deepcopy() one to get a mutable copy.
+    """
+
+    def __init__(self, repository=None, max_entries: int = 128):
+        """
+        Initialize context cache.
+
+        Args:
+            repository: ProjectRepository whose change feed invalidates
+                        entries (optional)
+            max_entries: Maximum number of cached contexts (least recently
+                         used are evicted first)
+        """
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[Any, ...], Tuple[frozenset, FrozenDict]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._changes = getattr(repository, "changes", None)
+        self._subscription = self._changes.subscribe(self._on_change) if self._changes is not None else None
+
+    def get(self, key: Tuple[Any, ...]) -> Optional[FrozenDict]:
+        """Get a cached context, counting the hit or miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Tuple[Any, ...], projects: Iterable[str], context: Dict[str, Any]) -> FrozenDict:
+        """
+        Cache a context.
+
+        Args:
+            key: (project, metadata revision, config version)
+            projects: Projects the context was built from (the project and
+                      its bases), whose changes drop the entry
+            context: Built context
+
+        Returns:
+            The frozen context as cached
+        """
+        frozen = freeze(context)
+        with self._lock:
+            self._entries[key] = (frozenset(projects), frozen)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return frozen
+
+    def invalidate(self, project: Optional[str] = None):
+        """
+        Drop cached contexts.
+
+        Args:
+            project: Only contexts built from this project (default: all)
+        """
+        with self._lock:
+            if project is None:
+                self._entries.clear()
+                return
+            for key in [key for key, (projects, _) in self._entries.items() if project in projects]:
+                del self._entries[key]
+
+    def _on_change(self, event):
+        # A context being built while this runs may still be cached, but
+        # under the old revision/version key, which is never looked up again
+        self.invalidate(event.project)
+
+    def close(self):
+        """Stop following the repository's change feed."""
+        if self._subscription is not None:
+            self._changes.unsubscribe(self._subscription)
+            self._subscription = None
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get hit/miss counts (a metrics cache source).
+
+        Returns:
+            {"context": hits, misses, entries, hit_ratio}
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "context": {
+                    "hits": self.hits,
+                    "misses": self.misses,
+                    "entries": len(self._entries),
+                    "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0
+                }
+            }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
 
 class ContextManager:
     """
@@ -18,17 +189,23 @@ class ContextManager:
     - Stack multiple contexts
     """
 
-    def __init__(self, repository):
+    def __init__(self, repository, context_cache: Optional[ContextCache] = None):
         """
         Initialize context manager.
 
         Args:
             repository: ProjectRepository instance
+            context_cache: Built contexts to share with other managers
+                           (default: a cache of this manager's own)
         """
         self.repo = repository
+        self.context_cache = context_cache if context_cache is not None else ContextCache(repository)
         self.context_stack: List[Dict[str, Any]] = []
         self.current_context: Optional[Dict[str, Any]] = None
+        # Merged config the current context was built from (None after a pop)
+        self.current_config = None
 
+    @tracing.traced("context.load_context", "context")
     def load_context(self, project_name: str) -> Dict[str, Any]:
         """
         Load full project context for Claude.
@@ -41,24 +218,51 @@ class ContextManager:
         - Quality gates and standards
         - Deployment requirements
 
+        Contexts are cached per project revision and config version, so
+        loading an unchanged project again only checks its versions. The
+        returned context is frozen and shared; deepcopy it to modify it.
+
         Args:
             project_name: Name of project to load
 
         Returns:
-            Complete project context dictionary
+            Complete project context dictionary (read-only)
 
         Raises:
             ValueError: If project doesn't exist
         """
+        context, config = self._context_and_config(project_name)
+        self.current_context = context
+        self.current_config = config
+        return context
+
+    def _context_and_config(self, project_name: str) -> Tuple[FrozenDict, Any]:
+        """Get a project's (cached) context and merged config without loading it."""
         # Get project metadata
         metadata = self.repo.get_project(project_name)
         if not metadata:
             raise ValueError(f"Project '{project_name}' not found")
 
-        # Get merged configuration
+        # Get merged configuration (cached by the repository)
         config = self.repo.get_project_config(project_name)
 
-        # Build comprehensive context
+        if config.version is None:
+            # Unversioned manager: nothing to key a cache entry on
+            context = freeze(self._build_context(project_name, metadata, config))
+        else:
+            key = (project_name, metadata.revision, config.version)
+            context = self.context_cache.get(key)
+            if context is None:
+                context = self.context_cache.put(
+                    key,
+                    [project_name, *metadata.base_projects],
+                    self._build_context(project_name, metadata, config)
+                )
+        return context, config
+
+    @tracing.traced("context.build_context", "context")
+    def _build_context(self, project_name: str, metadata, config) -> Dict[str, Any]:
+        """Build a project's context from its metadata and merged config."""
         context = {
             "metadata": {
                 "name": metadata.name,
@@ -111,9 +315,9 @@ class ContextManager:
                 "runtime_overrides": metadata.runtime_overrides
             }
 
-        self.current_context = context
         return context
 
+    @tracing.traced("context.load_policies", "context")
     def _load_policies(self, config) -> Dict[str, Any]:
         """Load policy documents from URIs."""
         policies = {}
@@ -143,6 +347,7 @@ class ContextManager:
 
         return policies
 
+    @tracing.traced("context.load_documentation", "context")
     def _load_documentation(self, config, project_name: str) -> Dict[str, Any]:
         """Load project documentation."""
         docs = {}
@@ -169,6 +374,7 @@ class ContextManager:
 
         return docs
 
+    @tracing.traced("context.switch_context", "context")
     def switch_context(
         self,
         from_project: Optional[str],
@@ -177,7 +383,13 @@ class ContextManager:
         """
         Switch from one project context to another.
 
-        Shows what changed so Claude knows how to adjust its behavior.
+        Shows what changed so Claude knows how to adjust its behavior:
+        every value that differs between the two merged configs, keyed by
+        dot path.
+
+        When from_project is the loaded context, its merged config is
+        reused, and to_project's comes from the repository's cache, so a
+        switch merges at most to_project (nothing when it is cached).
 
         Args:
             from_project: Current project (None if no context loaded)
@@ -185,78 +397,63 @@ class ContextManager:
 
         Returns:
             Context switch summary with requirement changes
+
+        Raises:
+            ValueError: If either project doesn't exist
         """
-        # Load new context
-        new_context = self.load_context(to_project)
+        old_config = None
+        if from_project:
+            loaded = self.current_context["metadata"]["name"] if self.current_context else None
+            if loaded == from_project and self.current_config is not None:
+                old_config = self.current_config
+            else:
+                old_config = self.repo.get_project_config(from_project)
+                if old_config is None:
+                    raise ValueError(f"Project '{from_project}' not found")
+
+        new_context, new_config = self._context_and_config(to_project)
+
+        changes = {}
+        if old_config is not None:
+            # Diff before replacing the current context, so a failure
+            # leaves the session on from_project
+            for change in diff_hierarchies(old_config.merged_hierarchy, new_config.merged_hierarchy):
+                changes[change.path] = self._describe_change(change)
+
+        self.current_context = new_context
+        self.current_config = new_config
 
-        if not from_project:
+        if old_config is None:
             return {
                 "action": "loaded",
                 "project": to_project,
                 "context": new_context
             }
 
-        # Load old context for comparison
-        old_metadata = self.repo.get_project(from_project)
-        old_config = self.repo.get_project_config(from_project)
-        new_config = self.repo.get_project_config(to_project)
-
-        # Compare requirements
-        changes = {
-            "testing": self._compare_values(
-                "Testing Coverage",
-                old_config.get_value("methodology.testing.min_coverage"),
-                new_config.get_value("methodology.testing.min_coverage")
-            ),
-            "classification": self._compare_values(
-                "Classification",
-                old_config.get_value("project.classification"),
-                new_config.get_value("project.classification")
-            ),
-            "security_sla": self._compare_values(
-                "Critical Fix SLA",
-                old_config.get_value("security.vulnerability_management.critical_fix_sla_hours"),
-                new_config.get_value("security.vulnerability_management.critical_fix_sla_hours")
-            ),
-            "max_code_smells": self._compare_values(
-                "Max Code Smells",
-                old_config.get_value("quality.gates.code_quality.max_code_smells"),
-                new_config.get_value("quality.gates.code_quality.max_code_smells")
-            )
-        }
-
         return {
             "action": "switched",
             "from": from_project,
             "to": to_project,
-            "changes": {k: v for k, v in changes.items() if v},  # Only changed values
+            "changes": changes,
             "new_context": new_context
         }
 
-    def _compare_values(
-        self,
-        label: str,
-        old_value: Any,
-        new_value: Any
-    ) -> Optional[Dict[str, Any]]:
-        """Compare two values and return change description."""
-        if old_value == new_value:
-            return None
-
-        change = {
-            "label": label,
-            "old": old_value,
-            "new": new_value
+    @staticmethod
+    def _describe_change(change: HierarchyChange) -> Dict[str, Any]:
+        """Describe one changed path, with a direction for numeric changes."""
+        described = {
+            "label": change.path,
+            "old": change.old,
+            "new": change.new,
+            "change": change.kind.value
         }
 
         # Add interpretation for common cases
-        if isinstance(old_value, (int, float)) and isinstance(new_value, (int, float)):
-            if new_value > old_value:
-                change["direction"] = "stricter"
-            else:
-                change["direction"] = "relaxed"
+        numbers = (int, float)
+        if isinstance(change.old, numbers) and isinstance(change.new, numbers):
+            described["direction"] = "stricter" if change.new > change.old else "relaxed"
 
-        return change
+        return described
 
     def push_context(self, project_name: str) -> Dict[str, Any]:
         """
@@ -295,6 +492,7 @@ class ContextManager:
             self.current_context = self.context_stack[-1]
         else:
             self.current_context = None
+        self.current_config = None
 
         return {
             "action": "popped",
@@ -303,6 +501,7 @@ class ContextManager:
             "current": self.current_context["metadata"]["name"] if self.current_context else None
         }
 
+    @tracing.traced("context.query_context", "context")
     def query_context(self, question: str) -> str:
         """
         Query current context using natural language.
@@ -371,6 +570,7 @@ Question: {question}
             "stack_depth": len(self.context_stack)
         }
 
+    @tracing.traced("context.get_full_context_state", "context")
     def get_full_context_state(self) -> Dict[str, Any]:
         """
         Get comprehensive view of the entire context state.
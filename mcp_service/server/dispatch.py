@@ -0,0 +1,200 @@
+"""
+Table-driven dispatch of MCP tool calls.
+
+Each tool has one handler function, registered by name, and a validator
+compiled from the tool's input schema when the handler is registered.
+Dispatching is a dict lookup plus validation, so malformed requests are
+rejected before a handler touches the repository, and the cost of
+finding a handler doesn't grow with the number of tools.
+"""
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from .schema import SchemaValidationError, compile_schema
+
+
+class UnknownToolError(LookupError):
+    """Raised when dispatching a tool that has no handler."""
+
+
+class InvalidArgumentsError(ValueError):
+    """Raised when tool arguments don't match the tool's input schema."""
+
+    def __init__(self, tool: str, error: SchemaValidationError):
+        self.tool = tool
+        self.path = error.path
+        super().__init__(f"Invalid arguments for {tool}: {error}")
+
+
+@dataclass
+class HandlerStats:
+    """Call counts and timings of one tool handler."""
+    calls: int = 0
+    errors: int = 0
+    invalid: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.calls if self.calls else 0.0
+
+
+@dataclass
+class _Entry:
+    handler: Callable[[Dict[str, Any]], Any]
+    validate: Callable[[Any], None]
+    stats: HandlerStats
+
+
+class ToolDispatcher:
+    """
+    Registry of tool handlers with schema validation and timing.
+
+    Example:
+        >>> dispatcher = ToolDispatcher({"echo": {"type": "object"}})
+        >>> @dispatcher.handler("echo")
+        ... def echo(arguments):
+        ...     return arguments
+        >>> dispatcher.dispatch("echo", {"text": "hi"})
+        {'text': 'hi'}
+    """
+
+    def __init__(self, schemas: Dict[str, Dict[str, Any]]):
+        """
+        Initialize tool dispatcher.
+
+        Args:
+            schemas: Tool name -> input schema
+        """
+        self.schemas = dict(schemas)
+        self._entries: Dict[str, _Entry] = {}
+        self._stats_lock = threading.Lock()
+
+    def handler(self, name: str) -> Callable[[Callable], Callable]:
+        """
+        Decorator registering the handler of a tool.
+
+        The handler takes the validated arguments dict.
+
+        Raises:
+            ValueError: If the tool has no schema or already has a handler
+        """
+        if name not in self.schemas:
+            raise ValueError(f"No schema for tool '{name}'")
+        if name in self._entries:
+            raise ValueError(f"Tool '{name}' already has a handler")
+        validate = compile_schema(self.schemas[name])
+
+        def register(function: Callable) -> Callable:
+            self._entries[name] = _Entry(function, validate, HandlerStats())
+            return function
+
+        return register
+
+    @property
+    def tools(self) -> List[str]:
+        """Names of tools with a registered handler."""
+        return list(self._entries)
+
+    def missing_handlers(self) -> List[str]:
+        """Names of tools that have a schema but no handler."""
+        return [name for name in self.schemas if name not in self._entries]
+
+    def validate(self, name: str, arguments: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Check arguments against a tool's schema.
+
+        Returns:
+            The arguments (an empty dict for None)
+
+        Raises:
+            UnknownToolError: If the tool has no handler
+            InvalidArgumentsError: If the arguments don't match the schema
+        """
+        entry = self._entries.get(name)
+        if entry is None:
+            raise UnknownToolError(name)
+        return self._validate(name, entry, arguments)
+
+    def _validate(self, name: str, entry: _Entry, arguments: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        if arguments is None:
+            arguments = {}
+        try:
+            entry.validate(arguments)
+        except SchemaValidationError as e:
+            with self._stats_lock:
+                entry.stats.invalid += 1
+            raise InvalidArgumentsError(name, e) from None
+        return arguments
+
+    def dispatch(
+        self,
+        name: str,
+        arguments: Optional[Dict[str, Any]],
+        validate: bool = True
+    ) -> Any:
+        """
+        Validate arguments and run the tool's handler.
+
+        Args:
+            name: Tool name
+            arguments: Tool arguments
+            validate: Check arguments against the schema (skip only for
+                      arguments that already passed validate())
+
+        Returns:
+            The handler's result
+
+        Raises:
+            UnknownToolError: If the tool has no handler
+            InvalidArgumentsError: If the arguments don't match the schema
+        """
+        entry = self._entries.get(name)
+        if entry is None:
+            raise UnknownToolError(name)
+        if validate:
+            arguments = self._validate(name, entry, arguments)
+        elif arguments is None:
+            arguments = {}
+
+        start = time.perf_counter()
+        failed = False
+        try:
+            return entry.handler(arguments)
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            stats = entry.stats
+            with self._stats_lock:
+                stats.calls += 1
+                stats.errors += failed
+                stats.total_ms += elapsed
+                if elapsed > stats.max_ms:
+                    stats.max_ms = elapsed
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get per-tool call counts and timings.
+
+        Returns:
+            Tool name -> calls, errors, invalid, total_ms, max_ms, mean_ms
+        """
+        with self._stats_lock:
+            return {
+                name: {
+                    **asdict(entry.stats),
+                    "mean_ms": entry.stats.mean_ms
+                }
+                for name, entry in self._entries.items()
+            }
+
+    def reset_stats(self):
+        """Zero all handler statistics."""
+        with self._stats_lock:
+            for entry in self._entries.values():
+                entry.stats = HandlerStats()
@@ -0,0 +1,119 @@
+"""
+Bounded executor for MCP tool handlers.
+
+Tool handlers are synchronous and block: YAML parsing, merges, git
+commits, file I/O and URI fetches. ToolExecutor runs them on a thread
+pool so the event loop keeps serving other requests, with a concurrency
+limit per tool (or group of tools) and optional timeouts.
+
+Threads rather than processes: handlers share the in-process repository
+(its locks and caches) and the session state of the context and persona
+managers. The blocking parts (subprocess git, file and network I/O)
+release the GIL.
+"""
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+
+class ToolTimeoutError(RuntimeError):
+    """Raised when a tool call takes longer than its timeout."""
+
+
+class ToolExecutor:
+    """
+    Runs blocking tool handlers off the event loop.
+
+    Tools are grouped for concurrency limits: a tool's group defaults to
+    its own name, and groups without a limit are bounded only by the pool.
+    A slot is held until the handler's thread actually finishes (not just
+    until the caller stops waiting), so limits hold even after timeouts or
+    cancellation. Cancelling a call that is still queued stops it from
+    running; a handler already running is left to finish.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        limits: Optional[Dict[str, int]] = None,
+        groups: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+        timeouts: Optional[Dict[str, float]] = None
+    ):
+        """
+        Initialize tool executor.
+
+        Args:
+            max_workers: Thread pool size (default: ThreadPoolExecutor's)
+            limits: Group (or tool) name -> max concurrent calls
+            groups: Tool name -> group name
+            timeout: Default seconds before a call fails (None: no limit)
+            timeouts: Tool name -> timeout, overriding the default
+        """
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ai-sdlc-tool")
+        self.limits = dict(limits or {})
+        self.groups = dict(groups or {})
+        self.timeout = timeout
+        self.timeouts = dict(timeouts or {})
+        # Created lazily, on the loop that runs the calls
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def group(self, tool: str) -> str:
+        """Get the concurrency group of a tool."""
+        return self.groups.get(tool, tool)
+
+    def _semaphore(self, tool: str) -> Optional[asyncio.Semaphore]:
+        group = self.group(tool)
+        limit = self.limits.get(group)
+        if limit is None:
+            return None
+        semaphore = self._semaphores.get(group)
+        if semaphore is None:
+            semaphore = self._semaphores[group] = asyncio.Semaphore(limit)
+        return semaphore
+
+    async def run(self, tool: str, function: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run function(*args, **kwargs) on the pool under the tool's limits.
+
+        Args:
+            tool: Tool name (selects group, limit and timeout)
+            function: Blocking callable
+
+        Returns:
+            The function's result
+
+        Raises:
+            ToolTimeoutError: If the call exceeds its timeout
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphore(tool)
+        if semaphore is not None:
+            await semaphore.acquire()
+
+        try:
+            future = self._pool.submit(functools.partial(function, *args, **kwargs))
+        except BaseException:
+            if semaphore is not None:
+                semaphore.release()
+            raise
+
+        if semaphore is not None:
+            def release(_):
+                try:
+                    loop.call_soon_threadsafe(semaphore.release)
+                except RuntimeError:
+                    # Event loop already closed
+                    pass
+            future.add_done_callback(release)
+
+        timeout = self.timeouts.get(tool, self.timeout)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            raise ToolTimeoutError(f"Tool '{tool}' timed out after {timeout}s") from None
+
+    def shutdown(self, wait: bool = True):
+        """Stop the pool (queued calls are cancelled)."""
+        self._pool.shutdown(wait=wait, cancel_futures=True)
@@ -5,10 +5,11 @@ MCP Server for ai_sdlc_method.
 Provides Model Context Protocol interface for managing configuration projects.
 """
 import asyncio
-import json
 import sys
+from contextlib import contextmanager
+from dataclasses import asdict
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
 # MCP SDK imports
 try:
@@ -19,16 +20,69 @@ except ImportError:
     print("Error: MCP SDK not installed. Install with: pip install mcp", file=sys.stderr)
     sys.exit(1)
 
+from ai_sdlc_config import HierarchyStreamer, tracing
+from ai_sdlc_config.serializers import dump_json
+from ai_sdlc_config.serializers.encoders import JSON_BACKEND, YAML_BACKEND
+
 from ..storage.project_repository import ProjectRepository
-from .context_tools import ContextManager
-from .persona_manager import PersonaManager
+from .context_tools import format_context_for_llm, format_full_context_state
+from .dispatch import InvalidArgumentsError, ToolDispatcher, UnknownToolError
+from .executor import ToolExecutor, ToolTimeoutError
+from .metrics import ServerMetrics, start_http_server
+from .sessions import Session, SessionManager
 
 
 # Global instances
 repo: Optional[ProjectRepository] = None
-context_manager: Optional[ContextManager] = None
-persona_manager: Optional[PersonaManager] = None
-
+sessions: Optional[SessionManager] = None
+executor: Optional[ToolExecutor] = None
+metrics = ServerMetrics()
+
+# Tools working on a session's context and persona state. They take a
+# "session_id" argument; calls within one session run one at a time (under
+# the session's lock), different sessions run in parallel.
+SESSION_TOOLS = (
+    "load_context", "switch_context", "query_context", "get_current_context",
+    "get_full_context_state", "list_personas", "load_persona",
+    "apply_persona_to_context", "switch_persona", "get_persona_checklist",
+)
+
+# Concurrency groups for the tool executor. The repository does its own
+# locking, so its tools run in parallel.
+TOOL_GROUPS = {"maintain_repository": "maintenance"}
+TOOL_LIMITS = {
+    "maintenance": 1,
+    "merge_projects_batch": 2,
+}
+
+
+# Paging options of tools that return configuration trees
+DEFAULT_MAX_BYTES = 64 * 1024
+OUTPUT_BUDGET_PROPERTIES = {
+    "path": {
+        "type": "string",
+        "description": "Only return the subtree at this dot path (e.g. 'methodology.testing')"
+    },
+    "max_bytes": {
+        "type": "integer",
+        "minimum": 1,
+        "description": f"Configuration bytes per response (default {DEFAULT_MAX_BYTES})"
+    },
+    "max_nodes": {
+        "type": "integer",
+        "minimum": 1,
+        "description": "Configuration entries per response (optional)"
+    },
+    "max_depth": {
+        "type": "integer",
+        "minimum": 1,
+        "description": "Collapse entries nested deeper than this (1 = top-level keys only)"
+    },
+    "cursor": {
+        "type": "string",
+        "description": "Continue a truncated response (the cursor it returned)"
+    }
+}
 
 # Tool definitions
 TOOLS = [
@@ -83,7 +137,12 @@ TOOLS = [
         description="List all projects in the repository",
         inputSchema={
             "type": "object",
-            "properties": {}
+            "properties": {
+                "type": {
+                    "type": "string",
+                    "description": "Only list projects of this type (base, methodology, custom, merged)"
+                }
+            }
         }
     ),
     Tool(
@@ -99,6 +158,10 @@ TOOLS = [
                 "updates": {
                     "type": "object",
                     "description": "Dict of dot-path to value updates (e.g., {'methodology.testing.min_coverage': 95})"
+                },
+                "expected_revision": {
+                    "type": "integer",
+                    "description": "Only apply if the project is still at this revision (optimistic concurrency)"
                 }
             },
             "required": ["name", "updates"]
@@ -134,6 +197,10 @@ TOOLS = [
                 },
                 "value": {
                     "description": "Value to set at the path"
+                },
+                "expected_revision": {
+                    "type": "integer",
+                    "description": "Only apply if the project is still at this revision (optimistic concurrency)"
                 }
             },
             "required": ["project", "path", "value"]
@@ -152,6 +219,10 @@ TOOLS = [
                 "path": {
                     "type": "string",
                     "description": "Dot-delimited path to remove"
+                },
+                "expected_revision": {
+                    "type": "integer",
+                    "description": "Only apply if the project is still at this revision (optimistic concurrency)"
                 }
             },
             "required": ["project", "path"]
@@ -201,11 +272,126 @@ TOOLS = [
                 "description": {
                     "type": "string",
                     "description": "Description for merged project (optional)"
+                },
+                "materialize": {
+                    "type": "boolean",
+                    "description": "Write a merged.yml snapshot now (default true); false keeps the project virtual, merged on read from its sources (optional)"
                 }
             },
             "required": ["source_projects", "target_project"]
         }
     ),
+    Tool(
+        name="merge_projects_batch",
+        description="Create many merged projects (e.g. environment tuples) in one pass and one commit",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "recipes": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "source_projects": {
+                                "type": "array",
+                                "items": {"type": "string"},
+                                "description": "List of project names to merge (in priority order)"
+                            },
+                            "target_project": {
+                                "type": "string",
+                                "description": "Name for the new merged project"
+                            },
+                            "runtime_overrides": {
+                                "type": "object",
+                                "description": "Additional runtime overrides to apply (optional)"
+                            },
+                            "description": {
+                                "type": "string",
+                                "description": "Description for merged project (optional)"
+                            },
+                            "materialize": {
+                                "type": "boolean",
+                                "description": "Write a merged.yml snapshot (default true) (optional)"
+                            }
+                        },
+                        "required": ["source_projects", "target_project"]
+                    },
+                    "description": "Merge recipes; all are validated before any is created"
+                },
+                "max_workers": {
+                    "type": "integer",
+                    "description": "Merge targets on this many threads (optional)"
+                }
+            },
+            "required": ["recipes"]
+        }
+    ),
+    Tool(
+        name="get_changes",
+        description="Get repository change events (project created/updated/deleted, document added, merged, external edits) after a sequence number",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "since": {
+                    "type": "integer",
+                    "description": "Return events with a sequence number above this (default 0)"
+                }
+            }
+        }
+    ),
+    Tool(
+        name="get_server_metrics",
+        description="Get server metrics: per-tool call and error counts, latency percentiles (p50/p95/p99), in-flight calls and cache hit ratios",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "format": {
+                    "type": "string",
+                    "enum": ["json", "prometheus"],
+                    "description": "Output format (default json)"
+                }
+            }
+        }
+    ),
+    Tool(
+        name="maintain_repository",
+        description="Compact the project repository (prune orphaned merged projects, deduplicate documents, git gc) and report size and commit-latency metrics before and after",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "prune_merged": {
+                    "type": "boolean",
+                    "description": "Delete merged project directories with no registry entry (default true)"
+                },
+                "dedupe_docs": {
+                    "type": "boolean",
+                    "description": "Hardlink identical documents across projects (default true)"
+                },
+                "gc": {
+                    "type": "boolean",
+                    "description": "Pack objects with git gc (default true)"
+                },
+                "aggressive": {
+                    "type": "boolean",
+                    "description": "Use git gc --aggressive (default false)"
+                }
+            }
+        }
+    ),
+    Tool(
+        name="materialize_project",
+        description="Write a merged project's current merge result as a merged.yml snapshot",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "project": {
+                    "type": "string",
+                    "description": "Merged project name"
+                }
+            },
+            "required": ["project"]
+        }
+    ),
     Tool(
         name="inspect_project",
         description="Query and inspect a project using natural language (LLM-powered)",
@@ -219,7 +405,12 @@ TOOLS = [
                 "query": {
                     "type": "string",
                     "description": "Natural language query about the project"
-                }
+                },
+                "at": {
+                    "type": "string",
+                    "description": "Inspect the project as of a git revision or ISO-8601 timestamp (optional)"
+                },
+                **OUTPUT_BUDGET_PROPERTIES
             },
             "required": ["project", "query"]
         }
@@ -241,7 +432,8 @@ TOOLS = [
                 "query": {
                     "type": "string",
                     "description": "What to compare (e.g., 'testing requirements')"
-                }
+                },
+                **OUTPUT_BUDGET_PROPERTIES
             },
             "required": ["project1", "project2"]
         }
@@ -263,7 +455,7 @@ TOOLS = [
     ),
     Tool(
         name="switch_context",
-        description="Switch from current context to a different project context",
+        description="Switch from current context to a different project context and list every requirement that changed",
         inputSchema={
             "type": "object",
             "properties": {
@@ -377,13 +569,90 @@ TOOLS = [
             }
         }
     ),
+    Tool(
+        name="close_session",
+        description="Discard a session's loaded context and persona",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "session_id": {
+                    "type": "string",
+                    "description": "Session to close"
+                }
+            },
+            "required": ["session_id"]
+        }
+    ),
 ]
 
+# Every tool accepts "trace": record spans of that call and append them
+# to the response
+TRACE_ARGUMENT = {
+    "type": "boolean",
+    "description": "Return a timing trace of this call (span summary and Chrome trace-event JSON)"
+}
+for _tool in TOOLS:
+    _tool.inputSchema.setdefault("properties", {})["trace"] = TRACE_ARGUMENT
+
+# Tools answering in JSON also accept "compact": no indentation, for
+# machine clients
+COMPACT_ARGUMENT = {
+    "type": "boolean",
+    "description": "Return JSON without indentation or spaces"
+}
+JSON_TOOLS = (
+    "create_project", "get_project", "list_projects", "update_project",
+    "merge_projects", "merge_projects_batch", "get_changes", "get_server_metrics",
+    "maintain_repository", "materialize_project", "query_context"
+)
+for _tool in TOOLS:
+    if _tool.name in JSON_TOOLS:
+        _tool.inputSchema["properties"]["compact"] = COMPACT_ARGUMENT
+
+SESSION_ARGUMENT = {
+    "type": "string",
+    "minLength": 1,
+    "maxLength": 128,
+    "description": "Session whose context and persona to use (default: the shared default session)"
+}
+for _tool in TOOLS:
+    if _tool.name in SESSION_TOOLS:
+        _tool.inputSchema["properties"]["session_id"] = SESSION_ARGUMENT
+
+# Handlers register below; each call's arguments are validated against
+# the tool's inputSchema before its handler runs
+dispatcher = ToolDispatcher({tool.name: tool.inputSchema for tool in TOOLS})
+
+
+def _text(text: str) -> List[TextContent]:
+    """Wrap a tool response as MCP text content."""
+    return [TextContent(type="text", text=text)]
+
+
+def _json(data: Any, arguments: Dict[str, Any]) -> List[TextContent]:
+    """Wrap data as a JSON tool response (compact if the call asked for it)."""
+    return _text(dump_json(data, compact=bool(arguments.get("compact"))))
+
+
+@contextmanager
+def _session(arguments: Dict[str, Any]) -> Iterator[Session]:
+    """Use the session named by a call's session_id, holding its lock."""
+    if sessions is None:
+        raise RuntimeError("Session manager not initialized")
+    with sessions.use(arguments.get("session_id")) as session:
+        yield session
+
 
 async def handle_tool_call(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
     """
     Handle MCP tool calls.
 
+    Arguments are validated on the event loop, so malformed calls are
+    rejected without queueing for a worker. Valid calls run on the
+    executor's thread pool (when the server started one), so a slow tool
+    doesn't block other requests. Every call to a known tool is timed
+    end to end (including time queued for a worker) in `metrics`.
+
     Args:
         name: Tool name
         arguments: Tool arguments
@@ -391,447 +660,528 @@ async def handle_tool_call(name: str, arguments: Dict[str, Any]) -> List[TextCon
     Returns:
         List of TextContent responses
     """
-    global repo, context_manager, persona_manager
+    if name not in dispatcher.schemas:
+        return _text(f"Unknown tool: {name}")
+
+    with metrics.track(name) as call:
+        try:
+            arguments = dispatcher.validate(name, arguments)
+        except UnknownToolError:
+            call.outcome = "error"
+            return _text(f"Unknown tool: {name}")
+        except InvalidArgumentsError as e:
+            call.outcome = "invalid"
+            return _text(f"Error: {str(e)}")
+
+        run = dispatcher.dispatch
+        if arguments.get("trace"):
+            run = _dispatch_traced
+            arguments = {key: value for key, value in arguments.items() if key != "trace"}
+
+        try:
+            if executor is None:
+                return run(name, arguments, validate=False)
+            return await executor.run(name, run, name, arguments, validate=False)
+        except ToolTimeoutError as e:
+            call.outcome = "timeout"
+            return _text(f"Error: {str(e)}")
+        except Exception as e:
+            call.outcome = "error"
+            return _text(f"Error: {str(e)}")
+
+
+def _dispatch_traced(name: str, arguments: Dict[str, Any], validate: bool = True) -> List[TextContent]:
+    """Run a tool while capturing a trace, and append the trace to its response."""
+    with tracing.capture() as trace:
+        with tracing.span(f"tool.{name}", "tool"):
+            result = dispatcher.dispatch(name, arguments, validate=validate)
+
+    summary = "\n".join(
+        f"  {span_name}: {stats['count']}x, {stats['total_ms']} ms total, {stats['max_ms']} ms max"
+        for span_name, stats in trace.summary().items()
+    )
+    return result + _text(
+        f"Trace summary:\n{summary}\n\n"
+        f"Chrome trace (open in chrome://tracing or ui.perfetto.dev):\n{trace.to_json()}"
+    )
+
 
+@dispatcher.handler("create_project")
+def handle_create_project(arguments: Dict[str, Any]) -> List[TextContent]:
+    metadata = repo.create_project(
+        name=arguments["name"],
+        project_type=arguments["type"],
+        base_projects=arguments["base_projects"],
+        config=arguments.get("config"),
+        description=arguments.get("description")
+    )
+    return _json(metadata.__dict__, arguments)
+
+
+@dispatcher.handler("get_project")
+def handle_get_project(arguments: Dict[str, Any]) -> List[TextContent]:
+    metadata = repo.get_project(arguments["name"])
+    if metadata is None:
+        return _text(f"Project '{arguments['name']}' not found")
+    return _json(metadata.__dict__, arguments)
+
+
+@dispatcher.handler("list_projects")
+def handle_list_projects(arguments: Dict[str, Any]) -> List[TextContent]:
+    projects = repo.list_projects(project_type=arguments.get("type"))
+    result = [
+        {
+            "name": p.name,
+            "type": p.project_type,
+            "base_projects": p.base_projects,
+            "description": p.description
+        }
+        for p in projects
+    ]
+    return _json(result, arguments)
+
+
+@dispatcher.handler("update_project")
+def handle_update_project(arguments: Dict[str, Any]) -> List[TextContent]:
+    metadata = repo.update_project(
+        name=arguments["name"],
+        updates=arguments["updates"],
+        expected_revision=arguments.get("expected_revision")
+    )
+    return _json(metadata.__dict__, arguments)
+
+
+@dispatcher.handler("delete_project")
+def handle_delete_project(arguments: Dict[str, Any]) -> List[TextContent]:
+    repo.delete_project(arguments["name"])
+    return _text(f"Project '{arguments['name']}' deleted successfully")
+
+
+@dispatcher.handler("add_node")
+def handle_add_node(arguments: Dict[str, Any]) -> List[TextContent]:
+    repo.update_project(
+        name=arguments["project"],
+        updates={arguments["path"]: arguments["value"]},
+        expected_revision=arguments.get("expected_revision")
+    )
+    return _text(f"Added node '{arguments['path']}' to project '{arguments['project']}'")
+
+
+@dispatcher.handler("remove_node")
+def handle_remove_node(arguments: Dict[str, Any]) -> List[TextContent]:
+    # Remove by setting to None (triggers deletion in merge)
+    repo.update_project(
+        name=arguments["project"],
+        updates={arguments["path"]: None},
+        expected_revision=arguments.get("expected_revision")
+    )
+    return _text(f"Removed node '{arguments['path']}' from project '{arguments['project']}'")
+
+
+@dispatcher.handler("add_document")
+def handle_add_document(arguments: Dict[str, Any]) -> List[TextContent]:
+    doc_path = repo.add_document(
+        project_name=arguments["project"],
+        doc_path=arguments["path"],
+        content=arguments["content"]
+    )
+    return _text(f"Document added at: {doc_path}")
+
+
+@dispatcher.handler("merge_projects")
+def handle_merge_projects(arguments: Dict[str, Any]) -> List[TextContent]:
+    metadata = repo.merge_projects(
+        source_projects=arguments["source_projects"],
+        target_name=arguments["target_project"],
+        runtime_overrides=arguments.get("runtime_overrides"),
+        description=arguments.get("description"),
+        materialize=arguments.get("materialize", True)
+    )
+    return _json(metadata.__dict__, arguments)
+
+
+@dispatcher.handler("merge_projects_batch")
+def handle_merge_projects_batch(arguments: Dict[str, Any]) -> List[TextContent]:
+    results = repo.merge_projects_batch(
+        [
+            {
+                "source_projects": recipe["source_projects"],
+                "target_name": recipe["target_project"],
+                "runtime_overrides": recipe.get("runtime_overrides"),
+                "description": recipe.get("description"),
+                "materialize": recipe.get("materialize", True)
+            }
+            for recipe in arguments["recipes"]
+        ],
+        max_workers=arguments.get("max_workers")
+    )
+    return _json([metadata.__dict__ for metadata in results], arguments)
+
+
+@dispatcher.handler("get_changes")
+def handle_get_changes(arguments: Dict[str, Any]) -> List[TextContent]:
+    events = repo.changes.events_since(arguments.get("since", 0))
+    return _json({
+        "sequence": repo.changes.sequence,
+        "events": [event.to_dict() for event in events]
+    }, arguments)
+
+
+@dispatcher.handler("get_server_metrics")
+def handle_get_server_metrics(arguments: Dict[str, Any]) -> List[TextContent]:
+    if arguments.get("format") == "prometheus":
+        return _text(metrics.render_prometheus())
+    snapshot = metrics.snapshot()
+    # Handler-only timings, excluding time queued for a worker
+    snapshot["handlers"] = dispatcher.stats()
+    snapshot["encoders"] = {"json": JSON_BACKEND, "yaml": YAML_BACKEND}
+    if sessions is not None:
+        snapshot["sessions"] = sessions.stats()
+    return _json(snapshot, arguments)
+
+
+@dispatcher.handler("maintain_repository")
+def handle_maintain_repository(arguments: Dict[str, Any]) -> List[TextContent]:
+    report = repo.maintain(
+        prune_merged=arguments.get("prune_merged", True),
+        dedupe_docs=arguments.get("dedupe_docs", True),
+        gc=arguments.get("gc", True),
+        aggressive=arguments.get("aggressive", False)
+    )
+    return _json(asdict(report), arguments)
+
+
+@dispatcher.handler("materialize_project")
+def handle_materialize_project(arguments: Dict[str, Any]) -> List[TextContent]:
+    metadata = repo.materialize_project(arguments["project"])
+    return _json(metadata.__dict__, arguments)
+
+
+def _streamer(arguments: Dict[str, Any], **budget) -> HierarchyStreamer:
+    """Build a streamer from a tool call's paging options."""
+    budget.setdefault("max_bytes", arguments.get("max_bytes", DEFAULT_MAX_BYTES))
+    budget.setdefault("max_nodes", arguments.get("max_nodes"))
+    return HierarchyStreamer(max_depth=arguments.get("max_depth"), **budget)
+
+
+def _truncation_note(cursor: str) -> str:
+    return f"\n# Truncated to fit the response budget. Continue with cursor: {cursor}\n"
+
+
+@dispatcher.handler("inspect_project")
+def handle_inspect_project(arguments: Dict[str, Any]) -> List[TextContent]:
+    # Get project config
+    config_manager = repo.get_project_config(arguments["project"], at=arguments.get("at"))
+    if config_manager is None:
+        return _text(f"Project '{arguments['project']}' not found")
+
+    def uri_preview(node) -> Dict[str, Any]:
+        # Try to resolve content
+        try:
+            content = config_manager.get_content(node.path)
+            return {"uri": node.value.uri, "content": content[:500]}  # Preview
+        except Exception:
+            return {"uri": node.value.uri}
+
+    # Stream the (possibly scoped) hierarchy as YAML within the budget;
+    # pages of an unchanged project come from the repository's cache
+    path = arguments.get("path")
     try:
-        if name == "create_project":
-            metadata = repo.create_project(
-                name=arguments["name"],
-                project_type=arguments["type"],
-                base_projects=arguments["base_projects"],
-                config=arguments.get("config"),
-                description=arguments.get("description")
-            )
-            return [TextContent(
-                type="text",
-                text=json.dumps(metadata.__dict__, indent=2)
-            )]
-
-        elif name == "get_project":
-            metadata = repo.get_project(arguments["name"])
-            if metadata is None:
-                return [TextContent(
-                    type="text",
-                    text=f"Project '{arguments['name']}' not found"
-                )]
-            return [TextContent(
-                type="text",
-                text=json.dumps(metadata.__dict__, indent=2)
-            )]
-
-        elif name == "list_projects":
-            projects = repo.list_projects()
-            result = [
-                {
-                    "name": p.name,
-                    "type": p.project_type,
-                    "base_projects": p.base_projects,
-                    "description": p.description
-                }
-                for p in projects
-            ]
-            return [TextContent(
-                type="text",
-                text=json.dumps(result, indent=2)
-            )]
-
-        elif name == "update_project":
-            metadata = repo.update_project(
-                name=arguments["name"],
-                updates=arguments["updates"]
-            )
-            return [TextContent(
-                type="text",
-                text=json.dumps(metadata.__dict__, indent=2)
-            )]
-
-        elif name == "delete_project":
-            repo.delete_project(arguments["name"])
-            return [TextContent(
-                type="text",
-                text=f"Project '{arguments['name']}' deleted successfully"
-            )]
-
-        elif name == "add_node":
-            updates = {arguments["path"]: arguments["value"]}
-            metadata = repo.update_project(
-                name=arguments["project"],
-                updates=updates
-            )
-            return [TextContent(
-                type="text",
-                text=f"Added node '{arguments['path']}' to project '{arguments['project']}'"
-            )]
-
-        elif name == "remove_node":
-            # Remove by setting to None (triggers deletion in merge)
-            updates = {arguments["path"]: None}
-            metadata = repo.update_project(
-                name=arguments["project"],
-                updates=updates
-            )
-            return [TextContent(
-                type="text",
-                text=f"Removed node '{arguments['path']}' from project '{arguments['project']}'"
-            )]
-
-        elif name == "add_document":
-            doc_path = repo.add_document(
-                project_name=arguments["project"],
-                doc_path=arguments["path"],
-                content=arguments["content"]
-            )
-            return [TextContent(
-                type="text",
-                text=f"Document added at: {doc_path}"
-            )]
-
-        elif name == "merge_projects":
-            metadata = repo.merge_projects(
-                source_projects=arguments["source_projects"],
-                target_name=arguments["target_project"],
-                runtime_overrides=arguments.get("runtime_overrides"),
-                description=arguments.get("description")
-            )
-            return [TextContent(
-                type="text",
-                text=json.dumps(metadata.__dict__, indent=2)
-            )]
-
-        elif name == "inspect_project":
-            # Get project config
-            config_manager = repo.get_project_config(arguments["project"])
-            if config_manager is None:
-                return [TextContent(
-                    type="text",
-                    text=f"Project '{arguments['project']}' not found"
-                )]
-
-            # Convert hierarchy to JSON for LLM context
-            import yaml
-            from ai_sdlc_config.models.hierarchy_node import URIReference
-
-            def hierarchy_to_dict(node) -> Dict[str, Any]:
-                if node.value is not None and not node.children:
-                    if isinstance(node.value, URIReference):
-                        # Try to resolve content
-                        try:
-                            content = config_manager.get_content(node.path)
-                            return {"uri": node.value.uri, "content": content[:500]}  # Preview
-                        except:
-                            return {"uri": node.value.uri}
-                    else:
-                        return node.value
-
-                result = {}
-                for key, child in node.children.items():
-                    result[key] = hierarchy_to_dict(child)
-                return result
-
-            config_data = hierarchy_to_dict(config_manager.merged_hierarchy)
-
-            # Format response for LLM
-            response = f"Project: {arguments['project']}\n\n"
-            response += f"Query: {arguments['query']}\n\n"
-            response += "Configuration:\n"
-            response += yaml.dump(config_data, default_flow_style=False)
-
-            return [TextContent(
-                type="text",
-                text=response
-            )]
-
-        elif name == "compare_projects":
-            # Get both project configs
-            config1 = repo.get_project_config(arguments["project1"])
-            config2 = repo.get_project_config(arguments["project2"])
-
-            if config1 is None:
-                return [TextContent(
-                    type="text",
-                    text=f"Project '{arguments['project1']}' not found"
-                )]
-
-            if config2 is None:
-                return [TextContent(
-                    type="text",
-                    text=f"Project '{arguments['project2']}' not found"
-                )]
-
-            # Simple comparison (could be enhanced with LLM)
-            import yaml
-            from ai_sdlc_config.models.hierarchy_node import URIReference
-
-            def hierarchy_to_dict(node) -> Dict[str, Any]:
-                if node.value is not None and not node.children:
-                    if isinstance(node.value, URIReference):
-                        return {"uri": node.value.uri}
-                    else:
-                        return node.value
-
-                result = {}
-                for key, child in node.children.items():
-                    result[key] = hierarchy_to_dict(child)
-                return result
-
-            data1 = hierarchy_to_dict(config1.merged_hierarchy)
-            data2 = hierarchy_to_dict(config2.merged_hierarchy)
-
-            response = f"Comparison: {arguments['project1']} vs {arguments['project2']}\n\n"
-            if "query" in arguments:
-                response += f"Focus: {arguments['query']}\n\n"
-
-            response += f"{arguments['project1']} Configuration:\n"
-            response += yaml.dump(data1, default_flow_style=False)
-            response += f"\n{arguments['project2']} Configuration:\n"
-            response += yaml.dump(data2, default_flow_style=False)
-
-            return [TextContent(
-                type="text",
-                text=response
-            )]
-
-        # Context Management Tools
-        elif name == "load_context":
-            if context_manager is None:
-                return [TextContent(
-                    type="text",
-                    text="Error: Context manager not initialized"
-                )]
-
-            context = context_manager.load_context(arguments["project_name"])
-            formatted = context_manager.format_context_for_llm(context)
-
-            return [TextContent(
-                type="text",
-                text=formatted
-            )]
-
-        elif name == "switch_context":
-            if context_manager is None:
-                return [TextContent(
-                    type="text",
-                    text="Error: Context manager not initialized"
-                )]
-
-            result = context_manager.switch_context(arguments["new_project"])
-
-            response = f"Switched context to: {result['new_project']}\n\n"
-            if result.get('requirements_changed'):
-                response += "Requirements that changed:\n"
-                for change in result['requirements_changed']:
-                    response += f"  • {change}\n"
-
-            return [TextContent(
-                type="text",
-                text=response
-            )]
-
-        elif name == "query_context":
-            if context_manager is None:
-                return [TextContent(
-                    type="text",
-                    text="Error: Context manager not initialized"
-                )]
-
-            result = context_manager.query_context(arguments["query"])
-
-            return [TextContent(
-                type="text",
-                text=json.dumps(result, indent=2)
-            )]
-
-        elif name == "get_current_context":
-            if context_manager is None:
-                return [TextContent(
-                    type="text",
-                    text="Error: Context manager not initialized"
-                )]
-
-            if context_manager.current_context is None:
-                return [TextContent(
-                    type="text",
-                    text="No context currently loaded"
-                )]
-
-            context_name = context_manager.current_context.get('metadata', {}).get('name', 'Unknown')
-            formatted = context_manager.format_context_for_llm(context_manager.current_context)
-
-            return [TextContent(
-                type="text",
-                text=f"Current Context: {context_name}\n\n{formatted}"
-            )]
-
-        elif name == "get_full_context_state":
-            if context_manager is None:
-                return [TextContent(
-                    type="text",
-                    text="Error: Context manager not initialized"
-                )]
-
-            state = context_manager.get_full_context_state()
-
-            # Import the formatter
-            from .context_tools import format_full_context_state
-            formatted = format_full_context_state(state)
-
-            return [TextContent(
-                type="text",
-                text=formatted
-            )]
-
-        # Persona Management Tools
-        elif name == "list_personas":
-            if persona_manager is None:
-                return [TextContent(
-                    type="text",
-                    text="Error: Persona manager not initialized"
-                )]
-
-            personas = persona_manager.list_personas()
-
-            response = f"Available Personas ({len(personas)}):\n\n"
-            for persona in personas:
-                response += f"👤 {persona['name']} ({persona['role']})\n"
-                response += f"   Focus: {', '.join(persona['focus_areas'][:3])}\n\n"
-
-            return [TextContent(
-                type="text",
-                text=response
-            )]
-
-        elif name == "load_persona":
-            if persona_manager is None:
-                return [TextContent(
-                    type="text",
-                    text="Error: Persona manager not initialized"
-                )]
-
-            persona = persona_manager.load_persona(arguments["persona_name"])
-
-            response = f"Loaded Persona: {persona['persona']['name']}\n\n"
-            response += "Focus Areas:\n"
-            for focus in persona['persona']['focus_areas']:
-                response += f"  • {focus}\n"
-
-            return [TextContent(
-                type="text",
-                text=response
-            )]
-
-        elif name == "apply_persona_to_context":
-            if persona_manager is None:
-                return [TextContent(
-                    type="text",
-                    text="Error: Persona manager not initialized"
-                )]
-            if context_manager is None:
-                return [TextContent(
-                    type="text",
-                    text="Error: Context manager not initialized"
-                )]
-
-            # Load persona
-            persona = persona_manager.load_persona(arguments["persona_name"])
-
-            # Get project context
-            if "project_name" in arguments:
-                project_context = context_manager.load_context(arguments["project_name"])
-            elif context_manager.current_context:
-                project_context = context_manager.current_context
-            else:
-                return [TextContent(
-                    type="text",
-                    text="Error: No context loaded. Specify project_name or load a context first."
-                )]
-
-            # Apply persona to context
-            persona_context = persona_manager.apply_persona_to_context(project_context, persona)
-
-            # Format for display
-            formatted = persona_manager.format_context_for_persona(persona_context, persona)
-
-            return [TextContent(
-                type="text",
-                text=formatted
-            )]
-
-        elif name == "switch_persona":
-            if persona_manager is None:
-                return [TextContent(
-                    type="text",
-                    text="Error: Persona manager not initialized"
-                )]
-
-            result = persona_manager.switch_persona(
-                arguments.get("from_persona"),
-                arguments["to_persona"]
+        page = repo.serializer.page(
+            config_manager.merged_hierarchy,
+            _streamer(arguments, uri_formatter=uri_preview),
+            path,
+            arguments.get("cursor"),
+            key=(arguments["project"], config_manager.version, "preview")
+        )
+    except KeyError:
+        return _text(f"Path '{path}' not found in project '{arguments['project']}'")
+
+    # Format response for LLM
+    response = f"Project: {arguments['project']}\n\n"
+    if arguments.get("at"):
+        response += f"As of: {arguments['at']}\n\n"
+    response += f"Query: {arguments['query']}\n\n"
+    if path:
+        response += f"Path: {path}\n\n"
+    response += "Configuration:\n"
+    response += page.text
+    if not page.complete:
+        response += _truncation_note(page.next_cursor)
+
+    return _text(response)
+
+
+@dispatcher.handler("compare_projects")
+def handle_compare_projects(arguments: Dict[str, Any]) -> List[TextContent]:
+    # Get both project configs
+    config1 = repo.get_project_config(arguments["project1"])
+    config2 = repo.get_project_config(arguments["project2"])
+
+    if config1 is None:
+        return _text(f"Project '{arguments['project1']}' not found")
+
+    if config2 is None:
+        return _text(f"Project '{arguments['project2']}' not found")
+
+    # The cursor is "<part>:<streamer cursor>", part 1 or 2 naming the
+    # project the previous response stopped in
+    part, cursor = 1, None
+    if arguments.get("cursor"):
+        part_text, _, cursor = arguments["cursor"].partition(":")
+        if part_text not in ("1", "2"):
+            raise ValueError(f"Invalid cursor: {arguments['cursor']}")
+        part, cursor = int(part_text), cursor or None
+
+    path = arguments.get("path")
+    response = f"Comparison: {arguments['project1']} vs {arguments['project2']}\n\n"
+    if "query" in arguments:
+        response += f"Focus: {arguments['query']}\n\n"
+    if path:
+        response += f"Path: {path}\n\n"
+
+    # Both projects share one budget
+    max_bytes = arguments.get("max_bytes", DEFAULT_MAX_BYTES)
+    max_nodes = arguments.get("max_nodes")
+    sections = [(1, arguments["project1"], config1), (2, arguments["project2"], config2)]
+    for index, project, config in sections[part - 1:]:
+        try:
+            # A project following another in the same response only gets
+            # what is left of the budget, possibly nothing
+            page = repo.serializer.page(
+                config.merged_hierarchy,
+                _streamer(arguments, max_bytes=max_bytes, max_nodes=max_nodes),
+                path,
+                cursor,
+                allow_empty=index > part,
+                key=(project, config.version)
             )
+        except KeyError:
+            page = None
+        if page is not None and page.nodes == 0 and not page.complete:
+            response += _truncation_note(f"{index}:")
+            break
+
+        if index > part:
+            response += "\n"
+        response += f"{project} Configuration:\n"
+        if page is None:
+            response += f"# Path '{path}' not found\n"
+            continue
+        response += page.text
+        if not page.complete:
+            response += _truncation_note(f"{index}:{page.next_cursor}")
+            break
+
+        max_bytes -= page.bytes
+        max_nodes = None if max_nodes is None else max_nodes - page.nodes
+        cursor = None
+
+    return _text(response)
+
+
+# Context Management Tools
+@dispatcher.handler("load_context")
+def handle_load_context(arguments: Dict[str, Any]) -> List[TextContent]:
+    with _session(arguments) as session:
+        context = session.context.load_context(arguments["project_name"])
+        return _text(format_context_for_llm(context))
+
+
+@dispatcher.handler("switch_context")
+def handle_switch_context(arguments: Dict[str, Any]) -> List[TextContent]:
+    with _session(arguments) as session:
+        current = session.context.current_context
+        from_project = current["metadata"]["name"] if current else None
+        result = session.context.switch_context(from_project, arguments["new_project"])
+
+    if result["action"] == "loaded":
+        return _text(f"Loaded context: {result['project']}\n\n{format_context_for_llm(result['context'])}")
+
+    response = f"Switched context: {result['from']} → {result['to']}\n\n"
+    if not result["changes"]:
+        return _text(response + "No requirements changed\n")
+
+    response += f"Requirements that changed ({len(result['changes'])}):\n"
+    for path, change in result["changes"].items():
+        old = dump_json(change["old"], compact=True)
+        new = dump_json(change["new"], compact=True)
+        if change["change"] == "added":
+            response += f"  + {path}: {new}\n"
+        elif change["change"] == "removed":
+            response += f"  - {path}: {old}\n"
+        else:
+            direction = f" ({change['direction']})" if change.get("direction") else ""
+            response += f"  • {path}: {old} → {new}{direction}\n"
 
-            response = f"Switched to: {result['to']}\n\n"
-            if result.get('focus_changed'):
-                if result['focus_changed'].get('added_focus'):
-                    response += "Added Focus Areas:\n"
-                    for focus in result['focus_changed']['added_focus']:
-                        response += f"  ✚ {focus}\n"
-                if result['focus_changed'].get('removed_focus'):
-                    response += "\nRemoved Focus Areas:\n"
-                    for focus in result['focus_changed']['removed_focus']:
-                        response += f"  ✖ {focus}\n"
-
-            return [TextContent(
-                type="text",
-                text=response
-            )]
-
-        elif name == "get_persona_checklist":
-            if persona_manager is None:
-                return [TextContent(
-                    type="text",
-                    text="Error: Persona manager not initialized"
-                )]
-
-            checklist = persona_manager.get_persona_review_checklist(
-                arguments.get("persona_name")
-            )
+    return _text(response)
 
-            if not checklist:
-                return [TextContent(
-                    type="text",
-                    text="No checklist available for this persona"
-                )]
 
-            response = "Review Checklist:\n\n"
-            for item in checklist:
-                response += f"□ {item}\n"
+@dispatcher.handler("query_context")
+def handle_query_context(arguments: Dict[str, Any]) -> List[TextContent]:
+    with _session(arguments) as session:
+        result = session.context.query_context(arguments["query"])
+    return _json(result, arguments)
 
-            return [TextContent(
-                type="text",
-                text=response
-            )]
 
-        else:
-            return [TextContent(
-                type="text",
-                text=f"Unknown tool: {name}"
-            )]
+@dispatcher.handler("get_current_context")
+def handle_get_current_context(arguments: Dict[str, Any]) -> List[TextContent]:
+    with _session(arguments) as session:
+        current_context = session.context.current_context
+
+    if current_context is None:
+        return _text("No context currently loaded")
+
+    context_name = current_context.get('metadata', {}).get('name', 'Unknown')
+    formatted = format_context_for_llm(current_context)
+
+    return _text(f"Current Context: {context_name}\n\n{formatted}")
+
+
+@dispatcher.handler("get_full_context_state")
+def handle_get_full_context_state(arguments: Dict[str, Any]) -> List[TextContent]:
+    with _session(arguments) as session:
+        state = session.context.get_full_context_state()
 
-    except Exception as e:
-        return [TextContent(
-            type="text",
-            text=f"Error: {str(e)}"
-        )]
+    return _text(format_full_context_state(state))
 
 
-async def main(repo_path: Optional[str] = None, personas_path: Optional[str] = None):
+# Persona Management Tools
+@dispatcher.handler("list_personas")
+def handle_list_personas(arguments: Dict[str, Any]) -> List[TextContent]:
+    with _session(arguments) as session:
+        personas = session.personas.list_personas()
+
+    response = f"Available Personas ({len(personas)}):\n\n"
+    for persona in personas:
+        response += f"👤 {persona['name']} ({persona['role']})\n"
+        response += f"   Focus: {', '.join(persona['focus_areas'][:3])}\n\n"
+
+    return _text(response)
+
+
+@dispatcher.handler("load_persona")
+def handle_load_persona(arguments: Dict[str, Any]) -> List[TextContent]:
+    with _session(arguments) as session:
+        persona = session.personas.load_persona(arguments["persona_name"])
+
+    response = f"Loaded Persona: {persona['persona']['name']}\n\n"
+    response += "Focus Areas:\n"
+    for focus in persona['persona']['focus_areas']:
+        response += f"  • {focus}\n"
+
+    return _text(response)
+
+
+@dispatcher.handler("apply_persona_to_context")
+def handle_apply_persona_to_context(arguments: Dict[str, Any]) -> List[TextContent]:
+    with _session(arguments) as session:
+        # Load persona
+        persona = session.personas.load_persona(arguments["persona_name"])
+
+        # Get project context
+        if "project_name" in arguments:
+            project_context = session.context.load_context(arguments["project_name"])
+        elif session.context.current_context:
+            project_context = session.context.current_context
+        else:
+            return _text("Error: No context loaded. Specify project_name or load a context first.")
+
+        # Apply persona to context
+        persona_context = session.personas.apply_persona_to_context(project_context, persona)
+
+        # Format for display
+        return _text(session.personas.format_context_for_persona(persona_context, persona))
+
+
+@dispatcher.handler("switch_persona")
+def handle_switch_persona(arguments: Dict[str, Any]) -> List[TextContent]:
+    with _session(arguments) as session:
+        result = session.personas.switch_persona(
+            arguments.get("from_persona"),
+            arguments["to_persona"]
+        )
+
+    response = f"Switched to: {result['to']}\n\n"
+    if result.get('focus_changed'):
+        if result['focus_changed'].get('added_focus'):
+            response += "Added Focus Areas:\n"
+            for focus in result['focus_changed']['added_focus']:
+                response += f"  ✚ {focus}\n"
+        if result['focus_changed'].get('removed_focus'):
+            response += "\nRemoved Focus Areas:\n"
+            for focus in result['focus_changed']['removed_focus']:
+                response += f"  ✖ {focus}\n"
+
+    return _text(response)
+
+
+@dispatcher.handler("get_persona_checklist")
+def handle_get_persona_checklist(arguments: Dict[str, Any]) -> List[TextContent]:
+    with _session(arguments) as session:
+        checklist = session.personas.get_persona_review_checklist(
+            arguments.get("persona_name")
+        )
+
+    if not checklist:
+        return _text("No checklist available for this persona")
+
+    response = "Review Checklist:\n\n"
+    for item in checklist:
+        response += f"□ {item}\n"
+
+    return _text(response)
+
+
+@dispatcher.handler("close_session")
+def handle_close_session(arguments: Dict[str, Any]) -> List[TextContent]:
+    if sessions is None:
+        return _text("Error: Session manager not initialized")
+
+    session_id = arguments["session_id"]
+    if not sessions.close(session_id):
+        return _text(f"Session '{session_id}' not found")
+    return _text(f"Session '{session_id}' closed")
+
+
+async def main(
+    repo_path: Optional[str] = None,
+    personas_path: Optional[str] = None,
+    commit_interval_ms: Optional[int] = None,
+    commit_max_ops: Optional[int] = None,
+    fsync: bool = False,
+    use_index: bool = False,
+    gc_every: Optional[int] = None,
+    watch: bool = False,
+    max_workers: Optional[int] = None,
+    tool_timeout: Optional[float] = None,
+    metrics_file: Optional[str] = None,
+    metrics_port: Optional[int] = None,
+    metrics_interval: float = 15.0,
+    session_idle_timeout: Optional[float] = 1800.0,
+    max_sessions: int = 256
+):
     """
     Run the MCP server.
 
     Args:
         repo_path: Path to project repository (defaults to ./projects_repo)
         personas_path: Path to personas directory (defaults to ./personas)
+        commit_interval_ms: Enable write-behind commits every N ms (optional)
+        commit_max_ops: Enable write-behind commits every N operations (optional)
+        fsync: Make repository writes durable before each commit
+        use_index: Serve listing/dependency queries from a SQLite index
+        gc_every: Run `git gc --auto` every N commits (optional)
+        watch: Detect edits made outside the server (inotify or polling)
+        max_workers: Threads for running tool calls (default: Python's default)
+        tool_timeout: Seconds before a tool call fails (optional)
+        metrics_file: Write Prometheus metrics to this file (optional)
+        metrics_port: Serve Prometheus metrics on this localhost port (optional)
+        metrics_interval: Seconds between metrics file writes
+        session_idle_timeout: Evict sessions idle this many seconds (None: never)
+        max_sessions: Sessions kept besides the default one (least recently used go first)
     """
-    global repo, context_manager, persona_manager
+    global repo, sessions, executor
 
     # Initialize repository
     if repo_path is None:
@@ -839,18 +1189,39 @@ async def main(repo_path: Optional[str] = None, personas_path: Optional[str] = N
     else:
         repo_path = Path(repo_path)
 
-    repo = ProjectRepository(repo_path)
-
-    # Initialize context manager
-    context_manager = ContextManager(repo)
+    repo = ProjectRepository(
+        repo_path,
+        commit_interval_ms=commit_interval_ms,
+        commit_max_ops=commit_max_ops,
+        fsync=fsync,
+        use_index=use_index,
+        gc_every=gc_every
+    )
+    if watch:
+        repo.watch()
+    metrics.add_cache_source(repo.cache_stats)
 
-    # Initialize persona manager
+    # Per-session context and persona managers
     if personas_path is None:
         personas_path = Path.cwd() / "personas"
     else:
         personas_path = Path(personas_path)
 
-    persona_manager = PersonaManager(personas_path)
+    sessions = SessionManager(
+        repo,
+        personas_path,
+        idle_timeout=session_idle_timeout,
+        max_sessions=max_sessions
+    )
+    metrics.add_cache_source(sessions.contexts.stats)
+
+    # Run tool handlers off the event loop
+    executor = ToolExecutor(
+        max_workers=max_workers,
+        limits=TOOL_LIMITS,
+        groups=TOOL_GROUPS,
+        timeout=tool_timeout
+    )
 
     # Create server
     server = Server("ai-sdlc-config")
@@ -864,9 +1235,30 @@ async def main(repo_path: Optional[str] = None, personas_path: Optional[str] = N
     async def call_tool(name: str, arguments: Dict[str, Any]):
         return await handle_tool_call(name, arguments)
 
+    # Export metrics
+    metrics_server = start_http_server(metrics, metrics_port) if metrics_port is not None else None
+    metrics_writer = None
+    if metrics_file is not None:
+        async def write_metrics():
+            while True:
+                metrics.write_textfile(Path(metrics_file))
+                await asyncio.sleep(metrics_interval)
+        metrics_writer = asyncio.create_task(write_metrics())
+
     # Run server
-    async with stdio_server() as (read_stream, write_stream):
-        await server.run(read_stream, write_stream, server.create_initialization_options())
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await server.run(read_stream, write_stream, server.create_initialization_options())
+    finally:
+        # Let running tool calls finish, then commit anything still in
+        # the write-behind journal
+        executor.shutdown()
+        repo.close()
+        if metrics_writer is not None:
+            metrics_writer.cancel()
+            metrics.write_textfile(Path(metrics_file))
+        if metrics_server is not None:
+            metrics_server.shutdown()
 
 
 if __name__ == "__main__":
@@ -881,6 +1273,89 @@ if __name__ == "__main__":
         "--personas-path",
         help="Path to personas directory (default: ./personas)"
     )
+    parser.add_argument(
+        "--commit-interval-ms",
+        type=int,
+        help="Write-behind: commit journaled changes every N milliseconds"
+    )
+    parser.add_argument(
+        "--commit-max-ops",
+        type=int,
+        help="Write-behind: commit journaled changes every N operations"
+    )
+    parser.add_argument(
+        "--fsync",
+        action="store_true",
+        help="fsync each operation's file writes (one grouped barrier per operation)"
+    )
+    parser.add_argument(
+        "--index",
+        action="store_true",
+        help="Maintain a SQLite index of projects for listing and dependency queries"
+    )
+    parser.add_argument(
+        "--gc-every",
+        type=int,
+        help="Run `git gc --auto` after every N commits"
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Detect edits made to the repository outside the server"
+    )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        help="Threads for running tool calls concurrently"
+    )
+    parser.add_argument(
+        "--tool-timeout",
+        type=float,
+        help="Fail tool calls that take longer than N seconds"
+    )
+    parser.add_argument(
+        "--metrics-file",
+        help="Write Prometheus metrics to this file (for a textfile collector)"
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        help="Serve Prometheus metrics at http://127.0.0.1:PORT/metrics"
+    )
+    parser.add_argument(
+        "--metrics-interval",
+        type=float,
+        default=15.0,
+        help="Seconds between metrics file writes (default: 15)"
+    )
+    parser.add_argument(
+        "--session-idle-timeout",
+        type=float,
+        default=1800.0,
+        help="Evict sessions idle for N seconds (default: 1800; 0: never)"
+    )
+    parser.add_argument(
+        "--max-sessions",
+        type=int,
+        default=256,
+        help="Sessions kept besides the default one (default: 256)"
+    )
     args = parser.parse_args()
 
-    asyncio.run(main(args.repo_path, args.personas_path))
+    asyncio.run(main(
+        args.repo_path,
+        args.personas_path,
+        args.commit_interval_ms,
+        args.commit_max_ops,
+        args.fsync,
+        args.index,
+        args.gc_every,
+        args.watch,
+        args.max_workers,
+        args.tool_timeout,
+        args.metrics_file,
+        args.metrics_port,
+        args.metrics_interval,
+        args.session_idle_timeout or None,
+        args.max_sessions
+    ))
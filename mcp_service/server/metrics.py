@@ -0,0 +1,288 @@
+"""
+Metrics for the MCP server.
+
+ServerMetrics records per-tool call counts by outcome, latency histograms
+and in-flight gauges, and collects cache hit ratios from registered
+sources (the repository's cache_stats()). Metrics are read as a JSON
+snapshot (the get_server_metrics tool) or in the Prometheus text
+exposition format, written to a file for a textfile collector or served
+over HTTP on a local port.
+
+Latency percentiles are computed from a window of recent samples per
+tool; the Prometheus histogram buckets count every call.
+"""
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Tuple
+
+
+# Histogram bucket upper bounds, in seconds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Recent samples kept per tool for percentiles
+LATENCY_SAMPLES = 1024
+
+OUTCOMES = ("ok", "error", "invalid", "timeout")
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+CacheSource = Callable[[], Dict[str, Dict[str, float]]]
+
+
+class Histogram:
+    """Latency histogram with cumulative buckets and a window of recent samples."""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS, samples: int = LATENCY_SAMPLES):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self.recent: "deque[float]" = deque(maxlen=samples)
+
+    def observe(self, seconds: float):
+        """Record one observation."""
+        for i, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                self.counts[i] += 1
+                break
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.recent.append(seconds)
+
+    def cumulative(self) -> List[int]:
+        """Observations <= each bucket bound."""
+        total = 0
+        result = []
+        for count in self.counts:
+            total += count
+            result.append(total)
+        return result
+
+    def summary_ms(self) -> Dict[str, float]:
+        """Mean, max and p50/p95/p99 (of recent samples) in milliseconds."""
+        if not self.count:
+            return {}
+        ordered = sorted(self.recent)
+
+        def percentile(p: float) -> float:
+            return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000, 3)
+
+        return {
+            "mean": round(self.sum / self.count * 1000, 3),
+            "p50": percentile(0.5),
+            "p95": percentile(0.95),
+            "p99": percentile(0.99),
+            "max": round(self.max * 1000, 3)
+        }
+
+
+class _ToolMetrics:
+    def __init__(self):
+        self.outcomes = dict.fromkeys(OUTCOMES, 0)
+        self.in_flight = 0
+        self.latency = Histogram()
+
+
+class _Call:
+    """Outcome of a tracked call; set outcome before the block exits."""
+
+    def __init__(self):
+        self.outcome = "ok"
+
+
+class ServerMetrics:
+    """
+    Thread-safe tool and cache metrics.
+
+    Example:
+        >>> metrics = ServerMetrics()
+        >>> with metrics.track("load_context") as call:
+        ...     call.outcome = "ok"
+        >>> metrics.snapshot()["tools"]["load_context"]["calls"]
+        1
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        """
+        Initialize server metrics.
+
+        Args:
+            clock: Monotonic clock in seconds (replaceable in tests)
+        """
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._tools: Dict[str, _ToolMetrics] = {}
+        self._cache_sources: List[CacheSource] = []
+        self.started = time.time()
+
+    def add_cache_source(self, source: CacheSource):
+        """
+        Register a callable returning cache name -> hits, misses, entries.
+
+        Sources are called on every snapshot or export.
+        """
+        self._cache_sources.append(source)
+
+    def _tool(self, tool: str) -> _ToolMetrics:
+        metrics = self._tools.get(tool)
+        if metrics is None:
+            metrics = self._tools[tool] = _ToolMetrics()
+        return metrics
+
+    @contextmanager
+    def track(self, tool: str) -> Iterator[_Call]:
+        """
+        Time a tool call and count its outcome.
+
+        The call is in flight for the duration of the block. An exception
+        escaping the block counts as "error".
+        """
+        call = _Call()
+        with self._lock:
+            self._tool(tool).in_flight += 1
+        start = self._clock()
+        try:
+            yield call
+        except BaseException:
+            call.outcome = "error"
+            raise
+        finally:
+            elapsed = self._clock() - start
+            with self._lock:
+                metrics = self._tool(tool)
+                metrics.in_flight -= 1
+                metrics.outcomes[call.outcome] = metrics.outcomes.get(call.outcome, 0) + 1
+                metrics.latency.observe(elapsed)
+
+    def _caches(self) -> Dict[str, Dict[str, float]]:
+        caches = {}
+        for source in self._cache_sources:
+            caches.update(source())
+        return caches
+
+    def snapshot(self) -> Dict[str, object]:
+        """
+        Get all metrics as a JSON-serializable dict.
+
+        Returns:
+            Dict with uptime_seconds, tools (name -> calls, errors,
+            outcomes, in_flight, latency_ms) and caches
+        """
+        with self._lock:
+            tools = {
+                tool: {
+                    "calls": sum(metrics.outcomes.values()),
+                    "errors": metrics.outcomes["error"] + metrics.outcomes["timeout"],
+                    "outcomes": dict(metrics.outcomes),
+                    "in_flight": metrics.in_flight,
+                    "latency_ms": metrics.latency.summary_ms()
+                }
+                for tool, metrics in sorted(self._tools.items())
+            }
+        return {
+            "uptime_seconds": round(time.time() - self.started, 3),
+            "tools": tools,
+            "caches": self._caches()
+        }
+
+    def render_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = [
+            "# HELP ai_sdlc_tool_calls_total MCP tool calls by outcome.",
+            "# TYPE ai_sdlc_tool_calls_total counter",
+        ]
+        with self._lock:
+            tools = sorted(self._tools.items())
+            for tool, metrics in tools:
+                for outcome, count in metrics.outcomes.items():
+                    lines.append(f'ai_sdlc_tool_calls_total{{tool="{tool}",outcome="{outcome}"}} {count}')
+
+            lines += [
+                "# HELP ai_sdlc_tool_in_flight MCP tool calls currently running.",
+                "# TYPE ai_sdlc_tool_in_flight gauge",
+            ]
+            for tool, metrics in tools:
+                lines.append(f'ai_sdlc_tool_in_flight{{tool="{tool}"}} {metrics.in_flight}')
+
+            lines += [
+                "# HELP ai_sdlc_tool_duration_seconds MCP tool call latency.",
+                "# TYPE ai_sdlc_tool_duration_seconds histogram",
+            ]
+            for tool, metrics in tools:
+                histogram = metrics.latency
+                for bound, count in zip(histogram.buckets, histogram.cumulative()):
+                    lines.append(
+                        f'ai_sdlc_tool_duration_seconds_bucket{{tool="{tool}",le="{bound}"}} {count}'
+                    )
+                lines.append(f'ai_sdlc_tool_duration_seconds_bucket{{tool="{tool}",le="+Inf"}} {histogram.count}')
+                lines.append(f'ai_sdlc_tool_duration_seconds_sum{{tool="{tool}"}} {histogram.sum:.6f}')
+                lines.append(f'ai_sdlc_tool_duration_seconds_count{{tool="{tool}"}} {histogram.count}')
+
+        caches = sorted(self._caches().items())
+        for name, kind, key, help_text in (
+            ("ai_sdlc_cache_hits_total", "counter", "hits", "Cache hits."),
+            ("ai_sdlc_cache_misses_total", "counter", "misses", "Cache misses."),
+            ("ai_sdlc_cache_entries", "gauge", "entries", "Entries currently cached."),
+        ):
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+            for cache, stats in caches:
+                lines.append(f'{name}{{cache="{cache}"}} {stats.get(key, 0)}')
+
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: Path):
+        """
+        Write the Prometheus exposition to a file, replacing it atomically
+        (so a collector never reads a partial file).
+        """
+        path = Path(path)
+        temp = path.with_name(f".{path.name}.tmp")
+        temp.write_text(self.render_prometheus(), encoding="utf-8")
+        os.replace(temp, path)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    metrics: ServerMetrics
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = self.metrics.render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # stdout/stderr belong to the MCP stdio transport
+        pass
+
+
+def start_http_server(metrics: ServerMetrics, port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """
+    Serve /metrics on a background thread.
+
+    Args:
+        metrics: Metrics to expose
+        port: TCP port (0 picks a free one; see server.server_address)
+        host: Interface to bind (default: loopback only)
+
+    Returns:
+        The HTTP server (call shutdown() to stop it)
+    """
+    handler = type("MetricsHandler", (_MetricsHandler,), {"metrics": metrics})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name="ai-sdlc-metrics", daemon=True)
+    thread.start()
+    return server
@@ -17,16 +17,18 @@ class PersonaManager:
     and can customize how project configurations are presented and prioritized.
     """
 
-    def __init__(self, personas_dir: Path):
+    def __init__(self, personas_dir: Path, persona_cache: Optional[Dict[str, Dict[str, Any]]] = None):
         """
         Initialize persona manager.
 
         Args:
             personas_dir: Directory containing persona YAML files
+            persona_cache: Parsed personas to share with other managers
+                           (e.g. one per session); treated as read-only
         """
         self.personas_dir = Path(personas_dir)
         self.current_persona: Optional[Dict[str, Any]] = None
-        self.persona_cache: Dict[str, Dict[str, Any]] = {}
+        self.persona_cache: Dict[str, Dict[str, Any]] = persona_cache if persona_cache is not None else {}
 
     def load_persona(self, persona_name: str) -> Dict[str, Any]:
         """
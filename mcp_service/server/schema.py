@@ -0,0 +1,207 @@
+"""
+Compiled validators for MCP tool input schemas.
+
+Tool schemas are compiled once into nested closures, so validating a
+request is a handful of isinstance checks with no schema interpretation
+and no third-party dependency. Supports the JSON Schema subset the tool
+definitions use: type (single or list), properties, required,
+additionalProperties, items, enum, const, minimum/maximum,
+minLength/maxLength and minItems/maxItems. Unknown keywords (description,
+default, ...) are ignored.
+"""
+from typing import Any, Callable, Dict, List, Optional
+
+
+Validator = Callable[[Any, str], None]
+
+
+class SchemaValidationError(ValueError):
+    """Raised when tool arguments don't match the tool's input schema."""
+
+    def __init__(self, path: str, message: str):
+        self.path = path
+        super().__init__(f"{path}: {message}" if path else message)
+
+
+def _is_integer(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+_TYPE_CHECKS: Dict[str, Callable[[Any], bool]] = {
+    "object": lambda value: isinstance(value, dict),
+    "array": lambda value: isinstance(value, list),
+    "string": lambda value: isinstance(value, str),
+    "integer": _is_integer,
+    "number": _is_number,
+    "boolean": lambda value: isinstance(value, bool),
+    "null": lambda value: value is None,
+}
+
+
+def _child(path: str, key: Any) -> str:
+    if isinstance(key, int):
+        return f"{path}[{key}]"
+    return f"{path}.{key}" if path else str(key)
+
+
+def compile_schema(schema: Dict[str, Any]) -> Callable[[Any], None]:
+    """
+    Compile a JSON schema into a validator.
+
+    Args:
+        schema: JSON schema (the subset described in the module docstring)
+
+    Returns:
+        validate(value), raising SchemaValidationError on the first mismatch
+
+    Raises:
+        ValueError: If the schema uses a type this compiler doesn't know
+    """
+    validator = _compile(schema)
+
+    def validate(value: Any):
+        validator(value, "")
+
+    return validate
+
+
+def _compile(schema: Dict[str, Any]) -> Validator:
+    checks: List[Validator] = []
+
+    types = schema.get("type")
+    if types is not None:
+        checks.append(_compile_type([types] if isinstance(types, str) else list(types)))
+    if "enum" in schema:
+        checks.append(_compile_enum(list(schema["enum"])))
+    if "const" in schema:
+        checks.append(_compile_enum([schema["const"]]))
+    if "minimum" in schema or "maximum" in schema:
+        checks.append(_compile_range(schema.get("minimum"), schema.get("maximum")))
+    if "minLength" in schema or "maxLength" in schema:
+        checks.append(_compile_length(str, "characters", schema.get("minLength"), schema.get("maxLength")))
+    if "minItems" in schema or "maxItems" in schema:
+        checks.append(_compile_length(list, "items", schema.get("minItems"), schema.get("maxItems")))
+    if "properties" in schema or "required" in schema or "additionalProperties" in schema:
+        checks.append(_compile_object(schema))
+    if "items" in schema:
+        checks.append(_compile_items(_compile(schema["items"])))
+
+    if not checks:
+        return lambda value, path: None
+    if len(checks) == 1:
+        return checks[0]
+
+    def validate_all(value: Any, path: str):
+        for check in checks:
+            check(value, path)
+
+    return validate_all
+
+
+def _compile_type(types: List[str]) -> Validator:
+    unknown = [name for name in types if name not in _TYPE_CHECKS]
+    if unknown:
+        raise ValueError(f"Unsupported schema type: {', '.join(unknown)}")
+    type_checks = [_TYPE_CHECKS[name] for name in types]
+    expected = " or ".join(types)
+
+    def validate_type(value: Any, path: str):
+        for check in type_checks:
+            if check(value):
+                return
+        raise SchemaValidationError(path, f"expected {expected}, got {_json_type(value)}")
+
+    return validate_type
+
+
+def _compile_enum(allowed: List[Any]) -> Validator:
+    def validate_enum(value: Any, path: str):
+        # Exact type match, so True doesn't satisfy an enum of 1
+        for option in allowed:
+            if value == option and type(value) is type(option):
+                return
+        raise SchemaValidationError(path, f"must be one of {allowed!r}, got {value!r}")
+
+    return validate_enum
+
+
+def _compile_range(minimum: Optional[float], maximum: Optional[float]) -> Validator:
+    def validate_range(value: Any, path: str):
+        if not _is_number(value):
+            return
+        if minimum is not None and value < minimum:
+            raise SchemaValidationError(path, f"must be >= {minimum}, got {value}")
+        if maximum is not None and value > maximum:
+            raise SchemaValidationError(path, f"must be <= {maximum}, got {value}")
+
+    return validate_range
+
+
+def _compile_length(kind: type, unit: str, low: Optional[int], high: Optional[int]) -> Validator:
+    def validate_length(value: Any, path: str):
+        if not isinstance(value, kind):
+            return
+        if low is not None and len(value) < low:
+            raise SchemaValidationError(path, f"must have at least {low} {unit}")
+        if high is not None and len(value) > high:
+            raise SchemaValidationError(path, f"must have at most {high} {unit}")
+
+    return validate_length
+
+
+def _compile_object(schema: Dict[str, Any]) -> Validator:
+    properties = {
+        key: _compile(subschema) for key, subschema in schema.get("properties", {}).items()
+    }
+    required = list(schema.get("required", []))
+    additional = schema.get("additionalProperties", True)
+    additional_validator = _compile(additional) if isinstance(additional, dict) else None
+
+    def validate_object(value: Any, path: str):
+        if not isinstance(value, dict):
+            return
+        for key in required:
+            if key not in value:
+                raise SchemaValidationError(path, f"missing required property '{key}'")
+        for key, item in value.items():
+            validator = properties.get(key)
+            if validator is not None:
+                validator(item, _child(path, key))
+            elif additional_validator is not None:
+                additional_validator(item, _child(path, key))
+            elif additional is False:
+                raise SchemaValidationError(path, f"unexpected property '{key}'")
+
+    return validate_object
+
+
+def _compile_items(item_validator: Validator) -> Validator:
+    def validate_items(value: Any, path: str):
+        if not isinstance(value, list):
+            return
+        for index, item in enumerate(value):
+            item_validator(item, _child(path, index))
+
+    return validate_items
+
+
+def _json_type(value: Any) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, int):
+        return "integer"
+    if isinstance(value, float):
+        return "number"
+    if isinstance(value, str):
+        return "string"
+    if isinstance(value, list):
+        return "array"
+    if isinstance(value, dict):
+        return "object"
+    return type(value).__name__
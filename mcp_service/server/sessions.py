@@ -0,0 +1,185 @@
+"""
+Per-session context and persona state for the MCP server.
+
+Each session (named by the session_id tool argument) gets its own
+ContextManager and PersonaManager, so concurrent agents don't overwrite
+each other's current context, context stack or persona. Sessions are
+light: the managers share the repository (with its merged-config caches),
+one cache of built contexts and one of parsed personas, and only hold
+the session's own current state.
+
+Sessions idle for longer than idle_timeout are evicted, and beyond
+max_sessions the least recently used one goes, so memory stays bounded
+however many clients come and go. Calls without a session_id use the
+default session, which is never evicted.
+"""
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from .context_tools import ContextCache, ContextManager
+from .persona_manager import PersonaManager
+
+
+DEFAULT_SESSION = "default"
+
+
+@dataclass
+class Session:
+    """State of one client session."""
+    id: str
+    context: ContextManager
+    personas: PersonaManager
+    created: float
+    last_used: float
+    calls: int = 0
+    # Held while a tool call runs in this session, so one session's calls
+    # don't interleave
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+
+class SessionManager:
+    """
+    Creates, looks up and evicts sessions.
+
+    Example:
+        >>> sessions = SessionManager(repo, Path("personas"))
+        >>> with sessions.use("agent-1") as session:
+        ...     session.context.load_context("payment_gateway")
+        >>> sessions.get("agent-2").context.current_context is None
+        True
+    """
+
+    def __init__(
+        self,
+        repository,
+        personas_dir: Path,
+        idle_timeout: Optional[float] = 1800.0,
+        max_sessions: int = 256,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize session manager.
+
+        Args:
+            repository: ProjectRepository shared by all sessions
+            personas_dir: Directory containing persona YAML files
+            idle_timeout: Seconds without calls before a session is evicted
+                          (None: only evict beyond max_sessions)
+            max_sessions: Sessions kept besides the default one
+            clock: Monotonic clock in seconds (replaceable in tests)
+        """
+        self.repo = repository
+        self.personas_dir = Path(personas_dir)
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self._clock = clock
+        self._lock = threading.Lock()
+        # Least recently used first
+        self._sessions: "OrderedDict[str, Session]" = OrderedDict()
+        # Built contexts and parsed personas, shared read-only by every session
+        self.contexts = ContextCache(repository)
+        self._persona_cache: Dict[str, Dict[str, Any]] = {}
+        self.created = 0
+        self.evicted = 0
+
+    def _new_session(self, session_id: str, now: float) -> Session:
+        self.created += 1
+        return Session(
+            id=session_id,
+            context=ContextManager(self.repo, context_cache=self.contexts),
+            personas=PersonaManager(self.personas_dir, persona_cache=self._persona_cache),
+            created=now,
+            last_used=now
+        )
+
+    def get(self, session_id: Optional[str] = None) -> Session:
+        """
+        Get a session, creating it on first use, and mark it used.
+
+        Args:
+            session_id: Session name (default: the default session)
+        """
+        session_id = session_id or DEFAULT_SESSION
+        now = self._clock()
+        with self._lock:
+            self._evict(now)
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = self._sessions[session_id] = self._new_session(session_id, now)
+            else:
+                self._sessions.move_to_end(session_id)
+            session.last_used = now
+            session.calls += 1
+            self._evict(now)
+            return session
+
+    @contextmanager
+    def use(self, session_id: Optional[str] = None) -> Iterator[Session]:
+        """Get a session and hold its lock for the duration of the block."""
+        session = self.get(session_id)
+        with session.lock:
+            yield session
+
+    def close(self, session_id: str) -> bool:
+        """
+        Drop a session's state.
+
+        Returns:
+            True if the session existed
+        """
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def evict_idle(self) -> List[str]:
+        """
+        Evict sessions idle past idle_timeout now (get() also does this).
+
+        Returns:
+            Evicted session ids
+        """
+        with self._lock:
+            return self._evict(self._clock())
+
+    def _evict(self, now: float) -> List[str]:
+        evicted = []
+        kept = len(self._sessions) - (DEFAULT_SESSION in self._sessions)
+        for session_id, session in list(self._sessions.items()):
+            if session_id == DEFAULT_SESSION:
+                continue
+            idle = self.idle_timeout is not None and now - session.last_used > self.idle_timeout
+            if not idle and kept <= self.max_sessions:
+                # Sessions are in last-used order: the rest are newer
+                break
+            del self._sessions[session_id]
+            evicted.append(session_id)
+            kept -= 1
+        self.evicted += len(evicted)
+        return evicted
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Session counts.
+
+        Returns:
+            Dict with active, created, evicted and max_sessions
+        """
+        with self._lock:
+            return {
+                "active": len(self._sessions),
+                "created": self.created,
+                "evicted": self.evicted,
+                "max_sessions": self.max_sessions
+            }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+
+    def __contains__(self, session_id: str) -> bool:
+        with self._lock:
+            return session_id in self._sessions
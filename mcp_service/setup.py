@@ -18,6 +18,9 @@ setup(
             "pytest>=7.0",
             "pytest-cov>=4.0",
         ],
+        "fast": [
+            "orjson>=3.6",
+        ],
     },
     python_requires=">=3.8",
     entry_points={
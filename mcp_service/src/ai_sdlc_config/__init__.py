@@ -9,20 +9,27 @@ This library provides a flexible way to manage configuration using:
 Inspired by the C4H configuration system but designed to be generic
 and work with any content type at any URI.
 """
-from .models import HierarchyNode, URIReference, NodeValue
+from .models import HierarchyNode, LazyHierarchyNode, URIReference, NodeValue
 from .loaders import YAMLLoader, URIResolver
-from .mergers import HierarchyMerger, MergeStrategy
+from .mergers import HierarchyMerger, MergeStrategy, HierarchyChange, diff_hierarchies
 from .core import ConfigManager
+from .serializers import HierarchyStreamer, HierarchyPage, HierarchySerializer
 
 __version__ = "0.1.0"
 
 __all__ = [
     "HierarchyNode",
+    "LazyHierarchyNode",
     "URIReference",
     "NodeValue",
     "YAMLLoader",
     "URIResolver",
     "HierarchyMerger",
     "MergeStrategy",
+    "HierarchyChange",
+    "diff_hierarchies",
     "ConfigManager",
+    "HierarchyStreamer",
+    "HierarchyPage",
+    "HierarchySerializer",
 ]
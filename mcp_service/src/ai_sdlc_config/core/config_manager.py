@@ -47,7 +47,8 @@ class ConfigManager:
     def __init__(
         self,
         base_path: Optional[Path] = None,
-        merge_strategy: MergeStrategy = MergeStrategy.OVERRIDE
+        merge_strategy: MergeStrategy = MergeStrategy.OVERRIDE,
+        lazy_loading: bool = False
     ):
         """
         Initialize configuration manager.
@@ -55,14 +56,18 @@ class ConfigManager:
         Args:
             base_path: Base path for resolving relative file URIs and config files
             merge_strategy: Strategy for merging conflicts
+            lazy_loading: Materialize loaded subtrees only when first accessed
         """
         self.base_path = Path(base_path) if base_path else Path.cwd()
-        self.loader = YAMLLoader()
+        self.loader = YAMLLoader(lazy=lazy_loading)
         self.resolver = URIResolver(self.base_path)
         self.merger = HierarchyMerger(merge_strategy)
 
         self.hierarchies: List[HierarchyNode] = []
         self.merged_hierarchy: Optional[HierarchyNode] = None
+        # Identifies the merged content, when whoever builds the manager
+        # knows it (e.g. a digest of the layer hashes); used in cache keys
+        self.version: Optional[str] = None
 
     def load_hierarchy(self, file_path: str, source_name: Optional[str] = None) -> None:
         """
@@ -94,6 +99,19 @@ class ConfigManager:
         self.hierarchies.append(hierarchy)
         self.merged_hierarchy = None
 
+    def add_hierarchy(self, hierarchy: HierarchyNode) -> None:
+        """
+        Add an already-loaded hierarchy as the highest priority layer.
+
+        The hierarchy is not copied; it must not be mutated afterwards.
+        Useful when the same parsed layer is shared by several managers.
+
+        Args:
+            hierarchy: Root HierarchyNode
+        """
+        self.hierarchies.append(hierarchy)
+        self.merged_hierarchy = None
+
     def add_runtime_overrides(self, overrides: Dict[str, Any]) -> None:
         """
         Add runtime overrides as highest priority configuration.
@@ -103,6 +121,19 @@ class ConfigManager:
         Args:
             overrides: Dict of path -> value overrides
         """
+        self.hierarchies.append(self.build_runtime_hierarchy(overrides))
+        self.merged_hierarchy = None
+
+    def build_runtime_hierarchy(self, overrides: Dict[str, Any]) -> HierarchyNode:
+        """
+        Build the hierarchy add_runtime_overrides() would add, without adding it.
+
+        Args:
+            overrides: Dict of path -> value overrides
+
+        Returns:
+            Root HierarchyNode of the overrides
+        """
         # Create a hierarchy from overrides
         runtime_hierarchy = HierarchyNode(path="", source="runtime_overrides")
 
@@ -110,8 +141,7 @@ class ConfigManager:
         for path, value in overrides.items():
             self._add_path_to_hierarchy(runtime_hierarchy, path, value)
 
-        self.hierarchies.append(runtime_hierarchy)
-        self.merged_hierarchy = None
+        return runtime_hierarchy
 
     def _add_path_to_hierarchy(
         self,
@@ -155,6 +185,26 @@ class ConfigManager:
 
         self.merged_hierarchy = self.merger.merge(self.hierarchies)
 
+    def merge_from_prefix(self, prefix: HierarchyNode, prefix_length: int) -> None:
+        """
+        Merge loaded hierarchies on top of an already-merged prefix.
+
+        Equivalent to merge(), but skips re-merging the first prefix_length
+        hierarchies whose merge result is passed in (e.g. from a cache).
+
+        Args:
+            prefix: Merge result of the first prefix_length loaded hierarchies
+            prefix_length: Number of hierarchies covered by prefix
+        """
+        if prefix_length > len(self.hierarchies):
+            raise ValueError("Prefix covers more hierarchies than are loaded")
+
+        self.merged_hierarchy = self.merger.merge_onto(
+            prefix,
+            self.hierarchies[prefix_length:],
+            start_priority=prefix_length
+        )
+
     def get_value(self, path: str) -> Optional[NodeValue]:
         """
         Get value at path in merged hierarchy.
@@ -12,6 +12,7 @@ from pathlib import Path
 from urllib.parse import urlparse
 import urllib.request
 
+from .. import tracing
 from ..models.hierarchy_node import URIReference, URIScheme, HierarchyNode
 
 
@@ -37,6 +38,8 @@ class URIResolver:
         """
         self.base_path = base_path or Path.cwd()
         self.cache: Dict[str, str] = {}  # URI -> content cache
+        self.cache_hits = 0
+        self.cache_misses = 0
         self.custom_resolvers: Dict[str, Callable] = {}
 
     def resolve(self, uri_ref: URIReference, hierarchy: Optional[HierarchyNode] = None) -> str:
@@ -57,29 +60,34 @@ class URIResolver:
         """
         # Check cache first
         if uri_ref.uri in self.cache:
+            self.cache_hits += 1
             return self.cache[uri_ref.uri]
+        self.cache_misses += 1
 
-        # Route to appropriate resolver
+        with tracing.span("resolver.fetch", "resolver", uri=uri_ref.uri):
+            content = self._fetch(uri_ref, hierarchy)
+
+        # Cache the result
+        self.cache[uri_ref.uri] = content
+        return content
+
+    def _fetch(self, uri_ref: URIReference, hierarchy: Optional[HierarchyNode]) -> str:
+        """Route a URI to the resolver for its scheme (uncached)."""
         if uri_ref.scheme == URIScheme.FILE:
-            content = self._resolve_file(uri_ref)
+            return self._resolve_file(uri_ref)
         elif uri_ref.scheme in (URIScheme.HTTP, URIScheme.HTTPS):
-            content = self._resolve_http(uri_ref)
+            return self._resolve_http(uri_ref)
         elif uri_ref.scheme == URIScheme.DATA:
-            content = self._resolve_data(uri_ref)
+            return self._resolve_data(uri_ref)
         elif uri_ref.scheme == URIScheme.REF:
             if hierarchy is None:
                 raise ValueError("Cannot resolve ref: URI without hierarchy context")
-            content = self._resolve_ref(uri_ref, hierarchy)
-        else:
-            # Try custom resolver
-            if uri_ref.scheme.value in self.custom_resolvers:
-                content = self.custom_resolvers[uri_ref.scheme.value](uri_ref)
-            else:
-                raise ValueError(f"Unsupported URI scheme: {uri_ref.scheme}")
+            return self._resolve_ref(uri_ref, hierarchy)
 
-        # Cache the result
-        self.cache[uri_ref.uri] = content
-        return content
+        # Try custom resolver
+        if uri_ref.scheme.value in self.custom_resolvers:
+            return self.custom_resolvers[uri_ref.scheme.value](uri_ref)
+        raise ValueError(f"Unsupported URI scheme: {uri_ref.scheme}")
 
     def _resolve_file(self, uri_ref: URIReference) -> str:
         """
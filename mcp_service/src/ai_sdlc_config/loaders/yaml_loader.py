@@ -8,7 +8,10 @@ from typing import Dict, Any, Optional
 from pathlib import Path
 import yaml
 
-from ..models.hierarchy_node import HierarchyNode, URIReference, NodeValue
+from .. import tracing
+from ..models.hierarchy_node import (
+    HierarchyNode, LazyHierarchyNode, URIReference, NodeValue
+)
 
 
 class YAMLLoader:
@@ -32,11 +35,25 @@ class YAMLLoader:
           agents:
             discovery:
               model: "claude-3-5-sonnet"  # Regular value
+
+    Lazy mode:
+        With lazy=True, containers are returned as LazyHierarchyNode objects
+        that keep their raw parsed sub-mapping and only build child nodes
+        when first accessed. Useful for very large layers where only a few
+        paths are ever read.
     """
 
-    def __init__(self):
+    def __init__(self, lazy: bool = False):
+        """
+        Initialize loader.
+
+        Args:
+            lazy: Build container children on demand instead of eagerly
+        """
         self.uri_schemes = ["file://", "http://", "https://", "data:", "ref:"]
+        self.lazy = lazy
 
+    @tracing.traced("loader.load", "loader")
     def load(self, file_path: str, source_name: Optional[str] = None) -> HierarchyNode:
         """
         Load YAML file into HierarchyNode structure.
@@ -56,12 +73,13 @@ class YAMLLoader:
         if not path.exists():
             raise FileNotFoundError(f"Configuration file not found: {file_path}")
 
-        with open(path, 'r') as f:
+        with open(path, 'r') as f, tracing.span("yaml.parse", "loader", source=str(file_path)):
             data = yaml.safe_load(f) or {}
 
         source = source_name or str(file_path)
         return self._build_hierarchy(data, path="", source=source)
 
+    @tracing.traced("loader.load_from_string", "loader")
     def load_from_string(self, yaml_string: str, source_name: str = "string") -> HierarchyNode:
         """
         Load YAML from string into HierarchyNode structure.
@@ -73,7 +91,8 @@ class YAMLLoader:
         Returns:
             Root HierarchyNode
         """
-        data = yaml.safe_load(yaml_string) or {}
+        with tracing.span("yaml.parse", "loader", source=source_name):
+            data = yaml.safe_load(yaml_string) or {}
         return self._build_hierarchy(data, path="", source=source_name)
 
     def _build_hierarchy(
@@ -95,6 +114,16 @@ class YAMLLoader:
         Returns:
             HierarchyNode
         """
+        if self.lazy and isinstance(data, (dict, list)) and data:
+            if isinstance(data, list) or not self._is_uri_reference_dict(data):
+                return LazyHierarchyNode(
+                    path=path,
+                    materializer=lambda: self._build_children(data, path, source),
+                    size=len(data),
+                    source=source,
+                    metadata={"sequence": True} if isinstance(data, list) else None
+                )
+
         node = HierarchyNode(path=path, source=source)
 
         # Handle dictionary (container with children)
@@ -111,6 +140,7 @@ class YAMLLoader:
 
         # Handle list (convert to dict with numeric keys)
         elif isinstance(data, list):
+            node.metadata["sequence"] = True
             for i, item in enumerate(data):
                 child_path = f"{path}[{i}]"
                 child = self._build_hierarchy(item, child_path, source, node)
@@ -129,6 +159,31 @@ class YAMLLoader:
 
         return node
 
+    def _build_children(
+        self,
+        data: Any,
+        path: str,
+        source: str
+    ) -> Dict[str, HierarchyNode]:
+        """
+        Build the immediate children of a lazily loaded container.
+
+        Mirrors the container handling in _build_hierarchy(); each child is
+        itself lazy when it is a container.
+        """
+        children: Dict[str, HierarchyNode] = {}
+
+        if isinstance(data, dict):
+            for key, value in data.items():
+                child_path = f"{path}.{key}" if path else key
+                children[key] = self._build_hierarchy(value, child_path, source)
+        else:
+            for i, item in enumerate(data):
+                child_path = f"{path}[{i}]"
+                children[str(i)] = self._build_hierarchy(item, child_path, source)
+
+        return children
+
     def _is_uri_string(self, value: str) -> bool:
         """Check if string value is a URI"""
         return any(value.startswith(scheme) for scheme in self.uri_schemes)
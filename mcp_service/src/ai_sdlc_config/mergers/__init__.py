@@ -2,5 +2,6 @@
 Hierarchy merging functionality
 """
 from .hierarchy_merger import HierarchyMerger, MergeStrategy
+from .hierarchy_diff import ChangeKind, HierarchyChange, diff_hierarchies
 
-__all__ = ["HierarchyMerger", "MergeStrategy"]
+__all__ = ["HierarchyMerger", "MergeStrategy", "ChangeKind", "HierarchyChange", "diff_hierarchies"]
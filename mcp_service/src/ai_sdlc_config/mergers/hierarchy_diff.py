@@ -0,0 +1,82 @@
+"""
+Structural diff of two hierarchies.
+
+diff_hierarchies() walks two trees side by side (typically the merged
+configs of two projects, or of one project at two versions) and reports
+every path whose value differs. A subtree present on one side only is
+reported once, at its root, and YAML lists are compared as whole values,
+so an extended list is one change rather than one per index. Subtrees
+that are the same node on both sides are skipped without walking them.
+"""
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, List
+
+from ..models.hierarchy_node import HierarchyNode
+from ..serializers.hierarchy_serializer import to_data
+
+
+class ChangeKind(Enum):
+    """How a path differs between two hierarchies."""
+    ADDED = "added"  # Only in the new hierarchy
+    REMOVED = "removed"  # Only in the old hierarchy
+    CHANGED = "changed"  # In both, with different values
+
+
+@dataclass(frozen=True)
+class HierarchyChange:
+    """One difference between two hierarchies."""
+    path: str  # Dot path ("" for the roots themselves)
+    kind: ChangeKind
+    old: Any = None  # Plain data (see to_data); None when added
+    new: Any = None  # Plain data; None when removed
+
+
+def diff_hierarchies(old: HierarchyNode, new: HierarchyNode) -> List[HierarchyChange]:
+    """
+    List the differences between two hierarchies.
+
+    Args:
+        old: Hierarchy before
+        new: Hierarchy after
+
+    Returns:
+        Changes in depth-first order (old keys first, then keys only in new)
+
+    Example:
+        >>> loader = YAMLLoader()
+        >>> old = loader.load_from_string("testing: {min_coverage: 80}\\nstyle: pep8\\n")
+        >>> new = loader.load_from_string("testing: {min_coverage: 95}\\nlint: [ruff]\\n")
+        >>> [(c.path, c.kind.value, c.old, c.new) for c in diff_hierarchies(old, new)]
+        [('testing.min_coverage', 'changed', 80, 95), ('style', 'removed', 'pep8', None), ('lint', 'added', None, ['ruff'])]
+    """
+    changes: List[HierarchyChange] = []
+    _diff(old, new, "", changes)
+    return changes
+
+
+def _diff(old: HierarchyNode, new: HierarchyNode, path: str, changes: List[HierarchyChange]):
+    if old is new:
+        return
+
+    old_children = old.children
+    new_children = new.children
+    if old_children and new_children and not old.is_sequence() and not new.is_sequence():
+        for key, old_child in old_children.items():
+            child_path = f"{path}.{key}" if path else key
+            new_child = new_children.get(key)
+            if new_child is None:
+                changes.append(HierarchyChange(child_path, ChangeKind.REMOVED, old=to_data(old_child)))
+            else:
+                _diff(old_child, new_child, child_path, changes)
+        for key, new_child in new_children.items():
+            if key not in old_children:
+                child_path = f"{path}.{key}" if path else key
+                changes.append(HierarchyChange(child_path, ChangeKind.ADDED, new=to_data(new_child)))
+        return
+
+    # Leaves, lists, or a mapping on one side only: compare as values
+    old_data = to_data(old)
+    new_data = to_data(new)
+    if old_data != new_data:
+        changes.append(HierarchyChange(path, ChangeKind.CHANGED, old=old_data, new=new_data))
@@ -11,6 +11,7 @@ from typing import List, Dict, Any, Optional
 from enum import Enum
 import copy
 
+from .. import tracing
 from ..models.hierarchy_node import HierarchyNode, URIReference, NodeValue
 
 
@@ -42,6 +43,7 @@ class HierarchyMerger:
     def __init__(self, strategy: MergeStrategy = MergeStrategy.OVERRIDE):
         self.strategy = strategy
 
+    @tracing.traced("merger.merge", "merger")
     def merge(self, hierarchies: List[HierarchyNode]) -> HierarchyNode:
         """
         Merge multiple hierarchies into a single definitive hierarchy.
@@ -71,12 +73,42 @@ class HierarchyMerger:
             return copy.deepcopy(hierarchies[0])
 
         # Start with first hierarchy as base
-        result = copy.deepcopy(hierarchies[0])
-        result.priority = 0
-        result.source = f"merged_from_{len(hierarchies)}_sources"
+        return self.merge_onto(hierarchies[0], hierarchies[1:], start_priority=1)
+
+    @tracing.traced("merger.merge_onto", "merger")
+    def merge_onto(
+        self,
+        base: HierarchyNode,
+        hierarchies: List[HierarchyNode],
+        start_priority: int
+    ) -> HierarchyNode:
+        """
+        Continue a merge on top of an already-merged prefix.
+
+        merge(layers) == merge_onto(merge(layers[:k]), layers[k:], k) for
+        any k >= 2, and merge_onto(layers[0], layers[1:], 1) for k == 1.
+        This lets callers cache the merge of a shared prefix (e.g. common
+        base layers) and only pay for the layers on top of it.
+
+        Args:
+            base: Merge result of the first start_priority hierarchies
+                  (or the first hierarchy itself when start_priority == 1)
+            hierarchies: Remaining hierarchies, lowest priority first
+            start_priority: Number of hierarchies already merged into base
+
+        Returns:
+            Merged HierarchyNode tree (base is not mutated)
+        """
+        result = copy.deepcopy(base)
+        if not hierarchies:
+            return result
+
+        if start_priority == 1:
+            result.priority = 0
+        result.source = f"merged_from_{start_priority + len(hierarchies)}_sources"
 
         # Merge each subsequent hierarchy into result
-        for i, hierarchy in enumerate(hierarchies[1:], start=1):
+        for i, hierarchy in enumerate(hierarchies, start=start_priority):
             result = self._merge_two_nodes(
                 base=result,
                 override=hierarchy,
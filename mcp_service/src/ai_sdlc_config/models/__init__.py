@@ -1,6 +1,6 @@
 """
 Data models for ai_sdlc_method
 """
-from .hierarchy_node import HierarchyNode, URIReference, NodeValue
+from .hierarchy_node import HierarchyNode, LazyHierarchyNode, URIReference, NodeValue
 
-__all__ = ["HierarchyNode", "URIReference", "NodeValue"]
+__all__ = ["HierarchyNode", "LazyHierarchyNode", "URIReference", "NodeValue"]
@@ -5,8 +5,11 @@ This module defines the fundamental building blocks:
 - HierarchyNode: Represents a node in the dot hierarchy
 - URIReference: Represents a reference to external content
 - NodeValue: Union type for values that can be stored in nodes
+- LazyHierarchyNode: HierarchyNode whose children are built on first access
 """
-from typing import Dict, Any, Optional, Union, List
+import copy
+import threading
+from typing import Dict, Any, Optional, Union, List, Callable
 from dataclasses import dataclass, field
 from enum import Enum
 
@@ -98,6 +101,18 @@ class HierarchyNode:
         """Check if this node is a leaf (has value, no children)"""
         return self.value is not None and not self.is_container()
 
+    def is_sequence(self) -> bool:
+        """
+        Check if this node holds a YAML list.
+
+        The loader marks list nodes with metadata["sequence"] and keys
+        their children "0".."n-1". A mapping merged into a list can add
+        other keys; the node then reads as a mapping.
+        """
+        return bool(self.metadata.get("sequence")) and all(
+            key == str(i) for i, key in enumerate(self.children)
+        )
+
     def get_child(self, key: str) -> Optional['HierarchyNode']:
         """Get immediate child by key"""
         return self.children.get(key)
@@ -203,20 +218,114 @@ class HierarchyNode:
         Convert node tree to dictionary representation.
         Useful for serialization and debugging.
         """
-        if self.is_leaf():
-            if isinstance(self.value, URIReference):
-                return {
-                    "_uri": self.value.uri,
-                    "_type": "uri_reference"
-                }
-            return self.value
-
-        result = {}
-        for key, child in self.children.items():
-            result[key] = child.to_dict()
+        from ..serializers.hierarchy_serializer import to_data
 
-        return result
+        return to_data(self, lambda reference: {
+            "_uri": reference.uri,
+            "_type": "uri_reference"
+        })
 
     def __repr__(self) -> str:
         value_repr = f"value={self.value}" if not self.is_container() else f"children={len(self.children)}"
         return f"HierarchyNode(path='{self.path}', {value_repr})"
+
+
+# Serializes first access to lazy children (a materializer builds one level,
+# so holding it is brief); re-entrant for materializers that read other nodes
+_MATERIALIZE_LOCK = threading.RLock()
+
+
+class LazyHierarchyNode(HierarchyNode):
+    """
+    HierarchyNode whose children are materialized on first access.
+
+    The loader hands over a materializer (typically closing over the raw
+    sub-mapping parsed from YAML) instead of building every descendant up
+    front. Touching ``children`` - directly, via get_node_by_path(), or from
+    the merger - builds one level; grandchildren stay lazy until they are
+    reached in turn. Untouched subtrees therefore cost nothing beyond the
+    raw parsed data.
+
+    Deep copies share the (read-only) materializer, so copying a lazy node
+    during a merge does not force its subtree to be built. Concurrent first
+    accesses build the children once; is_materialized() turns true only
+    after they are in place.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        materializer: Callable[[], Dict[str, HierarchyNode]],
+        size: int,
+        source: Optional[str] = None,
+        priority: int = 0,
+        metadata: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Args:
+            path: Dot-delimited path of this node
+            materializer: Callable returning this node's children dict
+            size: Number of children the materializer will produce
+            source: Which config file this came from
+            priority: Merge priority
+            metadata: Optional node metadata
+        """
+        super().__init__(
+            path=path,
+            source=source,
+            priority=priority,
+            metadata=metadata if metadata is not None else {}
+        )
+        # Set after super().__init__, whose children assignment clears them
+        self._materializer = materializer
+        self._size = size
+
+    @property
+    def children(self) -> Dict[str, HierarchyNode]:
+        if self._materializer is not None:
+            with _MATERIALIZE_LOCK:
+                materializer = self._materializer
+                if materializer is not None:
+                    # Children first: once the materializer is cleared,
+                    # readers skip the lock and read _children
+                    self._children = materializer()
+                    self._materializer = None
+        return self._children
+
+    @children.setter
+    def children(self, value: Dict[str, HierarchyNode]) -> None:
+        # Explicit assignment replaces anything still pending
+        with _MATERIALIZE_LOCK:
+            self._children = value
+            self._materializer = None
+
+    def is_materialized(self) -> bool:
+        """Check if this node's children have been built"""
+        return self._materializer is None
+
+    def is_container(self) -> bool:
+        """Check if this node is a container without forcing materialization"""
+        if self._materializer is not None:
+            return self._size > 0
+        return len(self._children) > 0
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> 'LazyHierarchyNode':
+        clone = LazyHierarchyNode.__new__(LazyHierarchyNode)
+        memo[id(self)] = clone
+        clone.path = self.path
+        clone.value = copy.deepcopy(self.value, memo)
+        clone.source = self.source
+        clone.priority = self.priority
+        clone.metadata = copy.deepcopy(self.metadata, memo)
+        clone._materializer = self._materializer
+        clone._size = self._size
+        clone._children = (
+            {} if self._materializer is not None
+            else copy.deepcopy(self._children, memo)
+        )
+        return clone
+
+    def __repr__(self) -> str:
+        if self._materializer is not None:
+            return f"LazyHierarchyNode(path='{self.path}', pending={self._size})"
+        return super().__repr__()
@@ -0,0 +1,17 @@
+"""
+Serializers for writing HierarchyNode structures
+"""
+from .hierarchy_streamer import HierarchyPage, HierarchyStreamer
+from .hierarchy_serializer import HierarchySerializer, to_data
+from .encoders import dump_json, dump_yaml, encode, register_encoder
+
+__all__ = [
+    "HierarchyPage",
+    "HierarchyStreamer",
+    "HierarchySerializer",
+    "to_data",
+    "dump_json",
+    "dump_yaml",
+    "encode",
+    "register_encoder",
+]
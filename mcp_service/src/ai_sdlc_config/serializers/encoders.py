@@ -0,0 +1,110 @@
+"""
+Text encoders for serialized output.
+
+YAML is written with libyaml's CSafeDumper when PyYAML was built with it
+(falling back to the pure-Python SafeDumper), and JSON with orjson when it
+is installed (pip install orjson; falling back to the json module). Both
+backends of a format encode plain data to documents that parse back to
+the same data, though not always byte for byte (libyaml folds long
+strings differently; NaN becomes null with orjson).
+
+Encoders are looked up by format name, so callers (HierarchySerializer,
+tool responses) can be given new formats with register_encoder().
+"""
+import json
+from typing import Any, Callable, Dict
+
+import yaml
+
+try:
+    import orjson
+except ImportError:  # optional fast JSON backend
+    orjson = None
+
+
+Encoder = Callable[[Any], str]
+
+YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+YAML_BACKEND = "libyaml" if YAML_DUMPER is not yaml.SafeDumper else "python"
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+
+
+def dump_yaml(data: Any, sort_keys: bool = False) -> str:
+    """
+    Encode data as block-style YAML.
+
+    Args:
+        data: Plain data (dicts, lists, scalars)
+        sort_keys: Sort mapping keys (default: keep insertion order)
+    """
+    return yaml.dump(data, Dumper=YAML_DUMPER, default_flow_style=False, sort_keys=sort_keys)
+
+
+def dump_json(data: Any, compact: bool = False, sort_keys: bool = False) -> str:
+    """
+    Encode data as JSON.
+
+    Values JSON has no type for are written as str(value). Non-ASCII text
+    is written as UTF-8 rather than escaped, as orjson always does.
+
+    Args:
+        data: Plain data (dicts, lists, scalars)
+        compact: No indentation or spaces, for machine clients
+                 (default: indented by 2)
+        sort_keys: Sort mapping keys
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if not compact:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(data, default=str, option=option).decode("utf-8")
+        except TypeError:
+            # e.g. integers beyond 64 bits, which the json module handles
+            pass
+    if compact:
+        return json.dumps(data, separators=(",", ":"), sort_keys=sort_keys, ensure_ascii=False, default=str)
+    return json.dumps(data, indent=2, sort_keys=sort_keys, ensure_ascii=False, default=str)
+
+
+def _dump_json_compact(data: Any) -> str:
+    return dump_json(data, compact=True)
+
+
+_ENCODERS: Dict[str, Encoder] = {
+    "json": dump_json,
+    "json_compact": _dump_json_compact,
+    "yaml": dump_yaml,
+}
+
+
+def register_encoder(format: str, encoder: Encoder):
+    """
+    Add or replace the encoder for a format.
+
+    Args:
+        format: Format name
+        encoder: Callable turning plain data into text
+    """
+    _ENCODERS[format] = encoder
+
+
+def encoder_formats() -> tuple:
+    """Names of the registered formats."""
+    return tuple(_ENCODERS)
+
+
+def encode(data: Any, format: str) -> str:
+    """
+    Encode plain data in a registered format.
+
+    Raises:
+        ValueError: If format is not registered
+    """
+    encoder = _ENCODERS.get(format)
+    if encoder is None:
+        raise ValueError(f"Unknown format: {format} (expected one of {', '.join(_ENCODERS)})")
+    return encoder(data)
@@ -0,0 +1,190 @@
+"""
+Conversion of hierarchies to plain data, JSON and YAML, with an output cache.
+
+to_data() is the one tree walk behind every dict form of a hierarchy
+(HierarchyNode.to_dict, merged project files, tool responses).
+HierarchySerializer encodes it in any format of the encoders module and
+caches outputs under a caller-supplied key, so serializing an unchanged
+hierarchy again is a dictionary lookup.
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from ..models.hierarchy_node import HierarchyNode, URIReference
+from .encoders import encode, encoder_formats
+from .hierarchy_streamer import HierarchyPage, HierarchyStreamer
+
+# Converts a URI leaf to its plain-data form (default: {"uri": ...})
+URIData = Callable[[URIReference], Any]
+
+
+def _uri_mapping(reference: URIReference) -> Dict[str, str]:
+    return {"uri": reference.uri}
+
+
+def to_data(node: HierarchyNode, uri_data: Optional[URIData] = None) -> Any:
+    """
+    Convert a hierarchy to plain data.
+
+    Containers become dicts, or lists for nodes the loader marked as YAML
+    lists (see HierarchyNode.is_sequence); leaves become their values. A node
+    with neither children nor a value becomes {}: the loader stores empty
+    mappings, empty lists and nulls alike.
+
+    Args:
+        node: Hierarchy to convert
+        uri_data: Plain-data form of URI leaves (default: {"uri": ...})
+
+    Returns:
+        Dict, list or scalar
+    """
+    return _to_data(node, uri_data or _uri_mapping)
+
+
+def _to_data(node: HierarchyNode, uri_data: URIData) -> Any:
+    children = node.children
+    if not children:
+        if isinstance(node.value, URIReference):
+            return uri_data(node.value)
+        return {} if node.value is None else node.value
+    if node.is_sequence():
+        return [_to_data(child, uri_data) for child in children.values()]
+    return {key: _to_data(child, uri_data) for key, child in children.items()}
+
+
+def _scoped(node: HierarchyNode, path: Optional[str]) -> HierarchyNode:
+    if not path:
+        return node
+    scoped = node.get_node_by_path(path)
+    if scoped is None:
+        raise KeyError(f"Path not found: {path}")
+    return scoped
+
+
+class HierarchySerializer:
+    """
+    Serializes hierarchies to plain data or encoded text, caching outputs.
+
+    Outputs are cached only when the caller passes a key identifying the
+    hierarchy's content, typically (project, version). The cache holds
+    one entry per (key, format, scope) and evicts least recently used
+    entries beyond cache_size. Cached dicts are shared: treat them as
+    read-only.
+
+    Example:
+        >>> serializer = HierarchySerializer()
+        >>> root = YAMLLoader().load_from_string("b: [1, 2]\na: x\n")
+        >>> serializer.serialize(root, "json", key=("demo", "v1"))
+        '{\\n  "b": [\\n    1,\\n    2\\n  ],\\n  "a": "x"\\n}'
+        >>> serializer.serialize(root, "dict", path="b", key=("demo", "v1"))
+        [1, 2]
+    """
+
+    def __init__(self, cache_size: int = 128):
+        """
+        Initialize hierarchy serializer.
+
+        Args:
+            cache_size: Maximum number of cached outputs
+        """
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple[Hashable, ...], Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def serialize(
+        self,
+        node: HierarchyNode,
+        format: str = "dict",
+        path: Optional[str] = None,
+        key: Optional[Tuple[Hashable, ...]] = None
+    ) -> Any:
+        """
+        Serialize a hierarchy, or the subtree at path.
+
+        Args:
+            node: Hierarchy root
+            format: "dict" or an encoder format ("json", "json_compact", "yaml", ...)
+            path: Dot path of the subtree to serialize (default: whole tree)
+            key: Cache key for the hierarchy's content (default: don't cache)
+
+        Returns:
+            Plain data for "dict", text otherwise
+
+        Raises:
+            ValueError: If format is unknown
+            KeyError: If path doesn't exist
+        """
+        if format != "dict" and format not in encoder_formats():
+            raise ValueError(f"Unknown format: {format} (expected dict or one of {', '.join(encoder_formats())})")
+        return self._cached(
+            key and (*key, format, path or ""),
+            lambda: self._encode(to_data(_scoped(node, path)), format)
+        )
+
+    def page(
+        self,
+        node: HierarchyNode,
+        streamer: HierarchyStreamer,
+        path: Optional[str] = None,
+        cursor: Optional[str] = None,
+        allow_empty: bool = False,
+        key: Optional[Tuple[Hashable, ...]] = None
+    ) -> HierarchyPage:
+        """
+        Get one page of streamed YAML (see HierarchyStreamer.page).
+
+        The streamer's budgets are part of the cached scope; its
+        uri_formatter is not, so include it in key if it varies.
+
+        Raises:
+            KeyError: If path doesn't exist
+            ValueError: If the cursor is malformed or from another path
+        """
+        scope = (path or "", cursor, allow_empty, streamer.max_bytes, streamer.max_nodes, streamer.max_depth)
+        return self._cached(
+            key and (*key, "page", scope),
+            lambda: streamer.page(node, path, cursor, allow_empty)
+        )
+
+    @staticmethod
+    def _encode(data: Any, format: str) -> Any:
+        return data if format == "dict" else encode(data, format)
+
+    def _cached(self, cache_key: Optional[Tuple[Hashable, ...]], build: Callable[[], Any]) -> Any:
+        if not cache_key:
+            return build()
+        with self._lock:
+            if cache_key in self._cache:
+                self._cache.move_to_end(cache_key)
+                self.hits += 1
+                return self._cache[cache_key]
+            self.misses += 1
+
+        output = build()
+
+        with self._lock:
+            self._cache[cache_key] = output
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return output
+
+    def invalidate(self, project: Optional[str] = None):
+        """
+        Drop cached outputs.
+
+        Args:
+            project: Only outputs whose key starts with this name (default: all)
+        """
+        with self._lock:
+            if project is None:
+                self._cache.clear()
+                return
+            for cache_key in [k for k in self._cache if k[0] == project]:
+                del self._cache[cache_key]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._cache)
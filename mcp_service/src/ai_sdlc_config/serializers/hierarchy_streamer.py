@@ -0,0 +1,324 @@
+"""
+Streaming YAML output of hierarchies, with size budgets and pagination.
+
+HierarchyStreamer writes block YAML line by line straight from the tree,
+without building an intermediate dict or YAML string, and stops at a
+byte or node budget. A page that stops early returns a cursor; passing
+it back resumes at the next entry, re-emitting the parent keys so every
+page is valid YAML on its own.
+
+Keys are emitted sorted (as yaml.dump does by default), which gives
+cursors a stable order: a cursor stays valid when entries are added or
+removed between pages.
+"""
+import base64
+import binascii
+import json
+import math
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from ..models.hierarchy_node import HierarchyNode, URIReference
+
+
+# Formats a URI leaf as a mapping of scalars (default: {"uri": ...})
+URIFormatter = Callable[[HierarchyNode], Dict[str, Any]]
+
+_PLAIN = re.compile(r"^[A-Za-z_/][\w./()+-]*( [\w./()+-]+)*$")
+_RESERVED = {
+    "null", "~", "true", "false", "yes", "no", "on", "off", "y", "n",
+    ".nan", ".inf", "-.inf", "<<"
+}
+_NUMBER = re.compile(r"^[-+]?(\d[\d_]*)?(\.\d*)?([eE][-+]?\d+)?$|^0[xXoObB]")
+
+
+def format_scalar(value: Any) -> str:
+    """
+    Format a value for a YAML line.
+
+    Strings are left plain when that is unambiguous and double-quoted
+    (JSON escaping, which is valid YAML) otherwise; non-scalar values are
+    written in flow style.
+    """
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, float):
+        if math.isnan(value):
+            return ".nan"
+        if math.isinf(value):
+            return ".inf" if value > 0 else "-.inf"
+        return repr(value)
+    if isinstance(value, str):
+        if _PLAIN.match(value) and value.lower() not in _RESERVED and not _NUMBER.match(value):
+            return value
+        return json.dumps(value, ensure_ascii=False)
+    if isinstance(value, URIReference):
+        return format_scalar(value.uri)
+    return json.dumps(value, ensure_ascii=False, default=str)
+
+
+def _ordered(node: HierarchyNode) -> Tuple[bool, List[Tuple[str, HierarchyNode]]]:
+    if node.children and node.is_sequence():
+        return True, list(node.children.items())
+    return False, sorted(node.children.items(), key=lambda item: str(item[0]))
+
+
+def _position(key: str, sequence: bool) -> Any:
+    return int(key) if sequence else str(key)
+
+
+@dataclass
+class HierarchyPage:
+    """One page of streamed YAML."""
+    text: str
+    nodes: int
+    bytes: int
+    next_cursor: Optional[str] = None
+
+    @property
+    def complete(self) -> bool:
+        """True when this page reached the end of the tree."""
+        return self.next_cursor is None
+
+
+class HierarchyStreamer:
+    """
+    Writes hierarchies as block YAML under size budgets.
+
+    Example:
+        >>> root = YAMLLoader().load_from_string("a: 1\nb: 2\nc: 3\n")
+        >>> streamer = HierarchyStreamer(max_nodes=2)
+        >>> page = streamer.page(root)
+        >>> page.text, page.next_cursor
+        ('a: 1\\nb: 2\\n', 'WyIiLCBbImMiXV0')
+        >>> streamer.page(root, cursor=page.next_cursor).text
+        'c: 3\\n'
+    """
+
+    def __init__(
+        self,
+        max_bytes: Optional[int] = None,
+        max_nodes: Optional[int] = None,
+        max_depth: Optional[int] = None,
+        uri_formatter: Optional[URIFormatter] = None
+    ):
+        """
+        Initialize hierarchy streamer.
+
+        Args:
+            max_bytes: Stop a page before it exceeds this many bytes
+            max_nodes: Stop a page after this many entries (keys)
+            max_depth: Collapse containers below this depth (1 = top-level keys)
+            uri_formatter: Mapping to write for URI leaves
+        """
+        self.max_bytes = max_bytes
+        self.max_nodes = max_nodes
+        self.max_depth = max_depth
+        self.uri_formatter = uri_formatter or (lambda node: {"uri": node.value.uri})
+
+    def page(
+        self,
+        root: HierarchyNode,
+        path: Optional[str] = None,
+        cursor: Optional[str] = None,
+        allow_empty: bool = False
+    ) -> HierarchyPage:
+        """
+        Write one page of YAML.
+
+        Every page holds at least one entry, however small the budget,
+        unless allow_empty is set (for filling what is left of a budget
+        shared with other output).
+
+        Args:
+            root: Hierarchy to write
+            path: Dot path of the subtree to write (default: whole tree)
+            cursor: next_cursor of the previous page
+            allow_empty: Return no entries if the first one doesn't fit
+
+        Returns:
+            HierarchyPage
+
+        Raises:
+            KeyError: If path doesn't exist
+            ValueError: If the cursor is malformed or from another path
+        """
+        start_keys = self.decode_cursor(cursor, path or "") if cursor else []
+        lines: List[Tuple[List[str], str, bool, int]] = []
+        size = 0
+        nodes = 0
+        next_keys = None
+        for keys, line, is_entry in self.iter_lines(root, path, start_keys):
+            line_size = len(line.encode("utf-8")) + 1
+            if is_entry and (nodes or allow_empty):
+                if (self.max_nodes is not None and nodes >= self.max_nodes) or \
+                        (self.max_bytes is not None and size + line_size > self.max_bytes):
+                    next_keys = keys
+                    break
+            lines.append((keys, line, is_entry, line_size))
+            size += line_size
+            nodes += is_entry
+
+        # Don't end a page on a container key whose entries all fall on
+        # the next page
+        while next_keys is not None and nodes > (0 if allow_empty else 1):
+            keys, _, is_entry, line_size = lines[-1]
+            if not is_entry or keys != next_keys[:len(keys)]:
+                break
+            lines.pop()
+            size -= line_size
+            nodes -= 1
+            next_keys = keys
+
+        if not nodes:
+            lines = []
+            size = 0
+        next_cursor = self.encode_cursor(path or "", next_keys) if next_keys is not None else None
+        text = "".join(f"{line}\n" for _, line, _, _ in lines)
+        return HierarchyPage(text=text, nodes=nodes, bytes=size, next_cursor=next_cursor)
+
+    def iter_lines(
+        self,
+        root: HierarchyNode,
+        path: Optional[str] = None,
+        start_keys: Optional[List[str]] = None
+    ) -> Iterator[Tuple[List[str], str, bool]]:
+        """
+        Generate YAML lines, unbounded.
+
+        Args:
+            root: Hierarchy to write
+            path: Dot path of the subtree to write
+            start_keys: Key path (relative to the subtree) to start at;
+                        parents of it are re-emitted as context
+
+        Yields:
+            (key path, line, is_entry); context lines and the lines of a
+            URI mapping are not entries
+        """
+        node = root
+        if path:
+            node = root.get_node_by_path(path)
+            if node is None:
+                raise KeyError(f"Path not found: {path}")
+
+        if not node.children:
+            if not start_keys:
+                yield [], self._leaf_text(node), True
+            return
+
+        yield from self._container(node, [], "", "", 1, list(start_keys or []))
+
+    def _leaf_text(self, node: HierarchyNode) -> str:
+        if isinstance(node.value, URIReference):
+            mapping = self.uri_formatter(node)
+            return "{" + ", ".join(
+                f"{format_scalar(key)}: {format_scalar(value)}" for key, value in mapping.items()
+            ) + "}"
+        return format_scalar(node.value)
+
+    def _container(
+        self,
+        node: HierarchyNode,
+        keys: List[str],
+        first_prefix: str,
+        indent: str,
+        depth: int,
+        start: List[str]
+    ) -> Iterator[Tuple[List[str], str, bool]]:
+        """
+        Lines of a container's entries.
+
+        The first line gets first_prefix (so a sequence item can start on
+        its "- " line), the rest get indent.
+        """
+        sequence, items = _ordered(node)
+        if start:
+            target = _position(start[0], sequence)
+            items = [item for item in items if _position(item[0], sequence) >= target]
+            if sequence and target:
+                yield keys, f"{indent}# continued from item {target}", False
+
+        prefix = first_prefix
+        for key, child in items:
+            resume = start[1:] if start and str(key) == start[0] else []
+            start = []
+            child_keys = keys + [str(key)]
+            item_prefix = f"{prefix}- " if sequence else f"{prefix}{format_scalar(str(key))}:"
+            item_indent = f"{indent}  "
+            yield from self._entry(child, child_keys, item_prefix, item_indent, sequence, depth, resume)
+            prefix = indent
+
+    def _entry(
+        self,
+        node: HierarchyNode,
+        keys: List[str],
+        prefix: str,
+        indent: str,
+        in_sequence: bool,
+        depth: int,
+        resume: List[str]
+    ) -> Iterator[Tuple[List[str], str, bool]]:
+        separator = "" if in_sequence else " "
+        children = node.children
+
+        if not children:
+            if isinstance(node.value, URIReference):
+                mapping = self.uri_formatter(node)
+                if in_sequence:
+                    lines = [f"{format_scalar(k)}: {format_scalar(v)}" for k, v in mapping.items()]
+                    yield keys, prefix + lines[0], True
+                    for line in lines[1:]:
+                        yield keys, indent + line, False
+                else:
+                    yield keys, prefix, True
+                    for k, v in mapping.items():
+                        yield keys, f"{indent}{format_scalar(k)}: {format_scalar(v)}", False
+                return
+            yield keys, f"{prefix}{separator}{format_scalar(node.value)}", True
+            return
+
+        if self.max_depth is not None and depth >= self.max_depth:
+            yield keys, f"{prefix}{separator}...  # {len(children)} entries below max_depth", True
+            return
+
+        sequence = node.is_sequence()
+        if in_sequence:
+            # "- key: value" / "- - item": the first child shares the dash line
+            yield from self._container(node, keys, prefix, indent, depth + 1, resume)
+            return
+
+        # Sequences sit at the parent key's indent, as yaml.dump writes them
+        child_indent = indent[:-2] if sequence else indent
+        yield keys, prefix, not resume
+        yield from self._container(node, keys, child_indent, child_indent, depth + 1, resume)
+
+    @staticmethod
+    def encode_cursor(path: str, keys: List[str]) -> str:
+        """Encode the resume position of a page."""
+        data = json.dumps([path, keys], ensure_ascii=False).encode("utf-8")
+        return base64.urlsafe_b64encode(data).decode("ascii").rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str, path: str) -> List[str]:
+        """
+        Decode a cursor into its key path.
+
+        Raises:
+            ValueError: If the cursor is malformed or from another path
+        """
+        try:
+            data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            cursor_path, keys = json.loads(data.decode("utf-8"))
+        except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+            raise ValueError(f"Invalid cursor: {cursor}") from None
+        if cursor_path != path:
+            raise ValueError(f"Cursor is for path '{cursor_path}', not '{path}'")
+        if not isinstance(keys, list) or not all(isinstance(key, str) for key in keys):
+            raise ValueError(f"Invalid cursor: {cursor}")
+        return keys
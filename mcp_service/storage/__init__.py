@@ -1,4 +1,14 @@
 """Storage layer for MCP service."""
-from .project_repository import ProjectRepository
+from .change_feed import ChangeEvent, ChangeFeed, ChangeType
+from .maintenance import MaintenanceReport, RepositoryStats
+from .project_repository import ConcurrentModificationError, ProjectRepository
 
-__all__ = ['ProjectRepository']
+__all__ = [
+    'ProjectRepository',
+    'ConcurrentModificationError',
+    'MaintenanceReport',
+    'RepositoryStats',
+    'ChangeEvent',
+    'ChangeFeed',
+    'ChangeType',
+]
@@ -0,0 +1,193 @@
+"""
+Atomic file writes with grouped durability.
+
+Every write goes to a temporary file in the target's directory and is
+renamed over the target, so readers (and a crash) see either the old or
+the new contents, never a truncated file.
+
+With fsync enabled, a WriteGroup defers its renames until commit() and
+then pays for durability once for the whole group: one data barrier
+covering every temporary file (a single syncfs() where the platform has
+it), the renames, and one fsync per affected directory.
+"""
+import ctypes
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Callable, List, Optional, Set, Tuple
+
+
+def _load_syncfs() -> Optional[Callable[[int], int]]:
+    """Get libc syncfs() if available (Linux)."""
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        syncfs = libc.syncfs
+    except (OSError, AttributeError):
+        return None
+    syncfs.argtypes = [ctypes.c_int]
+    syncfs.restype = ctypes.c_int
+    return syncfs
+
+
+_SYNCFS = _load_syncfs()
+
+
+def _read_umask() -> int:
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+# New files get the permissions open() would have given them
+_UMASK = _read_umask()
+
+
+# Names of WriteGroup's temporary files: "." + target name + "." + the
+# 8 random characters tempfile.mkstemp() adds + ".tmp"
+_TEMP_NAME = re.compile(r"\..+\.[a-z0-9_]{8}\.tmp")
+
+
+def is_temporary_name(name: str) -> bool:
+    """Check whether a file name is one of WriteGroup's temporary files."""
+    return _TEMP_NAME.fullmatch(name) is not None
+
+
+def fsync_directory(path: Path):
+    """Make renames and new entries in a directory durable."""
+    if os.name != "posix":
+        return
+    fd = os.open(str(path), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class WriteGroup:
+    """
+    Collects the file writes of one operation.
+
+    Without fsync each write is renamed into place immediately. With
+    fsync, writes are staged as temporary files and only become visible
+    at commit(); abort() discards them. Callbacks registered with a write
+    run once its file is in place (e.g. to update a cache with the new
+    file's stat signature).
+    """
+
+    def __init__(self, fsync: bool = False, on_write: Optional[Callable[[Path], None]] = None):
+        """
+        Initialize write group.
+
+        Args:
+            fsync: Make the group's writes durable on commit()
+            on_write: Called with each target path right after it is replaced
+        """
+        self.fsync = fsync
+        self.on_write = on_write
+        # (temporary file, target, callback) awaiting rename
+        self._staged: List[Tuple[Path, Path, Optional[Callable[[], None]]]] = []
+        self._directories: Set[Path] = set()
+
+    def write_text(self, path: Path, text: str, on_commit: Optional[Callable[[], None]] = None):
+        """Write text to path atomically."""
+        self.write_bytes(path, text.encode("utf-8"), on_commit)
+
+    def write_bytes(self, path: Path, data: bytes, on_commit: Optional[Callable[[], None]] = None):
+        """
+        Write bytes to path atomically.
+
+        Args:
+            path: Target file
+            data: New contents
+            on_commit: Called once the new contents are in place
+        """
+        path = Path(path)
+        fd, temp_name = tempfile.mkstemp(
+            dir=str(path.parent), prefix=f".{path.name}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            if path.exists():
+                os.chmod(temp_name, os.stat(path).st_mode & 0o7777)
+            else:
+                os.chmod(temp_name, 0o666 & ~_UMASK)
+        except BaseException:
+            os.unlink(temp_name)
+            raise
+
+        if not self.fsync:
+            try:
+                os.replace(temp_name, path)
+            except BaseException:
+                os.unlink(temp_name)
+                raise
+            if self.on_write:
+                self.on_write(path)
+            if on_commit:
+                on_commit()
+            return
+
+        self._staged.append((Path(temp_name), path, on_commit))
+        self._directories.add(path.parent)
+
+    def mkdir(self, path: Path, parents: bool = False, exist_ok: bool = False):
+        """Create a directory, recording its parent for the directory barrier."""
+        path = Path(path)
+        path.mkdir(parents=parents, exist_ok=exist_ok)
+        if self.fsync:
+            self._directories.add(path.parent)
+
+    def commit(self):
+        """Make staged writes durable and move them into place."""
+        staged, self._staged = self._staged, []
+        directories, self._directories = self._directories, set()
+        if not self.fsync:
+            return
+
+        # Data barrier: file contents must be on disk before the renames
+        if staged:
+            if _SYNCFS is not None and len(staged) > 1:
+                fd = os.open(str(staged[0][0]), os.O_RDONLY)
+                try:
+                    if _SYNCFS(fd) != 0:
+                        for temp, _, _ in staged:
+                            _fsync_file(temp)
+                finally:
+                    os.close(fd)
+            else:
+                for temp, _, _ in staged:
+                    _fsync_file(temp)
+
+        for temp, target, _ in staged:
+            os.replace(temp, target)
+            if self.on_write:
+                self.on_write(target)
+
+        # Directory barrier: renames and new directory entries
+        for directory in sorted(directories, key=lambda p: len(p.parts), reverse=True):
+            fsync_directory(directory)
+
+        for _, _, on_commit in staged:
+            if on_commit:
+                on_commit()
+
+    def abort(self):
+        """Discard staged writes."""
+        staged, self._staged = self._staged, []
+        self._directories = set()
+        for temp, _, _ in staged:
+            try:
+                os.unlink(temp)
+            except FileNotFoundError:
+                pass
+
+
+def _fsync_file(path: Path):
+    fd = os.open(str(path), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
@@ -0,0 +1,436 @@
+"""
+Change feed for a project repository.
+
+ProjectRepository publishes a typed ChangeEvent for every mutation once it
+is committed (with the commit id and the paths it touched), so caches and
+downstream consumers can invalidate precisely instead of re-reading
+everything or relying on TTLs.
+
+Edits made outside the repository object (an editor, `git pull`, another
+process) are picked up by an optional watcher: inotify on Linux (through
+ctypes, no extra dependency), stat polling elsewhere.
+"""
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+
+class ChangeType(str, Enum):
+    """Kinds of repository change."""
+    PROJECT_CREATED = "project_created"
+    PROJECT_UPDATED = "project_updated"
+    PROJECT_DELETED = "project_deleted"
+    DOCUMENT_ADDED = "document_added"
+    PROJECT_MERGED = "project_merged"
+    # Made outside this repository object (commit set if HEAD moved)
+    EXTERNAL_CHANGE = "external_change"
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    """A committed (or externally detected) change to the repository."""
+    type: ChangeType
+    project: Optional[str]
+    paths: Tuple[str, ...] = ()
+    commit: Optional[str] = None
+    revision: Optional[int] = None
+    sequence: int = 0
+    timestamp: float = field(default_factory=time.time)
+
+    def to_dict(self) -> Dict[str, object]:
+        """Convert to a JSON-serializable dict."""
+        return {
+            "type": self.type.value,
+            "project": self.project,
+            "paths": list(self.paths),
+            "commit": self.commit,
+            "revision": self.revision,
+            "sequence": self.sequence,
+            "timestamp": self.timestamp
+        }
+
+
+ChangeCallback = Callable[[ChangeEvent], None]
+
+
+class ChangeFeed:
+    """
+    In-process publish/subscribe of ChangeEvents.
+
+    Subscribers are called synchronously on the publishing thread, after
+    the change is committed and outside repository locks. A subscriber
+    raising does not stop delivery to the others. Recent events are also
+    kept (numbered by sequence) for consumers that poll instead.
+    """
+
+    def __init__(self, history_size: int = 1024):
+        """
+        Initialize change feed.
+
+        Args:
+            history_size: Number of recent events kept for events_since()
+        """
+        self._lock = threading.Lock()
+        self._subscribers: Dict[int, Tuple[ChangeCallback, Optional[Set[ChangeType]], Optional[Set[str]]]] = {}
+        self._next_token = 0
+        self._sequence = 0
+        self._history: "deque[ChangeEvent]" = deque(maxlen=history_size)
+
+    def subscribe(
+        self,
+        callback: ChangeCallback,
+        types: Optional[Iterable[ChangeType]] = None,
+        projects: Optional[Iterable[str]] = None
+    ) -> int:
+        """
+        Register a callback.
+
+        Args:
+            callback: Called with each matching event
+            types: Only these change types (default: all)
+            projects: Only events for these projects (default: all; events
+                      without a project are always delivered)
+
+        Returns:
+            Token for unsubscribe()
+        """
+        with self._lock:
+            token = self._next_token
+            self._next_token += 1
+            self._subscribers[token] = (
+                callback,
+                set(types) if types is not None else None,
+                set(projects) if projects is not None else None
+            )
+        return token
+
+    def unsubscribe(self, token: int):
+        """Remove a callback registered with subscribe()."""
+        with self._lock:
+            self._subscribers.pop(token, None)
+
+    def publish(self, event: ChangeEvent) -> ChangeEvent:
+        """
+        Number, record and deliver an event.
+
+        Returns:
+            The event as delivered (with its sequence number)
+        """
+        with self._lock:
+            self._sequence += 1
+            event = ChangeEvent(
+                type=event.type,
+                project=event.project,
+                paths=event.paths,
+                commit=event.commit,
+                revision=event.revision,
+                sequence=self._sequence,
+                timestamp=event.timestamp
+            )
+            self._history.append(event)
+            subscribers = list(self._subscribers.values())
+
+        for callback, types, projects in subscribers:
+            if types is not None and event.type not in types:
+                continue
+            if projects is not None and event.project is not None and event.project not in projects:
+                continue
+            try:
+                callback(event)
+            except Exception:
+                logger.exception("Change feed subscriber failed on %s", event.type.value)
+        return event
+
+    @property
+    def sequence(self) -> int:
+        """Sequence number of the latest event (0 before any)."""
+        with self._lock:
+            return self._sequence
+
+    def events_since(self, sequence: int) -> List[ChangeEvent]:
+        """
+        Get recorded events newer than a sequence number.
+
+        Events older than the history window are no longer available;
+        compare the first event's sequence with sequence + 1 to detect a gap.
+        """
+        with self._lock:
+            return [event for event in self._history if event.sequence > sequence]
+
+
+# -- external change detection ----------------------------------------------
+
+# Reported instead of paths under .git when refs move
+HEAD_MARKER = ".git/HEAD"
+
+
+def _is_temporary(name: str) -> bool:
+    """Atomic-write and git lock files never need reporting."""
+    return (name.startswith(".") and name.endswith(".tmp")) or name.endswith(".lock")
+
+
+class _PollingWatcher:
+    """Detects changes by comparing stat snapshots of the working tree."""
+
+    def __init__(self, root: Path, callback: Callable[[Set[str]], None], interval: float):
+        self.root = root
+        self.callback = callback
+        self.interval = interval
+        self._stop = threading.Event()
+        self._snapshot = self._scan()
+        self._thread = threading.Thread(target=self._run, name="ai-sdlc-watch", daemon=True)
+        self._thread.start()
+
+    def _scan(self) -> Dict[str, Tuple[int, int, int]]:
+        snapshot = {}
+        for root, dirs, names in os.walk(self.root):
+            if root == str(self.root):
+                dirs[:] = [d for d in dirs if d != ".git"]
+            for name in names:
+                if _is_temporary(name):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                snapshot[os.path.relpath(path, self.root)] = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+        for ref_file in ("HEAD", "packed-refs"):
+            try:
+                stat = os.stat(self.root / ".git" / ref_file)
+                snapshot[f".git/{ref_file}"] = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+            except FileNotFoundError:
+                pass
+        heads = self.root / ".git" / "refs" / "heads"
+        for ref in heads.rglob("*") if heads.exists() else ():
+            if ref.is_file() and not _is_temporary(ref.name):
+                stat = ref.stat()
+                snapshot[ref.relative_to(self.root).as_posix()] = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        return snapshot
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            snapshot = self._scan()
+            changed = {
+                path for path in set(snapshot) | set(self._snapshot)
+                if snapshot.get(path) != self._snapshot.get(path)
+            }
+            self._snapshot = snapshot
+            if changed:
+                self.callback({
+                    HEAD_MARKER if path.startswith(".git/") else path for path in changed
+                })
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+
+
+# inotify(7) constants
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_WATCH_MASK = (
+    _IN_CLOSE_WRITE | _IN_MODIFY | _IN_ATTRIB | _IN_MOVED_FROM | _IN_MOVED_TO
+    | _IN_CREATE | _IN_DELETE | _IN_DELETE_SELF
+)
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+def _load_inotify():
+    """Get libc's inotify functions, or None where unavailable."""
+    if not hasattr(select, "poll"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        functions = (libc.inotify_init1, libc.inotify_add_watch, libc.inotify_rm_watch)
+    except (OSError, AttributeError):
+        return None
+    functions[0].argtypes = [ctypes.c_int]
+    functions[1].argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    functions[2].argtypes = [ctypes.c_int, ctypes.c_int]
+    return functions
+
+
+_INOTIFY = _load_inotify()
+
+
+class _InotifyWatcher:
+    """Detects changes through inotify watches on every working-tree directory."""
+
+    # Collect events for this long before reporting them together
+    DEBOUNCE = 0.05
+
+    def __init__(self, root: Path, callback: Callable[[Set[str]], None]):
+        self.root = root
+        self.callback = callback
+        init, self._add_watch, self._rm_watch = _INOTIFY
+        self._fd = init(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs: Dict[int, str] = {}
+        self._stop_read, self._stop_write = os.pipe()
+
+        self._watch_tree(root)
+        for git_dir in (root / ".git", root / ".git" / "refs" / "heads"):
+            if git_dir.exists():
+                self._watch_tree(git_dir, recursive=git_dir.name == "heads")
+
+        self._thread = threading.Thread(target=self._run, name="ai-sdlc-inotify", daemon=True)
+        self._thread.start()
+
+    def _watch(self, directory: Path) -> bool:
+        wd = self._add_watch(self._fd, os.fsencode(str(directory)), _WATCH_MASK)
+        if wd < 0:
+            return False
+        self._dirs[wd] = os.path.relpath(directory, self.root)
+        return True
+
+    def _watch_tree(self, directory: Path, recursive: bool = True) -> Set[str]:
+        """Watch a directory (and subdirectories); return the files already in it."""
+        found: Set[str] = set()
+        if not self._watch(directory):
+            return found
+        if not recursive:
+            return found
+        for root, dirs, names in os.walk(directory):
+            if root == str(self.root):
+                dirs[:] = [d for d in dirs if d != ".git"]
+            for name in dirs:
+                self._watch(Path(root) / name)
+            for name in names:
+                if not _is_temporary(name):
+                    found.add(os.path.relpath(os.path.join(root, name), self.root))
+        return found
+
+    def _run(self):
+        poller = select.poll()
+        poller.register(self._fd, select.POLLIN)
+        poller.register(self._stop_read, select.POLLIN)
+        while True:
+            ready = {fd for fd, _ in poller.poll()}
+            if self._stop_read in ready:
+                return
+            time.sleep(self.DEBOUNCE)
+            changed = self._drain()
+            if changed:
+                try:
+                    self.callback(changed)
+                except Exception:
+                    logger.exception("Repository watcher callback failed")
+
+    def _drain(self) -> Set[str]:
+        """Read all pending inotify events into a set of changed paths."""
+        changed: Set[str] = set()
+        while True:
+            try:
+                data = os.read(self._fd, 65536)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = data[offset:offset + length].rstrip(b"\0").decode("utf-8", "surrogateescape")
+                offset += length
+
+                if mask & _IN_Q_OVERFLOW:
+                    # Lost events: report everything
+                    changed |= self._watch_tree(self.root) | {HEAD_MARKER}
+                    continue
+                if mask & _IN_IGNORED:
+                    self._dirs.pop(wd, None)
+                    continue
+                directory = self._dirs.get(wd)
+                if directory is None or not name or _is_temporary(name):
+                    continue
+
+                relative = os.path.normpath(os.path.join(directory, name))
+                if relative.startswith(".git/"):
+                    if name in ("HEAD", "packed-refs") or relative.startswith(".git/refs/"):
+                        changed.add(HEAD_MARKER)
+                        if mask & _IN_ISDIR and mask & (_IN_CREATE | _IN_MOVED_TO):
+                            self._watch_tree(self.root / relative)
+                    continue
+                if mask & _IN_ISDIR:
+                    if mask & (_IN_CREATE | _IN_MOVED_TO):
+                        # Files may have appeared before the watch existed
+                        changed |= self._watch_tree(self.root / relative)
+                    continue
+                changed.add(relative)
+
+    def close(self):
+        os.write(self._stop_write, b"x")
+        self._thread.join()
+        os.close(self._stop_read)
+        os.close(self._stop_write)
+        os.close(self._fd)
+
+
+class RepositoryWatcher:
+    """
+    Reports paths changed in a repository's working tree.
+
+    Uses inotify where available and falls back to stat polling. Paths are
+    reported relative to the repository root; moves of HEAD or branch refs
+    are reported as HEAD_MARKER.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        callback: Callable[[Set[str]], None],
+        poll_interval: float = 1.0,
+        use_inotify: bool = True
+    ):
+        """
+        Start watching.
+
+        Args:
+            root: Repository root
+            callback: Called (on the watcher thread) with sets of changed paths
+            poll_interval: Seconds between scans when polling
+            use_inotify: Try inotify before falling back to polling
+        """
+        self.root = Path(root)
+        self._watcher = None
+        if use_inotify and _INOTIFY is not None:
+            try:
+                self._watcher = _InotifyWatcher(self.root, callback)
+            except OSError:
+                self._watcher = None
+        if self._watcher is None:
+            self._watcher = _PollingWatcher(self.root, callback, poll_interval)
+
+    @property
+    def backend(self) -> str:
+        """"inotify" or "polling"."""
+        return "inotify" if isinstance(self._watcher, _InotifyWatcher) else "polling"
+
+    def close(self):
+        """Stop watching."""
+        self._watcher.close()
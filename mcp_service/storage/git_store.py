@@ -0,0 +1,597 @@
+"""
+In-process git object store.
+
+Writes blobs, trees and commits straight into .git/objects and moves the
+branch ref itself, so committing a change costs work proportional to the
+paths touched rather than a `git add .` scan of the whole working tree.
+Existing objects (including packed ones) are read through a single
+long-lived `git cat-file --batch` process.
+"""
+import os
+import hashlib
+import subprocess
+import tempfile
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+TREE_MODE = "40000"
+FILE_MODE = "100644"
+EXECUTABLE_MODE = "100755"
+SYMLINK_MODE = "120000"
+
+# (mode, sha) of a tree entry
+TreeEntry = Tuple[str, str]
+
+# Working-tree files whose rules only git itself applies
+RULE_FILES = (".gitignore", ".gitattributes")
+
+
+def _has_rules(path: Path) -> bool:
+    """Whether an ignore/attributes file has any non-comment line."""
+    if not path.is_file():
+        return False
+    return any(
+        line.strip() and not line.startswith("#")
+        for line in path.read_text(errors="replace").splitlines()
+    )
+
+
+class UnsupportedRepositoryError(RuntimeError):
+    """Raised when a commit cannot be written in-process (caller falls back to git)."""
+
+
+class GitObjectStore:
+    """
+    Reads and writes git objects for a non-bare repository.
+
+    Only SHA-1 repositories with a real .git directory are supported;
+    anything else raises UnsupportedRepositoryError so callers can fall
+    back to the git command line.
+
+    The index is not updated by commit_paths(); callers reset the
+    committed paths with sync_index() so `git status` stays accurate.
+
+    Blobs are written from the file bytes as they are, so repositories
+    where `git add` would transform or skip content (attributes with
+    eol/filter rules, core.autocrlf, global or info excludes) are refused.
+    """
+
+    def __init__(self, repo_path: Path, tree_cache_size: int = 4096):
+        """
+        Initialize object store.
+
+        Args:
+            repo_path: Path to working tree root
+            tree_cache_size: Max parsed trees kept in memory
+        """
+        self.repo_path = Path(repo_path)
+        self.git_dir = self.repo_path / ".git"
+        self.objects_dir = self.git_dir / "objects"
+
+        self._cat_file: Optional[subprocess.Popen] = None
+        self._cat_file_lock = threading.Lock()
+        self._tree_cache: Dict[str, Dict[str, TreeEntry]] = {}
+        self._tree_cache_size = tree_cache_size
+        self._commit_cache: Dict[str, Tuple[str, List[str], int]] = {}
+        self._cache_lock = threading.Lock()
+        self._identity: Optional[str] = None
+
+    # -- capability ---------------------------------------------------------
+
+    def check_supported(self) -> None:
+        """
+        Raise UnsupportedRepositoryError unless in-process writes are safe.
+
+        Raises:
+            UnsupportedRepositoryError: For linked worktrees, non-SHA-1 repos,
+                or exclude/attribute rules outside the working tree
+        """
+        if not self.git_dir.is_dir():
+            raise UnsupportedRepositoryError(f"{self.git_dir} is not a directory")
+
+        config = self.git_dir / "config"
+        if config.exists() and "objectformat" in config.read_text().lower():
+            raise UnsupportedRepositoryError("Only SHA-1 object format is supported")
+
+        if _has_rules(self.git_dir / "info" / "exclude"):
+            raise UnsupportedRepositoryError("Repository has exclude rules")
+
+        attributes = self.git_dir / "info" / "attributes"
+        if attributes.exists() and _has_rules(attributes):
+            raise UnsupportedRepositoryError("Repository has attribute rules")
+
+        # Effective (system, global and local) settings that change what
+        # `git add` stores or skips
+        result = subprocess.run(
+            ["git", "config", "--get-regexp", r"^core\.(autocrlf|attributesfile|excludesfile)$"],
+            cwd=str(self.repo_path),
+            capture_output=True,
+            text=True
+        )
+        for line in result.stdout.splitlines():
+            key, _, value = line.partition(" ")
+            if key == "core.autocrlf" and value.lower() in ("false", ""):
+                continue
+            raise UnsupportedRepositoryError(f"Repository sets {key}")
+
+        # Per-user files git reads even when the settings above are unset
+        config_home = Path(os.environ.get("XDG_CONFIG_HOME") or Path.home() / ".config")
+        for name in ("ignore", "attributes"):
+            if _has_rules(config_home / "git" / name):
+                raise UnsupportedRepositoryError(f"User has global git {name} rules")
+
+    # -- object I/O ----------------------------------------------------------
+
+    @staticmethod
+    def hash_object(obj_type: str, data: bytes) -> str:
+        """Compute the object id of data stored as obj_type."""
+        header = f"{obj_type} {len(data)}\0".encode()
+        return hashlib.sha1(header + data).hexdigest()
+
+    def write_object(self, obj_type: str, data: bytes) -> str:
+        """
+        Write a loose object if it doesn't exist yet.
+
+        The file is written to a temp name and renamed into place, so a
+        crash never leaves a truncated object behind.
+
+        Returns:
+            Object id (hex SHA-1)
+        """
+        sha = self.hash_object(obj_type, data)
+        object_dir = self.objects_dir / sha[:2]
+        object_file = object_dir / sha[2:]
+        if object_file.exists():
+            return sha
+
+        object_dir.mkdir(exist_ok=True)
+        header = f"{obj_type} {len(data)}\0".encode()
+        fd, tmp_name = tempfile.mkstemp(dir=object_dir, prefix="tmp_obj_")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(zlib.compress(header + data))
+            os.chmod(tmp_name, 0o444)
+            os.replace(tmp_name, object_file)
+        except BaseException:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+            raise
+
+        return sha
+
+    def read_object(self, name: str) -> Optional[Tuple[str, str, bytes]]:
+        """
+        Read an object through the persistent cat-file pipe.
+
+        Args:
+            name: Any object name git understands (sha, "HEAD:path", ...)
+
+        Returns:
+            (sha, type, data) or None if the object doesn't exist
+        """
+        with self._cat_file_lock:
+            process = self._ensure_cat_file()
+            process.stdin.write(name.encode() + b"\n")
+            process.stdin.flush()
+
+            header = process.stdout.readline().decode().rstrip("\n")
+            if not header:
+                self._close_cat_file()
+                raise RuntimeError("git cat-file --batch exited unexpectedly")
+            if header.endswith(" missing") or header.endswith(" ambiguous"):
+                return None
+
+            sha, obj_type, size = header.split(" ")
+            data = process.stdout.read(int(size))
+            process.stdout.read(1)  # trailing newline
+
+        return sha, obj_type, data
+
+    def _ensure_cat_file(self) -> subprocess.Popen:
+        if self._cat_file is None or self._cat_file.poll() is not None:
+            self._cat_file = subprocess.Popen(
+                ["git", "cat-file", "--batch"],
+                cwd=str(self.repo_path),
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL
+            )
+        return self._cat_file
+
+    def _close_cat_file(self) -> None:
+        if self._cat_file is not None:
+            try:
+                self._cat_file.stdin.close()
+                self._cat_file.wait(timeout=5)
+            except (OSError, subprocess.TimeoutExpired):
+                self._cat_file.kill()
+            self._cat_file = None
+
+    def close(self) -> None:
+        """Stop the cat-file process."""
+        with self._cat_file_lock:
+            self._close_cat_file()
+
+    # -- trees ---------------------------------------------------------------
+
+    def read_tree(self, sha: str) -> Dict[str, TreeEntry]:
+        """
+        Parse a tree object into {name: (mode, sha)}.
+
+        Results are cached by sha (trees are immutable). Callers must not
+        mutate the returned dict.
+        """
+        cached = self._tree_cache.get(sha)
+        if cached is not None:
+            return cached
+
+        obj = self.read_object(sha)
+        if obj is None or obj[1] != "tree":
+            raise RuntimeError(f"Not a tree object: {sha}")
+
+        entries: Dict[str, TreeEntry] = {}
+        data = obj[2]
+        pos = 0
+        while pos < len(data):
+            space = data.index(b" ", pos)
+            nul = data.index(b"\0", space)
+            mode = data[pos:space].decode()
+            name = data[space + 1:nul].decode("utf-8", "surrogateescape")
+            entries[name] = (mode, data[nul + 1:nul + 21].hex())
+            pos = nul + 21
+
+        self._cache_tree(sha, entries)
+        return entries
+
+    def write_tree(self, entries: Dict[str, TreeEntry]) -> str:
+        """Write a tree object from {name: (mode, sha)}."""
+        def sort_key(name: str) -> bytes:
+            # Git orders trees as if their names ended with "/"
+            suffix = "/" if entries[name][0] == TREE_MODE else ""
+            return (name + suffix).encode("utf-8", "surrogateescape")
+
+        data = b"".join(
+            f"{entries[name][0]} ".encode()
+            + name.encode("utf-8", "surrogateescape")
+            + b"\0"
+            + bytes.fromhex(entries[name][1])
+            for name in sorted(entries, key=sort_key)
+        )
+        sha = self.write_object("tree", data)
+        self._cache_tree(sha, dict(entries))
+        return sha
+
+    def _cache_tree(self, sha: str, entries: Dict[str, TreeEntry]) -> None:
+        with self._cache_lock:
+            if len(self._tree_cache) >= self._tree_cache_size:
+                # Cheap bounded cache: drop the oldest insertion
+                self._tree_cache.pop(next(iter(self._tree_cache)), None)
+            self._tree_cache[sha] = entries
+
+    def commit_tree(self, sha: str) -> str:
+        """Get the root tree id of a commit."""
+        return self.commit_info(sha)[0]
+
+    def path_entry(self, commit: str, path: str) -> Optional[TreeEntry]:
+        """
+        Look up a path in a commit's tree.
+
+        Args:
+            commit: Commit id
+            path: Repository-relative posix path
+
+        Returns:
+            (mode, sha) of the entry or None if the path doesn't exist
+        """
+        tree = self.commit_tree(commit)
+        parts = path.split("/")
+        for part in parts[:-1]:
+            entry = self.read_tree(tree).get(part)
+            if entry is None or entry[0] != TREE_MODE:
+                return None
+            tree = entry[1]
+        return self.read_tree(tree).get(parts[-1])
+
+    # -- history -------------------------------------------------------------
+
+    def commit_info(self, sha: str) -> Tuple[str, List[str], int]:
+        """
+        Parse a commit object (cached; commits are immutable).
+
+        Returns:
+            (tree id, parent ids, committer time as epoch seconds)
+        """
+        cached = self._commit_cache.get(sha)
+        if cached is not None:
+            return cached
+
+        obj = self.read_object(sha)
+        if obj is None or obj[1] != "commit":
+            raise RuntimeError(f"Not a commit object: {sha}")
+
+        tree, parents, committed = "", [], 0
+        for line in obj[2].split(b"\n\n", 1)[0].decode("utf-8", "replace").splitlines():
+            key, _, value = line.partition(" ")
+            if key == "tree":
+                tree = value
+            elif key == "parent":
+                parents.append(value)
+            elif key == "committer":
+                # "Name <email> <epoch> <tz>"
+                committed = int(value.rsplit(" ", 2)[1])
+
+        info = (tree, parents, committed)
+        with self._cache_lock:
+            if len(self._commit_cache) >= self._tree_cache_size:
+                self._commit_cache.pop(next(iter(self._commit_cache)), None)
+            self._commit_cache[sha] = info
+        return info
+
+    def resolve_commit(self, rev: str) -> Optional[str]:
+        """
+        Resolve any revision expression (sha, branch, tag, "HEAD~3", ...) to a commit.
+
+        Returns:
+            Commit id or None if rev doesn't name a commit
+        """
+        if not rev or any(c.isspace() for c in rev):
+            return None
+        obj = self.read_object(rev + "^{commit}")
+        if obj is None or obj[1] != "commit":
+            return None
+        return obj[0]
+
+    def commit_before(self, timestamp: float, start: Optional[str] = None) -> Optional[str]:
+        """
+        Find the newest commit made at or before a time.
+
+        Walks first-parent history from start (default HEAD).
+
+        Args:
+            timestamp: Epoch seconds
+            start: Commit to walk back from (optional)
+
+        Returns:
+            Commit id or None if history starts after timestamp
+        """
+        sha = start or self.resolve_head()[1]
+        while sha:
+            _, parents, committed = self.commit_info(sha)
+            if committed <= timestamp:
+                return sha
+            sha = parents[0] if parents else None
+        return None
+
+    # -- refs ----------------------------------------------------------------
+
+    def resolve_head(self) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Resolve HEAD without spawning git.
+
+        Returns:
+            (ref name or None if detached, commit sha or None if unborn)
+        """
+        head = (self.git_dir / "HEAD").read_text().strip()
+        if not head.startswith("ref: "):
+            return None, head
+
+        ref = head[5:]
+        return ref, self._read_ref(ref)
+
+    def _read_ref(self, ref: str) -> Optional[str]:
+        loose = self.git_dir / ref
+        if loose.exists():
+            return loose.read_text().strip() or None
+
+        packed = self.git_dir / "packed-refs"
+        if packed.exists():
+            for line in packed.read_text().splitlines():
+                if line.endswith(" " + ref) and not line.startswith(("#", "^")):
+                    return line.split(" ", 1)[0]
+        return None
+
+    def _update_ref(
+        self,
+        ref: Optional[str],
+        old_sha: Optional[str],
+        new_sha: str,
+        message: str
+    ) -> None:
+        """Compare-and-swap a ref (or detached HEAD) using git's lock protocol."""
+        target = self.git_dir / (ref or "HEAD")
+        target.parent.mkdir(parents=True, exist_ok=True)
+        lock_file = target.with_name(target.name + ".lock")
+
+        try:
+            fd = os.open(lock_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        except FileExistsError:
+            raise RuntimeError(f"Git commit failed: {lock_file} exists") from None
+
+        try:
+            current = self._read_ref(ref) if ref else self.resolve_head()[1]
+            if current != old_sha:
+                raise RuntimeError(
+                    f"Git commit failed: {ref or 'HEAD'} moved from {old_sha} to {current}"
+                )
+            lock = os.fdopen(fd, 'w')
+            fd = None
+            with lock:
+                lock.write(new_sha + "\n")
+            os.replace(lock_file, target)
+        finally:
+            if fd is not None:
+                os.close(fd)
+            if lock_file.exists():
+                lock_file.unlink()
+
+        self._append_reflogs(ref, old_sha, new_sha, message)
+
+    def _append_reflogs(
+        self,
+        ref: Optional[str],
+        old_sha: Optional[str],
+        new_sha: str,
+        message: str
+    ) -> None:
+        logs_dir = self.git_dir / "logs"
+        if not logs_dir.is_dir():
+            return
+
+        subject = message.split("\n", 1)[0]
+        line = f"{old_sha or '0' * 40} {new_sha} {self._signature()}\tcommit: {subject}\n"
+        for name in filter(None, ["HEAD", ref]):
+            log_file = logs_dir / name
+            log_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(log_file, 'a') as f:
+                f.write(line)
+
+    # -- commits -------------------------------------------------------------
+
+    def _signature(self) -> str:
+        """Committer identity with the current timestamp."""
+        if self._identity is None:
+            result = subprocess.run(
+                ["git", "var", "GIT_COMMITTER_IDENT"],
+                cwd=str(self.repo_path),
+                capture_output=True,
+                text=True
+            )
+            ident = result.stdout.strip()
+            # Drop the timestamp git appended; ours is taken per commit
+            self._identity = ident.rsplit(" ", 2)[0] if result.returncode == 0 and ident \
+                else "ai_sdlc_method <ai-sdlc-config@localhost>"
+
+        offset = time.localtime().tm_gmtoff // 60
+        sign = "+" if offset >= 0 else "-"
+        tz = f"{sign}{abs(offset) // 60:02d}{abs(offset) % 60:02d}"
+        return f"{self._identity} {int(time.time())} {tz}"
+
+    def commit_paths(self, message: str, paths: Iterable[str]) -> Optional[str]:
+        """
+        Commit the working-tree state of paths on top of HEAD.
+
+        Each path may be a file or directory (committed recursively) and
+        may no longer exist (removed from the tree). Everything else in
+        HEAD's tree is carried over unchanged.
+
+        Args:
+            message: Commit message
+            paths: Paths relative to the repository root
+
+        Returns:
+            New commit sha, or None if the tree is unchanged
+
+        Raises:
+            UnsupportedRepositoryError: If paths are under .gitignore or
+                .gitattributes rules (ignore and filter semantics are left
+                to git itself)
+        """
+        ref, parent = self.resolve_head()
+        parent_tree = self.commit_tree(parent) if parent else None
+
+        replacements: Dict[Tuple[str, ...], Optional[TreeEntry]] = {}
+        for rel_path in self._collapse(paths):
+            parts = tuple(Path(rel_path).parts)
+            for depth in range(len(parts)):
+                directory = self.repo_path.joinpath(*parts[:depth])
+                if any((directory / name).exists() for name in RULE_FILES):
+                    raise UnsupportedRepositoryError(f"{rel_path} is under ignore or attribute rules")
+            replacements[parts] = self._snapshot(self.repo_path / rel_path)
+
+        tree = self._apply(parent_tree, replacements) or self.write_tree({})
+        if tree == parent_tree:
+            return None
+
+        lines = [f"tree {tree}"]
+        if parent:
+            lines.append(f"parent {parent}")
+        signature = self._signature()
+        lines.append(f"author {signature}")
+        lines.append(f"committer {signature}")
+        body = "\n".join(lines) + "\n\n" + message.rstrip() + "\n"
+
+        commit = self.write_object("commit", body.encode())
+        self._update_ref(ref, parent, commit, message)
+        return commit
+
+    @staticmethod
+    def _collapse(paths: Iterable[str]) -> List[str]:
+        """Drop paths already covered by a touched ancestor directory."""
+        result: List[str] = []
+        for path in sorted({Path(p).as_posix() for p in paths}):
+            if not any(path.startswith(kept + "/") for kept in result):
+                result.append(path)
+        return result
+
+    def _snapshot(self, path: Path) -> Optional[TreeEntry]:
+        """Write the working-tree object(s) at path; None if absent or empty."""
+        if path.is_symlink():
+            return SYMLINK_MODE, self.write_object("blob", os.readlink(path).encode())
+        if path.is_file():
+            mode = EXECUTABLE_MODE if os.access(path, os.X_OK) else FILE_MODE
+            return mode, self.write_object("blob", path.read_bytes())
+        if path.is_dir():
+            if any((path / name).exists() for name in RULE_FILES):
+                raise UnsupportedRepositoryError(f"{path} has ignore or attribute rules")
+            entries = {}
+            for child in path.iterdir():
+                if child.name == ".git":
+                    continue
+                entry = self._snapshot(child)
+                if entry is not None:
+                    entries[child.name] = entry
+            if not entries:
+                return None  # git doesn't track empty directories
+            return TREE_MODE, self.write_tree(entries)
+        return None
+
+    def _apply(
+        self,
+        tree_sha: Optional[str],
+        replacements: Dict[Tuple[str, ...], Optional[TreeEntry]]
+    ) -> Optional[str]:
+        """Rebuild tree_sha with replacements; None if the result is empty."""
+        entries = dict(self.read_tree(tree_sha)) if tree_sha else {}
+
+        grouped: Dict[str, Dict[Tuple[str, ...], Optional[TreeEntry]]] = {}
+        for parts, entry in replacements.items():
+            grouped.setdefault(parts[0], {})[parts[1:]] = entry
+
+        for name, nested in grouped.items():
+            if () in nested:
+                replacement = nested[()]
+            else:
+                existing = entries.get(name)
+                subtree = existing[1] if existing and existing[0] == TREE_MODE else None
+                new_subtree = self._apply(subtree, nested)
+                replacement = (TREE_MODE, new_subtree) if new_subtree else None
+
+            if replacement is None:
+                entries.pop(name, None)
+            else:
+                entries[name] = replacement
+
+        if not entries:
+            return None
+        return self.write_tree(entries)
+
+    # -- index ---------------------------------------------------------------
+
+    def sync_index(self, paths: Optional[Iterable[str]] = None) -> None:
+        """
+        Reset the index to HEAD after in-process commits.
+
+        Args:
+            paths: Only these paths (default: the whole index)
+        """
+        pathspec = ["--", *self._collapse(paths)] if paths is not None else []
+        subprocess.run(
+            ["git", "reset", "-q", *pathspec],
+            cwd=str(self.repo_path),
+            capture_output=True,
+            text=True
+        )
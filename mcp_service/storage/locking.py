@@ -0,0 +1,175 @@
+"""
+Locks for concurrent access to a project repository.
+
+Each project has a reader/writer lock, so independent projects can be
+updated in parallel while reads of a project wait only for its writers.
+The registry (projects.json) and git commits each get their own mutex.
+Locks are shared by every ProjectRepository in the process that opens the
+same repository path.
+
+Lock order, to stay deadlock-free: project locks (sorted by name), then
+the registry lock, then the commit lock.
+"""
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+class ReadWriteLock:
+    """
+    Writer-preferring reader/writer lock.
+
+    Reentrant: a thread holding the write lock may take it again or take
+    the read lock, and a reader may read again. Upgrading a read lock to a
+    write lock is refused (it would deadlock against another upgrader).
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition(threading.Lock())
+        self._readers: Dict[int, int] = {}
+        self._writer: Optional[int] = None
+        self._write_depth = 0
+        self._waiting_writers = 0
+
+    def acquire_read(self):
+        """Acquire the lock for reading."""
+        me = threading.get_ident()
+        with self._condition:
+            if self._writer == me or me in self._readers:
+                self._readers[me] = self._readers.get(me, 0) + 1
+                return
+            while self._writer is not None or self._waiting_writers:
+                self._condition.wait()
+            self._readers[me] = 1
+
+    def release_read(self):
+        """Release a read acquisition."""
+        me = threading.get_ident()
+        with self._condition:
+            count = self._readers[me] - 1
+            if count:
+                self._readers[me] = count
+            else:
+                del self._readers[me]
+                self._condition.notify_all()
+
+    def acquire_write(self):
+        """
+        Acquire the lock for writing.
+
+        Raises:
+            RuntimeError: If the calling thread only holds the read lock
+        """
+        me = threading.get_ident()
+        with self._condition:
+            if self._writer == me:
+                self._write_depth += 1
+                return
+            if me in self._readers:
+                raise RuntimeError("Cannot upgrade a read lock to a write lock")
+
+            self._waiting_writers += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._condition.wait()
+            finally:
+                self._waiting_writers -= 1
+            self._writer = me
+            self._write_depth = 1
+
+    def release_write(self):
+        """Release a write acquisition."""
+        with self._condition:
+            self._write_depth -= 1
+            if not self._write_depth:
+                self._writer = None
+                self._condition.notify_all()
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        """Hold the lock for reading."""
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        """Hold the lock for writing."""
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+
+class LockTable:
+    """Named ReadWriteLocks, created on first use."""
+
+    def __init__(self):
+        self._locks: Dict[str, ReadWriteLock] = {}
+        self._mutex = threading.Lock()
+
+    def get(self, name: str) -> ReadWriteLock:
+        """Get the lock for a name."""
+        with self._mutex:
+            lock = self._locks.get(name)
+            if lock is None:
+                lock = self._locks[name] = ReadWriteLock()
+            return lock
+
+    @contextmanager
+    def hold(self, read: Iterable[str] = (), write: Iterable[str] = ()) -> Iterator[None]:
+        """
+        Hold several locks at once, acquired in name order.
+
+        Args:
+            read: Names to lock for reading
+            write: Names to lock for writing (wins over read)
+        """
+        modes = {name: False for name in read}
+        modes.update({name: True for name in write})
+
+        acquired: List[Tuple[ReadWriteLock, bool]] = []
+        try:
+            for name in sorted(modes):
+                lock = self.get(name)
+                if modes[name]:
+                    lock.acquire_write()
+                else:
+                    lock.acquire_read()
+                acquired.append((lock, modes[name]))
+            yield
+        finally:
+            for lock, exclusive in reversed(acquired):
+                if exclusive:
+                    lock.release_write()
+                else:
+                    lock.release_read()
+
+
+class RepositoryLocks:
+    """The locks guarding one repository."""
+
+    def __init__(self):
+        self.projects = LockTable()
+        self.registry = threading.RLock()
+        self.commit = threading.RLock()
+        # Threads with file changes not yet committed or journaled
+        self.unrecorded = 0
+        self.unrecorded_lock = threading.Lock()
+
+
+_REPOSITORY_LOCKS: Dict[Path, RepositoryLocks] = {}
+_REPOSITORY_LOCKS_MUTEX = threading.Lock()
+
+
+def repository_locks(repo_path: Path) -> RepositoryLocks:
+    """Get the process-wide locks for a repository path."""
+    with _REPOSITORY_LOCKS_MUTEX:
+        locks = _REPOSITORY_LOCKS.get(repo_path)
+        if locks is None:
+            locks = _REPOSITORY_LOCKS[repo_path] = RepositoryLocks()
+        return locks
@@ -0,0 +1,203 @@
+"""
+Repository maintenance: size metrics, document deduplication and packing.
+
+Git already stores identical file contents once, but the working tree
+does not: the same policy document added to many projects is one file
+per project. DocumentStore keeps a content-addressed copy of each
+document (named by its git blob id) in .git and hardlinks identical
+working-tree files to it, so each distinct document is stored once. All
+repository writes replace files by rename, which breaks the link instead
+of changing the shared copy.
+"""
+import os
+import subprocess
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from .git_store import GitObjectStore
+
+
+@dataclass
+class RepositoryStats:
+    """Size and latency snapshot of a project repository."""
+    loose_objects: int
+    loose_size_kb: int
+    packs: int
+    packed_objects: int
+    pack_size_kb: int
+    working_tree_files: int
+    working_tree_bytes: int
+    commit_latency_ms: Dict[str, float] = field(default_factory=dict)
+
+
+@dataclass
+class MaintenanceReport:
+    """Outcome of ProjectRepository.maintain()."""
+    before: RepositoryStats
+    after: RepositoryStats
+    pruned_merged: List[str] = field(default_factory=list)
+    deduplicated_docs: int = 0
+    bytes_saved: int = 0
+    store_entries_pruned: int = 0
+    packed: bool = False
+    duration_ms: float = 0.0
+
+
+def count_objects(repo_path: Path) -> Dict[str, int]:
+    """
+    Get object counts and sizes from `git count-objects -v`.
+
+    Returns:
+        Dict with keys such as count, size, in-pack, packs, size-pack (KiB)
+    """
+    result = subprocess.run(
+        ["git", "count-objects", "-v"],
+        cwd=str(repo_path),
+        check=True,
+        capture_output=True,
+        text=True
+    )
+    counts = {}
+    for line in result.stdout.splitlines():
+        key, _, value = line.partition(":")
+        try:
+            counts[key.strip()] = int(value)
+        except ValueError:
+            pass
+    return counts
+
+
+def working_tree_usage(repo_path: Path) -> Tuple[int, int]:
+    """
+    Measure the working tree (everything outside .git).
+
+    Hardlinked files are counted once.
+
+    Returns:
+        (file count, bytes)
+    """
+    files = 0
+    size = 0
+    seen: Set[Tuple[int, int]] = set()
+    for root, dirs, names in os.walk(repo_path):
+        if root == str(repo_path):
+            dirs[:] = [d for d in dirs if d != ".git"]
+        for name in names:
+            stat = os.lstat(os.path.join(root, name))
+            files += 1
+            if (stat.st_dev, stat.st_ino) not in seen:
+                seen.add((stat.st_dev, stat.st_ino))
+                size += stat.st_size
+    return files, size
+
+
+def latency_summary(samples: Iterable[float]) -> Dict[str, float]:
+    """Summarize latency samples (ms) as count, mean, p50, p95 and max."""
+    ordered = sorted(samples)
+    if not ordered:
+        return {}
+
+    def percentile(p: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))], 3)
+
+    return {
+        "count": len(ordered),
+        "mean": round(sum(ordered) / len(ordered), 3),
+        "p50": percentile(0.5),
+        "p95": percentile(0.95),
+        "max": round(ordered[-1], 3)
+    }
+
+
+class DocumentStore:
+    """Content-addressed hardlink store for deduplicating documents."""
+
+    def __init__(self, store_dir: Path):
+        """
+        Initialize document store.
+
+        Args:
+            store_dir: Directory for the shared copies (same filesystem as
+                       the working tree)
+        """
+        self.store_dir = Path(store_dir)
+
+    def _entry(self, digest: str) -> Path:
+        return self.store_dir / digest[:2] / digest[2:]
+
+    def deduplicate(
+        self,
+        paths: Iterable[Path],
+        on_replace: Optional[Callable[[Path], None]] = None
+    ) -> Tuple[int, int]:
+        """
+        Hardlink identical files to one shared copy.
+
+        Files whose mode differs from the shared copy's are left alone.
+        Stops quietly if the filesystem doesn't support hardlinks.
+
+        Args:
+            paths: Files to deduplicate
+            on_replace: Called with each path right after it is relinked
+
+        Returns:
+            (files relinked, bytes freed)
+        """
+        relinked = 0
+        freed = 0
+        for path in paths:
+            with open(path, "rb") as f:
+                data = f.read()
+            entry = self._entry(GitObjectStore.hash_object("blob", data))
+            stat = os.stat(path)
+
+            try:
+                if not entry.exists():
+                    entry.parent.mkdir(parents=True, exist_ok=True)
+                    os.link(path, entry)
+                    continue
+
+                shared = os.stat(entry)
+                if (shared.st_dev, shared.st_ino) == (stat.st_dev, stat.st_ino):
+                    continue
+                if shared.st_mode != stat.st_mode or shared.st_size != stat.st_size:
+                    continue
+
+                # Link next to the target, then rename over it atomically
+                temp = path.with_name(f".{path.name}.link.tmp")
+                os.link(entry, temp)
+                try:
+                    os.replace(temp, path)
+                except BaseException:
+                    os.unlink(temp)
+                    raise
+            except OSError:
+                # No hardlinks here (or another filesystem): nothing to gain
+                break
+
+            if on_replace:
+                on_replace(path)
+            relinked += 1
+            if stat.st_nlink == 1:
+                freed += stat.st_size
+        return relinked, freed
+
+    def prune(self) -> int:
+        """
+        Remove shared copies no working-tree file links to any more.
+
+        Returns:
+            Number of entries removed
+        """
+        removed = 0
+        if not self.store_dir.exists():
+            return removed
+        for bucket in self.store_dir.iterdir():
+            for entry in bucket.iterdir():
+                if entry.stat().st_nlink == 1:
+                    entry.unlink()
+                    removed += 1
+            if not any(bucket.iterdir()):
+                bucket.rmdir()
+        return removed
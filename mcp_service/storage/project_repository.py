@@ -1,13 +1,37 @@
 """Git-backed project repository storage system."""
+import copy
+import functools
+import hashlib
 import json
+import os
 import shutil
 import subprocess
-from dataclasses import dataclass, asdict
-from datetime import datetime
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict, replace
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import List, Dict, Any, Optional
-
-from ai_sdlc_config import ConfigManager
+from typing import List, Dict, Any, Optional, Callable, Iterator, Set, Tuple, Union
+
+from ai_sdlc_config import ConfigManager, HierarchyMerger, HierarchyNode, HierarchySerializer, YAMLLoader, tracing
+from ai_sdlc_config.serializers import dump_json, dump_yaml
+
+from .atomic_write import WriteGroup, is_temporary_name
+from .change_feed import HEAD_MARKER, ChangeEvent, ChangeFeed, ChangeType, RepositoryWatcher
+from .git_store import TREE_MODE, GitObjectStore, UnsupportedRepositoryError
+from .locking import repository_locks
+from .maintenance import (
+    DocumentStore,
+    MaintenanceReport,
+    RepositoryStats,
+    count_objects,
+    latency_summary,
+    working_tree_usage,
+)
+from .sqlite_index import ProjectIndex
+from .yaml_patch import patch_yaml_text
 
 
 @dataclass
@@ -23,6 +47,131 @@ class ProjectMetadata:
     merged_from: Optional[List[str]] = None  # For merged projects
     merge_date: Optional[str] = None  # For merged projects
     runtime_overrides: Optional[Dict[str, Any]] = None  # For merged projects
+    virtual: bool = False  # Merged project materialized on read from its recipe
+    revision: int = 0  # Incremented by every update_project
+
+
+class ConcurrentModificationError(ValueError):
+    """Raised when a project changed since the revision the caller expected."""
+
+
+def _read_json(path: Path) -> Any:
+    """Read and parse a JSON file."""
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+class _FileCache:
+    """
+    Process-wide cache of parsed files, invalidated by stat changes.
+
+    Entries are keyed by absolute path and tagged with the file's
+    (mtime_ns, size, inode). A lookup costs one stat(); the file is only
+    re-read when that signature changes, so edits made outside this
+    process are still picked up. Writers push the value they just wrote
+    with put() (write-through) so their own writes never cause a re-read.
+    """
+
+    def __init__(self):
+        self._entries: Dict[Path, Tuple[Tuple[int, int, int], Any]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _signature(path: Path) -> Tuple[int, int, int]:
+        st = os.stat(path)
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def get(self, path: Path, loader: Callable[[Path], Any]) -> Any:
+        """
+        Get parsed contents of path, loading it if missing or stale.
+
+        Raises:
+            FileNotFoundError: If path doesn't exist
+        """
+        try:
+            signature = self._signature(path)
+        except FileNotFoundError:
+            self.discard(path)
+            raise
+
+        with self._lock:
+            entry = self._entries.get(path)
+        if entry is not None and entry[0] == signature:
+            return entry[1]
+
+        # Tag with the pre-read signature: if the file changes while we
+        # read it, the next lookup sees a new signature and reloads.
+        value = loader(path)
+        with self._lock:
+            self._entries[path] = (signature, value)
+        return value
+
+    def put(self, path: Path, value: Any) -> None:
+        """Record value as the current contents of a just-written path."""
+        signature = self._signature(path)
+        with self._lock:
+            self._entries[path] = (signature, value)
+
+    def discard(self, path: Path) -> None:
+        """Drop any cached entry for path."""
+        with self._lock:
+            self._entries.pop(path, None)
+
+
+def _hash_file(path: Path) -> str:
+    """Content hash of a file (its git blob id, so history reads share keys)."""
+    return GitObjectStore.hash_object("blob", path.read_bytes())
+
+
+def _config_version(layer_keys: Tuple[Any, ...]) -> str:
+    """Version of a merged config: a digest of its layers' content hashes."""
+    return hashlib.sha1(repr(layer_keys).encode("utf-8")).hexdigest()[:16]
+
+
+class _ThreadState(threading.local):
+    """Per-thread batch and write-group state of a repository."""
+
+    def __init__(self):
+        self.batch_depth = 0
+        self.batch_messages: List[str] = []
+        self.batch_paths: Optional[List[str]] = []
+        self.batch_events: List[ChangeEvent] = []
+        self.write_group: Optional[WriteGroup] = None
+        # Change events committed but not yet published, and the nesting
+        # depth of publishing mutators (events go out when it drops to 0)
+        self.committed_events: List[ChangeEvent] = []
+        self.call_depth = 0
+        # Files changed that no commit or journal entry covers yet
+        self.unrecorded = False
+
+
+def _publishes_changes(method):
+    """Publish a mutator's committed change events once it returns (locks released)."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self._thread.call_depth += 1
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self._thread.call_depth -= 1
+            if not self._thread.call_depth:
+                self._publish_committed()
+    return wrapper
+
+
+def _file_signature(path: Path) -> Optional[Tuple[int, int, int]]:
+    """(mtime_ns, size, inode) of a file, or None if it doesn't exist."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+# Shared by every ProjectRepository in the process
+_REGISTRY_CACHE = _FileCache()
+_METADATA_CACHE = _FileCache()
+_LAYER_HASHES = _FileCache()
 
 
 class ProjectRepository:
@@ -47,22 +196,148 @@ class ProjectRepository:
                 └── .merge_info.json  # Merge provenance
     """
 
-    def __init__(self, repo_path: Path):
+    # Bounds for the parsed-layer and merged-prefix caches
+    LAYER_CACHE_SIZE = 256
+    PREFIX_CACHE_SIZE = 128
+    HISTORY_CACHE_SIZE = 64
+    # Bound for cached serialized configs (dict/JSON/YAML outputs and pages)
+    SERIALIZED_CACHE_SIZE = 256
+    # Recent commit latencies kept for repository_stats()
+    COMMIT_LATENCY_SAMPLES = 256
+
+    def __init__(
+        self,
+        repo_path: Path,
+        commit_interval_ms: Optional[int] = None,
+        commit_max_ops: Optional[int] = None,
+        in_process_git: bool = True,
+        fsync: bool = False,
+        use_index: bool = False,
+        gc_every: Optional[int] = None
+    ):
         """
         Initialize project repository.
 
+        Passing commit_interval_ms and/or commit_max_ops enables write-behind
+        mode: mutations return once their files are written and journaled,
+        and a background committer folds the journal into a single git
+        commit every commit_interval_ms milliseconds or every commit_max_ops
+        operations, whichever comes first. Call flush() to commit
+        immediately and close() before discarding the repository.
+
         Args:
             repo_path: Path to repository root
+            commit_interval_ms: Write-behind flush interval (optional)
+            commit_max_ops: Write-behind flush threshold in operations (optional)
+            in_process_git: Write commits for touched paths directly into
+                            .git instead of running `git add .` + `git commit`.
+                            The git index catches up on flush() and close(),
+                            so until then `git status` lists those paths
+            fsync: Make each operation's file writes durable before it
+                   commits (one grouped barrier per operation)
+            use_index: Serve listing and dependency queries from a SQLite
+                       index in .git (rebuilt automatically when HEAD moves)
+            gc_every: Run `git gc --auto` after every N commits (optional)
         """
         self.repo_path = Path(repo_path).resolve()
         self.projects_file = self.repo_path / "projects.json"
         self.merged_projects_dir = self.repo_path / "merged_projects"
+        self.journal_file = self.repo_path / ".git" / "ai_sdlc_journal"
+        # Present while files are changed ahead of their commit or journal entry
+        self.unrecorded_file = self.repo_path / ".git" / "ai_sdlc_unrecorded"
+
+        # Per-project reader/writer locks plus registry and commit locks,
+        # shared with other instances on the same path
+        self._locks = repository_locks(self.repo_path)
+        self._commit_lock = self._locks.commit
+        # Open batch() and write group of the calling thread
+        self._thread = _ThreadState()
+
+        # Commit batching state
+        self._write_behind = False
+        self._pending_ops = 0
+
+        # Change feed: committed mutations, plus external edits once
+        # watch() runs (own writes are recorded so they aren't reported)
+        self.changes = ChangeFeed()
+        self._journaled_events: List[ChangeEvent] = []
+        self._known_head: Optional[str] = None
+        self._watcher: Optional[RepositoryWatcher] = None
+        self._own_changes: Dict[str, Optional[Tuple[int, int, int]]] = {}
+        self._own_lock = threading.Lock()
+
+        # Atomic writes
+        self._fsync = fsync
+
+        # Maintenance: commit latency samples and scheduled packing
+        self._commit_latencies: "deque[float]" = deque(maxlen=self.COMMIT_LATENCY_SAMPLES)
+        self._gc_every = gc_every
+        self._commits_since_gc = 0
+
+        # Merged ConfigManager cache: name -> (key, manager), plus the
+        # reverse map layer project -> projects whose cached config uses it
+        self._cache_lock = threading.Lock()
+        self._config_cache: Dict[str, Tuple[Any, ConfigManager]] = {}
+        self._config_dependents: Dict[str, Set[str]] = {}
+        # Parsed layers and merged base prefixes, keyed by content hashes
+        self._loader = YAMLLoader()
+        self._layer_cache: "OrderedDict[Tuple[str, str], HierarchyNode]" = OrderedDict()
+        self._prefix_cache: "OrderedDict[Tuple[Tuple[str, str], ...], HierarchyNode]" = OrderedDict()
+        # Merged managers at past revisions, keyed by their layer blobs
+        self._history_cache: "OrderedDict[Tuple[Tuple[str, str], ...], ConfigManager]" = OrderedDict()
+        self._history_reader: Optional[GitObjectStore] = None
+        # Serialized outputs of merged configs, keyed by (project, version, ...)
+        self.serializer = HierarchySerializer(self.SERIALIZED_CACHE_SIZE)
+        # Cache name -> [hits, misses], updated under _cache_lock
+        self._cache_counts: Dict[str, List[int]] = {
+            cache: [0, 0] for cache in ("config", "layer", "prefix", "history")
+        }
+
+        # In-process commit path (falls back to the git CLI when unsupported)
+        self._objects: Optional[GitObjectStore] = None
+        # Paths committed in-process whose index entries still hold the old version
+        self._stale_index: Set[str] = set()
+
+        # Optional SQLite index of registry and metadata
+        self._index: Optional[ProjectIndex] = None
 
         # Initialize if not a git repository
         git_dir = self.repo_path / ".git"
         if not git_dir.exists():
             self._initialize_repository()
 
+        if in_process_git:
+            objects = GitObjectStore(self.repo_path)
+            try:
+                objects.check_supported()
+                self._objects = objects
+            except UnsupportedRepositoryError:
+                pass
+
+        # Commit anything journaled by a previous process that died, then
+        # anything it was writing but died before committing or journaling
+        self._recover_journal()
+        self._recover_working_tree()
+
+        if use_index:
+            self._index = ProjectIndex(git_dir / "ai_sdlc_index.sqlite")
+        self._known_head = self._head_sha()
+
+        # Write-behind committer
+        self._write_behind = commit_interval_ms is not None or commit_max_ops is not None
+        self._commit_interval = commit_interval_ms / 1000.0 if commit_interval_ms else None
+        self._commit_max_ops = commit_max_ops
+        self._committer: Optional[threading.Thread] = None
+        self._committer_wakeup = threading.Event()
+        self._committer_stop = threading.Event()
+        if self._write_behind:
+            self._committer = threading.Thread(
+                target=self._committer_loop,
+                name="ai-sdlc-write-behind",
+                daemon=True
+            )
+            self._committer.start()
+
     def _initialize_repository(self):
         """Initialize a new repository."""
         self.repo_path.mkdir(parents=True, exist_ok=True)
@@ -107,21 +382,212 @@ class ProjectRepository:
         # Initial commit
         self._git_add_commit("Initialize project repository")
 
+    @tracing.traced("repository.registry", "repository")
     def _load_projects_registry(self) -> Dict[str, Dict[str, Any]]:
-        """Load projects registry."""
-        if not self.projects_file.exists():
+        """
+        Load projects registry.
+
+        Served from the process-wide registry cache; the file is only
+        re-parsed when it changed on disk. Returns a shallow copy, so
+        callers may add or delete entries but must not mutate entries
+        in place.
+        """
+        try:
+            registry = _REGISTRY_CACHE.get(self.projects_file, _read_json)
+        except FileNotFoundError:
             return {}
 
-        with open(self.projects_file, 'r') as f:
-            return json.load(f)
+        return dict(registry)
+
+    @contextmanager
+    def _writes(self) -> Iterator[WriteGroup]:
+        """
+        Group the file writes of one operation.
+
+        Writes are atomic (temp file + rename). With fsync enabled they are
+        staged until the outermost group exits and then made durable with a
+        single barrier; if the operation fails, staged writes are dropped.
+        Files written in the group must not be read back before it exits.
+        """
+        if self._thread.write_group is not None:
+            yield self._thread.write_group
+            return
+
+        self._mark_unrecorded()
+        group = WriteGroup(fsync=self._fsync, on_write=self._note_own_write)
+        self._thread.write_group = group
+        try:
+            yield group
+        except BaseException:
+            group.abort()
+            raise
+        else:
+            group.commit()
+        finally:
+            self._thread.write_group = None
+
+    def _write_text(self, path: Path, text: str, on_commit: Optional[Callable[[], None]] = None):
+        """Write a file atomically as part of the current write group."""
+        with self._writes() as group:
+            group.write_text(path, text, on_commit)
 
     def _save_projects_registry(self, registry: Dict[str, Dict[str, Any]]):
         """Save projects registry."""
-        with open(self.projects_file, 'w') as f:
-            json.dump(registry, f, indent=2)
+        snapshot = dict(registry)
+        self._write_text(
+            self.projects_file,
+            dump_json(registry),
+            lambda: _REGISTRY_CACHE.put(self.projects_file, snapshot)
+        )
+
+    def _read_project_metadata(self, metadata_file: Path) -> Optional[ProjectMetadata]:
+        """Read project.json through the metadata cache."""
+        try:
+            data = _METADATA_CACHE.get(metadata_file, _read_json)
+        except FileNotFoundError:
+            return None
+
+        # Fresh copy: callers mutate metadata (e.g. modified timestamp)
+        return ProjectMetadata(**copy.deepcopy(data))
+
+    def _write_project_metadata(self, metadata_file: Path, metadata: ProjectMetadata):
+        """Write project.json and record it in the metadata cache."""
+        data = asdict(metadata)
+        self._write_text(
+            metadata_file,
+            dump_json(data),
+            lambda: _METADATA_CACHE.put(metadata_file, data)
+        )
+
+    def _git_add_commit(
+        self,
+        message: str,
+        paths: Optional[List[Path]] = None,
+        change: Optional[ChangeEvent] = None
+    ):
+        """
+        Record a completed mutation for commit.
+
+        Commits immediately by default. Inside batch() the message is held
+        until the outermost batch exits; in write-behind mode it is appended
+        to the journal and committed by the background committer. The
+        change event is published once its commit exists.
+
+        Args:
+            message: Commit message
+            paths: Files/directories the mutation touched. When given, only
+                   these paths are committed (in-process, no `git add .`);
+                   None commits the whole working tree.
+            change: Event describing the mutation (paths are filled in)
+        """
+        rel_paths = None
+        if paths is not None:
+            rel_paths = [Path(p).relative_to(self.repo_path).as_posix() for p in paths]
+        events = [replace(change, paths=tuple(rel_paths or ()))] if change is not None else []
+
+        with self._commit_lock:
+            if self._thread.batch_depth:
+                self._thread.batch_messages.append(message)
+                self._thread.batch_events.extend(events)
+                if self._thread.batch_paths is not None:
+                    if rel_paths is None:
+                        self._thread.batch_paths = None
+                    else:
+                        self._thread.batch_paths.extend(rel_paths)
+                return
+
+            self._record_commit(message, rel_paths, events)
+
+    def _record_commit(
+        self,
+        message: str,
+        paths: Optional[List[str]],
+        events: List[ChangeEvent] = ()
+    ):
+        """Commit now, or journal for the write-behind committer."""
+        if not self._write_behind:
+            self._commit(message, paths)
+            self._mark_recorded()
+            self._thread.committed_events.extend(
+                replace(event, commit=self._known_head) for event in events
+            )
+            return
+
+        self._journal_append(message, paths)
+        self._mark_recorded()
+        self._journaled_events.extend(events)
+        self._pending_ops += 1
+        if self._commit_max_ops and self._pending_ops >= self._commit_max_ops:
+            self._committer_wakeup.set()
+
+    @tracing.traced("git.commit", "git")
+    def _commit(
+        self,
+        message: str,
+        paths: Optional[List[str]] = None,
+        allow_empty: bool = False
+    ):
+        """
+        Commit changes, keeping the SQLite index's HEAD in step.
+
+        The index already holds the committed changes (it is updated when
+        files are written), so if it was current before the commit it is
+        still current after it.
+        """
+        head = self._head_sha() if self._index is not None else None
+        start = time.perf_counter()
+        self._git_commit(message, paths, allow_empty)
+        self._commit_latencies.append((time.perf_counter() - start) * 1000)
+        self._known_head = self._head_sha()
+        if self._index is not None and self._index.head() == head:
+            self._index.set_head(self._known_head)
+
+        if self._gc_every:
+            self._commits_since_gc += 1
+            if self._commits_since_gc >= self._gc_every:
+                self._commits_since_gc = 0
+                self._git_gc(auto=True)
+
+    def _head_sha(self) -> Optional[str]:
+        """Get the commit HEAD points at (None before the first commit)."""
+        if self._objects is not None:
+            return self._objects.resolve_head()[1]
+
+        result = subprocess.run(
+            ["git", "rev-parse", "--verify", "-q", "HEAD"],
+            cwd=str(self.repo_path),
+            capture_output=True,
+            text=True
+        )
+        return result.stdout.strip() or None
+
+    def _git_commit(
+        self,
+        message: str,
+        paths: Optional[List[str]] = None,
+        allow_empty: bool = False
+    ):
+        """
+        Commit changes.
+
+        With paths, the commit is written in-process by the object store,
+        touching only those paths. Without paths (or when the object store
+        can't handle the repository), falls back to `git add .` + `git commit`.
+
+        Args:
+            message: Commit message
+            paths: Repository-relative paths to commit (optional)
+            allow_empty: Treat "nothing to commit" as success
+        """
+        if paths is not None and self._objects is not None:
+            try:
+                self._objects.commit_paths(message, paths)
+                # The index is reset off the commit path, by flush()
+                self._stale_index.update(paths)
+                return
+            except UnsupportedRepositoryError:
+                pass
 
-    def _git_add_commit(self, message: str):
-        """Add all changes and commit."""
         try:
             subprocess.run(
                 ["git", "add", "."],
@@ -142,8 +608,521 @@ class ProjectRepository:
                 text=True
             )
         except subprocess.CalledProcessError as e:
+            if allow_empty and "nothing to commit" in (e.stdout or ""):
+                return
             raise RuntimeError(f"Git commit failed: {e.stderr}") from e
 
+    @staticmethod
+    def _combine_messages(messages: List[str], summary: Optional[str] = None) -> str:
+        """Fold several commit messages into one."""
+        if len(messages) == 1 and not summary:
+            return messages[0]
+
+        subject = summary or f"Batch update ({len(messages)} changes)"
+        return subject + "\n\n" + "\n".join(f"- {m}" for m in messages)
+
+    @contextmanager
+    def batch(self, message: Optional[str] = None) -> Iterator['ProjectRepository']:
+        """
+        Group mutations into a single git commit.
+
+        Every create/update/delete/add_document/merge inside the block is
+        written to disk as usual, but only one commit is made when the
+        outermost batch exits (also on error, so completed mutations are
+        never left uncommitted). Batches nest, and are per thread: other
+        threads' mutations keep committing on their own.
+
+        Example:
+            with repo.batch("Provision environments"):
+                repo.create_project("dev", "custom", ["base"])
+                repo.create_project("prod", "custom", ["base"])
+
+        Args:
+            message: Subject for the combined commit (optional)
+        """
+        with self._commit_lock:
+            if self._thread.batch_depth == 0:
+                self._thread.batch_paths = []
+            self._thread.batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._commit_lock:
+                self._thread.batch_depth -= 1
+                if self._thread.batch_depth == 0 and self._thread.batch_messages:
+                    messages = self._thread.batch_messages
+                    events = self._thread.batch_events
+                    self._thread.batch_messages = []
+                    self._thread.batch_events = []
+                    self._record_commit(
+                        self._combine_messages(messages, message),
+                        self._thread.batch_paths,
+                        events
+                    )
+            if not self._thread.call_depth:
+                self._publish_committed()
+
+    def _journal_append(self, message: str, paths: Optional[List[str]]):
+        """Durably append a pending commit to the journal."""
+        with open(self.journal_file, 'a') as f:
+            f.write(json.dumps({"message": message, "paths": paths}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _read_journal(self) -> Tuple[List[str], Optional[List[str]]]:
+        """
+        Read pending commits from the journal.
+
+        Returns:
+            (messages, union of touched paths or None if any entry
+            needs a full working-tree commit)
+        """
+        messages: List[str] = []
+        paths: Optional[List[str]] = []
+        if not self.journal_file.exists():
+            return messages, paths
+
+        with open(self.journal_file, 'r') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    messages.append(entry["message"])
+                except (ValueError, KeyError):
+                    # Torn final line from a crash mid-append
+                    continue
+                if paths is not None:
+                    if entry.get("paths") is None:
+                        paths = None
+                    else:
+                        paths.extend(entry["paths"])
+        return messages, paths
+
+    def _flush_journal(self):
+        """Commit journaled mutations and clear the journal."""
+        with self._commit_lock:
+            messages, paths = self._read_journal()
+            if messages:
+                # Files on disk may already include later writes; allow an
+                # empty commit in case an earlier flush picked them up.
+                self._commit(self._combine_messages(messages), paths, allow_empty=True)
+            if self.journal_file.exists():
+                self.journal_file.unlink()
+            self._pending_ops = 0
+            events = [
+                replace(event, commit=self._known_head) for event in self._journaled_events
+            ]
+            self._journaled_events = []
+
+        for event in events:
+            self.changes.publish(event)
+
+    def _recover_journal(self):
+        """Commit mutations journaled but not committed before a crash."""
+        self._flush_journal()
+
+    def _mark_unrecorded(self):
+        """
+        Note that the calling thread is changing files ahead of recording them.
+
+        unrecorded_file exists while any thread has such changes, so a
+        process that dies before the commit or journal entry leaves it
+        behind for _recover_working_tree(). The file is not fsynced: it
+        covers crashes of the process, not of the machine.
+        """
+        if self._thread.unrecorded:
+            return
+        self._thread.unrecorded = True
+        with self._locks.unrecorded_lock:
+            self._locks.unrecorded += 1
+            if self._locks.unrecorded == 1:
+                self.unrecorded_file.touch()
+
+    def _mark_recorded(self):
+        """Note that the calling thread's changes are committed or journaled."""
+        if not self._thread.unrecorded:
+            return
+        self._thread.unrecorded = False
+        with self._locks.unrecorded_lock:
+            self._locks.unrecorded -= 1
+            if self._locks.unrecorded == 0:
+                self.unrecorded_file.unlink(missing_ok=True)
+
+    def _recover_working_tree(self):
+        """
+        Commit files a crashed process changed but never recorded.
+
+        Only runs when unrecorded_file was left behind, so edits made
+        outside the repository are otherwise left alone. Differences from
+        HEAD are committed; untracked WriteGroup temporaries are deleted
+        instead. Tracked files are never removed.
+        """
+        if not self.unrecorded_file.exists():
+            return
+        with self._locks.unrecorded_lock:
+            if self._locks.unrecorded:
+                # Another instance in this process is mid-write
+                return
+
+        result = subprocess.run(
+            ["git", "status", "--porcelain", "-z", "--untracked-files=all"],
+            cwd=str(self.repo_path),
+            capture_output=True,
+            text=True
+        )
+        if result.returncode != 0:
+            return
+
+        paths: List[str] = []
+        fields = iter(result.stdout.split("\0"))
+        for entry in fields:
+            if len(entry) < 4:
+                continue
+            status, path = entry[:2], entry[3:]
+            if "R" in status or "C" in status:
+                # Renames and copies are followed by their source path
+                paths.append(next(fields, ""))
+            if status == "??" and is_temporary_name(Path(path).name):
+                (self.repo_path / path).unlink(missing_ok=True)
+                continue
+            paths.append(path)
+
+        paths = [path for path in paths if path]
+        with self._commit_lock:
+            if paths:
+                self._commit("Recover uncommitted changes", paths, allow_empty=True)
+                self._sync_index()
+            self.unrecorded_file.unlink(missing_ok=True)
+
+    def flush(self):
+        """
+        Commit all journaled write-behind mutations now.
+
+        Also resets the index entries of paths committed in-process, so
+        `git status` in the repository is accurate again.
+        """
+        self._flush_journal()
+        self._sync_index()
+
+    def _sync_index(self):
+        """Reset stale index entries to HEAD in one `git reset`."""
+        with self._commit_lock:
+            if not self._stale_index:
+                return
+            paths, self._stale_index = sorted(self._stale_index), set()
+            self._objects.sync_index(paths)
+
+    def _committer_loop(self):
+        """Background write-behind committer."""
+        while not self._committer_stop.is_set():
+            self._committer_wakeup.wait(self._commit_interval)
+            self._committer_wakeup.clear()
+            try:
+                self.flush()
+            except RuntimeError:
+                # Journal is kept; the next flush (or restart) retries
+                pass
+
+    def close(self):
+        """
+        Stop the write-behind committer and commit anything pending.
+        """
+        if self._watcher is not None:
+            self._watcher.close()
+            self._watcher = None
+
+        if self._committer is not None:
+            self._committer_stop.set()
+            self._committer_wakeup.set()
+            self._committer.join()
+            self._committer = None
+        self.flush()
+
+        if self._objects is not None:
+            self._objects.close()
+
+        if self._index is not None:
+            self._index.close()
+
+        if self._history_reader is not None:
+            self._history_reader.close()
+
+    def watch(self, poll_interval: float = 1.0, use_inotify: bool = True) -> RepositoryWatcher:
+        """
+        Publish EXTERNAL_CHANGE events for edits made outside this object.
+
+        Watches the working tree and HEAD (inotify where available, stat
+        polling otherwise). The repository's own writes and commits are
+        not reported. Cached configs of externally changed projects are
+        invalidated, and the SQLite index is rebuilt on its next query.
+        Stopped by close().
+
+        Args:
+            poll_interval: Seconds between scans when polling
+            use_inotify: Try inotify before falling back to polling
+
+        Returns:
+            The running watcher
+        """
+        if self._watcher is None:
+            self._watcher = RepositoryWatcher(
+                self.repo_path, self._on_external_change, poll_interval, use_inotify
+            )
+        return self._watcher
+
+    def _publish_committed(self):
+        """Publish the calling thread's committed change events."""
+        events = self._thread.committed_events
+        self._thread.committed_events = []
+        for event in events:
+            self.changes.publish(event)
+
+    def _note_own_write(self, path: Path):
+        """Remember a file this repository wrote, so the watcher skips it."""
+        if self._watcher is None:
+            return
+        relative = Path(path).relative_to(self.repo_path).as_posix()
+        with self._own_lock:
+            self._own_changes[relative] = _file_signature(path)
+
+    def _note_own_removal(self, path: Path):
+        """Remember a file or directory this repository is about to delete."""
+        if self._watcher is None:
+            return
+        relative = Path(path).relative_to(self.repo_path).as_posix()
+        with self._own_lock:
+            self._own_changes[relative] = None
+
+    def _is_own_change(self, relative: str) -> bool:
+        """Check whether a path is as this repository last left it."""
+        current = _file_signature(self.repo_path / relative)
+        with self._own_lock:
+            if relative in self._own_changes:
+                return self._own_changes[relative] == current
+            if current is None:
+                # Inside a directory this repository deleted
+                return any(
+                    self._own_changes.get(parent.as_posix(), ()) is None
+                    for parent in Path(relative).parents
+                    if parent != Path(".")
+                )
+        return False
+
+    def _project_for_path(self, relative: str) -> Optional[str]:
+        """Get the registered project whose directory contains a path."""
+        best, best_length = None, -1
+        for name, entry in self._load_projects_registry().items():
+            prefix = entry["path"].rstrip("/") + "/"
+            if relative.startswith(prefix) and len(prefix) > best_length:
+                best, best_length = name, len(prefix)
+        return best
+
+    def _on_external_change(self, paths: Set[str]):
+        """Watcher callback: turn changed paths into EXTERNAL_CHANGE events."""
+        events = []
+        if HEAD_MARKER in paths:
+            # Own commits set _known_head under the commit lock
+            with self._commit_lock:
+                head = self._head_sha()
+                moved = head != self._known_head
+                self._known_head = head
+            if moved:
+                events.append(ChangeEvent(ChangeType.EXTERNAL_CHANGE, None, (HEAD_MARKER,), commit=head))
+
+        by_project: Dict[Optional[str], List[str]] = {}
+        for path in sorted(Path(p).as_posix() for p in paths if p != HEAD_MARKER):
+            if not self._is_own_change(path):
+                by_project.setdefault(self._project_for_path(path), []).append(path)
+        for project, project_paths in by_project.items():
+            events.append(ChangeEvent(ChangeType.EXTERNAL_CHANGE, project, tuple(project_paths)))
+
+        if not events:
+            return
+        for event in events:
+            if event.project is None:
+                self._invalidate_all_configs()
+            else:
+                self._invalidate_config(event.project)
+        if self._index is not None:
+            self._index.set_head(None)
+        for event in events:
+            self.changes.publish(event)
+
+    def repository_stats(self) -> RepositoryStats:
+        """
+        Measure the repository: git object storage, working tree and
+        recent commit latencies.
+        """
+        counts = count_objects(self.repo_path)
+        files, size = working_tree_usage(self.repo_path)
+        return RepositoryStats(
+            loose_objects=counts.get("count", 0),
+            loose_size_kb=counts.get("size", 0),
+            packs=counts.get("packs", 0),
+            packed_objects=counts.get("in-pack", 0),
+            pack_size_kb=counts.get("size-pack", 0),
+            working_tree_files=files,
+            working_tree_bytes=size,
+            commit_latency_ms=latency_summary(list(self._commit_latencies))
+        )
+
+    def cache_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get hit/miss counts of the in-memory caches.
+
+        Covers merged configs ("config"), parsed layers ("layer"), merged
+        base prefixes ("prefix"), historical configs ("history"), the URI
+        content caches of the cached configs ("resolver") and serialized
+        outputs ("serialized").
+
+        Returns:
+            Cache name -> hits, misses, entries, hit_ratio
+        """
+        with self._cache_lock:
+            counts = {cache: list(pair) for cache, pair in self._cache_counts.items()}
+            entries = {
+                "config": len(self._config_cache),
+                "layer": len(self._layer_cache),
+                "prefix": len(self._prefix_cache),
+                "history": len(self._history_cache),
+            }
+            resolvers = [manager.resolver for _, manager in self._config_cache.values()]
+            resolvers += [manager.resolver for manager in self._history_cache.values()]
+
+        counts["resolver"] = [
+            sum(resolver.cache_hits for resolver in resolvers),
+            sum(resolver.cache_misses for resolver in resolvers)
+        ]
+        entries["resolver"] = sum(len(resolver.cache) for resolver in resolvers)
+        counts["serialized"] = [self.serializer.hits, self.serializer.misses]
+        entries["serialized"] = len(self.serializer)
+
+        stats = {}
+        for cache, (hits, misses) in counts.items():
+            lookups = hits + misses
+            stats[cache] = {
+                "hits": hits,
+                "misses": misses,
+                "entries": entries[cache],
+                "hit_ratio": round(hits / lookups, 4) if lookups else 0.0
+            }
+        return stats
+
+    def maintain(
+        self,
+        prune_merged: bool = True,
+        dedupe_docs: bool = True,
+        gc: bool = True,
+        aggressive: bool = False
+    ) -> MaintenanceReport:
+        """
+        Compact the repository.
+
+        Args:
+            prune_merged: Delete merged_projects directories that no
+                          registered project owns (committed)
+            dedupe_docs: Hardlink identical project documents to one
+                         content-addressed copy in .git
+            gc: Pack loose objects with `git gc`
+            aggressive: Pass --aggressive to git gc (slower, smaller)
+
+        Returns:
+            MaintenanceReport with repository stats before and after
+        """
+        start = time.perf_counter()
+        before = self.repository_stats()
+
+        pruned = self._prune_merged() if prune_merged else []
+        relinked, freed, store_pruned = self._dedupe_documents() if dedupe_docs else (0, 0, 0)
+        if gc:
+            self._git_gc(aggressive=aggressive)
+
+        return MaintenanceReport(
+            before=before,
+            after=self.repository_stats(),
+            pruned_merged=pruned,
+            deduplicated_docs=relinked,
+            bytes_saved=freed,
+            store_entries_pruned=store_pruned,
+            packed=gc,
+            duration_ms=round((time.perf_counter() - start) * 1000, 3)
+        )
+
+    def _prune_merged(self) -> List[str]:
+        """Delete and commit merged_projects directories with no registry entry."""
+        pruned = []
+        with self._locks.registry:
+            owned = {
+                (self.repo_path / entry["path"]).resolve()
+                for entry in self._load_projects_registry().values()
+            }
+            if self.merged_projects_dir.exists():
+                for child in sorted(self.merged_projects_dir.iterdir()):
+                    if child.is_dir() and child.resolve() not in owned:
+                        self._note_own_removal(child)
+                        self._mark_unrecorded()
+                        shutil.rmtree(child)
+                        pruned.append(child.name)
+
+            if pruned:
+                self._git_add_commit(
+                    f"Prune orphaned merged projects: {', '.join(pruned)}",
+                    [self.merged_projects_dir / name for name in pruned]
+                )
+        return pruned
+
+    def _dedupe_documents(self) -> Tuple[int, int, int]:
+        """
+        Hardlink identical documents across projects.
+
+        Returns:
+            (files relinked, bytes freed, unreferenced store entries removed)
+        """
+        store = DocumentStore(self.repo_path / ".git" / "ai_sdlc_docs")
+        registry = self._load_projects_registry()
+
+        # Writers replace documents by rename; hold them off so a relink
+        # never puts back content that was just replaced
+        with self._locks.projects.hold(write=registry):
+            documents = []
+            for entry in registry.values():
+                docs_dir = self.repo_path / entry["path"] / "docs"
+                if docs_dir.is_dir():
+                    documents.extend(
+                        path for path in sorted(docs_dir.rglob("*"))
+                        if path.is_file() and not path.is_symlink()
+                    )
+            relinked, freed = store.deduplicate(documents, on_replace=self._note_own_write)
+            return relinked, freed, store.prune()
+
+    def _git_gc(self, auto: bool = False, aggressive: bool = False):
+        """
+        Pack the object database with `git gc`.
+
+        Runs under the commit lock so no in-process commit is writing
+        objects that aren't referenced yet.
+        """
+        command = ["git", "gc", "--quiet"]
+        if auto:
+            command.append("--auto")
+        if aggressive:
+            command.append("--aggressive")
+
+        with self._commit_lock:
+            if not auto:
+                self._flush_journal()
+            try:
+                subprocess.run(
+                    command,
+                    cwd=str(self.repo_path),
+                    check=True,
+                    capture_output=True,
+                    text=True
+                )
+            except subprocess.CalledProcessError as e:
+                raise RuntimeError(f"Git gc failed: {e.stderr}") from e
+
+    @tracing.traced("repository.create_project", "repository")
+    @_publishes_changes
     def create_project(
         self,
         name: str,
@@ -168,64 +1147,68 @@ class ProjectRepository:
         Raises:
             ValueError: If project already exists
         """
-        # Validate
-        registry = self._load_projects_registry()
-        if name in registry:
-            raise ValueError(f"Project '{name}' already exists")
-
-        # Create project directory
-        project_dir = self.repo_path / name
-        project_dir.mkdir(parents=True)
-
-        config_dir = project_dir / "config"
-        config_dir.mkdir()
-
-        docs_dir = project_dir / "docs"
-        docs_dir.mkdir()
-
-        # Create metadata
-        now = datetime.utcnow().isoformat() + "Z"
-        metadata = ProjectMetadata(
-            name=name,
-            project_type=project_type,
-            version="1.0.0",
-            created=now,
-            modified=now,
-            base_projects=base_projects,
-            description=description
-        )
-
-        # Save metadata
-        metadata_file = project_dir / "project.json"
-        with open(metadata_file, 'w') as f:
-            json.dump(asdict(metadata), f, indent=2)
-
-        # Save config if provided
-        if config:
-            from ai_sdlc_config.loaders.yaml_loader import YAMLLoader
-            import yaml
-
-            config_file = config_dir / "config.yml"
-            with open(config_file, 'w') as f:
-                yaml.dump(config, f, default_flow_style=False, sort_keys=False)
-        else:
-            # Create empty structure
-            config_file = config_dir / "config.yml"
-            config_file.write_text("# Configuration for {}\n".format(name))
-
-        # Update registry
-        registry[name] = {
-            "type": project_type,
-            "path": str(project_dir.relative_to(self.repo_path)),
-            "base_projects": base_projects
-        }
-        self._save_projects_registry(registry)
-
-        # Commit
-        self._git_add_commit(f"Create project: {name}")
+        with self._locks.projects.hold(write=[name]), self._locks.registry:
+            # Validate
+            registry = self._load_projects_registry()
+            if name in registry:
+                raise ValueError(f"Project '{name}' already exists")
+            self._check_acyclic(registry, name, base_projects)
+
+            with self._writes() as group:
+                # Create project directory
+                project_dir = self.repo_path / name
+                group.mkdir(project_dir, parents=True)
+
+                config_dir = project_dir / "config"
+                group.mkdir(config_dir)
+
+                docs_dir = project_dir / "docs"
+                group.mkdir(docs_dir)
+
+                # Create metadata
+                now = datetime.utcnow().isoformat() + "Z"
+                metadata = ProjectMetadata(
+                    name=name,
+                    project_type=project_type,
+                    version="1.0.0",
+                    created=now,
+                    modified=now,
+                    base_projects=base_projects,
+                    description=description
+                )
+
+                # Save metadata
+                metadata_file = project_dir / "project.json"
+                self._write_project_metadata(metadata_file, metadata)
+
+                # Save config if provided
+                config_file = config_dir / "config.yml"
+                if config:
+                    group.write_text(config_file, dump_yaml(config))
+                else:
+                    # Create empty structure
+                    group.write_text(config_file, "# Configuration for {}\n".format(name))
+
+                # Update registry
+                registry[name] = {
+                    "type": project_type,
+                    "path": str(project_dir.relative_to(self.repo_path)),
+                    "base_projects": base_projects
+                }
+                self._save_projects_registry(registry)
+
+            self._index_project(registry[name], metadata)
+
+            # Commit
+            self._git_add_commit(
+                f"Create project: {name}",
+                [project_dir, self.projects_file],
+                ChangeEvent(ChangeType.PROJECT_CREATED, name, revision=metadata.revision)
+            )
 
         return metadata
 
+    @tracing.traced("repository.get_project", "repository")
     def get_project(self, name: str) -> Optional[ProjectMetadata]:
         """
         Get project metadata.
@@ -240,96 +1223,299 @@ class ProjectRepository:
         if name not in registry:
             return None
 
-        project_dir = self.repo_path / registry[name]["path"]
-        metadata_file = project_dir / "project.json"
+        return self._get_registered_project(registry[name])
 
-        if not metadata_file.exists():
-            return None
-
-        with open(metadata_file, 'r') as f:
-            data = json.load(f)
-            return ProjectMetadata(**data)
+    def _get_registered_project(self, entry: Dict[str, Any]) -> Optional[ProjectMetadata]:
+        """Get metadata for a registry entry."""
+        metadata_file = self.repo_path / entry["path"] / "project.json"
+        return self._read_project_metadata(metadata_file)
 
-    def list_projects(self) -> List[ProjectMetadata]:
+    @tracing.traced("repository.list_projects", "repository")
+    def list_projects(self, project_type: Optional[str] = None) -> List[ProjectMetadata]:
         """
         List all projects.
 
+        Args:
+            project_type: Only list projects of this type (optional)
+
         Returns:
-            List of ProjectMetadata
+            List of ProjectMetadata, in registry (creation) order
         """
+        index = self._current_index()
+        if index is not None:
+            # The index returns rows by name; keep the registry's order
+            position = {name: i for i, name in enumerate(self._load_projects_registry())}
+            rows = sorted(
+                index.list_projects(project_type),
+                key=lambda data: position.get(data["name"], len(position))
+            )
+            return [ProjectMetadata(**data) for data in rows]
+
         registry = self._load_projects_registry()
         projects = []
 
-        for name in registry:
-            metadata = self.get_project(name)
+        for entry in registry.values():
+            if project_type is not None and entry.get("type") != project_type:
+                continue
+            metadata = self._get_registered_project(entry)
             if metadata:
                 projects.append(metadata)
 
         return projects
 
+    def _current_index(self) -> Optional[ProjectIndex]:
+        """Get the SQLite index, rebuilding it first if HEAD moved without it."""
+        if self._index is None:
+            return None
+        if self._index.head() != self._head_sha():
+            self.rebuild_index()
+        return self._index
+
+    def rebuild_index(self):
+        """
+        Rebuild the SQLite index from the registry and project metadata on disk.
+
+        Raises:
+            ValueError: If the repository was opened without use_index
+        """
+        if self._index is None:
+            raise ValueError("SQLite index is not enabled for this repository")
+
+        with self._locks.registry, self._commit_lock:
+            head = self._head_sha()
+            projects = []
+            for entry in self._load_projects_registry().values():
+                metadata = self._get_registered_project(entry)
+                if metadata:
+                    projects.append((entry, asdict(metadata)))
+            self._index.rebuild(projects, head)
+
+    def _index_project(self, entry: Dict[str, Any], metadata: ProjectMetadata):
+        """Mirror a written project into the SQLite index."""
+        if self._index is not None:
+            self._index.upsert(entry, asdict(metadata))
+
+    def dependency_graph(self) -> Dict[str, List[str]]:
+        """
+        Get the project dependency graph.
+
+        Returns:
+            Dict of project name -> base project names (edges point from a
+            project to the projects it builds on; merged projects point to
+            their sources)
+        """
+        registry = self._load_projects_registry()
+        return {
+            name: list(entry.get("base_projects", []))
+            for name, entry in registry.items()
+        }
+
+    def topological_order(self) -> List[str]:
+        """
+        List projects so that every project comes after its base projects.
+
+        Returns:
+            Project names in dependency order
+
+        Raises:
+            ValueError: If the registry contains a dependency cycle
+        """
+        graph = self.dependency_graph()
+        cycle = self._find_cycle(graph)
+        if cycle:
+            raise ValueError(f"Dependency cycle: {' -> '.join(cycle)}")
+
+        order: List[str] = []
+        visited: Set[str] = set()
+
+        def visit(name: str):
+            if name in visited:
+                return
+            visited.add(name)
+            for base in graph.get(name, []):
+                if base in graph:
+                    visit(base)
+            order.append(name)
+
+        for name in graph:
+            visit(name)
+        return order
+
+    def get_dependents(self, name: str, transitive: bool = True) -> List[str]:
+        """
+        Get projects that build on a project.
+
+        Args:
+            name: Project name
+            transitive: Include dependents of dependents
+
+        Returns:
+            Dependent project names (nearest first)
+        """
+        index = self._current_index()
+        if index is not None:
+            return index.get_dependents(name, transitive)
+
+        graph = self.dependency_graph()
+        reverse: Dict[str, List[str]] = {}
+        for project, bases in graph.items():
+            for base in bases:
+                reverse.setdefault(base, []).append(project)
+
+        result: List[str] = []
+        pending = list(reverse.get(name, []))
+        while pending:
+            current = pending.pop(0)
+            if current in result or current == name:
+                continue
+            result.append(current)
+            if transitive:
+                pending.extend(reverse.get(current, []))
+        return result
+
+    @staticmethod
+    def _find_cycle(graph: Dict[str, List[str]]) -> Optional[List[str]]:
+        """Find a dependency cycle, returned as a closed path of names."""
+        visiting: List[str] = []
+        done: Set[str] = set()
+
+        def visit(name: str) -> Optional[List[str]]:
+            if name in visiting:
+                return visiting[visiting.index(name):] + [name]
+            if name in done or name not in graph:
+                return None
+            visiting.append(name)
+            for base in graph[name]:
+                cycle = visit(base)
+                if cycle:
+                    return cycle
+            visiting.pop()
+            done.add(name)
+            return None
+
+        for name in graph:
+            cycle = visit(name)
+            if cycle:
+                return cycle
+        return None
+
+    def _check_acyclic(
+        self,
+        registry: Dict[str, Dict[str, Any]],
+        name: str,
+        base_projects: List[str]
+    ):
+        """
+        Raise if adding name -> base_projects would create a dependency cycle.
+
+        Base projects may reference projects that don't exist yet, so a
+        cycle can close when the missing project is finally created.
+
+        Raises:
+            ValueError: If a cycle would be created
+        """
+        graph = {
+            project: list(entry.get("base_projects", []))
+            for project, entry in registry.items()
+        }
+        graph[name] = list(base_projects)
+
+        cycle = self._find_cycle(graph)
+        if cycle:
+            raise ValueError(f"Dependency cycle: {' -> '.join(cycle)}")
+
+    @tracing.traced("repository.update_project", "repository")
+    @_publishes_changes
     def update_project(
         self,
         name: str,
-        updates: Dict[str, Any]
+        updates: Dict[str, Any],
+        expected_revision: Optional[int] = None
     ) -> ProjectMetadata:
         """
         Update project configuration.
 
+        Updates to different projects run in parallel; updates to the same
+        project are serialized by its write lock. Pass the revision the
+        caller last read to make the update conditional on nobody else
+        having updated the project since.
+
         Args:
             name: Project name
             updates: Dict of dot-path to value updates
                     e.g., {"methodology.testing.min_coverage": 95}
+            expected_revision: Only apply if the project is at this revision (optional)
 
         Returns:
             Updated ProjectMetadata
 
         Raises:
             ValueError: If project doesn't exist
+            ConcurrentModificationError: If the project is not at expected_revision
         """
-        metadata = self.get_project(name)
-        if not metadata:
-            raise ValueError(f"Project '{name}' not found")
+        with self._locks.projects.hold(write=[name]):
+            metadata = self.get_project(name)
+            if not metadata:
+                raise ValueError(f"Project '{name}' not found")
+            if expected_revision is not None and metadata.revision != expected_revision:
+                raise ConcurrentModificationError(
+                    f"Project '{name}' is at revision {metadata.revision}, "
+                    f"expected {expected_revision}"
+                )
+
+            registry = self._load_projects_registry()
+            project_dir = self.repo_path / registry[name]["path"]
+            config_file = project_dir / "config" / "config.yml"
 
-        registry = self._load_projects_registry()
-        project_dir = self.repo_path / registry[name]["path"]
-        config_file = project_dir / "config" / "config.yml"
+            # Patch only the affected keys, keeping comments and layout intact
+            text = config_file.read_text()
+            patched = patch_yaml_text(text, updates)
+
+            if patched is None:
+                # Fall back to load-modify-dump for YAML the patcher can't handle
+                import yaml
 
-        # Load current config
-        from ai_sdlc_config.loaders.yaml_loader import YAMLLoader
-        import yaml
+                config = yaml.safe_load(text) or {}
 
-        with open(config_file, 'r') as f:
-            config = yaml.safe_load(f) or {}
+                for path, value in updates.items():
+                    parts = path.split('.')
+                    current = config
 
-        # Apply updates
-        for path, value in updates.items():
-            parts = path.split('.')
-            current = config
+                    # Navigate to parent
+                    for part in parts[:-1]:
+                        if part not in current:
+                            current[part] = {}
+                        current = current[part]
 
-            # Navigate to parent
-            for part in parts[:-1]:
-                if part not in current:
-                    current[part] = {}
-                current = current[part]
+                    # Set value
+                    current[parts[-1]] = value
 
-            # Set value
-            current[parts[-1]] = value
+                patched = dump_yaml(config)
 
-        # Save updated config
-        with open(config_file, 'w') as f:
-            yaml.dump(config, f, default_flow_style=False, sort_keys=False)
+            with self._writes() as group:
+                # Save updated config
+                group.write_text(config_file, patched)
 
-        # Update metadata modified time
-        metadata.modified = datetime.utcnow().isoformat() + "Z"
-        metadata_file = project_dir / "project.json"
-        with open(metadata_file, 'w') as f:
-            json.dump(asdict(metadata), f, indent=2)
+                # Update metadata modified time and revision
+                metadata.modified = datetime.utcnow().isoformat() + "Z"
+                metadata.revision += 1
+                metadata_file = project_dir / "project.json"
+                self._write_project_metadata(metadata_file, metadata)
 
-        # Commit
-        self._git_add_commit(f"Update project: {name}")
+            self._invalidate_config(name)
+            self._index_project(registry[name], metadata)
+
+            # Commit
+            self._git_add_commit(
+                f"Update project: {name}",
+                [config_file, metadata_file],
+                ChangeEvent(ChangeType.PROJECT_UPDATED, name, revision=metadata.revision)
+            )
 
         return metadata
 
+    @tracing.traced("repository.delete_project", "repository")
+    @_publishes_changes
     def delete_project(self, name: str):
         """
         Delete a project.
@@ -340,23 +1526,36 @@ class ProjectRepository:
         Raises:
             ValueError: If project doesn't exist
         """
-        metadata = self.get_project(name)
-        if not metadata:
-            raise ValueError(f"Project '{name}' not found")
-
-        registry = self._load_projects_registry()
-        project_dir = self.repo_path / registry[name]["path"]
-
-        # Remove directory
-        shutil.rmtree(project_dir)
-
-        # Update registry
-        del registry[name]
-        self._save_projects_registry(registry)
-
-        # Commit
-        self._git_add_commit(f"Delete project: {name}")
+        with self._locks.projects.hold(write=[name]), self._locks.registry:
+            metadata = self.get_project(name)
+            if not metadata:
+                raise ValueError(f"Project '{name}' not found")
+
+            registry = self._load_projects_registry()
+            project_dir = self.repo_path / registry[name]["path"]
+
+            # Remove directory
+            self._note_own_removal(project_dir)
+            self._mark_unrecorded()
+            shutil.rmtree(project_dir)
+
+            # Update registry
+            del registry[name]
+            self._save_projects_registry(registry)
+
+            self._invalidate_config(name)
+            if self._index is not None:
+                self._index.delete(name)
+
+            # Commit
+            self._git_add_commit(
+                f"Delete project: {name}",
+                [project_dir, self.projects_file],
+                ChangeEvent(ChangeType.PROJECT_DELETED, name)
+            )
 
+    @tracing.traced("repository.add_document", "repository")
+    @_publishes_changes
     def add_document(
         self,
         project_name: str,
@@ -377,21 +1576,30 @@ class ProjectRepository:
         Raises:
             ValueError: If project doesn't exist
         """
-        metadata = self.get_project(project_name)
-        if not metadata:
-            raise ValueError(f"Project '{project_name}' not found")
-
-        registry = self._load_projects_registry()
-        project_dir = self.repo_path / registry[project_name]["path"]
-        docs_dir = project_dir / "docs"
+        with self._locks.projects.hold(write=[project_name]):
+            metadata = self.get_project(project_name)
+            if not metadata:
+                raise ValueError(f"Project '{project_name}' not found")
 
-        # Create document
-        doc_file = docs_dir / doc_path
-        doc_file.parent.mkdir(parents=True, exist_ok=True)
-        doc_file.write_text(content)
-
-        # Commit
-        self._git_add_commit(f"Add document to {project_name}: {doc_path}")
+            registry = self._load_projects_registry()
+            project_dir = self.repo_path / registry[project_name]["path"]
+            docs_dir = project_dir / "docs"
+
+            # Create document
+            doc_file = docs_dir / doc_path
+            with self._writes() as group:
+                group.mkdir(doc_file.parent, parents=True, exist_ok=True)
+                group.write_text(doc_file, content)
+
+            # Cached configs may hold resolved content of the old document
+            self._invalidate_config(project_name)
+
+            # Commit
+            self._git_add_commit(
+                f"Add document to {project_name}: {doc_path}",
+                [doc_file],
+                ChangeEvent(ChangeType.DOCUMENT_ADDED, project_name)
+            )
 
         return doc_file
 
@@ -400,16 +1608,26 @@ class ProjectRepository:
         source_projects: List[str],
         target_name: str,
         runtime_overrides: Optional[Dict[str, Any]] = None,
-        description: Optional[str] = None
+        description: Optional[str] = None,
+        materialize: bool = True
     ) -> ProjectMetadata:
         """
         Merge multiple projects into a new merged project.
 
+        By default the merge result is written to merged.yml, a snapshot
+        that does not follow later changes to the sources. With
+        materialize=False the project is virtual: only the recipe (sources
+        and runtime overrides) is stored, and get_project_config merges it
+        on read through the layer and prefix caches, so it never goes
+        stale and costs almost nothing to create. materialize_project()
+        persists a snapshot later.
+
         Args:
             source_projects: List of project names to merge (priority order)
             target_name: Name for merged project
             runtime_overrides: Additional runtime overrides to apply
             description: Description for merged project
+            materialize: Write merged.yml now (default) or keep the project virtual
 
         Returns:
             ProjectMetadata for merged project
@@ -417,68 +1635,191 @@ class ProjectRepository:
         Raises:
             ValueError: If any source project doesn't exist or target exists
         """
-        # Validate source projects exist
-        for name in source_projects:
-            if not self.get_project(name):
-                raise ValueError(f"Source project '{name}' not found")
-
-        # Check target doesn't exist
-        registry = self._load_projects_registry()
-        if target_name in registry:
-            raise ValueError(f"Target project '{target_name}' already exists")
-
-        # Create merged project directory
-        merged_dir = self.merged_projects_dir / target_name
-        merged_dir.mkdir(parents=True)
-
-        config_dir = merged_dir / "config"
-        config_dir.mkdir()
-
-        # Perform merge using ConfigManager
-        manager = ConfigManager(base_path=self.repo_path)
-
-        for project_name in source_projects:
-            project_dir = self.repo_path / registry[project_name]["path"]
-            config_file = project_dir / "config" / "config.yml"
+        return self.merge_projects_batch([{
+            "source_projects": source_projects,
+            "target_name": target_name,
+            "runtime_overrides": runtime_overrides,
+            "description": description,
+            "materialize": materialize
+        }])[0]
+
+    @tracing.traced("repository.merge_projects_batch", "repository")
+    @_publishes_changes
+    def merge_projects_batch(
+        self,
+        recipes: List[Dict[str, Any]],
+        max_workers: Optional[int] = None
+    ) -> List[ProjectMetadata]:
+        """
+        Create many merged projects in one pass and one commit.
+
+        Each recipe takes merge_projects() keyword arguments
+        (source_projects, target_name, and optionally runtime_overrides,
+        description, materialize). All recipes are validated before
+        anything is written. Each distinct source is hashed and parsed once
+        and each distinct source stack is merged once, then every target
+        only merges its runtime overrides on top.
+
+        Example:
+            repo.merge_projects_batch([
+                {"source_projects": ["corporate", "python", "payments"],
+                 "target_name": f"payments_{env}",
+                 "runtime_overrides": {"environment": env}}
+                for env in ("dev", "staging", "prod")
+            ], max_workers=4)
 
-            if config_file.exists():
-                # Load relative to repo root
-                rel_path = config_file.relative_to(self.repo_path)
-                manager.load_hierarchy(str(rel_path))
+        Args:
+            recipes: Merge recipes
+            max_workers: Merge targets on this many threads (default: serially)
 
-        # Apply runtime overrides
-        if runtime_overrides:
-            manager.add_runtime_overrides(runtime_overrides)
+        Returns:
+            ProjectMetadata per recipe, in order
 
-        # Merge
-        manager.merge()
+        Raises:
+            ValueError: If a recipe is malformed, a source doesn't exist, or
+                        a target exists or appears twice (nothing is written)
+        """
+        recipes = [self._normalize_recipe(recipe) for recipe in recipes]
+        targets = [recipe["target_name"] for recipe in recipes]
+        duplicates = sorted({name for name in targets if targets.count(name) > 1})
+        if duplicates:
+            raise ValueError(f"Duplicate target projects: {', '.join(duplicates)}")
+        sources = sorted({name for recipe in recipes for name in recipe["source_projects"]})
+
+        with self._locks.projects.hold(read=sources, write=targets):
+            # Validate source projects exist
+            for name in sources:
+                if not self.get_project(name):
+                    raise ValueError(f"Source project '{name}' not found")
+
+            # Check targets don't exist
+            registry = self._load_projects_registry()
+            for recipe in recipes:
+                if recipe["target_name"] in registry:
+                    raise ValueError(f"Target project '{recipe['target_name']}' already exists")
+                self._check_acyclic(registry, recipe["target_name"], recipe["source_projects"])
+
+            merged_dicts = self._merge_recipes(
+                [recipe for recipe in recipes if recipe["materialize"]], registry, max_workers
+            )
 
-        # Export merged config
-        import yaml
-        merged_config_file = config_dir / "merged.yml"
+            summary = f"Merge {len(recipes)} projects" if len(recipes) > 1 else None
+            with self.batch(summary):
+                with self._locks.registry, self._writes() as group:
+                    # Re-read: other projects may have been created meanwhile
+                    registry = self._load_projects_registry()
+                    for recipe in recipes:
+                        self._check_acyclic(registry, recipe["target_name"], recipe["source_projects"])
+                    results = [
+                        self._write_merged_project(
+                            group, registry, recipe, merged_dicts.get(recipe["target_name"])
+                        )
+                        for recipe in recipes
+                    ]
+                    self._save_projects_registry(registry)
+
+                for metadata in results:
+                    self._index_project(registry[metadata.name], metadata)
+                    self._git_add_commit(
+                        f"Merge projects into {metadata.name}: {', '.join(metadata.merged_from)}",
+                        [self.merged_projects_dir / metadata.name, self.projects_file],
+                        ChangeEvent(ChangeType.PROJECT_MERGED, metadata.name, revision=metadata.revision)
+                    )
+
+        return results
+
+    @staticmethod
+    def _normalize_recipe(recipe: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate a merge recipe and fill in its defaults."""
+        unknown = set(recipe) - {
+            "source_projects", "target_name", "runtime_overrides", "description", "materialize"
+        }
+        if unknown:
+            raise ValueError(f"Unknown merge recipe keys: {', '.join(sorted(unknown))}")
+        if not recipe.get("target_name"):
+            raise ValueError("Merge recipe needs a target_name")
+        if not recipe.get("source_projects"):
+            raise ValueError(f"Merge recipe for '{recipe['target_name']}' needs source_projects")
+
+        return {
+            "source_projects": list(recipe["source_projects"]),
+            "target_name": recipe["target_name"],
+            "runtime_overrides": recipe.get("runtime_overrides"),
+            "description": recipe.get("description"),
+            "materialize": recipe.get("materialize", True)
+        }
 
-        # Convert merged hierarchy to dict
-        def hierarchy_to_dict(node) -> Dict[str, Any]:
-            result = {}
+    def _merge_recipes(
+        self,
+        recipes: List[Dict[str, Any]],
+        registry: Dict[str, Dict[str, Any]],
+        max_workers: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Compute merged.yml contents for recipes, sharing work between them.
 
-            if node.value is not None and not node.children:
-                # Leaf node
-                from ai_sdlc_config.models.hierarchy_node import URIReference
-                if isinstance(node.value, URIReference):
-                    return {"uri": node.value.uri}
-                else:
-                    return node.value
+        Returns:
+            Dict of target name -> merged data
+        """
+        if not recipes:
+            return {}
 
-            # Branch node
-            for key, child in node.children.items():
-                result[key] = hierarchy_to_dict(child)
+        def run(function, items):
+            if max_workers and max_workers > 1 and len(items) > 1:
+                from concurrent.futures import ThreadPoolExecutor
+
+                with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                    return list(pool.map(tracing.bind(function), items))
+            return [function(item) for item in items]
+
+        # Each distinct source: hashed and parsed once
+        source_names = sorted({name for recipe in recipes for name in recipe["source_projects"]})
+        source_layers = dict(zip(source_names, run(
+            lambda name: self._source_layer(name, registry), source_names
+        )))
+        run(lambda layer: self._load_layer(*layer), [
+            layer for layer in source_layers.values() if layer is not None
+        ])
+
+        recipe_layers = [
+            [
+                source_layers[name] for name in recipe["source_projects"]
+                if source_layers[name] is not None
+            ] + self._overrides_layers(recipe["runtime_overrides"])
+            for recipe in recipes
+        ]
+
+        # Each distinct base stack: merged once (the prefix _merge_layers asks for)
+        prefixes = sorted({
+            tuple(layer_key for layer_key, _ in layers[:-1])
+            for layers in recipe_layers if len(layers) > 2
+        })
+        run(lambda keys: self._merged_prefix(keys, [self._load_layer(key) for key in keys]), prefixes)
+
+        managers = run(self._merge_layers, recipe_layers)
+        return {
+            recipe["target_name"]: self.serializer.serialize(manager.merged_hierarchy)
+            for recipe, manager in zip(recipes, managers)
+        }
 
-            return result
+    def _write_merged_project(
+        self,
+        group: WriteGroup,
+        registry: Dict[str, Dict[str, Any]],
+        recipe: Dict[str, Any],
+        merged_dict: Optional[Any]
+    ) -> ProjectMetadata:
+        """Write a merged project's files and add it to the (unsaved) registry."""
+        target_name = recipe["target_name"]
+        source_projects = recipe["source_projects"]
+        runtime_overrides = recipe["runtime_overrides"]
 
-        merged_dict = hierarchy_to_dict(manager.merged_hierarchy)
+        # Create merged project directory
+        merged_dir = self.merged_projects_dir / target_name
+        group.mkdir(merged_dir, parents=True)
 
-        with open(merged_config_file, 'w') as f:
-            yaml.dump(merged_dict, f, default_flow_style=False, sort_keys=False)
+        if merged_dict is not None:
+            self._write_merged_config(group, merged_dir, merged_dict)
 
         # Create merge info
         merge_info = {
@@ -488,8 +1829,7 @@ class ProjectRepository:
         }
 
         merge_info_file = merged_dir / ".merge_info.json"
-        with open(merge_info_file, 'w') as f:
-            json.dump(merge_info, f, indent=2)
+        group.write_text(merge_info_file, dump_json(merge_info))
 
         # Create metadata
         now = datetime.utcnow().isoformat() + "Z"
@@ -500,16 +1840,16 @@ class ProjectRepository:
             created=now,
             modified=now,
             base_projects=source_projects,
-            description=description or f"Merged from: {', '.join(source_projects)}",
+            description=recipe["description"] or f"Merged from: {', '.join(source_projects)}",
             merged_from=source_projects,
             merge_date=now,
-            runtime_overrides=runtime_overrides
+            runtime_overrides=runtime_overrides,
+            virtual=merged_dict is None
         )
 
         # Save metadata
         metadata_file = merged_dir / "project.json"
-        with open(metadata_file, 'w') as f:
-            json.dump(asdict(metadata), f, indent=2)
+        self._write_project_metadata(metadata_file, metadata)
 
         # Update registry
         registry[target_name] = {
@@ -518,54 +1858,504 @@ class ProjectRepository:
             "base_projects": source_projects,
             "merged_from": source_projects
         }
-        self._save_projects_registry(registry)
+        if metadata.virtual:
+            registry[target_name]["virtual"] = True
+
+        return metadata
+
+    @tracing.traced("repository.materialize_project", "repository")
+    @_publishes_changes
+    def materialize_project(self, name: str) -> ProjectMetadata:
+        """
+        Persist a merged project's current merge result as a merged.yml snapshot.
+
+        Re-merges the recipe from the sources as they are now, so this also
+        refreshes a stale snapshot. A virtual project stops being virtual.
+
+        Args:
+            name: Merged project name
 
-        # Commit
-        self._git_add_commit(f"Merge projects into {target_name}: {', '.join(source_projects)}")
+        Returns:
+            Updated ProjectMetadata
+
+        Raises:
+            ValueError: If the project doesn't exist, isn't a merged project,
+                        or one of its sources is gone
+        """
+        metadata = self.get_project(name)
+        if not metadata:
+            raise ValueError(f"Project '{name}' not found")
+        if metadata.project_type != "merged":
+            raise ValueError(f"Project '{name}' is not a merged project")
+        sources = metadata.merged_from or metadata.base_projects
+
+        with self._locks.projects.hold(read=sources, write=[name]):
+            metadata = self.get_project(name)
+            registry = self._load_projects_registry()
+            for source in sources:
+                if source not in registry:
+                    raise ValueError(f"Source project '{source}' not found")
+
+            manager = self._recipe_manager(sources, metadata.runtime_overrides, registry)
+            merged_dict = self.serializer.serialize(manager.merged_hierarchy)
+            merged_dir = self.repo_path / registry[name]["path"]
+
+            with self._locks.registry, self._writes() as group:
+                self._write_merged_config(group, merged_dir, merged_dict)
+
+                now = datetime.utcnow().isoformat() + "Z"
+                metadata.virtual = False
+                metadata.modified = now
+                metadata.merge_date = now
+                metadata.revision += 1
+                self._write_project_metadata(merged_dir / "project.json", metadata)
+
+                registry = self._load_projects_registry()
+                if "virtual" in registry[name]:
+                    # Replace the entry: cached entries are shared
+                    registry[name] = {k: v for k, v in registry[name].items() if k != "virtual"}
+                    self._save_projects_registry(registry)
+
+            self._invalidate_config(name)
+            self._index_project(registry[name], metadata)
+
+            self._git_add_commit(
+                f"Materialize project: {name}",
+                [merged_dir, self.projects_file],
+                ChangeEvent(ChangeType.PROJECT_UPDATED, name, revision=metadata.revision)
+            )
 
         return metadata
 
-    def get_project_config(self, name: str) -> Optional[ConfigManager]:
+    def _recipe_manager(
+        self,
+        source_projects: List[str],
+        runtime_overrides: Optional[Dict[str, Any]],
+        registry: Dict[str, Dict[str, Any]]
+    ) -> ConfigManager:
+        """Merge each source's own config plus runtime overrides (through the caches)."""
+        layers = [self._source_layer(name, registry) for name in source_projects]
+        return self._merge_layers(
+            [layer for layer in layers if layer is not None]
+            + self._overrides_layers(runtime_overrides)
+        )
+
+    def _source_layer(
+        self,
+        name: str,
+        registry: Dict[str, Dict[str, Any]]
+    ) -> Optional[Tuple[Tuple[str, str], None]]:
+        """Get the layer for a merge source's own config.yml (None if it has none)."""
+        config_file = self.repo_path / registry[name]["path"] / "config" / "config.yml"
+        if not config_file.exists():
+            return None
+        return (str(config_file), _LAYER_HASHES.get(config_file, _hash_file)), None
+
+    def _write_merged_config(self, group: WriteGroup, merged_dir: Path, merged_dict: Any):
+        """Write a merged.yml snapshot."""
+        config_dir = merged_dir / "config"
+        group.mkdir(config_dir, exist_ok=True)
+        group.write_text(
+            config_dir / "merged.yml",
+            dump_yaml(merged_dict)
+        )
+
+    @tracing.traced("repository.get_project_config", "repository")
+    def get_project_config(
+        self,
+        name: str,
+        at: Optional[Union[str, datetime, float]] = None
+    ) -> Optional[ConfigManager]:
         """
         Get ConfigManager for a project with all its base projects loaded.
 
+        Merged managers are cached per project, keyed by the base project
+        list and the content hash of every layer file, so repeated calls
+        for an unchanged project return the same (already merged) manager.
+        Treat the returned manager as read-only: it is shared between callers.
+
+        With at, the project is assembled as it was committed at that
+        revision: registry, metadata, base list and every layer are read
+        from git objects, without touching the working tree. Uncommitted
+        (e.g. write-behind) changes are not visible this way.
+
         Args:
             name: Project name
+            at: Revision (sha, branch, tag, "HEAD~3", ...), ISO-8601 timestamp
+                with "-" separators (tried after revisions), datetime or
+                epoch seconds (optional)
 
         Returns:
             ConfigManager with project hierarchy or None if not found
+
+        Raises:
+            ValueError: If at names no commit
         """
+        if at is not None:
+            return self._historical_config(name, self._resolve_revision(at))
+
         metadata = self.get_project(name)
         if not metadata:
             return None
 
+        with self._locks.projects.hold(read=[name, *metadata.base_projects]):
+            return self._build_project_config(name, metadata)
+
+    def serialize_project(
+        self,
+        name: str,
+        format: str = "dict",
+        path: Optional[str] = None,
+        at: Optional[Union[str, datetime, float]] = None
+    ) -> Any:
+        """
+        Get a project's merged configuration as plain data, JSON or YAML.
+
+        Outputs are cached per (project, config version, format, path) and
+        dropped when the project or one of its layers changes, so repeated
+        calls for an unchanged project skip the tree walk and the encoding.
+        Treat a returned dict as read-only: it is shared between callers.
+
+        Args:
+            name: Project name
+            format: "dict", "json" or "yaml"
+            path: Dot path of the subtree to serialize (optional)
+            at: Revision or point in time, as for get_project_config (optional)
+
+        Returns:
+            Serialized configuration or None if the project is not found
+
+        Raises:
+            ValueError: If format is unknown or at names no commit
+            KeyError: If path doesn't exist
+        """
+        manager = self.get_project_config(name, at=at)
+        if manager is None:
+            return None
+        return self.serializer.serialize(
+            manager.merged_hierarchy, format, path, key=(name, manager.version)
+        )
+
+    def _build_project_config(self, name: str, metadata: ProjectMetadata) -> Optional[ConfigManager]:
+        """Get or build the cached merged manager for a project (caller holds read locks)."""
         registry = self._load_projects_registry()
+        if name not in registry:
+            return None
+        layers = self._config_layers(metadata, registry)
+        loads = [
+            ((str(config_file), _LAYER_HASHES.get(config_file, _hash_file)), None)
+            for _, config_file in layers
+        ] + self._overrides_layers(metadata.runtime_overrides if metadata.virtual else None)
+        key = (
+            tuple(metadata.base_projects),
+            tuple(layer_key for layer_key, _ in loads)
+        )
+
+        with self._cache_lock:
+            cached = self._config_cache.get(name)
+            hit = cached is not None and cached[0] == key
+            self._cache_counts["config"][0 if hit else 1] += 1
+        if hit:
+            return cached[1]
+
+        manager = self._merge_layers(loads)
+        manager.version = _config_version(key)
+
+        with self._cache_lock:
+            self._config_cache[name] = (key, manager)
+            for layer_name, _ in layers:
+                self._config_dependents.setdefault(layer_name, set()).add(name)
+
+        return manager
+
+    @tracing.traced("repository.merge_layers", "repository")
+    def _merge_layers(
+        self,
+        layers: List[Tuple[Tuple[str, str], Optional[Callable[[], HierarchyNode]]]]
+    ) -> ConfigManager:
+        """
+        Build a merged manager from (layer key, loader) pairs.
+
+        Parsed layers and merged base prefixes come from the shared caches;
+        the loader (None to parse the working-tree file) is only called on
+        a cache miss.
+        """
         manager = ConfigManager(base_path=self.repo_path)
+        layer_keys = tuple(layer_key for layer_key, _ in layers)
+        for layer_key, load in layers:
+            manager.add_hierarchy(self._load_layer(layer_key, load))
+
+        # Merge on top of the (shared, cached) merge of the base layers
+        base_count = len(layer_keys) - 1
+        if base_count >= 2:
+            prefix = self._merged_prefix(layer_keys[:base_count], manager.hierarchies)
+            manager.merge_from_prefix(prefix, base_count)
+        else:
+            manager.merge()
+        return manager
 
-        # Load base projects first (if not merged)
-        if metadata.project_type != "merged":
+    def _history_objects(self) -> GitObjectStore:
+        """Get an object reader for historical reads (works for any repository)."""
+        if self._objects is not None:
+            return self._objects
+        with self._cache_lock:
+            if self._history_reader is None:
+                self._history_reader = GitObjectStore(self.repo_path)
+            return self._history_reader
+
+    def _resolve_revision(self, at: Union[str, datetime, float]) -> str:
+        """
+        Resolve a revision or point in time to a commit id.
+
+        Raises:
+            ValueError: If no commit matches
+        """
+        objects = self._history_objects()
+
+        if isinstance(at, str):
+            # Commit-ish first: an all-digit sha prefix such as "20240101"
+            # also parses as a basic-format ISO date
+            commit = objects.resolve_commit(at)
+            if commit is not None:
+                return commit
+            if "-" not in at and "T" not in at:
+                raise ValueError(f"Unknown revision: {at}")
+            try:
+                at = datetime.fromisoformat(at.replace("Z", "+00:00"))
+            except ValueError:
+                raise ValueError(f"Unknown revision: {at}") from None
+
+        if isinstance(at, datetime):
+            # Naive datetimes are UTC, like the repository's own timestamps
+            if at.tzinfo is None:
+                at = at.replace(tzinfo=timezone.utc)
+            timestamp = at.timestamp()
+        else:
+            timestamp = float(at)
+
+        commit = objects.commit_before(timestamp)
+        if commit is None:
+            raise ValueError(f"No commit at or before {at}")
+        return commit
+
+    def _read_blob_at(self, commit: str, path: Path) -> Optional[str]:
+        """Get the blob id of a working-tree path as of a commit."""
+        entry = self._history_objects().path_entry(
+            commit, path.relative_to(self.repo_path).as_posix()
+        )
+        if entry is None or entry[0] == TREE_MODE:
+            return None
+        return entry[1]
+
+    def _read_text(self, blob: str) -> str:
+        obj = self._history_objects().read_object(blob)
+        if obj is None:
+            raise RuntimeError(f"Missing git object: {blob}")
+        return obj[2].decode("utf-8")
+
+    @tracing.traced("repository.historical_config", "repository")
+    def _historical_config(self, name: str, commit: str) -> Optional[ConfigManager]:
+        """Assemble a project's config from the objects of a commit."""
+        registry_blob = self._read_blob_at(commit, self.projects_file)
+        if registry_blob is None:
+            return None
+        registry = json.loads(self._read_text(registry_blob))
+        if name not in registry:
+            return None
+
+        metadata_blob = self._read_blob_at(commit, self.repo_path / registry[name]["path"] / "project.json")
+        if metadata_blob is None:
+            return None
+        metadata = ProjectMetadata(**json.loads(self._read_text(metadata_blob)))
+
+        blobs: Dict[Path, Optional[str]] = {}
+
+        def exists(path: Path) -> bool:
+            blobs[path] = self._read_blob_at(commit, path)
+            return blobs[path] is not None
+
+        layers = [
+            (
+                (str(config_file), blobs[config_file]),
+                lambda blob=blobs[config_file], source=str(config_file):
+                    self._loader.load_from_string(self._read_text(blob), source)
+            )
+            for _, config_file in self._config_layers(metadata, registry, exists)
+        ] + self._overrides_layers(metadata.runtime_overrides if metadata.virtual else None)
+        history_key = tuple(layer_key for layer_key, _ in layers)
+
+        with self._cache_lock:
+            manager = self._history_cache.get(history_key)
+            if manager is not None:
+                self._history_cache.move_to_end(history_key)
+                self._cache_counts["history"][0] += 1
+                return manager
+            self._cache_counts["history"][1] += 1
+
+        manager = self._merge_layers(layers)
+        manager.version = _config_version((tuple(metadata.base_projects), history_key))
+
+        with self._cache_lock:
+            self._history_cache[history_key] = manager
+            if len(self._history_cache) > self.HISTORY_CACHE_SIZE:
+                self._history_cache.popitem(last=False)
+        return manager
+
+    def _config_layers(
+        self,
+        metadata: ProjectMetadata,
+        registry: Dict[str, Dict[str, Any]],
+        exists: Callable[[Path], bool] = Path.exists
+    ) -> List[Tuple[str, Path]]:
+        """
+        Get (project name, config file) layers for a project, lowest priority first.
+
+        Base projects come first (materialized merged projects are already
+        flattened), then the project's own config. Virtual merged projects
+        have no config of their own: their sources are the layers. Missing
+        files are skipped.
+        """
+        layers = []
+
+        # Load base projects first (if not a materialized merge)
+        if metadata.project_type != "merged" or metadata.virtual:
             for base_name in metadata.base_projects:
                 if base_name in registry:
                     base_dir = self.repo_path / registry[base_name]["path"]
                     base_config = base_dir / "config" / "config.yml"
 
-                    if base_config.exists():
-                        rel_path = base_config.relative_to(self.repo_path)
-                        manager.load_hierarchy(str(rel_path))
+                    if exists(base_config):
+                        layers.append((base_name, base_config))
+
+        if metadata.virtual:
+            return layers
 
         # Load project config
-        project_dir = self.repo_path / registry[name]["path"]
+        project_dir = self.repo_path / registry[metadata.name]["path"]
 
         if metadata.project_type == "merged":
             config_file = project_dir / "config" / "merged.yml"
         else:
             config_file = project_dir / "config" / "config.yml"
 
-        if config_file.exists():
-            rel_path = config_file.relative_to(self.repo_path)
-            manager.load_hierarchy(str(rel_path))
+        if exists(config_file):
+            layers.append((metadata.name, config_file))
 
-        # Merge
-        manager.merge()
+        return layers
 
-        return manager
+    def _overrides_layers(
+        self,
+        overrides: Optional[Dict[str, Any]]
+    ) -> List[Tuple[Tuple[str, str], Callable[[], HierarchyNode]]]:
+        """
+        Get the layer for a merge recipe's runtime overrides (if any).
+
+        Keyed by a hash of the overrides, so tuples sharing overrides share
+        the parsed layer, and tuples sharing sources share the merged prefix.
+        """
+        if not overrides:
+            return []
+
+        digest = hashlib.sha1(
+            json.dumps(overrides, sort_keys=True, default=str).encode()
+        ).hexdigest()
+        return [(
+            ("runtime_overrides", digest),
+            lambda: ConfigManager(base_path=self.repo_path).build_runtime_hierarchy(overrides)
+        )]
+
+    @tracing.traced("repository.load_layer", "repository")
+    def _load_layer(
+        self,
+        layer_key: Tuple[str, str],
+        load: Optional[Callable[[], HierarchyNode]] = None
+    ) -> HierarchyNode:
+        """
+        Get the parsed hierarchy for a (config file, content hash) layer.
+
+        Parsed layers are shared between managers and must not be mutated.
+
+        Args:
+            layer_key: (absolute config path, git blob id)
+            load: Builds the layer on a cache miss (default: parse the file)
+        """
+        with self._cache_lock:
+            hierarchy = self._layer_cache.get(layer_key)
+            if hierarchy is not None:
+                self._layer_cache.move_to_end(layer_key)
+                self._cache_counts["layer"][0] += 1
+                return hierarchy
+            self._cache_counts["layer"][1] += 1
+
+        hierarchy = self._loader.load(layer_key[0]) if load is None else load()
+
+        with self._cache_lock:
+            self._layer_cache[layer_key] = hierarchy
+            if len(self._layer_cache) > self.LAYER_CACHE_SIZE:
+                self._layer_cache.popitem(last=False)
+        return hierarchy
+
+    @tracing.traced("repository.merged_prefix", "repository")
+    def _merged_prefix(
+        self,
+        prefix_keys: Tuple[Tuple[str, str], ...],
+        hierarchies: List[HierarchyNode]
+    ) -> HierarchyNode:
+        """
+        Get the merge of the first len(prefix_keys) layers, reusing cached prefixes.
+
+        Projects sharing a base stack (e.g. methodology -> language standards
+        -> corporate) share one cached materialization of it. When only a
+        shorter prefix is cached, the merge continues from that one.
+        """
+        with self._cache_lock:
+            for length in range(len(prefix_keys), 1, -1):
+                cached = self._prefix_cache.get(prefix_keys[:length])
+                if cached is not None:
+                    self._prefix_cache.move_to_end(prefix_keys[:length])
+                    break
+            else:
+                cached, length = None, 0
+            self._cache_counts["prefix"][0 if length == len(prefix_keys) else 1] += 1
+
+        if length == len(prefix_keys):
+            return cached
+
+        merger = HierarchyMerger()
+        if cached is None:
+            merged = merger.merge(hierarchies[:len(prefix_keys)])
+        else:
+            merged = merger.merge_onto(cached, hierarchies[length:len(prefix_keys)], length)
+
+        with self._cache_lock:
+            self._prefix_cache[prefix_keys] = merged
+            if len(self._prefix_cache) > self.PREFIX_CACHE_SIZE:
+                self._prefix_cache.popitem(last=False)
+        return merged
+
+    def _invalidate_all_configs(self):
+        """Drop every cached config."""
+        with self._cache_lock:
+            self._config_cache.clear()
+            self._config_dependents.clear()
+        self.serializer.invalidate()
+
+    def _invalidate_config(self, name: str):
+        """
+        Drop cached configs that include project name as a layer.
+
+        Follows the reverse-dependency map, so only the project itself and
+        the projects built on top of it are evicted.
+        """
+        with self._cache_lock:
+            pending = [name]
+            seen = set()
+            while pending:
+                current = pending.pop()
+                if current in seen:
+                    continue
+                seen.add(current)
+                self._config_cache.pop(current, None)
+                pending.extend(self._config_dependents.pop(current, ()))
+        for current in seen:
+            self.serializer.invalidate(current)
@@ -0,0 +1,216 @@
+"""
+SQLite index of the project registry.
+
+Mirrors projects.json and every project.json (type, path, timestamps,
+full metadata) plus the base_projects edges, so listing, filtering by
+type and finding dependents are indexed queries instead of a registry
+parse and one file read per project.
+
+The git repository stays the source of truth: the index records the HEAD
+commit it reflects and is rebuilt from the working tree whenever HEAD
+moved without it (checkout, pull, commits made by other tools).
+"""
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS projects (
+    name TEXT PRIMARY KEY,
+    project_type TEXT NOT NULL,
+    path TEXT NOT NULL,
+    modified TEXT,
+    metadata TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS projects_by_type ON projects (project_type, name);
+CREATE TABLE IF NOT EXISTS base_edges (
+    project TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    base TEXT NOT NULL,
+    PRIMARY KEY (project, position)
+);
+CREATE INDEX IF NOT EXISTS base_edges_by_base ON base_edges (base, project);
+"""
+
+SCHEMA_VERSION = "1"
+
+
+class ProjectIndex:
+    """
+    WAL-mode SQLite mirror of project registry entries and metadata.
+
+    Each thread gets its own connection, so readers never wait for each
+    other or for a writer.
+    """
+
+    def __init__(self, db_path: Path):
+        """
+        Initialize project index.
+
+        Args:
+            db_path: SQLite database file (created if missing)
+        """
+        self.db_path = Path(db_path)
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        with conn:
+            conn.executescript(SCHEMA)
+            if self._get_meta(conn, "schema_version") != SCHEMA_VERSION:
+                conn.execute("DELETE FROM projects")
+                conn.execute("DELETE FROM base_edges")
+                self._set_meta(conn, "schema_version", SCHEMA_VERSION)
+                self._set_meta(conn, "head", None)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get the calling thread's connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    @staticmethod
+    def _get_meta(conn: sqlite3.Connection, key: str) -> Optional[str]:
+        row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def _set_meta(conn: sqlite3.Connection, key: str, value: Optional[str]):
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    @staticmethod
+    def _upsert(conn: sqlite3.Connection, entry: Dict[str, Any], metadata: Dict[str, Any]):
+        name = metadata["name"]
+        conn.execute(
+            "INSERT OR REPLACE INTO projects (name, project_type, path, modified, metadata) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (name, entry["type"], entry["path"], metadata.get("modified"), json.dumps(metadata))
+        )
+        conn.execute("DELETE FROM base_edges WHERE project = ?", (name,))
+        conn.executemany(
+            "INSERT INTO base_edges (project, position, base) VALUES (?, ?, ?)",
+            [(name, i, base) for i, base in enumerate(entry.get("base_projects", []))]
+        )
+
+    def head(self) -> Optional[str]:
+        """Get the commit the index was last synced with."""
+        return self._get_meta(self._connection(), "head")
+
+    def set_head(self, head: Optional[str]):
+        """Record the commit the index reflects."""
+        conn = self._connection()
+        with conn:
+            self._set_meta(conn, "head", head)
+
+    def upsert(self, entry: Dict[str, Any], metadata: Dict[str, Any]):
+        """
+        Add or replace a project.
+
+        Args:
+            entry: Registry entry (type, path, base_projects)
+            metadata: Contents of the project's project.json
+        """
+        conn = self._connection()
+        with conn:
+            self._upsert(conn, entry, metadata)
+
+    def delete(self, name: str):
+        """Remove a project."""
+        conn = self._connection()
+        with conn:
+            conn.execute("DELETE FROM projects WHERE name = ?", (name,))
+            conn.execute("DELETE FROM base_edges WHERE project = ?", (name,))
+
+    def rebuild(
+        self,
+        projects: Iterable[Tuple[Dict[str, Any], Dict[str, Any]]],
+        head: Optional[str]
+    ):
+        """
+        Replace the whole index in one transaction.
+
+        Args:
+            projects: (registry entry, metadata) pairs
+            head: Commit the rebuilt index reflects
+        """
+        conn = self._connection()
+        with conn:
+            conn.execute("DELETE FROM projects")
+            conn.execute("DELETE FROM base_edges")
+            for entry, metadata in projects:
+                self._upsert(conn, entry, metadata)
+            self._set_meta(conn, "head", head)
+
+    def list_projects(self, project_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        List project metadata in name order.
+
+        Args:
+            project_type: Only projects of this type (optional)
+
+        Returns:
+            List of metadata dicts
+        """
+        conn = self._connection()
+        if project_type is None:
+            rows = conn.execute("SELECT metadata FROM projects ORDER BY name")
+        else:
+            rows = conn.execute(
+                "SELECT metadata FROM projects WHERE project_type = ? ORDER BY name",
+                (project_type,)
+            )
+        return [json.loads(row[0]) for row in rows]
+
+    def get_dependents(self, name: str, transitive: bool = True) -> List[str]:
+        """
+        Get projects listing name as a base, nearest first.
+
+        Args:
+            name: Project name
+            transitive: Include dependents of dependents
+        """
+        conn = self._connection()
+        if not transitive:
+            rows = conn.execute(
+                "SELECT project FROM base_edges WHERE base = ? ORDER BY project", (name,)
+            )
+            return [row[0] for row in rows]
+
+        rows = conn.execute(
+            """
+            WITH RECURSIVE dependents (project, depth) AS (
+                SELECT project, 1 FROM base_edges WHERE base = ?
+                UNION
+                SELECT e.project, d.depth + 1
+                FROM base_edges e JOIN dependents d ON e.base = d.project
+                WHERE d.depth < 1000
+            )
+            SELECT project, MIN(depth) AS depth FROM dependents
+            WHERE project != ?
+            GROUP BY project ORDER BY depth, project
+            """,
+            (name, name)
+        )
+        return [row[0] for row in rows]
+
+    def close(self):
+        """Close every thread's connection."""
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
@@ -0,0 +1,216 @@
+"""
+Surgical YAML text patching.
+
+Applies dot-path updates to block-style YAML by rewriting only the lines
+of the keys being changed. Comments, key order and formatting elsewhere in
+the file are left untouched, so the resulting git diff is just the edit.
+
+Anything the line-based patcher can't reason about safely (flow parents,
+anchors and merge keys, quoted or complex keys, multiple documents, tabs)
+makes patch_yaml_text() return None so callers fall back to a full
+load-modify-dump.
+"""
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from ai_sdlc_config.serializers import dump_yaml
+
+
+# Plain keys the patcher can match textually
+_PLAIN_KEY = re.compile(r"^[A-Za-z_][\w\-]*$")
+
+# Plain keys YAML would read as booleans or null
+_RESERVED_KEYS = {"y", "n", "yes", "no", "true", "false", "on", "off", "null"}
+
+# "key:" followed by whitespace or end of line, capturing the inline value
+_KEY_LINE = re.compile(r"^([A-Za-z_][\w\-]*)[ ]*:(?:[ ]+(.*))?$")
+
+_COMMENT = re.compile(r"\s+#")
+
+_ANCHOR = re.compile(r"(^|[\s\[{,])&[^\s]")
+
+
+class _Unsupported(Exception):
+    """Internal signal that the document needs a full load-modify-dump."""
+
+
+def patch_yaml_text(text: str, updates: Dict[str, Any]) -> Optional[str]:
+    """
+    Apply dot-path updates to YAML text.
+
+    Args:
+        text: Current YAML document
+        updates: Dict of dot-path to value updates
+                e.g., {"methodology.testing.min_coverage": 95}
+
+    Returns:
+        Patched YAML text, or None if the document can't be patched in place
+    """
+    if "\t" in text or "\r" in text:
+        return None
+
+    lines = text.splitlines()
+    for line in lines:
+        if line.startswith(("---", "...", "%")):
+            return None
+
+    try:
+        for path, value in updates.items():
+            parts = path.split('.')
+            if not all(_is_plain_key(part) for part in parts):
+                return None
+            _apply_update(lines, parts, value)
+    except _Unsupported:
+        return None
+
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+def _is_plain_key(key: str) -> bool:
+    """Check a key is written the same way YAML would read it back."""
+    return bool(_PLAIN_KEY.match(key)) and key.lower() not in _RESERVED_KEYS
+
+
+def _content(line: str) -> Optional[Tuple[int, str]]:
+    """Get (indent, content) of a line, or None for blank and comment lines."""
+    stripped = line.lstrip(' ')
+    if not stripped or stripped.startswith('#'):
+        return None
+    return len(line) - len(stripped), stripped
+
+
+def _inline_value(inline: Optional[str]) -> str:
+    """Strip a trailing comment-only inline value down to nothing."""
+    if inline is None or inline.lstrip().startswith('#'):
+        return ""
+    return inline
+
+
+def _is_sequence_item(content: str) -> bool:
+    return content == '-' or content.startswith('- ')
+
+
+def _find_key(
+    lines: List[str],
+    start: int,
+    end: int,
+    indent: int,
+    key: str
+) -> Optional[Tuple[int, str]]:
+    """
+    Find a key among the entries of a block mapping.
+
+    Returns:
+        (line index, inline value) or None if the key is absent
+
+    Raises:
+        _Unsupported: If the mapping contains entries the patcher can't parse
+    """
+    seen_key = False
+    for i in range(start, end):
+        info = _content(lines[i])
+        if info is None or info[0] > indent:
+            continue
+        line_indent, content = info
+        if line_indent < indent:
+            raise _Unsupported()
+
+        if _is_sequence_item(content) and seen_key:
+            # Compact sequence value of the previous key
+            continue
+
+        match = _KEY_LINE.match(content)
+        if not match:
+            raise _Unsupported()
+        seen_key = True
+        if match.group(1) == key:
+            return i, _inline_value(match.group(2))
+    return None
+
+
+def _block_end(lines: List[str], index: int, indent: int, end: int, inline: str) -> int:
+    """Get the index after the last content line belonging to a key."""
+    last = index
+    for i in range(index + 1, end):
+        info = _content(lines[i])
+        if info is None:
+            continue
+        line_indent, content = info
+        if line_indent > indent or (
+            line_indent == indent and not inline and _is_sequence_item(content)
+        ):
+            last = i
+            continue
+        break
+    return last + 1
+
+
+def _last_content(lines: List[str], start: int, end: int) -> Optional[int]:
+    for i in range(end - 1, start - 1, -1):
+        if _content(lines[i]) is not None:
+            return i
+    return None
+
+
+def _dump(key: str, value: Any, indent: int) -> List[str]:
+    text = dump_yaml({key: value})
+    prefix = ' ' * indent
+    return [prefix + line if line else line for line in text.splitlines()]
+
+
+def _trailing_comment(inline: str) -> str:
+    """Get the comment trailing a plain inline scalar, if any."""
+    match = _COMMENT.search(inline)
+    if not match or any(c in inline[:match.start()] for c in "'\"[{|>"):
+        return ""
+    return inline[match.start():]
+
+
+def _apply_update(lines: List[str], parts: List[str], value: Any):
+    """Apply a single dot-path update to the document lines in place."""
+    start, end = 0, len(lines)
+    first = next((_content(line) for line in lines if _content(line)), None)
+    indent = first[0] if first else 0
+
+    for depth, part in enumerate(parts):
+        found = _find_key(lines, start, end, indent, part)
+
+        # Tail of the path below this key, for creating missing mappings
+        nested = value
+        for missing in reversed(parts[depth + 1:]):
+            nested = {missing: nested}
+
+        if found is None:
+            # Create the missing tail of the path at the end of this mapping
+            last = _last_content(lines, start, end)
+            position = end if last is None else last + 1
+            lines[position:position] = _dump(part, nested, indent)
+            return
+
+        index, inline = found
+        block_end = _block_end(lines, index, indent, end, inline)
+
+        if inline.rstrip() == "{}":
+            # Empty flow mapping: write the whole tail in its place
+            lines[index:block_end] = _dump(part, nested, indent)
+            return
+
+        if depth == len(parts) - 1:
+            if any(_ANCHOR.search(line) for line in lines[index:block_end]):
+                raise _Unsupported()
+            replacement = _dump(part, value, indent)
+            if block_end == index + 1 and len(replacement) == 1:
+                replacement[0] += _trailing_comment(inline)
+            lines[index:block_end] = replacement
+            return
+
+        # Intermediate keys must hold a block mapping
+        if inline:
+            raise _Unsupported()
+        child = next(
+            (_content(lines[i]) for i in range(index + 1, block_end) if _content(lines[i])),
+            None
+        )
+        if child is None or child[0] <= indent:
+            raise _Unsupported()
+        start, end, indent = index + 1, block_end, child[0]
@@ -0,0 +1,137 @@
+"""
+Unit tests for change_feed module.
+
+# Validates: REQ-NFR-FEDERATE-001 (Hierarchical configuration composition)
+
+Tests cover:
+- Publish/subscribe with type and project filters
+- Sequence numbers and event history
+- Watching a directory tree with inotify and polling
+"""
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from storage import change_feed
+from storage.change_feed import ChangeEvent, ChangeFeed, ChangeType, RepositoryWatcher
+
+
+class TestChangeFeed:
+    """Test ChangeFeed class"""
+
+    def test_subscribe_and_filters(self):
+        """Test that subscribers get only the events they asked for"""
+        feed = ChangeFeed()
+        everything, updates, app_only = [], [], []
+        feed.subscribe(everything.append)
+        feed.subscribe(updates.append, types=[ChangeType.PROJECT_UPDATED])
+        feed.subscribe(app_only.append, projects=["app"])
+
+        feed.publish(ChangeEvent(ChangeType.PROJECT_CREATED, "app"))
+        feed.publish(ChangeEvent(ChangeType.PROJECT_UPDATED, "base"))
+        feed.publish(ChangeEvent(ChangeType.EXTERNAL_CHANGE, None))
+
+        assert [e.sequence for e in everything] == [1, 2, 3]
+        assert [e.project for e in updates] == ["base"]
+        assert [e.type for e in app_only] == [ChangeType.PROJECT_CREATED, ChangeType.EXTERNAL_CHANGE]
+
+    def test_unsubscribe(self):
+        """Test that unsubscribed callbacks are no longer called"""
+        feed = ChangeFeed()
+        received = []
+        token = feed.subscribe(received.append)
+        feed.unsubscribe(token)
+
+        feed.publish(ChangeEvent(ChangeType.PROJECT_CREATED, "app"))
+
+        assert received == []
+
+    def test_failing_subscriber_isolated(self):
+        """Test that one subscriber raising doesn't stop the others"""
+        feed = ChangeFeed()
+        received = []
+
+        def broken(event):
+            raise RuntimeError("boom")
+
+        feed.subscribe(broken)
+        feed.subscribe(received.append)
+        feed.publish(ChangeEvent(ChangeType.PROJECT_CREATED, "app"))
+
+        assert len(received) == 1
+
+    def test_events_since(self):
+        """Test polling recorded events by sequence number"""
+        feed = ChangeFeed(history_size=2)
+        for name in ("a", "b", "c"):
+            feed.publish(ChangeEvent(ChangeType.PROJECT_CREATED, name))
+
+        assert feed.sequence == 3
+        assert [e.project for e in feed.events_since(0)] == ["b", "c"]
+        assert [e.project for e in feed.events_since(2)] == ["c"]
+        assert feed.events_since(3) == []
+        assert feed.events_since(2)[0].to_dict()["type"] == "project_created"
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+@pytest.fixture(params=["inotify", "polling"])
+def backend(request):
+    """Run watcher tests on each available backend"""
+    if request.param == "inotify" and change_feed._INOTIFY is None:
+        pytest.skip("inotify not available")
+    return request.param
+
+
+class TestRepositoryWatcher:
+    """Test RepositoryWatcher class"""
+
+    @pytest.fixture
+    def root(self):
+        """Create a directory tree with a .git directory"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            (root / ".git" / "refs" / "heads").mkdir(parents=True)
+            (root / ".git" / "HEAD").write_text("ref: refs/heads/master\n")
+            (root / "app" / "config").mkdir(parents=True)
+            (root / "app" / "config" / "config.yml").write_text("a: 1\n")
+            yield root
+
+    def test_reports_changed_paths(self, root, backend):
+        """Test edits, new directories, deletes and ref moves are reported"""
+        changes = set()
+        lock = threading.Lock()
+
+        def collect(paths):
+            with lock:
+                changes.update(paths)
+
+        watcher = RepositoryWatcher(root, collect, poll_interval=0.05, use_inotify=backend == "inotify")
+        try:
+            assert watcher.backend == backend
+            (root / "app" / "config" / "config.yml").write_text("a: 2\n")
+            (root / "api" / "docs").mkdir(parents=True)
+            (root / "api" / "docs" / "readme.md").write_text("hi\n")
+            (root / ".app.tmp").write_text("ignored\n")
+            (root / ".git" / "refs" / "heads" / "master").write_text("0" * 40 + "\n")
+
+            expected = {"app/config/config.yml", "api/docs/readme.md", change_feed.HEAD_MARKER}
+            assert _wait_for(lambda: expected <= changes)
+
+            with lock:
+                changes.clear()
+            (root / "app" / "config" / "config.yml").unlink()
+            assert _wait_for(lambda: "app/config/config.yml" in changes)
+        finally:
+            watcher.close()
+        assert ".app.tmp" not in changes
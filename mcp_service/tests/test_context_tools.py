@@ -0,0 +1,352 @@
+"""
+Unit tests for context_tools module.
+
+# Validates: REQ-F-TESTING-001 (Test coverage validation)
+
+Tests cover:
+- Frozen contexts: read-only dicts and lists, plain deep copies, JSON
+- Context cache: keys, LRU eviction, invalidation by change events, stats
+- Memoized load_context across managers and after repository changes
+- switch_context: reuse of the loaded config and every changed value reported
+"""
+import copy
+import json
+import pickle
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from server.context_tools import ContextCache, ContextManager, FrozenDict, FrozenList, freeze
+from server.persona_manager import PersonaManager
+from storage.project_repository import ProjectRepository
+
+
+@pytest.fixture
+def temp_dir():
+    """Create a temporary directory for the repository"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield Path(tmpdir)
+
+
+@pytest.fixture
+def repo(temp_dir):
+    """Repository with a base project and one built on it"""
+    repo = ProjectRepository(temp_dir / "projects_repo")
+    repo.create_project("base", "base", [], config={"methodology": {"testing": {"min_coverage": 80}}})
+    repo.create_project(
+        "app", "custom", ["base"],
+        config={"project": {"name": "app", "classification": "internal"}}
+    )
+    repo.create_project("other", "custom", [], config={"project": {"name": "other"}})
+    return repo
+
+
+@pytest.fixture
+def cache(repo):
+    cache = ContextCache(repo)
+    yield cache
+    cache.close()
+
+
+class TestFrozen:
+    """Test FrozenDict, FrozenList and freeze"""
+
+    @pytest.fixture
+    def frozen(self):
+        return freeze({"a": {"b": [1, {"c": 2}]}, "d": "x"})
+
+    def test_nested_containers_are_frozen(self, frozen):
+        """Test freeze converts dicts and lists at every level"""
+        assert isinstance(frozen, FrozenDict)
+        assert isinstance(frozen["a"], FrozenDict)
+        assert isinstance(frozen["a"]["b"], FrozenList)
+        assert isinstance(frozen["a"]["b"][1], FrozenDict)
+
+    def test_reads_like_plain_data(self, frozen):
+        """Test frozen data compares equal to plain data"""
+        assert frozen == {"a": {"b": [1, {"c": 2}]}, "d": "x"}
+        assert frozen.get("d") == "x"
+
+    @pytest.mark.parametrize("mutate", [
+        lambda f: f.__setitem__("d", "y"),
+        lambda f: f.__delitem__("d"),
+        lambda f: f.update(d="y"),
+        lambda f: f.setdefault("e", 1),
+        lambda f: f.pop("d"),
+        lambda f: f.clear(),
+        lambda f: f["a"].__setitem__("e", 1),
+        lambda f: f["a"]["b"].append(3),
+        lambda f: f["a"]["b"].__setitem__(0, 3),
+        lambda f: f["a"]["b"].sort(),
+    ])
+    def test_mutation_raises(self, frozen, mutate):
+        """Test every mutator raises TypeError"""
+        with pytest.raises(TypeError, match="read-only"):
+            mutate(frozen)
+
+    def test_deepcopy_is_plain_and_mutable(self, frozen):
+        """Test deepcopy returns plain dicts and lists"""
+        thawed = copy.deepcopy(frozen)
+
+        assert type(thawed) is dict
+        assert type(thawed["a"]["b"]) is list
+        thawed["a"]["b"].append(3)
+        assert frozen["a"]["b"] == [1, {"c": 2}]
+
+    def test_json_and_pickle(self, frozen):
+        """Test frozen data encodes as JSON and round-trips through pickle"""
+        assert json.loads(json.dumps(frozen)) == frozen
+        assert pickle.loads(pickle.dumps(frozen)) == frozen
+
+
+class TestContextCache:
+    """Test ContextCache class"""
+
+    def test_get_and_put(self, cache):
+        """Test put freezes the context and get returns it"""
+        assert cache.get(("app", 0, "v1")) is None
+
+        stored = cache.put(("app", 0, "v1"), ["app"], {"a": [1]})
+
+        assert isinstance(stored, FrozenDict)
+        assert cache.get(("app", 0, "v1")) is stored
+        assert cache.get(("app", 0, "v2")) is None
+
+    def test_lru_eviction(self, repo):
+        """Test entries beyond max_entries are evicted least recently used first"""
+        cache = ContextCache(repo, max_entries=2)
+        cache.put(("a",), ["a"], {})
+        cache.put(("b",), ["b"], {})
+        cache.get(("a",))
+        cache.put(("c",), ["c"], {})
+
+        assert cache.get(("b",)) is None
+        assert cache.get(("a",)) is not None
+        cache.close()
+
+    def test_invalidate_by_project(self, cache):
+        """Test invalidating a project drops every context built from it"""
+        cache.put(("app", 0, "v1"), ["app", "base"], {})
+        cache.put(("other", 0, "v1"), ["other"], {})
+
+        cache.invalidate("base")
+
+        assert cache.get(("app", 0, "v1")) is None
+        assert cache.get(("other", 0, "v1")) is not None
+
+    def test_change_events_invalidate(self, cache, repo):
+        """Test repository change events drop contexts of the changed project"""
+        cache.put(("app", 0, "v1"), ["app", "base"], {})
+
+        repo.update_project("base", {"extra": 1})
+
+        assert len(cache) == 0
+
+    def test_close_stops_following_changes(self, cache, repo):
+        """Test a closed cache no longer reacts to change events"""
+        cache.put(("app", 0, "v1"), ["app"], {})
+        cache.close()
+
+        repo.update_project("app", {"extra": 1})
+
+        assert len(cache) == 1
+
+    def test_stats(self, cache):
+        """Test stats report hits, misses, entries and hit ratio"""
+        cache.put(("app",), ["app"], {})
+        cache.get(("app",))
+        cache.get(("other",))
+
+        assert cache.stats() == {"context": {"hits": 1, "misses": 1, "entries": 1, "hit_ratio": 0.5}}
+
+
+class TestLoadContext:
+    """Test memoized ContextManager.load_context"""
+
+    def test_repeated_loads_share_context(self, repo, cache):
+        """Test loading an unchanged project again returns the cached context"""
+        manager = ContextManager(repo, context_cache=cache)
+
+        first = manager.load_context("app")
+        second = manager.load_context("app")
+
+        assert second is first
+        assert isinstance(first, FrozenDict)
+        assert first["requirements"]["testing"]["min_coverage"] == 80
+        assert cache.hits == 1
+
+    def test_managers_share_cache(self, repo, cache):
+        """Test managers given the same cache share built contexts"""
+        first = ContextManager(repo, context_cache=cache).load_context("app")
+
+        assert ContextManager(repo, context_cache=cache).load_context("app") is first
+
+    def test_switching_back_and_forth_hits_cache(self, repo, cache):
+        """Test alternating between projects builds each context once"""
+        manager = ContextManager(repo, context_cache=cache)
+        for _ in range(3):
+            manager.load_context("app")
+            manager.load_context("other")
+
+        assert cache.misses == 2
+        assert cache.hits == 4
+
+    def test_base_change_rebuilds_context(self, repo, cache):
+        """Test a change to a base project is reflected on the next load"""
+        manager = ContextManager(repo, context_cache=cache)
+        before = manager.load_context("app")
+
+        repo.update_project("base", {"methodology.testing.min_coverage": 95})
+        after = manager.load_context("app")
+
+        assert after is not before
+        assert after["requirements"]["testing"]["min_coverage"] == 95
+
+    def test_recreated_project_rebuilds_context(self, repo, cache):
+        """Test a project recreated with the same config but new metadata is rebuilt"""
+        manager = ContextManager(repo, context_cache=cache)
+        manager.load_context("other")
+
+        repo.delete_project("other")
+        repo.create_project(
+            "other", "custom", [], config={"project": {"name": "other"}}, description="Payments app"
+        )
+
+        assert manager.load_context("other")["metadata"]["description"] == "Payments app"
+
+    def test_default_cache_per_manager(self, repo):
+        """Test a manager without a cache argument still memoizes"""
+        manager = ContextManager(repo)
+
+        assert manager.load_context("app") is manager.load_context("app")
+        manager.context_cache.close()
+
+    def test_persona_applies_to_frozen_context(self, repo, cache, temp_dir):
+        """Test applying a persona copies the cached context and leaves it intact"""
+        context = ContextManager(repo, context_cache=cache).load_context("app")
+        persona = {"persona": {
+            "name": "QA", "role": "qa", "focus_areas": ["testing"],
+            "overrides": {"requirements": {"testing": {"min_coverage": 99}}}
+        }}
+
+        combined = PersonaManager(temp_dir).apply_persona_to_context(context, persona)
+
+        assert combined["requirements"]["testing"]["min_coverage"] == 99
+        assert combined["active_persona"]["role"] == "qa"
+        assert context["requirements"]["testing"]["min_coverage"] == 80
+        assert "active_persona" not in context
+
+
+class TestSwitchContext:
+    """Test ContextManager.switch_context"""
+
+    @pytest.fixture
+    def manager(self, repo, cache):
+        return ContextManager(repo, context_cache=cache)
+
+    def test_first_switch_loads(self, manager):
+        """Test switching with no context loaded just loads the target"""
+        result = manager.switch_context(None, "app")
+
+        assert result["action"] == "loaded"
+        assert manager.current_context["metadata"]["name"] == "app"
+
+    def test_reports_every_changed_value(self, manager):
+        """Test every differing path of the merged configs is reported"""
+        manager.load_context("app")
+
+        result = manager.switch_context("app", "other")
+
+        assert result["action"] == "switched"
+        assert result["changes"] == {
+            "methodology": {
+                "label": "methodology", "old": {"testing": {"min_coverage": 80}}, "new": None,
+                "change": "removed"
+            },
+            "project.name": {"label": "project.name", "old": "app", "new": "other", "change": "changed"},
+            "project.classification": {
+                "label": "project.classification", "old": "internal", "new": None, "change": "removed"
+            },
+        }
+        assert manager.current_context["metadata"]["name"] == "other"
+
+    def test_numeric_direction(self, manager, repo):
+        """Test numeric changes keep their stricter/relaxed direction"""
+        repo.create_project("strict", "custom", ["base"], config={"methodology": {"testing": {"min_coverage": 95}}})
+        manager.load_context("strict")
+
+        change = manager.switch_context("strict", "app")["changes"]["methodology.testing.min_coverage"]
+
+        assert (change["old"], change["new"], change["direction"]) == (95, 80, "relaxed")
+
+    def test_reuses_loaded_config(self, manager, repo, monkeypatch):
+        """Test the current context's merged config is reused for from_project"""
+        manager.load_context("app")
+        requested = []
+        get_project_config = repo.get_project_config
+        monkeypatch.setattr(
+            repo, "get_project_config",
+            lambda name, *args, **kwargs: requested.append(name) or get_project_config(name, *args, **kwargs)
+        )
+
+        manager.switch_context("app", "other")
+
+        assert requested == ["other"]
+
+    def test_no_merge_when_cached(self, manager, repo):
+        """Test switching between cached projects merges nothing"""
+        manager.load_context("other")
+        manager.load_context("app")
+        misses = repo.cache_stats()["config"]["misses"]
+
+        manager.switch_context("app", "other")
+        manager.switch_context("other", "app")
+
+        assert repo.cache_stats()["config"]["misses"] == misses
+
+    def test_from_project_not_loaded(self, manager):
+        """Test a from_project other than the loaded one is read from the repository"""
+        manager.load_context("other")
+
+        result = manager.switch_context("app", "other")
+
+        assert result["changes"]["project.name"]["old"] == "app"
+
+    def test_unknown_from_project(self, manager):
+        """Test an unknown from_project raises ValueError"""
+        with pytest.raises(ValueError, match="not found"):
+            manager.switch_context("missing", "app")
+
+    def test_same_project(self, manager):
+        """Test switching to the loaded project reports no changes"""
+        manager.load_context("app")
+
+        assert manager.switch_context("app", "app")["changes"] == {}
+
+    def test_empty_and_null_values(self, manager, repo):
+        """Test keys holding {} or null on one side are reported, not a crash"""
+        repo.create_project("sparse", "custom", [], config={"project": {"name": "sparse"}, "extra": {}, "notes": None})
+        manager.load_context("other")
+
+        changes = manager.switch_context("other", "sparse")["changes"]
+
+        assert changes["notes"] == {"label": "notes", "old": None, "new": {}, "change": "added"}
+        assert changes["extra"]["change"] == "added"
+        assert manager.current_context["metadata"]["name"] == "sparse"
+
+        back = manager.switch_context("sparse", "other")["changes"]
+
+        assert back["notes"]["change"] == "removed"
+        assert manager.current_context["metadata"]["name"] == "other"
+
+    def test_failed_diff_keeps_current_context(self, manager, monkeypatch):
+        """Test the session stays on from_project if the diff fails"""
+        manager.load_context("app")
+        monkeypatch.setattr("server.context_tools.diff_hierarchies", lambda old, new: 1 / 0)
+
+        with pytest.raises(ZeroDivisionError):
+            manager.switch_context("app", "other")
+
+        assert manager.current_context["metadata"]["name"] == "app"
+        assert manager.current_config is not None
@@ -0,0 +1,145 @@
+"""
+Unit tests for dispatch module.
+
+# Validates: REQ-F-TESTING-001 (Test coverage validation)
+
+Tests cover:
+- Registering handlers against tool schemas
+- Validating arguments before handlers run
+- Per-tool call statistics
+"""
+import pytest
+
+from server.dispatch import InvalidArgumentsError, ToolDispatcher, UnknownToolError
+
+
+SCHEMAS = {
+    "get_project": {
+        "type": "object",
+        "properties": {"name": {"type": "string"}},
+        "required": ["name"]
+    },
+    "list_projects": {
+        "type": "object",
+        "properties": {"type": {"type": "string", "enum": ["base", "custom"]}}
+    },
+    "delete_project": {
+        "type": "object",
+        "properties": {"name": {"type": "string"}},
+        "required": ["name"]
+    },
+}
+
+
+@pytest.fixture
+def dispatcher():
+    """Create a dispatcher with handlers for two of the three tools"""
+    dispatcher = ToolDispatcher(SCHEMAS)
+    calls = []
+
+    @dispatcher.handler("get_project")
+    def get_project(arguments):
+        calls.append(arguments)
+        return f"project {arguments['name']}"
+
+    @dispatcher.handler("list_projects")
+    def list_projects(arguments):
+        raise RuntimeError("boom")
+
+    dispatcher.calls = calls
+    return dispatcher
+
+
+class TestRegistration:
+    """Test handler registration"""
+
+    def test_tools_and_missing_handlers(self, dispatcher):
+        """Test registered and missing handlers are reported"""
+        assert dispatcher.tools == ["get_project", "list_projects"]
+        assert dispatcher.missing_handlers() == ["delete_project"]
+
+    def test_handler_requires_schema(self, dispatcher):
+        """Test that a tool without a schema can't get a handler"""
+        with pytest.raises(ValueError, match="No schema for tool 'unknown'"):
+            dispatcher.handler("unknown")
+
+    def test_one_handler_per_tool(self, dispatcher):
+        """Test that registering a second handler fails"""
+        with pytest.raises(ValueError, match="already has a handler"):
+            dispatcher.handler("get_project")
+
+    def test_decorator_returns_function(self, dispatcher):
+        """Test that the decorated function is still callable directly"""
+        @dispatcher.handler("delete_project")
+        def delete_project(arguments):
+            return "deleted"
+
+        assert delete_project({}) == "deleted"
+        assert dispatcher.missing_handlers() == []
+
+
+class TestDispatch:
+    """Test dispatching calls"""
+
+    def test_dispatch_runs_handler(self, dispatcher):
+        """Test that valid calls reach their handler"""
+        assert dispatcher.dispatch("get_project", {"name": "a"}) == "project a"
+        assert dispatcher.calls == [{"name": "a"}]
+
+    def test_invalid_arguments_never_reach_handler(self, dispatcher):
+        """Test that invalid calls are rejected before the handler"""
+        with pytest.raises(InvalidArgumentsError) as excinfo:
+            dispatcher.dispatch("get_project", {"name": 42})
+        assert str(excinfo.value) == "Invalid arguments for get_project: name: expected string, got integer"
+        assert excinfo.value.tool == "get_project"
+        assert excinfo.value.path == "name"
+        assert dispatcher.calls == []
+
+    def test_missing_arguments(self, dispatcher):
+        """Test that None arguments are validated as an empty object"""
+        with pytest.raises(InvalidArgumentsError, match="missing required property 'name'"):
+            dispatcher.dispatch("get_project", None)
+
+    def test_unknown_tool(self, dispatcher):
+        """Test dispatching a tool without a handler"""
+        with pytest.raises(UnknownToolError):
+            dispatcher.dispatch("delete_project", {"name": "a"})
+        with pytest.raises(UnknownToolError):
+            dispatcher.validate("nope", {})
+
+    def test_prevalidated_dispatch(self, dispatcher):
+        """Test validating up front and dispatching without re-validating"""
+        arguments = dispatcher.validate("get_project", {"name": "a"})
+        assert dispatcher.dispatch("get_project", arguments, validate=False) == "project a"
+
+    def test_handler_errors_propagate(self, dispatcher):
+        """Test that handler exceptions reach the caller"""
+        with pytest.raises(RuntimeError, match="boom"):
+            dispatcher.dispatch("list_projects", {})
+
+
+class TestStats:
+    """Test per-tool statistics"""
+
+    def test_counts(self, dispatcher):
+        """Test call, error and invalid counts"""
+        dispatcher.dispatch("get_project", {"name": "a"})
+        dispatcher.dispatch("get_project", {"name": "b"})
+        with pytest.raises(InvalidArgumentsError):
+            dispatcher.dispatch("get_project", {})
+        with pytest.raises(RuntimeError):
+            dispatcher.dispatch("list_projects", {"type": "base"})
+
+        stats = dispatcher.stats()
+        assert stats["get_project"]["calls"] == 2
+        assert stats["get_project"]["errors"] == 0
+        assert stats["get_project"]["invalid"] == 1
+        assert stats["list_projects"]["calls"] == 1
+        assert stats["list_projects"]["errors"] == 1
+        assert stats["get_project"]["max_ms"] >= stats["get_project"]["mean_ms"] >= 0
+
+    def test_reset(self, dispatcher):
+        """Test zeroing statistics"""
+        dispatcher.dispatch("get_project", {"name": "a"})
+        dispatcher.reset_stats()
+        assert dispatcher.stats()["get_project"]["calls"] == 0
@@ -0,0 +1,95 @@
+"""
+Unit tests for encoders module.
+
+# Validates: REQ-F-TESTING-001 (Test coverage validation)
+
+Tests cover:
+- YAML and JSON round trips on both backends
+- Compact JSON
+- Format registry
+"""
+import json
+
+import pytest
+import yaml
+
+from ai_sdlc_config import HierarchySerializer, YAMLLoader
+from ai_sdlc_config.serializers import dump_json, dump_yaml, encode, register_encoder
+from ai_sdlc_config.serializers import encoders
+
+
+DATA = {
+    "project": {"name": "payment service", "tags": ["pci", "prod"]},
+    "testing": {"min_coverage": 95, "ratio": 0.5, "enabled": True, "owner": None},
+    "notes": "multi\nline: text # not a comment",
+    "unicode": "ünïcode ✓",
+}
+
+
+@pytest.fixture(params=["fast", "fallback"])
+def backend(request, monkeypatch):
+    """Run with the installed backends, then with the pure-Python ones"""
+    if request.param == "fallback":
+        monkeypatch.setattr(encoders, "orjson", None)
+        monkeypatch.setattr(encoders, "YAML_DUMPER", yaml.SafeDumper)
+    return request.param
+
+
+class TestEncoders:
+    """Test YAML and JSON output"""
+
+    def test_yaml_round_trip(self, backend):
+        """Test that YAML parses back to the same data, in block style"""
+        text = dump_yaml(DATA)
+        assert yaml.safe_load(text) == DATA
+        assert text.startswith("project:\n  name: payment service\n")
+
+    def test_yaml_sort_keys(self, backend):
+        """Test optional key sorting"""
+        assert dump_yaml({"b": 1, "a": 2}, sort_keys=True) == "a: 2\nb: 1\n"
+
+    def test_json_round_trip(self, backend):
+        """Test that JSON parses back to the same data, indented by 2"""
+        text = dump_json(DATA)
+        assert json.loads(text) == DATA
+        assert text.startswith('{\n  "project": {\n    "name"')
+        assert "ünïcode ✓" in text
+
+    def test_json_compact(self, backend):
+        """Test compact JSON has no indentation or separator spaces"""
+        text = dump_json(DATA, compact=True)
+        assert json.loads(text) == DATA
+        assert text == json.dumps(DATA, separators=(",", ":"), ensure_ascii=False)
+
+    def test_backends_agree(self, backend):
+        """Test both JSON backends write the same text for plain data"""
+        assert dump_json(DATA) == json.dumps(DATA, indent=2, ensure_ascii=False)
+
+    def test_json_fallbacks(self, backend):
+        """Test values without a JSON type and integers beyond 64 bits"""
+        assert json.loads(dump_json({"path": encoders, "big": 2 ** 70, 1: "x"}, compact=True)) == {
+            "path": str(encoders), "big": 2 ** 70, "1": "x"
+        }
+
+
+class TestRegistry:
+    """Test format lookup"""
+
+    def test_encode(self):
+        """Test encoding by format name"""
+        assert encode({"a": [1]}, "json_compact") == '{"a":[1]}'
+        assert encode({"a": 1}, "yaml") == "a: 1\n"
+
+    def test_unknown_format(self):
+        """Test unknown formats raise ValueError"""
+        with pytest.raises(ValueError, match="Unknown format"):
+            encode({}, "toml")
+
+    def test_register_encoder(self, monkeypatch):
+        """Test serializers pick up registered formats"""
+        monkeypatch.setattr(encoders, "_ENCODERS", dict(encoders._ENCODERS))
+        register_encoder("keys", lambda data: ",".join(data))
+
+        root = YAMLLoader().load_from_string("a: 1\nb: 2\n")
+        assert HierarchySerializer().serialize(root, "keys") == "a,b"
+        assert HierarchySerializer().serialize(root, "json_compact") == '{"a":1,"b":2}'
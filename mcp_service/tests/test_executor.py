@@ -0,0 +1,131 @@
+"""
+Unit tests for executor module.
+
+# Validates: REQ-F-TESTING-001 (Test coverage validation)
+
+Tests cover:
+- Running blocking handlers off the event loop
+- Per-tool and per-group concurrency limits
+- Timeouts and cancellation
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from server.executor import ToolExecutor, ToolTimeoutError
+
+
+@pytest.fixture
+def executor():
+    """Create an executor with a serialized "session" group"""
+    executor = ToolExecutor(
+        max_workers=8,
+        limits={"session": 1, "write": 2},
+        groups={"load_context": "session", "switch_context": "session"}
+    )
+    yield executor
+    executor.shutdown()
+
+
+class TestToolExecutor:
+    """Test ToolExecutor class"""
+
+    def test_runs_off_event_loop(self, executor):
+        """Test that handlers run on pool threads and return their result"""
+        async def main():
+            return await executor.run("get_project", lambda x: (x, threading.current_thread().name), 1)
+
+        value, thread_name = asyncio.run(main())
+
+        assert value == 1
+        assert thread_name.startswith("ai-sdlc-tool")
+
+    def test_reads_respond_during_slow_write(self, executor):
+        """Test that a blocked tool doesn't hold up other tools"""
+        release = threading.Event()
+
+        async def main():
+            slow = asyncio.ensure_future(executor.run("merge_projects", release.wait, 5))
+            start = time.perf_counter()
+            result = await executor.run("get_project", lambda: "fast")
+            elapsed = time.perf_counter() - start
+            assert not slow.done()
+            release.set()
+            await slow
+            return result, elapsed
+
+        result, elapsed = asyncio.run(main())
+
+        assert result == "fast"
+        assert elapsed < 1
+
+    @pytest.mark.parametrize("tools, limit", [
+        (["load_context", "switch_context"] * 3, 1),
+        (["write"] * 6, 2),
+        (["get_project"] * 6, 6),
+    ])
+    def test_concurrency_limits(self, executor, tools, limit):
+        """Test that groups never exceed their limit"""
+        running = []
+        peak = []
+        lock = threading.Lock()
+
+        def work():
+            with lock:
+                running.append(1)
+                peak.append(len(running))
+            time.sleep(0.05)
+            with lock:
+                running.pop()
+
+        async def main():
+            await asyncio.gather(*(executor.run(tool, work) for tool in tools))
+
+        asyncio.run(main())
+
+        assert max(peak) == limit
+
+    def test_timeout(self):
+        """Test that slow calls fail and keep their slot until they finish"""
+        executor = ToolExecutor(limits={"slow": 1}, timeout=0.05)
+        finished = threading.Event()
+
+        def slow():
+            time.sleep(0.3)
+            finished.set()
+
+        async def main():
+            with pytest.raises(ToolTimeoutError, match="'slow' timed out after 0.05s"):
+                await executor.run("slow", slow)
+            # The next call waits for the timed-out one to really finish
+            return await executor.run("slow", finished.is_set)
+
+        try:
+            assert asyncio.run(main()) is True
+        finally:
+            executor.shutdown()
+
+    def test_cancel_queued_call(self):
+        """Test that a cancelled call that hasn't started never runs"""
+        executor = ToolExecutor(max_workers=1)
+        release = threading.Event()
+        ran = []
+
+        async def main():
+            blocker = asyncio.ensure_future(executor.run("a", release.wait, 5))
+            queued = asyncio.ensure_future(executor.run("b", ran.append, 1))
+            await asyncio.sleep(0.05)
+            queued.cancel()
+            await asyncio.sleep(0.05)
+            release.set()
+            await blocker
+            with pytest.raises(asyncio.CancelledError):
+                await queued
+
+        try:
+            asyncio.run(main())
+        finally:
+            executor.shutdown()
+        assert ran == []
@@ -0,0 +1,105 @@
+"""
+Unit tests for hierarchy_diff module.
+
+# Validates: REQ-F-TESTING-001 (Test coverage validation)
+
+Tests cover:
+- Changed, added and removed paths, in depth-first order
+- Lists, URI references and mapping/leaf mismatches compared as values
+- Shared subtrees and merged configurations
+"""
+import pytest
+
+from ai_sdlc_config import ConfigManager, YAMLLoader
+from ai_sdlc_config.mergers import ChangeKind, HierarchyChange, diff_hierarchies
+
+
+@pytest.fixture
+def loader():
+    return YAMLLoader()
+
+
+def _diff(loader, old, new):
+    return diff_hierarchies(loader.load_from_string(old), loader.load_from_string(new))
+
+
+class TestDiffHierarchies:
+    """Test diff_hierarchies function"""
+
+    def test_identical(self, loader):
+        """Test equal hierarchies have no changes"""
+        text = "a: {b: 1, c: [x, y]}\nd: file:///docs/d.md\n"
+
+        assert _diff(loader, text, text) == []
+
+    def test_changed_leaf(self, loader):
+        """Test a changed value is reported at its full path"""
+        changes = _diff(loader, "testing: {min_coverage: 80}\n", "testing: {min_coverage: 95}\n")
+
+        assert changes == [HierarchyChange("testing.min_coverage", ChangeKind.CHANGED, 80, 95)]
+
+    def test_added_and_removed_subtrees(self, loader):
+        """Test subtrees on one side only are reported once, as plain data"""
+        changes = _diff(loader, "a: 1\nold: {x: 1, y: 2}\n", "a: 1\nnew: {z: [1, 2]}\n")
+
+        assert changes == [
+            HierarchyChange("old", ChangeKind.REMOVED, old={"x": 1, "y": 2}),
+            HierarchyChange("new", ChangeKind.ADDED, new={"z": [1, 2]}),
+        ]
+
+    def test_lists_compared_whole(self, loader):
+        """Test a changed list is one change rather than one per index"""
+        changes = _diff(loader, "tools: [ruff, mypy]\n", "tools: [ruff, mypy, bandit]\n")
+
+        assert changes == [
+            HierarchyChange("tools", ChangeKind.CHANGED, ["ruff", "mypy"], ["ruff", "mypy", "bandit"])
+        ]
+
+    def test_numeric_keys_walked_as_mapping(self, loader):
+        """Test a mapping keyed "0", "1" is diffed per key, not as a list"""
+        changes = _diff(loader, 'codes: {"0": ok, "1": warn}\n', 'codes: {"0": ok, "1": fail}\n')
+
+        assert changes == [HierarchyChange("codes.1", ChangeKind.CHANGED, "warn", "fail")]
+
+    def test_uri_references(self, loader):
+        """Test URI leaves are compared and reported by URI"""
+        changes = _diff(loader, "doc: file:///a.md\n", "doc: file:///b.md\n")
+
+        assert changes == [
+            HierarchyChange("doc", ChangeKind.CHANGED, {"uri": "file:///a.md"}, {"uri": "file:///b.md"})
+        ]
+
+    def test_mapping_replaced_by_leaf(self, loader):
+        """Test a mapping replaced by a scalar is one change"""
+        changes = _diff(loader, "gates: {max_smells: 0}\n", "gates: none\n")
+
+        assert changes == [HierarchyChange("gates", ChangeKind.CHANGED, {"max_smells": 0}, "none")]
+
+    def test_shared_subtree_skipped(self, loader):
+        """Test a subtree that is the same node on both sides is not walked"""
+        old = loader.load_from_string("shared: {a: 1}\nb: 1\n")
+        new = loader.load_from_string("b: 2\n")
+        new.add_child("shared", old.get_child("shared"))
+
+        assert diff_hierarchies(old, new) == [HierarchyChange("b", ChangeKind.CHANGED, 1, 2)]
+
+    def test_merged_configs(self, loader):
+        """Test diffing merged configs that share a base layer"""
+        base = "methodology: {testing: {min_coverage: 80}, style: pep8}\n"
+
+        def merged(override):
+            manager = ConfigManager()
+            manager.add_hierarchy(loader.load_from_string(base))
+            manager.add_hierarchy(loader.load_from_string(override))
+            manager.merge()
+            return manager.merged_hierarchy
+
+        changes = diff_hierarchies(
+            merged("methodology: {testing: {min_coverage: 95}}\nproject: {classification: restricted}\n"),
+            merged("project: {classification: internal}\n")
+        )
+
+        assert [(c.path, c.kind, c.old, c.new) for c in changes] == [
+            ("methodology.testing.min_coverage", ChangeKind.CHANGED, 95, 80),
+            ("project.classification", ChangeKind.CHANGED, "restricted", "internal"),
+        ]
@@ -10,6 +10,7 @@ Tests cover:
 - Multi-hierarchy merging with priorities
 - Override strategies (OVERRIDE, PRESERVE, URI_PRIORITY)
 - Merge with runtime overrides
+- Continuing a merge from a cached prefix
 - Conflict resolution
 - Nested structure merging
 - MergeReport functionality
@@ -405,6 +406,48 @@ class TestHierarchyMerger:
         assert result.get_value_by_path("float") == 2.71
         assert result.get_value_by_path("bool") is True
 
+    def _layers(self):
+        """Create four overlapping layers"""
+        layers = []
+        for i in range(4):
+            root = HierarchyNode(path="", source=f"layer{i}.yml")
+            shared = HierarchyNode(path="shared", source=f"layer{i}.yml")
+            shared.add_child("value", HierarchyNode(path="shared.value", value=i, source=f"layer{i}.yml"))
+            root.add_child("shared", shared)
+            root.add_child(f"only{i}", HierarchyNode(path=f"only{i}", value=i, source=f"layer{i}.yml"))
+            layers.append(root)
+        return layers
+
+    @pytest.mark.parametrize("prefix_length", [2, 3])
+    def test_merge_onto_prefix_equals_full_merge(self, merger, prefix_length):
+        """Test that continuing from a merged prefix matches a full merge"""
+        layers = self._layers()
+
+        full = merger.merge(layers)
+        prefix = merger.merge(layers[:prefix_length])
+        continued = merger.merge_onto(prefix, layers[prefix_length:], prefix_length)
+
+        assert continued == full
+        assert continued.source == "merged_from_4_sources"
+        assert continued.get_node_by_path("shared.value").priority == 3
+
+    def test_merge_onto_single_layer_prefix(self, merger):
+        """Test that a one-layer prefix is the first hierarchy itself"""
+        layers = self._layers()
+        layers[0].priority = 7
+
+        assert merger.merge_onto(layers[0], layers[1:], 1) == merger.merge(layers)
+
+    def test_merge_onto_does_not_mutate_prefix(self, merger):
+        """Test that a cached prefix can be reused safely"""
+        layers = self._layers()
+        prefix = merger.merge(layers[:2])
+
+        merger.merge_onto(prefix, layers[2:], 2)
+
+        assert prefix.get_value_by_path("shared.value") == 1
+        assert prefix.source == "merged_from_2_sources"
+
 
 class TestMergeReport:
     """Test MergeReport class"""
@@ -0,0 +1,159 @@
+"""
+Unit tests for hierarchy_serializer module.
+
+# Validates: REQ-F-TESTING-001 (Test coverage validation)
+
+Tests cover:
+- Plain-data conversion (lists, URIs, empty and null values)
+- dict/JSON/YAML output and path scoping
+- Output caching by key, LRU bound and invalidation
+"""
+import json
+
+import pytest
+import yaml
+
+from ai_sdlc_config import YAMLLoader
+from ai_sdlc_config.serializers import HierarchySerializer, HierarchyStreamer, to_data
+
+
+CONFIG = """
+project:
+  name: payment service
+testing:
+  required_types: [unit, {name: e2e, enabled: false}]
+docs:
+  policy: file:///docs/policy.md
+empty: null
+"""
+
+
+@pytest.fixture
+def root():
+    return YAMLLoader().load_from_string(CONFIG)
+
+
+class TestToData:
+    """Test the conversion to plain data"""
+
+    def test_round_trips_loaded_yaml(self, root):
+        """Test lists and URIs come back as loaded"""
+        data = to_data(root)
+
+        assert data["testing"]["required_types"] == ["unit", {"name": "e2e", "enabled": False}]
+        assert data["empty"] == {}
+        assert data["docs"]["policy"] == {"uri": "file:///docs/policy.md"}
+
+    def test_empty_values_as_before(self):
+        """Test empty mappings, empty lists and nulls become {} as to_dict always gave"""
+        root = YAMLLoader().load_from_string("a: {}\nd: []\ne: null\nf: 0\n")
+
+        assert to_data(root) == {"a": {}, "d": {}, "e": {}, "f": 0}
+        assert root.to_dict() == {"a": {}, "d": {}, "e": {}, "f": 0}
+
+    @pytest.mark.parametrize("lazy", [False, True])
+    def test_numeric_keys_stay_a_mapping(self, lazy):
+        """Test a mapping keyed "0", "1" is not mistaken for a list"""
+        root = YAMLLoader(lazy=lazy).load_from_string('codes: {"0": ok, "1": warn}\nlevels: [ok, warn]\n')
+
+        assert to_data(root) == {"codes": {"0": "ok", "1": "warn"}, "levels": ["ok", "warn"]}
+        assert root.to_dict()["codes"] == {"0": "ok", "1": "warn"}
+        assert yaml.safe_load(HierarchyStreamer().page(root).text) == to_data(root)
+
+    def test_uri_data(self, root):
+        """Test a custom form for URI leaves"""
+        data = to_data(root, lambda reference: reference.uri)
+        assert data["docs"]["policy"] == "file:///docs/policy.md"
+
+    def test_node_to_dict_tags_uris(self, root):
+        """Test HierarchyNode.to_dict keeps its tagged URI form"""
+        assert root.to_dict()["docs"]["policy"] == {
+            "_uri": "file:///docs/policy.md",
+            "_type": "uri_reference"
+        }
+
+
+class TestSerialize:
+    """Test formats and scoping"""
+
+    @pytest.mark.parametrize("format, parse", [
+        ("dict", lambda output: output),
+        ("json", json.loads),
+        ("yaml", yaml.safe_load),
+    ])
+    def test_formats(self, root, format, parse):
+        """Test every format carries the same data"""
+        assert parse(HierarchySerializer().serialize(root, format)) == to_data(root)
+
+    def test_path(self, root):
+        """Test serializing a subtree"""
+        assert HierarchySerializer().serialize(root, "dict", path="project") == {"name": "payment service"}
+
+    def test_missing_path(self, root):
+        """Test unknown paths raise KeyError"""
+        with pytest.raises(KeyError):
+            HierarchySerializer().serialize(root, "dict", path="missing")
+
+    def test_unknown_format(self, root):
+        """Test unknown formats raise ValueError"""
+        with pytest.raises(ValueError, match="Unknown format"):
+            HierarchySerializer().serialize(root, "toml")
+
+
+class TestCache:
+    """Test output caching"""
+
+    def test_cached_by_key(self, root):
+        """Test that outputs are reused per (key, format, path)"""
+        serializer = HierarchySerializer()
+
+        first = serializer.serialize(root, "yaml", key=("demo", "v1"))
+        assert serializer.serialize(root, "yaml", key=("demo", "v1")) is first
+        serializer.serialize(root, "json", key=("demo", "v1"))
+        serializer.serialize(root, "yaml", path="project", key=("demo", "v1"))
+
+        assert (serializer.hits, serializer.misses, len(serializer)) == (1, 3, 3)
+
+    def test_not_cached_without_key(self, root):
+        """Test that keyless calls always serialize"""
+        serializer = HierarchySerializer()
+        serializer.serialize(root, "dict")
+        assert serializer.serialize(root, "dict") is not serializer.serialize(root, "dict")
+        assert len(serializer) == 0
+
+    def test_lru_bound(self, root):
+        """Test that the least recently used output is evicted"""
+        serializer = HierarchySerializer(cache_size=2)
+        serializer.serialize(root, "json", key=("a", "v1"))
+        serializer.serialize(root, "json", key=("b", "v1"))
+        serializer.serialize(root, "json", key=("a", "v1"))
+        serializer.serialize(root, "json", key=("c", "v1"))
+
+        assert len(serializer) == 2
+        serializer.serialize(root, "json", key=("a", "v1"))
+        assert serializer.hits == 2
+
+    def test_invalidate(self, root):
+        """Test dropping one project's outputs or all of them"""
+        serializer = HierarchySerializer()
+        for project in ("a", "b"):
+            serializer.serialize(root, "json", key=(project, "v1"))
+            serializer.serialize(root, "yaml", key=(project, "v1"))
+
+        serializer.invalidate("a")
+        assert len(serializer) == 2
+        serializer.invalidate()
+        assert len(serializer) == 0
+
+    def test_pages_cached_per_budget(self, root):
+        """Test that pages are cached per cursor and budget"""
+        serializer = HierarchySerializer()
+        streamer = HierarchyStreamer(max_nodes=2)
+
+        first = serializer.page(root, streamer, key=("demo", "v1"))
+        assert serializer.page(root, streamer, key=("demo", "v1")) is first
+        second = serializer.page(root, streamer, cursor=first.next_cursor, key=("demo", "v1"))
+        assert second.text != first.text
+        serializer.page(root, HierarchyStreamer(max_nodes=3), key=("demo", "v1"))
+
+        assert (serializer.hits, serializer.misses) == (1, 3)
@@ -0,0 +1,196 @@
+"""
+Unit tests for hierarchy_streamer module.
+
+# Validates: REQ-F-TESTING-001 (Test coverage validation)
+
+Tests cover:
+- YAML output equivalent to the hierarchy's data
+- Path scoping and depth limits
+- Byte and node budgets with resumable cursors
+"""
+import pytest
+import yaml
+
+from ai_sdlc_config import YAMLLoader
+from ai_sdlc_config.models.hierarchy_node import URIReference
+from ai_sdlc_config.serializers import HierarchyStreamer
+from ai_sdlc_config.serializers.hierarchy_streamer import format_scalar
+
+
+CONFIG = """
+project:
+  name: payment service
+  version: "1.0"
+testing:
+  min_coverage: 95
+  required_types: [unit, integration, {name: e2e, enabled: false}, [1, 2]]
+  ratio: 0.5
+  note: "needs: quoting # here"
+docs:
+  policy: file:///docs/policy.md
+empty: null
+"""
+
+
+def _data(node):
+    """Reference conversion: lists for "0".."n-1" children, {"uri"} for URIs"""
+    if not node.children:
+        if isinstance(node.value, URIReference):
+            return {"uri": node.value.uri}
+        return node.value
+    keys = list(node.children)
+    if keys == [str(i) for i in range(len(keys))]:
+        return [_data(child) for child in node.children.values()]
+    return {key: _data(child) for key, child in node.children.items()}
+
+
+def _all_pages(streamer, root, path=None):
+    pages = []
+    cursor = None
+    while True:
+        page = streamer.page(root, path, cursor)
+        pages.append(page)
+        cursor = page.next_cursor
+        if cursor is None:
+            return pages
+
+
+@pytest.fixture
+def root():
+    return YAMLLoader().load_from_string(CONFIG)
+
+
+class TestOutput:
+    """Test the YAML written for whole trees"""
+
+    def test_round_trips(self, root):
+        """Test that the output parses back to the hierarchy's data"""
+        page = HierarchyStreamer().page(root)
+
+        assert yaml.safe_load(page.text) == _data(root)
+        assert page.complete
+        assert page.bytes == len(page.text.encode())
+
+    def test_keys_sorted(self, root):
+        """Test top-level keys are written in sorted order"""
+        text = HierarchyStreamer().page(root).text
+        top_level = [line.split(":")[0] for line in text.splitlines() if not line.startswith((" ", "-"))]
+        assert top_level == ["docs", "empty", "project", "testing"]
+
+    def test_uri_formatter(self, root):
+        """Test custom mappings for URI leaves"""
+        streamer = HierarchyStreamer(uri_formatter=lambda node: {"uri": node.value.uri, "content": "# Policy"})
+        data = yaml.safe_load(streamer.page(root).text)
+        assert data["docs"]["policy"] == {"uri": "file:///docs/policy.md", "content": "# Policy"}
+
+    @pytest.mark.parametrize("value", [
+        "plain", "two words", "yes", "No", "null", "123", "1e5", "0x1F", "", " padded",
+        "a: b", "# comment", "- dash", "multi\nline", "quote\"d", "ünïcode", "[list]",
+    ])
+    def test_format_scalar_strings(self, value):
+        """Test that every string reads back as the same string"""
+        assert yaml.safe_load(f"key: {format_scalar(value)}") == {"key": value}
+
+    @pytest.mark.parametrize("value", [None, True, False, 0, -3, 1.5, float("inf"), [1, "a"], {"k": 1}])
+    def test_format_scalar_values(self, value):
+        """Test non-string values"""
+        assert yaml.safe_load(f"key: {format_scalar(value)}") == {"key": value}
+
+
+class TestScoping:
+    """Test path and depth limits"""
+
+    def test_path(self, root):
+        """Test writing only a subtree"""
+        text = HierarchyStreamer().page(root, path="testing.required_types").text
+        assert yaml.safe_load(text) == ["unit", "integration", {"name": "e2e", "enabled": False}, [1, 2]]
+
+    def test_path_to_leaf(self, root):
+        """Test a path naming a single value"""
+        assert HierarchyStreamer().page(root, path="testing.min_coverage").text == "95\n"
+
+    def test_missing_path(self, root):
+        """Test that unknown paths raise KeyError"""
+        with pytest.raises(KeyError):
+            HierarchyStreamer().page(root, path="testing.missing")
+
+    def test_max_depth(self, root):
+        """Test collapsing containers below the depth limit"""
+        text = HierarchyStreamer(max_depth=1).page(root).text
+        assert "project: ...  # 2 entries below max_depth" in text
+        assert "min_coverage" not in text
+        assert "empty: null" in text
+
+
+class TestPaging:
+    """Test budgets and cursors"""
+
+    @pytest.mark.parametrize("max_nodes", [1, 2, 3, 5])
+    def test_pages_cover_every_entry(self, root, max_nodes):
+        """Test that paging by nodes visits every leaf exactly once"""
+        pages = _all_pages(HierarchyStreamer(max_nodes=max_nodes), root)
+        full = HierarchyStreamer().page(root)
+
+        assert sum(page.nodes for page in pages) >= full.nodes
+        for page in pages:
+            assert page.nodes <= max_nodes
+            yaml.safe_load(page.text)
+
+        leaves = [line.strip() for page in pages for line in page.text.splitlines()
+                  if line.strip().endswith(("95", "0.5", "null", "unit", "false"))]
+        assert len(leaves) == len(set(leaves))
+
+    def test_resumed_page_repeats_parents(self, root):
+        """Test that a page starting mid-tree re-emits the parent keys"""
+        streamer = HierarchyStreamer(max_nodes=5)
+        first = streamer.page(root)
+        second = streamer.page(root, cursor=first.next_cursor)
+
+        assert yaml.safe_load(first.text)
+        assert second.text.startswith("project:\n") or second.text.startswith("testing:\n")
+
+    def test_max_bytes(self, root):
+        """Test that pages stay within the byte budget"""
+        pages = _all_pages(HierarchyStreamer(max_bytes=60), root)
+
+        assert len(pages) > 1
+        for page in pages:
+            assert page.bytes <= 60 or page.nodes == 1
+
+    def test_page_does_not_end_on_bare_container(self, root):
+        """Test that a container key isn't left without its entries"""
+        for page in _all_pages(HierarchyStreamer(max_nodes=3), root):
+            if not page.complete:
+                assert not page.text.rstrip("\n").endswith(":")
+
+    def test_oversized_entry_still_progresses(self):
+        """Test that an entry larger than the budget gets a page of its own"""
+        root = YAMLLoader().load_from_string(f"a: {'x' * 200}\nb: 1\n")
+        pages = _all_pages(HierarchyStreamer(max_bytes=10), root)
+        assert [page.nodes for page in pages] == [1, 1]
+
+    def test_allow_empty(self, root):
+        """Test that allow_empty returns no entries when none fit"""
+        page = HierarchyStreamer(max_bytes=0).page(root, allow_empty=True)
+        assert page.text == ""
+        assert page.nodes == 0
+        assert not page.complete
+
+    def test_cursor_bound_to_path(self, root):
+        """Test that a cursor can't be used with another path"""
+        streamer = HierarchyStreamer(max_nodes=1)
+        cursor = streamer.page(root, path="testing").next_cursor
+
+        with pytest.raises(ValueError, match="Cursor is for path 'testing'"):
+            streamer.page(root, path="project", cursor=cursor)
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            streamer.page(root, cursor="not-a-cursor")
+
+    def test_cursor_survives_changes(self):
+        """Test resuming after the entry under the cursor was removed"""
+        streamer = HierarchyStreamer(max_nodes=2)
+        before = YAMLLoader().load_from_string("a: 1\nb: 2\nc: 3\nd: 4\n")
+        cursor = streamer.page(before).next_cursor
+
+        after = YAMLLoader().load_from_string("a: 1\nb: 2\nd: 4\n")
+        assert streamer.page(after, cursor=cursor).text == "d: 4\n"
@@ -0,0 +1,126 @@
+"""
+Unit tests for locking module.
+
+# Validates: REQ-NFR-FEDERATE-001 (Hierarchical configuration composition)
+
+Tests cover:
+- Shared readers and exclusive writers
+- Reentrancy and refused upgrades
+- Ordered acquisition of several named locks
+- Per-repository lock sharing
+"""
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from storage.locking import LockTable, ReadWriteLock, repository_locks
+
+
+class TestReadWriteLock:
+    """Test ReadWriteLock class"""
+
+    def test_readers_share(self):
+        """Test that several threads can read at once"""
+        lock = ReadWriteLock()
+        inside = []
+        barrier = threading.Barrier(3, timeout=5)
+
+        def reader():
+            with lock.read():
+                inside.append(1)
+                barrier.wait()
+
+        threads = [threading.Thread(target=reader) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+
+        assert len(inside) == 3
+
+    def test_writer_excludes_readers(self):
+        """Test that readers wait for the writer"""
+        lock = ReadWriteLock()
+        events = []
+
+        lock.acquire_write()
+        reader = threading.Thread(target=lambda: (lock.acquire_read(), events.append("read"), lock.release_read()))
+        reader.start()
+        time.sleep(0.05)
+        events.append("write done")
+        lock.release_write()
+        reader.join(5)
+
+        assert events == ["write done", "read"]
+
+    def test_writer_reentrant(self):
+        """Test that the writing thread may write and read again"""
+        lock = ReadWriteLock()
+
+        with lock.write():
+            with lock.write():
+                with lock.read():
+                    pass
+
+        # Fully released: another thread can write
+        acquired = []
+        thread = threading.Thread(target=lambda: (lock.acquire_write(), acquired.append(True), lock.release_write()))
+        thread.start()
+        thread.join(5)
+        assert acquired == [True]
+
+    def test_upgrade_refused(self):
+        """Test that a reader can't upgrade to a writer"""
+        lock = ReadWriteLock()
+
+        with lock.read():
+            with pytest.raises(RuntimeError):
+                lock.acquire_write()
+
+
+class TestLockTable:
+    """Test LockTable class"""
+
+    def test_same_name_same_lock(self):
+        """Test that names map to one lock each"""
+        table = LockTable()
+
+        assert table.get("a") is table.get("a")
+        assert table.get("a") is not table.get("b")
+
+    def test_hold_opposite_orders_no_deadlock(self):
+        """Test that sorted acquisition avoids lock-order deadlocks"""
+        table = LockTable()
+        done = []
+
+        def worker(names):
+            for _ in range(200):
+                with table.hold(write=names):
+                    pass
+            done.append(names)
+
+        threads = [
+            threading.Thread(target=worker, args=(["a", "b"],)),
+            threading.Thread(target=worker, args=(["b", "a"],))
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+
+        assert len(done) == 2
+
+    def test_write_wins_over_read(self):
+        """Test that a name in both lists is locked for writing"""
+        table = LockTable()
+
+        with table.hold(read=["a"], write=["a"]):
+            assert table.get("a")._writer == threading.get_ident()
+
+
+def test_repository_locks_shared_per_path(tmp_path):
+    """Test that instances on the same path share locks"""
+    assert repository_locks(tmp_path) is repository_locks(Path(tmp_path))
+    assert repository_locks(tmp_path) is not repository_locks(tmp_path / "other")
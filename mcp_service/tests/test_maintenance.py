@@ -0,0 +1,93 @@
+"""
+Unit tests for maintenance module.
+
+# Validates: REQ-NFR-FEDERATE-001 (Hierarchical configuration composition)
+
+Tests cover:
+- Content-addressed document deduplication with hardlinks
+- Pruning unreferenced store entries
+- Working tree and latency measurements
+"""
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from storage.maintenance import DocumentStore, latency_summary, working_tree_usage
+
+
+@pytest.fixture
+def temp_dir():
+    """Create a temporary directory"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield Path(tmpdir)
+
+
+class TestDocumentStore:
+    """Test DocumentStore class"""
+
+    def test_identical_files_share_one_inode(self, temp_dir):
+        """Test that duplicates are relinked to the shared copy"""
+        files = [temp_dir / name for name in ("a.md", "b.md", "c.md")]
+        for path in files[:2]:
+            path.write_text("# Policy\n" * 100)
+        files[2].write_text("# Other\n")
+        store = DocumentStore(temp_dir / ".store")
+
+        relinked, freed = store.deduplicate(files)
+
+        assert relinked == 1
+        assert freed == len("# Policy\n" * 100)
+        assert files[0].samefile(files[1])
+        assert not files[0].samefile(files[2])
+        assert files[1].read_text() == "# Policy\n" * 100
+
+        # Already deduplicated: nothing left to do
+        assert store.deduplicate(files) == (0, 0)
+
+    def test_mode_mismatch_left_alone(self, temp_dir):
+        """Test that files with different permissions are not linked"""
+        first, second = temp_dir / "a.sh", temp_dir / "b.sh"
+        first.write_text("echo hi\n")
+        second.write_text("echo hi\n")
+        os.chmod(second, 0o755)
+
+        assert DocumentStore(temp_dir / ".store").deduplicate([first, second]) == (0, 0)
+        assert not first.samefile(second)
+
+    def test_prune_unreferenced(self, temp_dir):
+        """Test that store entries without working-tree links are removed"""
+        doc = temp_dir / "a.md"
+        doc.write_text("content\n")
+        store = DocumentStore(temp_dir / ".store")
+        store.deduplicate([doc])
+
+        assert store.prune() == 0
+        doc.unlink()
+        assert store.prune() == 1
+        assert list((temp_dir / ".store").iterdir()) == []
+
+
+class TestMeasurements:
+    """Test working_tree_usage and latency_summary"""
+
+    def test_hardlinks_counted_once(self, temp_dir):
+        """Test that working tree size counts each inode once and skips .git"""
+        (temp_dir / ".git").mkdir()
+        (temp_dir / ".git" / "big").write_bytes(b"x" * 1000)
+        (temp_dir / "a").write_bytes(b"y" * 10)
+        os.link(temp_dir / "a", temp_dir / "b")
+
+        assert working_tree_usage(temp_dir) == (2, 10)
+
+    def test_latency_summary(self):
+        """Test percentile summary of samples"""
+        summary = latency_summary(float(i) for i in range(1, 101))
+
+        assert summary["count"] == 100
+        assert summary["mean"] == 50.5
+        assert summary["p50"] == 51.0
+        assert summary["p95"] == 96.0
+        assert summary["max"] == 100.0
+        assert latency_summary([]) == {}
@@ -0,0 +1,166 @@
+"""
+Unit tests for metrics module.
+
+# Validates: REQ-F-TESTING-001 (Test coverage validation)
+
+Tests cover:
+- Per-tool outcome counts, in-flight gauges and latency percentiles
+- Cache sources
+- Prometheus exposition, textfile export and the HTTP endpoint
+"""
+import urllib.request
+
+import pytest
+
+from server.metrics import Histogram, ServerMetrics, start_http_server
+
+
+class FakeClock:
+    """Clock advanced by hand"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def metrics(clock):
+    return ServerMetrics(clock=clock)
+
+
+class TestHistogram:
+    """Test Histogram class"""
+
+    def test_buckets_and_percentiles(self):
+        """Test cumulative buckets and percentiles of recent samples"""
+        histogram = Histogram(buckets=(0.01, 0.1, 1.0))
+        for ms in range(1, 101):
+            histogram.observe(ms / 1000)
+
+        assert histogram.cumulative() == [10, 100, 100]
+        summary = histogram.summary_ms()
+        assert summary["p50"] == 51.0
+        assert summary["p99"] == 100.0
+        assert summary["max"] == 100.0
+        assert summary["mean"] == pytest.approx(50.5)
+
+    def test_sample_window(self):
+        """Test that percentiles only cover the most recent samples"""
+        histogram = Histogram(samples=10)
+        for _ in range(100):
+            histogram.observe(1.0)
+        for _ in range(10):
+            histogram.observe(0.001)
+
+        assert histogram.summary_ms()["p99"] == 1.0
+        assert histogram.summary_ms()["max"] == 1000.0
+        assert histogram.count == 110
+
+    def test_empty(self):
+        """Test an unused histogram"""
+        assert Histogram().summary_ms() == {}
+
+
+class TestServerMetrics:
+    """Test ServerMetrics class"""
+
+    def test_track_outcomes_and_latency(self, metrics, clock):
+        """Test that calls are counted by outcome and timed"""
+        with metrics.track("load_context"):
+            clock.now += 0.02
+        with metrics.track("load_context") as call:
+            clock.now += 0.04
+            call.outcome = "invalid"
+
+        tool = metrics.snapshot()["tools"]["load_context"]
+        assert tool["calls"] == 2
+        assert tool["errors"] == 0
+        assert tool["outcomes"]["ok"] == 1
+        assert tool["outcomes"]["invalid"] == 1
+        assert tool["latency_ms"]["max"] == pytest.approx(40.0)
+
+    def test_exception_counts_as_error(self, metrics):
+        """Test that an exception escaping the block is an error"""
+        with pytest.raises(RuntimeError):
+            with metrics.track("merge_projects"):
+                raise RuntimeError("boom")
+
+        tool = metrics.snapshot()["tools"]["merge_projects"]
+        assert tool["errors"] == 1
+        assert tool["in_flight"] == 0
+
+    def test_timeouts_count_as_errors(self, metrics):
+        """Test that timeouts are included in the error count"""
+        with metrics.track("merge_projects") as call:
+            call.outcome = "timeout"
+
+        assert metrics.snapshot()["tools"]["merge_projects"]["errors"] == 1
+
+    def test_in_flight(self, metrics):
+        """Test the in-flight gauge during a call"""
+        with metrics.track("merge_projects"):
+            assert metrics.snapshot()["tools"]["merge_projects"]["in_flight"] == 1
+        assert metrics.snapshot()["tools"]["merge_projects"]["in_flight"] == 0
+
+    def test_cache_sources(self, metrics):
+        """Test that registered cache sources are merged into snapshots"""
+        metrics.add_cache_source(lambda: {"config": {"hits": 3, "misses": 1, "entries": 2, "hit_ratio": 0.75}})
+        metrics.add_cache_source(lambda: {"persona": {"hits": 0, "misses": 0, "entries": 0, "hit_ratio": 0.0}})
+
+        assert set(metrics.snapshot()["caches"]) == {"config", "persona"}
+
+
+class TestExport:
+    """Test Prometheus exposition"""
+
+    @pytest.fixture
+    def populated(self, metrics, clock):
+        metrics.add_cache_source(lambda: {"layer": {"hits": 5, "misses": 2, "entries": 2, "hit_ratio": 0.7143}})
+        with metrics.track("load_context"):
+            clock.now += 0.003
+        return metrics
+
+    def test_render_prometheus(self, populated):
+        """Test the text exposition format"""
+        text = populated.render_prometheus()
+
+        assert '# TYPE ai_sdlc_tool_duration_seconds histogram' in text
+        assert 'ai_sdlc_tool_calls_total{tool="load_context",outcome="ok"} 1' in text
+        assert 'ai_sdlc_tool_duration_seconds_bucket{tool="load_context",le="0.0025"} 0' in text
+        assert 'ai_sdlc_tool_duration_seconds_bucket{tool="load_context",le="0.005"} 1' in text
+        assert 'ai_sdlc_tool_duration_seconds_bucket{tool="load_context",le="+Inf"} 1' in text
+        assert 'ai_sdlc_tool_duration_seconds_count{tool="load_context"} 1' in text
+        assert 'ai_sdlc_tool_in_flight{tool="load_context"} 0' in text
+        assert 'ai_sdlc_cache_hits_total{cache="layer"} 5' in text
+        assert text.endswith("\n")
+
+    def test_write_textfile(self, populated, tmp_path):
+        """Test writing the exposition to a file"""
+        path = tmp_path / "ai_sdlc.prom"
+        populated.write_textfile(path)
+
+        assert path.read_text() == populated.render_prometheus()
+        assert [p.name for p in tmp_path.iterdir()] == ["ai_sdlc.prom"]
+
+    def test_http_endpoint(self, populated):
+        """Test serving /metrics over HTTP"""
+        server = start_http_server(populated, 0)
+        try:
+            port = server.server_address[1]
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as response:
+                assert response.headers["Content-Type"].startswith("text/plain")
+                body = response.read().decode()
+            assert 'ai_sdlc_tool_calls_total{tool="load_context",outcome="ok"} 1' in body
+
+            with pytest.raises(urllib.error.HTTPError):
+                urllib.request.urlopen(f"http://127.0.0.1:{port}/other")
+        finally:
+            server.shutdown()
+            server.server_close()
@@ -0,0 +1,1468 @@
+"""
+Unit tests for project_repository module.
+
+# Validates: REQ-NFR-FEDERATE-001 (Hierarchical configuration composition)
+# Validates: REQ-F-TESTING-001 (Test coverage validation)
+
+Tests cover:
+- Project lifecycle (create, get, list, update, delete)
+- Registry and metadata caching
+- Batched commits, write-behind journaling and crash recovery
+- In-process git commits of touched paths
+- Merged config caching, invalidation and hit/miss stats
+- Dependency graph, cycle detection and shared base prefixes
+- Atomic writes and grouped fsync
+- Concurrent access, per-project locking and revision checks
+- SQLite index queries, write-through and rebuilds
+- Historical config reads at revisions and timestamps
+- Virtual merged projects and materialized snapshots
+- Batch merges sharing source loads and prefixes
+- Maintenance: pruning, document dedupe, gc and size metrics
+- Change events for mutations and external edits
+"""
+import json
+import subprocess
+import time
+import pytest
+import tempfile
+from pathlib import Path
+
+from storage import project_repository
+from storage.locking import RepositoryLocks
+from storage.project_repository import ProjectRepository
+
+
+class TestProjectRepository:
+    """Test ProjectRepository basics"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """Create a temporary directory for the repository"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            yield Path(tmpdir)
+
+    @pytest.fixture
+    def repo(self, temp_dir):
+        """Create an initialized repository"""
+        return ProjectRepository(temp_dir / "projects_repo")
+
+    def test_create_and_get_project(self, repo):
+        """Test creating a project and reading it back"""
+        repo.create_project(
+            name="corporate",
+            project_type="base",
+            base_projects=[],
+            config={"corporate": {"name": "Acme"}},
+            description="Corporate base"
+        )
+
+        metadata = repo.get_project("corporate")
+
+        assert metadata.name == "corporate"
+        assert metadata.project_type == "base"
+        assert metadata.description == "Corporate base"
+        assert repo.get_project("missing") is None
+
+    def test_update_project(self, repo):
+        """Test updating configuration values"""
+        repo.create_project("app", "custom", [], config={"testing": {"min_coverage": 80}})
+
+        repo.update_project("app", {"testing.min_coverage": 95, "testing.framework": "pytest"})
+        config = repo.get_project_config("app")
+
+        assert config.get_value("testing.min_coverage") == 95
+        assert config.get_value("testing.framework") == "pytest"
+
+    def test_update_project_keeps_comments(self, repo):
+        """Test that updates patch the config file in place"""
+        repo.create_project("app", "custom", [], config={"testing": {"min_coverage": 80}})
+        config_file = repo.repo_path / "app" / "config" / "config.yml"
+        config_file.write_text(
+            "# Team config\ntesting:\n  min_coverage: 80  # agreed with QA\n"
+        )
+
+        repo.update_project("app", {"testing.min_coverage": 95})
+
+        assert config_file.read_text() == (
+            "# Team config\ntesting:\n  min_coverage: 95  # agreed with QA\n"
+        )
+
+    def test_update_project_falls_back_for_flow_yaml(self, repo):
+        """Test that YAML the patcher can't handle is rewritten in full"""
+        repo.create_project("app", "custom", [])
+        config_file = repo.repo_path / "app" / "config" / "config.yml"
+        config_file.write_text("testing: {min_coverage: 80}\n")
+
+        repo.update_project("app", {"testing.framework": "pytest"})
+        config = repo.get_project_config("app")
+
+        assert config.get_value("testing.min_coverage") == 80
+        assert config.get_value("testing.framework") == "pytest"
+
+    def test_delete_project(self, repo):
+        """Test deleting a project"""
+        repo.create_project("app", "custom", [])
+
+        repo.delete_project("app")
+
+        assert repo.get_project("app") is None
+        assert repo.list_projects() == []
+
+    def test_get_project_config_merges_bases(self, repo):
+        """Test that base project configs are merged below the project"""
+        repo.create_project("base", "base", [], config={"a": 1, "b": {"c": 2}})
+        repo.create_project("app", "custom", ["base"], config={"b": {"c": 3}})
+
+        config = repo.get_project_config("app")
+
+        assert config.get_value("a") == 1
+        assert config.get_value("b.c") == 3
+
+
+class TestRegistryCache:
+    """Test registry and metadata caching"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """Create a temporary directory for the repository"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            yield Path(tmpdir)
+
+    @pytest.fixture
+    def repo(self, temp_dir):
+        """Create a repository with a few projects"""
+        repo = ProjectRepository(temp_dir / "projects_repo")
+        for name in ("one", "two", "three"):
+            repo.create_project(name, "custom", [])
+        return repo
+
+    @pytest.fixture
+    def read_counter(self, monkeypatch):
+        """Count JSON file reads performed by the repository"""
+        reads = []
+        original = project_repository._read_json
+
+        def counting_read(path):
+            reads.append(Path(path).name)
+            return original(path)
+
+        monkeypatch.setattr(project_repository, "_read_json", counting_read)
+        return reads
+
+    def test_list_projects_reads_nothing_when_warm(self, repo, read_counter):
+        """Test that writes populate the caches (write-through)"""
+        projects = repo.list_projects()
+
+        assert sorted(p.name for p in projects) == ["one", "three", "two"]
+        assert read_counter == []
+
+    def test_list_projects_reads_registry_once(self, temp_dir, repo, read_counter):
+        """Test that a cold list reads projects.json once, not once per project"""
+        project_repository._REGISTRY_CACHE.discard(repo.projects_file)
+        for name in ("one", "two", "three"):
+            project_repository._METADATA_CACHE.discard(repo.repo_path / name / "project.json")
+
+        repo.list_projects()
+        repo.list_projects()
+
+        assert read_counter.count("projects.json") == 1
+        assert read_counter.count("project.json") == 3
+
+    def test_cache_is_shared_across_instances(self, repo, read_counter):
+        """Test that a second repository on the same path reuses the cache"""
+        other = ProjectRepository(repo.repo_path)
+
+        assert other.get_project("two").name == "two"
+        assert read_counter == []
+
+    def test_external_registry_edit_is_detected(self, repo):
+        """Test that edits made outside the repository invalidate the cache"""
+        registry = json.loads(repo.projects_file.read_text())
+        del registry["three"]
+        repo.projects_file.write_text(json.dumps(registry, indent=2))
+
+        assert repo.get_project("three") is None
+        assert sorted(p.name for p in repo.list_projects()) == ["one", "two"]
+
+    def test_returned_metadata_is_independent_copy(self, repo):
+        """Test that mutating returned metadata does not corrupt the cache"""
+        metadata = repo.get_project("one")
+        metadata.base_projects.append("mutated")
+        metadata.description = "mutated"
+
+        fresh = repo.get_project("one")
+
+        assert fresh.base_projects == []
+        assert fresh.description is None
+
+
+def _git_log(repo):
+    """Return commit subjects, newest first"""
+    result = subprocess.run(
+        ["git", "log", "--format=%s"],
+        cwd=repo.repo_path,
+        check=True,
+        capture_output=True,
+        text=True
+    )
+    return result.stdout.splitlines()
+
+
+class TestCommitBatching:
+    """Test batched commits and write-behind journaling"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """Create a temporary directory for the repository"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            yield Path(tmpdir)
+
+    def test_batch_makes_single_commit(self, temp_dir):
+        """Test that mutations inside batch() share one commit"""
+        repo = ProjectRepository(temp_dir / "repo")
+        before = len(_git_log(repo))
+
+        with repo.batch("Provision environments"):
+            repo.create_project("dev", "custom", [])
+            repo.create_project("prod", "custom", [])
+            repo.update_project("dev", {"env": "dev"})
+
+        log = _git_log(repo)
+        assert len(log) == before + 1
+        assert log[0] == "Provision environments"
+        assert repo.get_project_config("dev").get_value("env") == "dev"
+
+    def test_nested_batches_commit_once(self, temp_dir):
+        """Test that only the outermost batch commits"""
+        repo = ProjectRepository(temp_dir / "repo")
+        before = len(_git_log(repo))
+
+        with repo.batch():
+            repo.create_project("a", "custom", [])
+            with repo.batch():
+                repo.create_project("b", "custom", [])
+            assert len(_git_log(repo)) == before
+
+        assert len(_git_log(repo)) == before + 1
+
+    def test_batch_commits_completed_work_on_error(self, temp_dir):
+        """Test that completed mutations are committed when the block raises"""
+        repo = ProjectRepository(temp_dir / "repo")
+
+        with pytest.raises(ValueError):
+            with repo.batch():
+                repo.create_project("a", "custom", [])
+                repo.create_project("a", "custom", [])
+
+        assert _git_log(repo)[0] == "Create project: a"
+
+    def test_write_behind_flushes_on_op_threshold(self, temp_dir):
+        """Test that the committer flushes after commit_max_ops operations"""
+        repo = ProjectRepository(temp_dir / "repo", commit_max_ops=2)
+        try:
+            repo.create_project("a", "custom", [])
+            repo.create_project("b", "custom", [])
+
+            deadline = time.time() + 5
+            while repo.journal_file.exists() and time.time() < deadline:
+                time.sleep(0.01)
+
+            assert not repo.journal_file.exists()
+            assert _git_log(repo)[0].startswith("Batch update (2 changes)")
+        finally:
+            repo.close()
+
+    def test_journal_recovered_after_crash(self, temp_dir):
+        """Test that journaled but uncommitted mutations are committed on restart"""
+        repo = ProjectRepository(temp_dir / "repo")
+        # Simulate a crash: journal without a committer that ever runs
+        repo._write_behind = True
+        repo.create_project("a", "custom", [])
+        assert repo.journal_file.exists()
+
+        recovered = ProjectRepository(temp_dir / "repo")
+
+        assert not recovered.journal_file.exists()
+        assert _git_log(recovered)[0] == "Create project: a"
+        assert recovered.get_project("a") is not None
+
+    @pytest.mark.parametrize("write_behind", [False, True])
+    def test_unrecorded_writes_recovered_after_crash(self, temp_dir, monkeypatch, write_behind):
+        """Test that files written before a crash, but never committed or journaled, are committed on restart"""
+        repo = ProjectRepository(temp_dir / "repo")
+        repo._write_behind = write_behind
+
+        def crash(*args, **kwargs):
+            raise KeyboardInterrupt("crash")
+
+        # Files are written, then the process dies before the commit or journal entry
+        monkeypatch.setattr(repo, "_git_commit", crash)
+        monkeypatch.setattr(repo, "_journal_append", crash)
+        with pytest.raises(KeyboardInterrupt):
+            repo.create_project("a", "custom", [], config={"team": "payments"})
+        leftover = repo.repo_path / ".projects.json.k3x_9q0a.tmp"
+        leftover.write_text("{}")
+        # The next process starts without the dead one's in-memory state
+        monkeypatch.setattr(project_repository, "repository_locks", lambda path: RepositoryLocks())
+
+        recovered = ProjectRepository(temp_dir / "repo")
+
+        assert _git_log(recovered)[0] == "Recover uncommitted changes"
+        assert not leftover.exists()
+        assert not recovered.unrecorded_file.exists()
+        assert _git(recovered, "status", "--porcelain") == ""
+        assert recovered.get_project_config("a").get_value("team") == "payments"
+
+    def test_external_edits_left_alone_on_restart(self, temp_dir):
+        """Test that reopening after a clean run neither commits nor deletes edited files"""
+        repo = ProjectRepository(temp_dir / "repo")
+        repo.create_project("app", "custom", [])
+        lock_file = repo.repo_path / "app" / "docs" / "Pipfile.lock"
+        repo.add_document("app", "Pipfile.lock", "{}")
+        lock_file.write_text('{"default": {}}')
+        stray = repo.repo_path / "app" / ".notes.tmp"
+        stray.write_text("draft")
+        before = _git_log(repo)
+
+        reopened = ProjectRepository(temp_dir / "repo")
+
+        assert _git_log(reopened) == before
+        assert lock_file.read_text() == '{"default": {}}'
+        assert stray.exists()
+
+    def test_recovery_keeps_tracked_lookalikes(self, temp_dir):
+        """Test that recovery commits, rather than deletes, tracked files with temporary-looking names"""
+        repo = ProjectRepository(temp_dir / "repo")
+        repo.create_project("app", "custom", [])
+        lock_file = repo.repo_path / "app" / "docs" / "Pipfile.lock"
+        repo.add_document("app", "Pipfile.lock", "{}")
+        lock_file.write_text('{"default": {}}')
+        repo.unrecorded_file.touch()
+
+        recovered = ProjectRepository(temp_dir / "repo")
+
+        assert lock_file.read_text() == '{"default": {}}'
+        assert _git_log(recovered)[0] == "Recover uncommitted changes"
+        assert _git(recovered, "status", "--porcelain") == ""
+
+    def test_clean_restart_makes_no_commit(self, temp_dir):
+        """Test that reopening a clean repository commits nothing"""
+        repo = ProjectRepository(temp_dir / "repo")
+        repo.create_project("a", "custom", [])
+        before = _git_log(repo)
+
+        assert _git_log(ProjectRepository(temp_dir / "repo")) == before
+
+
+def _git(repo, *args):
+    """Run a git command in the repository and return stdout"""
+    result = subprocess.run(
+        ["git", *args],
+        cwd=repo.repo_path,
+        check=True,
+        capture_output=True,
+        text=True
+    )
+    return result.stdout
+
+
+class TestInProcessCommits:
+    """Test commits written by the in-process object store"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """Create a temporary directory for the repository"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            yield Path(tmpdir)
+
+    @pytest.fixture
+    def repo(self, temp_dir):
+        """Create a repository using the in-process commit path"""
+        repo = ProjectRepository(temp_dir / "repo")
+        assert repo._objects is not None
+        yield repo
+        repo.close()
+
+    def test_commits_match_working_tree(self, repo):
+        """Test that in-process commits produce a valid, complete history"""
+        repo.create_project("base", "base", [], config={"a": {"b": 1}})
+        repo.create_project("app", "custom", ["base"])
+        repo.update_project("app", {"a.b": 2})
+        repo.add_document("app", "policies/security.md", "# Security")
+        repo.merge_projects(["base", "app"], "app_prod")
+        repo.delete_project("base")
+        repo.close()
+
+        _git(repo, "fsck", "--strict")
+        assert _git(repo, "status", "--porcelain") == ""
+        assert _git(repo, "show", "HEAD~1:app/docs/policies/security.md") == "# Security"
+        assert "base/project.json" not in _git(repo, "ls-tree", "-r", "--name-only", "HEAD")
+
+    def test_only_touched_paths_are_committed(self, repo):
+        """Test that unrelated working-tree changes are left uncommitted"""
+        repo.create_project("app", "custom", [])
+        (repo.repo_path / "scratch.txt").write_text("not part of any mutation")
+
+        repo.update_project("app", {"x": 1})
+
+        changed = _git(repo, "show", "--name-only", "--format=", "HEAD").split()
+        assert sorted(changed) == ["app/config/config.yml", "app/project.json"]
+
+    def test_gitignore_falls_back_to_git_cli(self, repo):
+        """Test that ignore rules are honoured by falling back to git add"""
+        (repo.repo_path / ".gitignore").write_text("*.tmp\n")
+        repo.create_project("app", "custom", [])
+        (repo.repo_path / "app" / "docs" / "cache.tmp").write_text("ignored")
+
+        repo.add_document("app", "guide.md", "content")
+
+        files = _git(repo, "ls-tree", "-r", "--name-only", "HEAD").split()
+        assert "app/docs/guide.md" in files
+        assert "app/docs/cache.tmp" not in files
+
+    def test_commit_runs_no_subprocess(self, repo, monkeypatch):
+        """Test that mutations commit without starting git"""
+        repo.create_project("app", "custom", [])
+
+        def no_git(*args, **kwargs):
+            raise AssertionError(f"subprocess started: {args[0]}")
+
+        monkeypatch.setattr(subprocess, "run", no_git)
+        repo.update_project("app", {"x": 1})
+        repo.add_document("app", "guide.md", "# Guide")
+
+    def test_status_clean_after_flush(self, repo):
+        """Test that flush() brings the index up to in-process commits without closing"""
+        repo.create_project("app", "custom", [])
+        repo.update_project("app", {"x": 1})
+        repo.delete_project("app")
+        repo.create_project("web", "custom", [])
+
+        repo.flush()
+
+        assert _git(repo, "status", "--porcelain") == ""
+
+    def test_gitattributes_falls_back_to_git_cli(self, repo):
+        """Test that attribute filters are applied by falling back to git add"""
+        (repo.repo_path / ".gitattributes").write_text("* text=auto\n")
+        repo.create_project("app", "custom", [])
+
+        repo.add_document("app", "guide.md", "line one\r\nline two\r\n")
+
+        blob = subprocess.run(
+            ["git", "cat-file", "-p", "HEAD:app/docs/guide.md"],
+            cwd=repo.repo_path, check=True, capture_output=True
+        ).stdout
+        assert blob == b"line one\nline two\n"
+
+    @pytest.mark.parametrize("key, value", [
+        ("core.autocrlf", "input"),
+        ("core.excludesFile", "/nonexistent/ignore"),
+        ("core.attributesFile", "/nonexistent/attributes"),
+    ])
+    def test_content_settings_disable_in_process_commits(self, temp_dir, key, value):
+        """Test that settings changing what git add stores fall back to the git CLI"""
+        ProjectRepository(temp_dir / "repo").close()
+        subprocess.run(["git", "config", key, value], cwd=temp_dir / "repo", check=True)
+
+        assert ProjectRepository(temp_dir / "repo")._objects is None
+
+    def test_user_ignore_file_disables_in_process_commits(self, temp_dir, monkeypatch):
+        """Test that a per-user global ignore file falls back to the git CLI"""
+        config_home = temp_dir / "config"
+        (config_home / "git").mkdir(parents=True)
+        (config_home / "git" / "ignore").write_text("*.bak\n")
+        monkeypatch.setenv("XDG_CONFIG_HOME", str(config_home))
+
+        assert ProjectRepository(temp_dir / "repo")._objects is None
+
+
+class TestConfigCache:
+    """Test the merged ConfigManager cache"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """Create a temporary directory for the repository"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            yield Path(tmpdir)
+
+    @pytest.fixture
+    def repo(self, temp_dir):
+        """Create a base project with two dependents and one unrelated project"""
+        repo = ProjectRepository(temp_dir / "repo")
+        repo.create_project("base", "base", [], config={"testing": {"min_coverage": 80}})
+        repo.create_project("app", "custom", ["base"], config={"team": "a"})
+        repo.create_project("api", "custom", ["base"], config={"team": "b"})
+        repo.create_project("other", "custom", [], config={"team": "c"})
+        yield repo
+        repo.close()
+
+    def test_repeated_calls_hit_cache(self, repo):
+        """Test that an unchanged project returns the cached manager"""
+        first = repo.get_project_config("app")
+
+        assert repo.get_project_config("app") is first
+
+    def test_base_update_invalidates_dependents_only(self, repo):
+        """Test precise invalidation through the reverse-dependency map"""
+        app = repo.get_project_config("app")
+        api = repo.get_project_config("api")
+        other = repo.get_project_config("other")
+
+        repo.update_project("base", {"testing.min_coverage": 90})
+
+        assert repo.get_project_config("other") is other
+        new_app = repo.get_project_config("app")
+        assert new_app is not app
+        assert new_app.get_value("testing.min_coverage") == 90
+        assert repo.get_project_config("api") is not api
+
+    def test_external_layer_edit_detected_by_content_hash(self, repo):
+        """Test that edits made outside the repository change the cache key"""
+        app = repo.get_project_config("app")
+        config_file = repo.repo_path / "base" / "config" / "config.yml"
+
+        config_file.write_text("testing:\n  min_coverage: 99\n")
+
+        refreshed = repo.get_project_config("app")
+        assert refreshed is not app
+        assert refreshed.get_value("testing.min_coverage") == 99
+
+    def test_new_base_project_changes_layers(self, repo):
+        """Test that creating a referenced base project is picked up"""
+        repo.create_project("late", "custom", ["missing"], config={"x": 1})
+        assert repo.get_project_config("late").get_value("y") is None
+
+        repo.create_project("missing", "base", [], config={"y": 2})
+
+        assert repo.get_project_config("late").get_value("y") == 2
+
+    def test_cache_stats(self, repo):
+        """Test hit/miss accounting of the config and layer caches"""
+        repo.get_project_config("app")
+        repo.get_project_config("app")
+        repo.get_project_config("api")
+
+        stats = repo.cache_stats()
+
+        assert stats["config"]["hits"] == 1
+        assert stats["config"]["misses"] == 2
+        assert stats["config"]["entries"] == 2
+        assert stats["config"]["hit_ratio"] == pytest.approx(1 / 3, abs=1e-4)
+        # api reuses the base layer parsed for app
+        assert stats["layer"]["hits"] >= 1
+        assert set(stats) == {"config", "layer", "prefix", "history", "resolver", "serialized"}
+
+    def test_serialize_project_cached(self, repo):
+        """Test that serialized outputs of an unchanged project are reused"""
+        first = repo.serialize_project("app", "yaml")
+
+        assert repo.serialize_project("app", "yaml") is first
+        assert repo.serialize_project("app", "dict", path="testing") == {"min_coverage": 80}
+        assert repo.serialize_project("missing") is None
+        assert repo.cache_stats()["serialized"]["hits"] == 1
+
+    def test_serialize_project_invalidated(self, repo):
+        """Test that changing a layer drops the outputs of its dependents"""
+        app = repo.serialize_project("app", "json")
+        other = repo.serialize_project("other", "json")
+
+        repo.update_project("base", {"testing.min_coverage": 90})
+
+        assert repo.cache_stats()["serialized"]["entries"] == 1
+        assert '"min_coverage": 90' in repo.serialize_project("app", "json")
+        assert repo.serialize_project("app", "json") is not app
+        assert repo.serialize_project("other", "json") is other
+
+    def test_serialize_project_version_shared_with_history(self, repo):
+        """Test that a revision with the same content has the same version"""
+        head = repo._head_sha()
+        assert repo.get_project_config("app", at=head).version == repo.get_project_config("app").version
+
+
+class TestDependencyGraph:
+    """Test the project dependency DAG and shared base prefixes"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """Create a temporary directory for the repository"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            yield Path(tmpdir)
+
+    @pytest.fixture
+    def repo(self, temp_dir):
+        """Create a three-layer base stack with several dependents"""
+        repo = ProjectRepository(temp_dir / "repo")
+        repo.create_project("methodology", "methodology", [], config={"testing": {"min_coverage": 70}})
+        repo.create_project("python", "base", ["methodology"], config={"testing": {"framework": "pytest"}})
+        repo.create_project("corporate", "base", ["python"], config={"testing": {"min_coverage": 80}})
+        for name in ("svc_a", "svc_b", "svc_c"):
+            repo.create_project(
+                name, "custom", ["methodology", "python", "corporate"], config={"team": name}
+            )
+        yield repo
+        repo.close()
+
+    def test_topological_order(self, repo):
+        """Test that bases precede their dependents"""
+        order = repo.topological_order()
+
+        assert order.index("methodology") < order.index("python") < order.index("corporate")
+        assert order.index("corporate") < order.index("svc_a")
+
+    def test_get_dependents(self, repo):
+        """Test direct and transitive dependents"""
+        assert sorted(repo.get_dependents("corporate")) == ["svc_a", "svc_b", "svc_c"]
+        assert repo.get_dependents("methodology", transitive=False)[0] == "python"
+        assert "corporate" in repo.get_dependents("methodology")
+
+    def test_cycle_rejected_on_create(self, repo):
+        """Test that a project cannot close a dependency cycle"""
+        repo.create_project("early", "custom", ["later"])
+
+        with pytest.raises(ValueError, match="Dependency cycle"):
+            repo.create_project("later", "custom", ["early"])
+
+        assert repo.get_project("later") is None
+
+    def test_self_dependency_rejected(self, repo):
+        """Test that a project cannot depend on itself"""
+        with pytest.raises(ValueError, match="Dependency cycle"):
+            repo.create_project("loop", "custom", ["loop"])
+
+    def test_shared_base_prefix_merged_once(self, repo, monkeypatch):
+        """Test that projects sharing a base stack reuse one prefix merge"""
+        from ai_sdlc_config import HierarchyMerger
+
+        merges = []
+        original = HierarchyMerger.merge
+
+        def counting_merge(self, hierarchies):
+            merges.append(len(hierarchies))
+            return original(self, hierarchies)
+
+        monkeypatch.setattr(HierarchyMerger, "merge", counting_merge)
+
+        configs = [repo.get_project_config(name) for name in ("svc_a", "svc_b", "svc_c")]
+
+        assert merges == [3]
+        for config in configs:
+            assert config.get_value("testing.min_coverage") == 80
+            assert config.get_value("testing.framework") == "pytest"
+        assert configs[1].get_value("team") == "svc_b"
+
+    def test_prefix_merge_matches_full_merge(self, repo):
+        """Test that prefix-based results equal a plain ConfigManager merge"""
+        from ai_sdlc_config import ConfigManager
+
+        cached = repo.get_project_config("svc_a")
+        manager = ConfigManager(base_path=repo.repo_path)
+        for name in ("methodology", "python", "corporate", "svc_a"):
+            manager.load_hierarchy(f"{name}/config/config.yml")
+        manager.merge()
+
+        assert cached.merged_hierarchy == manager.merged_hierarchy
+
+
+class TestAtomicWrites:
+    """Test atomic, optionally fsynced file writes"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """Create a temporary directory for the repository"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            yield Path(tmpdir)
+
+    @pytest.mark.parametrize("fsync", [False, True])
+    def test_operations_leave_no_temp_files(self, temp_dir, fsync):
+        """Test that every write is renamed into place"""
+        repo = ProjectRepository(temp_dir / "repo", fsync=fsync)
+        repo.create_project("base", "base", [], config={"a": 1})
+        repo.update_project("base", {"a": 2})
+        repo.add_document("base", "notes.md", "# Notes")
+        repo.merge_projects(["base"], "merged")
+        repo.close()
+
+        assert list((temp_dir / "repo").rglob("*.tmp")) == []
+        assert repo.get_project_config("merged").get_value("a") == 2
+        assert _git(repo, "status", "--porcelain") == ""
+
+    def test_failed_operation_discards_staged_writes(self, temp_dir, monkeypatch):
+        """Test that with fsync a failing operation leaves the registry untouched"""
+        repo = ProjectRepository(temp_dir / "repo", fsync=True)
+        repo.create_project("base", "base", [])
+        registry_before = repo.projects_file.read_text()
+
+        def fail(*args, **kwargs):
+            raise RuntimeError("disk full")
+
+        monkeypatch.setattr(repo, "_write_project_metadata", fail)
+        with pytest.raises(RuntimeError):
+            repo.merge_projects(["base"], "merged")
+
+        assert repo.projects_file.read_text() == registry_before
+        assert list((temp_dir / "repo").rglob("*.tmp")) == []
+        assert repo.get_project("merged") is None
+        repo.close()
+
+    def test_registry_replaced_not_truncated(self, temp_dir, monkeypatch):
+        """Test that a crash while writing keeps the previous registry"""
+        from storage import atomic_write
+
+        repo = ProjectRepository(temp_dir / "repo")
+        repo.create_project("base", "base", [])
+        registry_before = repo.projects_file.read_text()
+
+        def crash(*args, **kwargs):
+            raise OSError("crash before rename")
+
+        monkeypatch.setattr(atomic_write.os, "replace", crash)
+        with pytest.raises(OSError):
+            repo.create_project("other", "custom", [])
+
+        monkeypatch.undo()
+        assert repo.projects_file.read_text() == registry_before
+        assert json.loads(registry_before).keys() == {"base"}
+        assert list((temp_dir / "repo").rglob("*.tmp")) == []
+        repo.close()
+
+
+class TestConcurrency:
+    """Test concurrent access and optimistic revision checks"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """Create a temporary directory for the repository"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            yield Path(tmpdir)
+
+    @pytest.fixture
+    def repo(self, temp_dir):
+        """Create a repository"""
+        repo = ProjectRepository(temp_dir / "repo")
+        yield repo
+        repo.close()
+
+    def test_revision_increments(self, repo):
+        """Test that every update bumps the revision"""
+        metadata = repo.create_project("app", "custom", [])
+        assert metadata.revision == 0
+
+        assert repo.update_project("app", {"a": 1}).revision == 1
+        assert repo.get_project("app").revision == 1
+
+    def test_expected_revision(self, repo):
+        """Test optimistic concurrency on update_project"""
+        from storage import ConcurrentModificationError
+
+        repo.create_project("app", "custom", [])
+        repo.update_project("app", {"a": 1}, expected_revision=0)
+
+        with pytest.raises(ConcurrentModificationError, match="revision 1"):
+            repo.update_project("app", {"a": 2}, expected_revision=0)
+
+        assert repo.get_project_config("app").get_value("a") == 1
+
+    def test_parallel_updates_same_project(self, repo):
+        """Test that concurrent updates to one project are all applied"""
+        import threading
+
+        repo.create_project("app", "custom", [])
+
+        def update(i):
+            repo.update_project("app", {f"key_{i}": i})
+
+        threads = [threading.Thread(target=update, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        config = repo.get_project_config("app")
+        assert [config.get_value(f"key_{i}") for i in range(8)] == list(range(8))
+        assert repo.get_project("app").revision == 8
+
+    def test_parallel_creates_keep_registry(self, repo):
+        """Test that concurrent creates don't lose registry entries"""
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            list(pool.map(lambda i: repo.create_project(f"p{i}", "custom", []), range(8)))
+        repo.merge_projects(["p0", "p1"], "merged")
+
+        assert sorted(p.name for p in repo.list_projects()) == sorted(
+            [f"p{i}" for i in range(8)] + ["merged"]
+        )
+        repo.close()
+        assert _git(repo, "status", "--porcelain") == ""
+
+    def test_independent_projects_update_in_parallel(self, repo):
+        """Test that a writer on one project doesn't block another project"""
+        import threading
+
+        repo.create_project("a", "custom", [])
+        repo.create_project("b", "custom", [])
+        finished = threading.Event()
+
+        with repo._locks.projects.hold(write=["a"]):
+            thread = threading.Thread(
+                target=lambda: (repo.update_project("b", {"x": 1}), finished.set())
+            )
+            thread.start()
+            assert finished.wait(5)
+        thread.join()
+
+
+class TestSQLiteIndex:
+    """Test repository queries served from the SQLite index"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """Create a temporary directory for the repository"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            yield Path(tmpdir)
+
+    @pytest.fixture
+    def repo(self, temp_dir):
+        """Create an indexed repository with a base stack"""
+        repo = ProjectRepository(temp_dir / "repo", use_index=True)
+        repo.create_project("methodology", "methodology", [])
+        repo.create_project("python", "base", ["methodology"])
+        repo.create_project("app", "custom", ["python"])
+        yield repo
+        repo.close()
+
+    def test_list_projects_by_type(self, repo):
+        """Test listing and filtering through the index"""
+        assert sorted(p.name for p in repo.list_projects()) == ["app", "methodology", "python"]
+        assert [p.name for p in repo.list_projects(project_type="base")] == ["python"]
+
+    def test_same_order_as_registry(self, repo, temp_dir):
+        """Test that the index lists projects in the same order as the registry"""
+        repo.create_project("api", "custom", ["python"])
+        plain = ProjectRepository(temp_dir / "repo")
+
+        for project_type in (None, "custom"):
+            assert [p.name for p in repo.list_projects(project_type)] == [
+                p.name for p in plain.list_projects(project_type)
+            ]
+        assert [p.name for p in repo.list_projects()] == ["methodology", "python", "app", "api"]
+
+    def test_index_follows_mutations(self, repo, monkeypatch):
+        """Test that writes update the index without a rebuild"""
+        repo.list_projects()
+        head = repo._index.head()
+        monkeypatch.setattr(repo, "rebuild_index", lambda: pytest.fail("index rebuilt"))
+
+        repo.update_project("app", {"a": 1})
+        repo.merge_projects(["app"], "merged")
+        repo.delete_project("methodology")
+
+        assert repo._index.head() != head
+        assert repo._index.head() == repo._head_sha()
+        assert repo.get_project("app").revision == 1
+        assert [p.revision for p in repo.list_projects("custom")] == [1]
+        assert repo.get_dependents("app") == ["merged"]
+        assert "methodology" not in [p.name for p in repo.list_projects()]
+
+    def test_rebuild_after_external_commit(self, repo):
+        """Test that the index is rebuilt when HEAD moves outside the repository"""
+        repo.list_projects()
+        registry = json.loads(repo.projects_file.read_text())
+        del registry["app"]
+        repo.projects_file.write_text(json.dumps(registry, indent=2))
+        _git(repo, "commit", "-qam", "Remove app by hand")
+
+        assert sorted(p.name for p in repo.list_projects()) == ["methodology", "python"]
+        assert repo.get_dependents("python") == []
+
+    def test_matches_unindexed_queries(self, repo, temp_dir):
+        """Test that indexed and file-based answers agree"""
+        plain = ProjectRepository(temp_dir / "repo")
+
+        assert sorted(p.name for p in plain.list_projects()) == sorted(p.name for p in repo.list_projects())
+        assert plain.get_dependents("methodology") == repo.get_dependents("methodology")
+        assert plain.list_projects("base") == repo.list_projects("base")
+        plain.close()
+
+
+class TestHistoricalConfig:
+    """Test reading project configs at past revisions"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """Create a temporary directory for the repository"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            yield Path(tmpdir)
+
+    @pytest.fixture
+    def clock(self, monkeypatch):
+        """Control the commit timestamps written by the object store"""
+        from storage import git_store
+
+        class Clock:
+            now = 1_700_000_000
+            localtime = staticmethod(time.gmtime)
+
+            @staticmethod
+            def time():
+                return Clock.now
+
+        monkeypatch.setattr(git_store, "time", Clock)
+        return Clock
+
+    @pytest.fixture
+    def repo(self, temp_dir, clock):
+        """Create a repository with a base and an app changed over time"""
+        repo = ProjectRepository(temp_dir / "repo")
+        repo.create_project("base", "base", [], config={"testing": {"min_coverage": 70}})
+        repo.create_project("app", "custom", ["base"], config={"team": "payments"})
+        clock.now += 100
+        repo.update_project("base", {"testing.min_coverage": 80})
+        clock.now += 100
+        repo.update_project("app", {"team": "risk"})
+        yield repo
+        repo.close()
+
+    def test_at_revision(self, repo):
+        """Test reading at relative revisions and shas"""
+        previous = repo.get_project_config("app", at="HEAD~1")
+        first = repo.get_project_config("app", at="HEAD~2")
+
+        assert previous.get_value("team") == "payments"
+        assert previous.get_value("testing.min_coverage") == 80
+        assert first.get_value("testing.min_coverage") == 70
+
+        sha = _git(repo, "rev-parse", "HEAD~2").strip()
+        assert repo.get_project_config("app", at=sha).get_value("testing.min_coverage") == 70
+
+    def test_at_timestamp(self, repo, clock):
+        """Test reading as of epoch seconds, datetimes and ISO strings"""
+        from datetime import datetime, timezone
+
+        start = 1_700_000_000
+        assert repo.get_project_config("app", at=start + 50).get_value("testing.min_coverage") == 70
+        assert repo.get_project_config("app", at=start + 150).get_value("testing.min_coverage") == 80
+
+        moment = datetime.fromtimestamp(start + 150, tz=timezone.utc)
+        assert repo.get_project_config("app", at=moment).get_value("team") == "payments"
+        assert repo.get_project_config("app", at=moment.isoformat()).get_value("team") == "payments"
+
+    def test_numeric_revision_is_commit_first(self, repo):
+        """Test all-digit revisions resolve as commits before being read as dates"""
+        _git(repo, "tag", "20231114", "HEAD~2")
+        sha = _git(repo, "rev-parse", "HEAD~2").strip()
+
+        assert repo.get_project_config("app", at="20231114").get_value("testing.min_coverage") == 70
+        assert repo.get_project_config("app", at=sha[:7]).get_value("testing.min_coverage") == 70
+        with pytest.raises(ValueError, match="Unknown revision"):
+            repo.get_project_config("app", at="19991231")
+
+    def test_project_missing_at_revision(self, repo):
+        """Test that projects created later don't exist in the past"""
+        assert repo.get_project_config("app", at="HEAD~4") is None
+
+    def test_unknown_revision(self, repo):
+        """Test that bad revisions and times are rejected"""
+        with pytest.raises(ValueError, match="Unknown revision"):
+            repo.get_project_config("app", at="no-such-branch")
+        with pytest.raises(ValueError, match="No commit"):
+            repo.get_project_config("app", at=1_000_000_000)
+
+    def test_no_working_tree_changes(self, repo):
+        """Test that historical reads leave the working tree and HEAD alone"""
+        head = _git(repo, "rev-parse", "HEAD")
+        repo.get_project_config("app", at="HEAD~2")
+
+        assert _git(repo, "rev-parse", "HEAD") == head
+        assert repo.get_project_config("app").get_value("team") == "risk"
+        repo.close()
+        assert _git(repo, "status", "--porcelain") == ""
+
+    def test_cached_by_blob(self, repo, monkeypatch):
+        """Test that unchanged layers are parsed once across revisions"""
+        loads = []
+        original = repo._loader.load_from_string
+
+        def counting(text, source_name="string"):
+            loads.append(source_name)
+            return original(text, source_name)
+
+        monkeypatch.setattr(repo._loader, "load_from_string", counting)
+
+        repo.get_project_config("app", at="HEAD~1")
+        repo.get_project_config("app", at="HEAD~1")
+        # Same base blob as HEAD~1; app layer unchanged since HEAD~2
+        repo.get_project_config("base", at="HEAD~1")
+
+        assert len(loads) == 2
+
+    def test_concurrent_historical_reads(self, repo):
+        """Test parallel reads at different revisions"""
+        from concurrent.futures import ThreadPoolExecutor
+
+        revisions = ["HEAD", "HEAD~1", "HEAD~2"] * 10
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            values = list(pool.map(
+                lambda rev: repo.get_project_config("app", at=rev).get_value("testing.min_coverage"),
+                revisions
+            ))
+
+        assert values == [80, 80, 70] * 10
+
+
+class TestVirtualMergedProjects:
+    """Test merged projects stored as recipes and merged on read"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """Create a temporary directory for the repository"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            yield Path(tmpdir)
+
+    @pytest.fixture
+    def repo(self, temp_dir):
+        """Create three source projects"""
+        repo = ProjectRepository(temp_dir / "repo")
+        repo.create_project("corporate", "base", [], config={"testing": {"min_coverage": 80}})
+        repo.create_project("python", "methodology", [], config={"testing": {"framework": "pytest"}})
+        repo.create_project("team", "custom", [], config={"team": "payments"})
+        yield repo
+        repo.close()
+
+    def test_virtual_merge_stores_recipe_only(self, repo):
+        """Test that a virtual merge writes no snapshot"""
+        metadata = repo.merge_projects(
+            ["corporate", "python", "team"], "tuple", materialize=False
+        )
+        merged_dir = repo.merged_projects_dir / "tuple"
+
+        assert metadata.virtual
+        assert not (merged_dir / "config" / "merged.yml").exists()
+        assert (merged_dir / ".merge_info.json").exists()
+        assert repo.get_project("tuple").virtual
+
+        config = repo.get_project_config("tuple")
+        assert config.get_value("testing.min_coverage") == 80
+        assert config.get_value("testing.framework") == "pytest"
+        assert config.get_value("team") == "payments"
+
+    def test_virtual_follows_source_updates(self, repo):
+        """Test that a virtual project never serves a stale merge"""
+        repo.merge_projects(["corporate", "team"], "snapshot")
+        repo.merge_projects(["corporate", "team"], "live", materialize=False)
+
+        repo.update_project("corporate", {"testing.min_coverage": 95})
+
+        assert repo.get_project_config("live").get_value("testing.min_coverage") == 95
+        assert repo.get_project_config("snapshot").get_value("testing.min_coverage") == 80
+
+    def test_runtime_overrides_applied(self, repo):
+        """Test that the recipe's runtime overrides win over the sources"""
+        repo.merge_projects(
+            ["corporate", "team"], "tuple",
+            runtime_overrides={"testing.min_coverage": 99},
+            materialize=False
+        )
+
+        assert repo.get_project_config("tuple").get_value("testing.min_coverage") == 99
+
+    def test_tuples_share_source_prefix(self, repo, monkeypatch):
+        """Test that tuples with the same sources reuse one prefix merge"""
+        from ai_sdlc_config import HierarchyMerger
+
+        for name, env in (("dev", "dev"), ("prod", "prod")):
+            repo.merge_projects(
+                ["corporate", "python", "team"], name,
+                runtime_overrides={"env": env}, materialize=False
+            )
+
+        merges = []
+        original = HierarchyMerger.merge
+
+        def counting_merge(self, hierarchies):
+            merges.append(len(hierarchies))
+            return original(self, hierarchies)
+
+        monkeypatch.setattr(HierarchyMerger, "merge", counting_merge)
+
+        assert repo.get_project_config("dev").get_value("env") == "dev"
+        assert repo.get_project_config("prod").get_value("env") == "prod"
+        assert merges == [3]
+
+    def test_materialize_project(self, repo):
+        """Test writing a snapshot that matches the virtual merge"""
+        import yaml
+
+        repo.merge_projects(
+            ["corporate", "python", "team"], "tuple",
+            runtime_overrides={"env": "prod"}, materialize=False
+        )
+        virtual = repo.get_project_config("tuple")
+
+        metadata = repo.materialize_project("tuple")
+
+        merged_file = repo.merged_projects_dir / "tuple" / "config" / "merged.yml"
+        assert yaml.safe_load(merged_file.read_text())["env"] == "prod"
+        assert not metadata.virtual
+        assert "virtual" not in repo._load_projects_registry()["tuple"]
+        snapshot = repo.get_project_config("tuple")
+        for path in ("testing.min_coverage", "testing.framework", "team", "env"):
+            assert snapshot.get_value(path) == virtual.get_value(path)
+
+        with pytest.raises(ValueError, match="not a merged project"):
+            repo.materialize_project("team")
+
+    def test_failed_materialize_keeps_cached_registry(self, repo, monkeypatch):
+        """Test that a failed registry save leaves the cached entry virtual"""
+        repo.merge_projects(["corporate", "team"], "tuple", materialize=False)
+
+        def fail(registry):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(repo, "_save_projects_registry", fail)
+        with pytest.raises(OSError):
+            repo.materialize_project("tuple")
+
+        assert repo._load_projects_registry()["tuple"]["virtual"] is True
+
+    def test_materialize_refreshes_stale_snapshot(self, repo):
+        """Test that re-materializing picks up source changes"""
+        repo.merge_projects(["corporate", "team"], "snapshot")
+        repo.update_project("corporate", {"testing.min_coverage": 95})
+
+        repo.materialize_project("snapshot")
+
+        assert repo.get_project_config("snapshot").get_value("testing.min_coverage") == 95
+
+    def test_delete_virtual(self, repo):
+        """Test deleting a virtual merged project"""
+        repo.merge_projects(["corporate", "team"], "tuple", materialize=False)
+
+        repo.delete_project("tuple")
+
+        assert repo.get_project("tuple") is None
+        assert "tuple" not in repo._load_projects_registry()
+
+
+class TestMergeProjectsBatch:
+    """Test creating many merged projects in one pass"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """Create a temporary directory for the repository"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            yield Path(tmpdir)
+
+    @pytest.fixture
+    def repo(self, temp_dir):
+        """Create a three-project source stack"""
+        repo = ProjectRepository(temp_dir / "repo")
+        repo.create_project("corporate", "base", [], config={"testing": {"min_coverage": 80}})
+        repo.create_project("python", "methodology", [], config={"testing": {"framework": "pytest"}})
+        repo.create_project("payments", "custom", [], config={"team": "payments"})
+        yield repo
+        repo.close()
+
+    @staticmethod
+    def _recipes(*envs, **extra):
+        return [
+            dict({
+                "source_projects": ["corporate", "python", "payments"],
+                "target_name": f"payments_{env}",
+                "runtime_overrides": {"environment": env}
+            }, **extra)
+            for env in envs
+        ]
+
+    @pytest.mark.parametrize("max_workers", [None, 4])
+    def test_batch_creates_all_in_one_commit(self, repo, max_workers):
+        """Test that every target is created by a single commit"""
+        commits = len(_git_log(repo))
+
+        results = repo.merge_projects_batch(
+            self._recipes("dev", "staging", "prod"), max_workers=max_workers
+        )
+
+        assert [m.name for m in results] == ["payments_dev", "payments_staging", "payments_prod"]
+        assert len(_git_log(repo)) == commits + 1
+        assert _git_log(repo)[0] == "Merge 3 projects"
+        for env in ("dev", "staging", "prod"):
+            config = repo.get_project_config(f"payments_{env}")
+            assert config.get_value("environment") == env
+            assert config.get_value("testing.min_coverage") == 80
+            assert (repo.merged_projects_dir / f"payments_{env}" / "config" / "merged.yml").exists()
+
+    def test_sources_loaded_and_merged_once(self, repo, monkeypatch):
+        """Test that shared sources are parsed once and their stack merged once"""
+        from ai_sdlc_config import HierarchyMerger
+
+        loads = []
+        original_load = repo._loader.load
+        monkeypatch.setattr(repo._loader, "load", lambda path: loads.append(path) or original_load(path))
+        merges = []
+        original_merge = HierarchyMerger.merge
+
+        def counting_merge(self, hierarchies):
+            merges.append(len(hierarchies))
+            return original_merge(self, hierarchies)
+
+        monkeypatch.setattr(HierarchyMerger, "merge", counting_merge)
+
+        repo.merge_projects_batch(self._recipes("dev", "staging", "prod"), max_workers=3)
+
+        assert len(loads) == 3
+        assert merges == [3]
+
+    def test_matches_merge_projects(self, repo):
+        """Test that batch results equal individual merges"""
+        import yaml
+
+        repo.merge_projects(
+            ["corporate", "python", "payments"], "single",
+            runtime_overrides={"environment": "dev"}
+        )
+        repo.merge_projects_batch(self._recipes("dev"))
+
+        def read(name):
+            return yaml.safe_load((repo.merged_projects_dir / name / "config" / "merged.yml").read_text())
+
+        assert read("payments_dev") == read("single")
+
+    def test_validation_before_writes(self, repo):
+        """Test that a bad recipe leaves nothing behind"""
+        commits = len(_git_log(repo))
+        recipes = self._recipes("dev") + [{
+            "source_projects": ["corporate", "missing"],
+            "target_name": "broken"
+        }]
+
+        with pytest.raises(ValueError, match="Source project 'missing' not found"):
+            repo.merge_projects_batch(recipes)
+        with pytest.raises(ValueError, match="Duplicate target projects: payments_dev"):
+            repo.merge_projects_batch(self._recipes("dev", "dev"))
+        with pytest.raises(ValueError, match="Unknown merge recipe keys"):
+            repo.merge_projects_batch([{"source_projects": ["corporate"], "target_project": "x"}])
+
+        assert repo.get_project("payments_dev") is None
+        assert not (repo.merged_projects_dir / "payments_dev").exists()
+        assert len(_git_log(repo)) == commits
+
+    def test_virtual_recipes(self, repo):
+        """Test mixing virtual and materialized targets"""
+        results = repo.merge_projects_batch(
+            self._recipes("dev", materialize=False) + self._recipes("prod")
+        )
+
+        assert [m.virtual for m in results] == [True, False]
+        assert not (repo.merged_projects_dir / "payments_dev" / "config" / "merged.yml").exists()
+        assert repo.get_project_config("payments_dev").get_value("environment") == "dev"
+
+
+class TestMaintenance:
+    """Test repository maintenance and metrics"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """Create a temporary directory for the repository"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            yield Path(tmpdir)
+
+    @pytest.fixture
+    def repo(self, temp_dir):
+        """Create projects sharing a document and a merged project"""
+        repo = ProjectRepository(temp_dir / "repo")
+        repo.create_project("base", "base", [], config={"testing": {"min_coverage": 80}})
+        repo.create_project("app", "custom", ["base"], config={"team": "a"})
+        policy = "# Security policy\n" + "Encrypt everything.\n" * 200
+        repo.add_document("base", "policies/security.md", policy)
+        repo.add_document("app", "policies/security.md", policy)
+        repo.merge_projects(["base", "app"], "app_prod")
+        yield repo
+        repo.close()
+
+    def test_prune_orphaned_merged(self, repo):
+        """Test that unregistered merged directories are removed and committed"""
+        orphan = repo.merged_projects_dir / "stale_tuple"
+        (orphan / "config").mkdir(parents=True)
+        (orphan / "config" / "merged.yml").write_text("a: 1\n")
+        _git(repo, "add", "merged_projects/stale_tuple")
+        _git(repo, "commit", "-q", "-m", "Leftover")
+
+        report = repo.maintain(dedupe_docs=False, gc=False)
+
+        assert report.pruned_merged == ["stale_tuple"]
+        assert not orphan.exists()
+        assert (repo.merged_projects_dir / "app_prod").exists()
+        assert _git_log(repo)[0] == "Prune orphaned merged projects: stale_tuple"
+        assert "stale_tuple" not in _git(repo, "ls-tree", "-r", "--name-only", "HEAD")
+
+    def test_dedupe_documents(self, repo):
+        """Test that identical documents end up as one file on disk"""
+        base_doc = repo.repo_path / "base" / "docs" / "policies" / "security.md"
+        app_doc = repo.repo_path / "app" / "docs" / "policies" / "security.md"
+
+        report = repo.maintain(prune_merged=False, gc=False)
+
+        assert report.deduplicated_docs == 1
+        assert report.bytes_saved == base_doc.stat().st_size
+        assert base_doc.samefile(app_doc)
+        assert report.after.working_tree_bytes == report.before.working_tree_bytes - report.bytes_saved
+
+        # Updating one copy replaces it instead of changing the other
+        repo.add_document("app", "policies/security.md", "# Changed\n")
+        assert base_doc.read_text().startswith("# Security policy")
+        repo.close()
+        assert _git(repo, "status", "--porcelain") == ""
+
+    def test_gc_packs_objects(self, repo):
+        """Test that gc packs loose objects and reads keep working"""
+        report = repo.maintain()
+
+        assert report.before.loose_objects > 0
+        assert report.after.loose_objects == 0
+        assert report.after.packs >= 1
+        assert report.before.commit_latency_ms["count"] >= 5
+
+        repo.update_project("base", {"testing.min_coverage": 90})
+        assert repo.get_project_config("app").get_value("testing.min_coverage") == 90
+        assert repo.get_project_config("app", at="HEAD~1").get_value("testing.min_coverage") == 80
+        assert _git(repo, "fsck", "--strict") == ""
+
+    def test_scheduled_gc(self, temp_dir, monkeypatch):
+        """Test that gc_every runs git gc --auto every N commits"""
+        runs = []
+        monkeypatch.setattr(
+            ProjectRepository, "_git_gc",
+            lambda self, auto=False, aggressive=False: runs.append(auto)
+        )
+        repo = ProjectRepository(temp_dir / "scheduled", gc_every=2)
+        try:
+            repo.create_project("a", "base", [])
+            repo.create_project("b", "base", [])
+            repo.create_project("c", "base", [])
+
+            # Initial commit + 3 creates
+            assert runs == [True, True]
+        finally:
+            repo.close()
+
+
+class TestChangeFeed:
+    """Test change events published by the repository"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """Create a temporary directory for the repository"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            yield Path(tmpdir)
+
+    @pytest.fixture
+    def repo(self, temp_dir):
+        """Create a repository with a base project"""
+        repo = ProjectRepository(temp_dir / "repo")
+        repo.create_project("base", "base", [], config={"testing": {"min_coverage": 80}})
+        yield repo
+        repo.close()
+
+    @staticmethod
+    def _collect(repo, **filters):
+        events = []
+        repo.changes.subscribe(events.append, **filters)
+        return events
+
+    def test_mutation_events(self, repo):
+        """Test typed events with commit ids and touched paths"""
+        from storage.change_feed import ChangeType
+
+        events = self._collect(repo)
+
+        repo.create_project("app", "custom", ["base"], config={"team": "a"})
+        repo.update_project("app", {"team": "b"})
+        repo.add_document("app", "policies/security.md", "# Policy\n")
+        repo.merge_projects(["base", "app"], "app_prod")
+        repo.delete_project("app_prod")
+
+        assert [(e.type, e.project) for e in events] == [
+            (ChangeType.PROJECT_CREATED, "app"),
+            (ChangeType.PROJECT_UPDATED, "app"),
+            (ChangeType.DOCUMENT_ADDED, "app"),
+            (ChangeType.PROJECT_MERGED, "app_prod"),
+            (ChangeType.PROJECT_DELETED, "app_prod"),
+        ]
+        shas = _git(repo, "log", "--format=%H", "-5").split()
+        assert [e.commit for e in events] == shas[::-1]
+        assert events[1].revision == 1
+        assert events[1].paths == ("app/config/config.yml", "app/project.json")
+        assert events[2].paths == ("app/docs/policies/security.md",)
+
+    def test_events_published_after_commit(self, repo):
+        """Test that subscribers see the committed state"""
+        seen = []
+        repo.changes.subscribe(lambda event: seen.append(
+            (_git_log(repo)[0], repo.get_project_config(event.project).get_value("testing.min_coverage"))
+        ))
+
+        repo.update_project("base", {"testing.min_coverage": 90})
+
+        assert seen == [("Update project: base", 90)]
+
+    def test_batch_events_share_commit(self, repo):
+        """Test that batched mutations publish once the batch commits"""
+        events = self._collect(repo)
+
+        with repo.batch("Provision"):
+            repo.create_project("dev", "custom", ["base"])
+            repo.create_project("prod", "custom", ["base"])
+            assert events == []
+
+        assert [e.project for e in events] == ["dev", "prod"]
+        assert events[0].commit == events[1].commit == _git(repo, "rev-parse", "HEAD").strip()
+
+    def test_write_behind_events_published_on_flush(self, temp_dir):
+        """Test that journaled mutations publish when the journal commits"""
+        repo = ProjectRepository(temp_dir / "wb", commit_max_ops=100, commit_interval_ms=60_000)
+        try:
+            events = self._collect(repo)
+            repo.create_project("a", "base", [])
+            assert events == []
+
+            repo.flush()
+
+            assert [e.project for e in events] == ["a"]
+            assert events[0].commit == _git(repo, "rev-parse", "HEAD").strip()
+        finally:
+            repo.close()
+
+    @pytest.mark.parametrize("use_inotify", [True, False])
+    def test_external_changes(self, repo, use_inotify):
+        """Test that outside edits are reported and own writes are not"""
+        from storage.change_feed import ChangeType
+
+        def wait_for(condition, timeout=5.0):
+            deadline = time.time() + timeout
+            while time.time() < deadline:
+                if condition():
+                    return True
+                time.sleep(0.02)
+            return False
+
+        repo.watch(poll_interval=0.05, use_inotify=use_inotify)
+        events = self._collect(repo, types=[ChangeType.EXTERNAL_CHANGE])
+        repo.get_project_config("base")
+
+        repo.update_project("base", {"testing.min_coverage": 85})
+        repo.create_project("app", "custom", ["base"])
+        repo.delete_project("app")
+        time.sleep(0.3)
+        assert events == []
+
+        config_file = repo.repo_path / "base" / "config" / "config.yml"
+        config_file.write_text("testing:\n  min_coverage: 99\n")
+        assert wait_for(lambda: any(e.project == "base" for e in events))
+        assert events[0].paths == ("base/config/config.yml",)
+        assert repo.get_project_config("base").get_value("testing.min_coverage") == 99
+
+        _git(repo, "commit", "-q", "-am", "Edit outside")
+        head = _git(repo, "rev-parse", "HEAD").strip()
+        assert wait_for(lambda: any(e.commit == head for e in events))
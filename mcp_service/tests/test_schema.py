@@ -0,0 +1,185 @@
+"""
+Unit tests for schema module.
+
+# Validates: REQ-F-TESTING-001 (Test coverage validation)
+
+Tests cover:
+- Type checks, including unions and bool vs integer
+- Object properties, required keys and additionalProperties
+- Array items, enum and range/length constraints
+"""
+import pytest
+
+from server.schema import SchemaValidationError, compile_schema
+
+
+class TestTypes:
+    """Test type validation"""
+
+    @pytest.mark.parametrize("schema_type,value", [
+        ("string", "text"),
+        ("integer", 3),
+        ("number", 1.5),
+        ("number", 2),
+        ("boolean", False),
+        ("object", {}),
+        ("array", []),
+        ("null", None),
+    ])
+    def test_accepts_matching_type(self, schema_type, value):
+        """Test that values of the declared type pass"""
+        compile_schema({"type": schema_type})(value)
+
+    @pytest.mark.parametrize("schema_type,value", [
+        ("string", 1),
+        ("integer", 1.5),
+        ("integer", True),
+        ("number", False),
+        ("boolean", 0),
+        ("object", []),
+        ("array", "abc"),
+    ])
+    def test_rejects_other_types(self, schema_type, value):
+        """Test that values of another type fail"""
+        with pytest.raises(SchemaValidationError, match=f"expected {schema_type}"):
+            compile_schema({"type": schema_type})(value)
+
+    def test_union_type(self):
+        """Test a list of types"""
+        validate = compile_schema({"type": ["string", "null"]})
+        validate("x")
+        validate(None)
+        with pytest.raises(SchemaValidationError, match="expected string or null, got integer"):
+            validate(1)
+
+    def test_untyped_schema_accepts_anything(self):
+        """Test that a schema without type accepts any value"""
+        validate = compile_schema({"description": "Any value"})
+        for value in (None, 1, "x", [1], {"a": 1}):
+            validate(value)
+
+    def test_unknown_type_fails_at_compile_time(self):
+        """Test that unsupported types are reported when compiling"""
+        with pytest.raises(ValueError, match="Unsupported schema type: tuple"):
+            compile_schema({"type": "tuple"})
+
+
+class TestObjects:
+    """Test object validation"""
+
+    @pytest.fixture
+    def validate(self):
+        return compile_schema({
+            "type": "object",
+            "properties": {
+                "name": {"type": "string"},
+                "count": {"type": "integer", "minimum": 0},
+                "nested": {
+                    "type": "object",
+                    "properties": {"flag": {"type": "boolean"}},
+                    "required": ["flag"]
+                }
+            },
+            "required": ["name"]
+        })
+
+    def test_valid_object(self, validate):
+        """Test that a matching object passes"""
+        validate({"name": "a", "count": 2, "nested": {"flag": True}, "extra": 1})
+
+    def test_missing_required(self, validate):
+        """Test missing required property"""
+        with pytest.raises(SchemaValidationError, match="missing required property 'name'"):
+            validate({"count": 1})
+
+    def test_error_path(self, validate):
+        """Test that errors name the offending property"""
+        with pytest.raises(SchemaValidationError) as excinfo:
+            validate({"name": "a", "nested": {"flag": "yes"}})
+        assert excinfo.value.path == "nested.flag"
+        assert str(excinfo.value) == "nested.flag: expected boolean, got string"
+
+    def test_nested_required(self, validate):
+        """Test required properties of nested objects"""
+        with pytest.raises(SchemaValidationError, match="nested: missing required property 'flag'"):
+            validate({"name": "a", "nested": {}})
+
+    def test_additional_properties_false(self):
+        """Test that additionalProperties: false rejects unknown keys"""
+        validate = compile_schema({
+            "type": "object",
+            "properties": {"a": {"type": "string"}},
+            "additionalProperties": False
+        })
+        validate({"a": "x"})
+        with pytest.raises(SchemaValidationError, match="unexpected property 'b'"):
+            validate({"a": "x", "b": 1})
+
+    def test_additional_properties_schema(self):
+        """Test that additionalProperties schemas apply to unknown keys"""
+        validate = compile_schema({"type": "object", "additionalProperties": {"type": "integer"}})
+        validate({"x": 1, "y": 2})
+        with pytest.raises(SchemaValidationError, match="y: expected integer"):
+            validate({"x": 1, "y": "2"})
+
+
+class TestArraysAndConstraints:
+    """Test array items, enum and range/length constraints"""
+
+    def test_items(self):
+        """Test that every item is validated, with its index in the path"""
+        validate = compile_schema({"type": "array", "items": {"type": "string"}})
+        validate(["a", "b"])
+        with pytest.raises(SchemaValidationError) as excinfo:
+            validate(["a", 2])
+        assert excinfo.value.path == "[1]"
+
+    def test_items_of_objects(self):
+        """Test paths through arrays of objects"""
+        validate = compile_schema({
+            "type": "object",
+            "properties": {
+                "recipes": {
+                    "type": "array",
+                    "items": {"type": "object", "required": ["target"]}
+                }
+            }
+        })
+        with pytest.raises(SchemaValidationError, match=r"recipes\[0\]: missing required property 'target'"):
+            validate({"recipes": [{}]})
+
+    def test_enum(self):
+        """Test enum membership"""
+        validate = compile_schema({"type": "string", "enum": ["base", "custom"]})
+        validate("base")
+        with pytest.raises(SchemaValidationError, match="must be one of"):
+            validate("other")
+
+    def test_enum_distinguishes_bool_from_int(self):
+        """Test that True doesn't match an enum of 1"""
+        validate = compile_schema({"enum": [1]})
+        validate(1)
+        with pytest.raises(SchemaValidationError):
+            validate(True)
+
+    def test_range(self):
+        """Test minimum and maximum"""
+        validate = compile_schema({"type": "integer", "minimum": 1, "maximum": 3})
+        validate(1)
+        validate(3)
+        with pytest.raises(SchemaValidationError, match=">= 1"):
+            validate(0)
+        with pytest.raises(SchemaValidationError, match="<= 3"):
+            validate(4)
+
+    def test_lengths(self):
+        """Test string and array length limits"""
+        validate = compile_schema({"type": "string", "minLength": 1, "maxLength": 3})
+        with pytest.raises(SchemaValidationError, match="at least 1 characters"):
+            validate("")
+        with pytest.raises(SchemaValidationError, match="at most 3 characters"):
+            validate("abcd")
+
+        validate = compile_schema({"type": "array", "minItems": 1})
+        with pytest.raises(SchemaValidationError, match="at least 1 items"):
+            validate([])
@@ -0,0 +1,192 @@
+"""
+Unit tests for sessions module.
+
+# Validates: REQ-F-TESTING-001 (Test coverage validation)
+
+Tests cover:
+- Isolation of context and persona state between sessions
+- Default session, shared repository, context and persona caches
+- Idle and least-recently-used eviction
+- Closing sessions, per-session locks and stats
+"""
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from server.sessions import DEFAULT_SESSION, SessionManager
+from storage.project_repository import ProjectRepository
+
+
+class FakeClock:
+    """Clock advanced by hand"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def temp_dir():
+    """Create a temporary directory for the repository and personas"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield Path(tmpdir)
+
+
+@pytest.fixture
+def repo(temp_dir):
+    """Repository with two projects"""
+    repo = ProjectRepository(temp_dir / "projects_repo")
+    repo.create_project("alpha", "custom", [], config={"project": {"name": "alpha"}})
+    repo.create_project("beta", "custom", [], config={"project": {"name": "beta"}})
+    return repo
+
+
+@pytest.fixture
+def personas_dir(temp_dir):
+    """Personas directory with one persona"""
+    personas = temp_dir / "personas"
+    personas.mkdir()
+    (personas / "qa_engineer.yml").write_text(
+        "persona:\n  name: QA Engineer\n  role: qa\n  focus_areas: [testing]\n"
+    )
+    return personas
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def sessions(repo, personas_dir, clock):
+    return SessionManager(repo, personas_dir, idle_timeout=60.0, max_sessions=3, clock=clock)
+
+
+class TestIsolation:
+    """Test per-session state"""
+
+    def test_contexts_are_independent(self, sessions):
+        """Test loading a context in one session leaves others unchanged"""
+        sessions.get("a").context.load_context("alpha")
+        sessions.get("b").context.load_context("beta")
+
+        assert sessions.get("a").context.current_context["metadata"]["name"] == "alpha"
+        assert sessions.get("b").context.current_context["metadata"]["name"] == "beta"
+        assert sessions.get().context.current_context is None
+
+    def test_context_stacks_are_independent(self, sessions):
+        """Test pushing contexts in one session doesn't touch another's stack"""
+        sessions.get("a").context.push_context("alpha")
+        sessions.get("a").context.push_context("beta")
+
+        assert len(sessions.get("a").context.context_stack) == 2
+        assert sessions.get("b").context.context_stack == []
+
+    def test_personas_are_independent_but_cache_is_shared(self, sessions):
+        """Test the active persona is per session while parsed personas are shared"""
+        persona = sessions.get("a").personas.load_persona("qa_engineer")
+
+        assert sessions.get("b").personas.current_persona is None
+        assert sessions.get("b").personas.persona_cache["qa_engineer"] is persona
+
+    def test_sessions_share_repository(self, sessions, repo):
+        """Test every session reads through the same repository"""
+        assert sessions.get("a").context.repo is repo
+        assert sessions.get("b").context.repo is repo
+
+    def test_sessions_share_built_contexts(self, sessions):
+        """Test a context built in one session is reused by another"""
+        built = sessions.get("a").context.load_context("alpha")
+
+        assert sessions.get("b").context.load_context("alpha") is built
+        assert sessions.contexts.hits == 1
+
+    def test_no_id_uses_default_session(self, sessions):
+        """Test calls without a session id share the default session"""
+        assert sessions.get() is sessions.get(None)
+        assert sessions.get().id == DEFAULT_SESSION
+
+    def test_use_holds_session_lock(self, sessions):
+        """Test use() holds the session's lock for the block"""
+        with sessions.use("a") as session:
+            assert session.lock.locked()
+        assert not session.lock.locked()
+
+
+class TestEviction:
+    """Test session eviction"""
+
+    def test_idle_session_is_evicted(self, sessions, clock):
+        """Test a session unused past the idle timeout is dropped"""
+        sessions.get("a").context.load_context("alpha")
+        clock.now = 61.0
+
+        assert sessions.evict_idle() == ["a"]
+        assert "a" not in sessions
+        assert sessions.get("a").context.current_context is None
+
+    def test_use_keeps_session_alive(self, sessions, clock):
+        """Test each call restarts the idle timer"""
+        sessions.get("a")
+        clock.now = 50.0
+        sessions.get("a")
+        clock.now = 100.0
+
+        assert sessions.evict_idle() == []
+        assert "a" in sessions
+
+    def test_no_idle_timeout(self, repo, personas_dir, clock):
+        """Test idle_timeout None keeps sessions until max_sessions"""
+        sessions = SessionManager(repo, personas_dir, idle_timeout=None, clock=clock)
+        sessions.get("a")
+        clock.now = 1e9
+
+        assert sessions.evict_idle() == []
+
+    def test_least_recently_used_evicted_beyond_max(self, sessions, clock):
+        """Test going past max_sessions drops the least recently used session"""
+        for session_id in ("a", "b", "c"):
+            clock.now += 1
+            sessions.get(session_id)
+        clock.now += 1
+        sessions.get("a")
+        clock.now += 1
+        sessions.get("d")
+
+        assert "b" not in sessions
+        assert all(session_id in sessions for session_id in ("a", "c", "d"))
+
+    def test_default_session_never_evicted(self, sessions, clock):
+        """Test the default session survives idleness and max_sessions"""
+        sessions.get().context.load_context("alpha")
+        clock.now = 1000.0
+        for session_id in ("a", "b", "c", "d"):
+            sessions.get(session_id)
+
+        assert DEFAULT_SESSION in sessions
+        assert sessions.get().context.current_context["metadata"]["name"] == "alpha"
+        assert len(sessions) == 4
+
+
+class TestLifecycle:
+    """Test closing sessions and stats"""
+
+    def test_close(self, sessions):
+        """Test closing drops the session's state"""
+        sessions.get("a").context.load_context("alpha")
+
+        assert sessions.close("a") is True
+        assert sessions.close("a") is False
+        assert sessions.get("a").context.current_context is None
+
+    def test_stats(self, sessions, clock):
+        """Test stats count active, created and evicted sessions"""
+        sessions.get("a")
+        sessions.get("b")
+        clock.now = 100.0
+        sessions.get("c")
+
+        assert sessions.stats() == {"active": 1, "created": 3, "evicted": 2, "max_sessions": 3}
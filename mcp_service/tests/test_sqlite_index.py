@@ -0,0 +1,69 @@
+"""
+Unit tests for sqlite_index module.
+
+# Validates: REQ-NFR-FEDERATE-001 (Hierarchical configuration composition)
+
+Tests cover:
+- Upserting, deleting and listing projects
+- Filtering by type
+- Direct and transitive dependents
+- Full rebuilds and the recorded HEAD
+"""
+import pytest
+
+from storage.sqlite_index import ProjectIndex
+
+
+def _project(name, project_type="custom", bases=()):
+    entry = {"type": project_type, "path": name, "base_projects": list(bases)}
+    metadata = {"name": name, "project_type": project_type, "base_projects": list(bases),
+                "modified": "2025-01-01T00:00:00Z"}
+    return entry, metadata
+
+
+class TestProjectIndex:
+    """Test ProjectIndex class"""
+
+    @pytest.fixture
+    def index(self, tmp_path):
+        """Create an index with a small dependency chain"""
+        index = ProjectIndex(tmp_path / "index.sqlite")
+        index.upsert(*_project("methodology", "methodology"))
+        index.upsert(*_project("python", "base", ["methodology"]))
+        index.upsert(*_project("app", "custom", ["methodology", "python"]))
+        yield index
+        index.close()
+
+    def test_list_and_filter(self, index):
+        """Test listing in name order and filtering by type"""
+        assert [p["name"] for p in index.list_projects()] == ["app", "methodology", "python"]
+        assert [p["name"] for p in index.list_projects("base")] == ["python"]
+
+    def test_dependents(self, index):
+        """Test direct and transitive dependents, nearest first"""
+        assert index.get_dependents("python") == ["app"]
+        assert index.get_dependents("methodology", transitive=False) == ["app", "python"]
+        assert index.get_dependents("methodology") == ["app", "python"]
+
+    def test_upsert_replaces_edges(self, index):
+        """Test that re-indexing a project replaces its base edges"""
+        index.upsert(*_project("app", "custom", ["python"]))
+
+        assert index.get_dependents("methodology", transitive=False) == ["python"]
+
+    def test_delete(self, index):
+        """Test removing a project and its edges"""
+        index.delete("app")
+
+        assert index.get_dependents("python") == []
+        assert len(index.list_projects()) == 2
+
+    def test_rebuild_and_head(self, index, tmp_path):
+        """Test that rebuild replaces everything and persists HEAD"""
+        index.rebuild([_project("only")], "abc123")
+        index.close()
+
+        reopened = ProjectIndex(tmp_path / "index.sqlite")
+        assert [p["name"] for p in reopened.list_projects()] == ["only"]
+        assert reopened.head() == "abc123"
+        reopened.close()
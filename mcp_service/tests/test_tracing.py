@@ -0,0 +1,167 @@
+"""
+Unit tests for tracing module.
+
+# Validates: REQ-F-TESTING-001 (Test coverage validation)
+
+Tests cover:
+- Spans recorded only while capturing
+- Nesting, threads and Chrome trace-event export
+- Instrumented loader, merger, resolver and repository
+"""
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from ai_sdlc_config import HierarchyMerger, URIResolver, YAMLLoader, tracing
+from ai_sdlc_config.models.hierarchy_node import URIReference, URIScheme
+from storage.project_repository import ProjectRepository
+
+
+class TestCapture:
+    """Test span capture"""
+
+    def test_disabled_by_default(self):
+        """Test that nothing is recorded outside capture()"""
+        assert tracing.active() is None
+        with tracing.span("outside"):
+            pass
+
+        with tracing.capture() as trace:
+            assert tracing.active() is trace
+        assert trace.spans == []
+        assert tracing.active() is None
+
+    def test_span_and_traced(self):
+        """Test nested spans from a context manager and a decorator"""
+        @tracing.traced("inner", "test")
+        def inner():
+            return 42
+
+        with tracing.capture() as trace:
+            with tracing.span("outer", "test", items=2):
+                assert inner() == 42
+
+        events = {event["name"]: event for event in trace.spans}
+        assert set(events) == {"outer", "inner"}
+        assert events["outer"]["args"] == {"items": 2}
+        assert events["inner"]["cat"] == "test"
+        outer, inner_event = events["outer"], events["inner"]
+        assert outer["ts"] <= inner_event["ts"]
+        assert inner_event["ts"] + inner_event["dur"] <= outer["ts"] + outer["dur"]
+
+    def test_span_recorded_on_exception(self):
+        """Test that a failing block still records its span"""
+        with tracing.capture() as trace:
+            with pytest.raises(ValueError):
+                with tracing.span("failing"):
+                    raise ValueError("boom")
+
+        assert [event["name"] for event in trace.spans] == ["failing"]
+
+    def test_bind_carries_trace_to_threads(self):
+        """Test that bound callables record into the caller's trace"""
+        @tracing.traced("work")
+        def work(i):
+            return threading.current_thread().name
+
+        with tracing.capture() as trace:
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                list(pool.map(tracing.bind(work), range(4)))
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                list(pool.map(work, range(4)))  # Not bound: not recorded
+
+        assert len(trace.spans) == 4
+
+    def test_concurrent_captures_are_isolated(self):
+        """Test that captures in different threads don't mix"""
+        traces = {}
+
+        def run(name):
+            with tracing.capture() as trace:
+                with tracing.span(name):
+                    pass
+            traces[name] = trace
+
+        threads = [threading.Thread(target=run, args=(f"t{i}",)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for name, trace in traces.items():
+            assert [event["name"] for event in trace.spans] == [name]
+
+
+class TestExport:
+    """Test Chrome trace-event export and summaries"""
+
+    def test_chrome_format(self):
+        """Test complete events plus thread-name metadata"""
+        with tracing.capture() as trace:
+            with tracing.span("a"):
+                pass
+
+        document = json.loads(trace.to_json())
+        phases = [event["ph"] for event in document["traceEvents"]]
+        assert phases == ["M", "X"]
+        assert document["traceEvents"][0]["args"]["name"] == threading.current_thread().name
+        assert {"name", "cat", "ts", "dur", "pid", "tid"} <= set(document["traceEvents"][1])
+
+    def test_summary(self):
+        """Test totals per span name"""
+        with tracing.capture() as trace:
+            for _ in range(3):
+                with tracing.span("repeat"):
+                    pass
+
+        summary = trace.summary()
+        assert summary["repeat"]["count"] == 3
+        assert summary["repeat"]["max_ms"] <= summary["repeat"]["total_ms"]
+
+
+class TestInstrumentation:
+    """Test spans from instrumented components"""
+
+    def test_loader_and_merger(self):
+        """Test loader parse and merge spans"""
+        loader = YAMLLoader()
+        with tracing.capture() as trace:
+            base = loader.load_from_string("a: 1\n", "base")
+            override = loader.load_from_string("a: 2\n", "override")
+            HierarchyMerger().merge([base, override])
+
+        names = [event["name"] for event in trace.spans]
+        assert names.count("loader.load_from_string") == 2
+        assert names.count("yaml.parse") == 2
+        assert "merger.merge" in names
+        assert "merger.merge_onto" in names
+
+    def test_resolver_records_fetches_not_cache_hits(self):
+        """Test that only uncached URI fetches are spans"""
+        resolver = URIResolver()
+        uri = URIReference(uri="data:text/plain,hello", scheme=URIScheme.DATA)
+        with tracing.capture() as trace:
+            resolver.resolve(uri)
+            resolver.resolve(uri)
+
+        assert [event["name"] for event in trace.spans] == ["resolver.fetch"]
+        assert trace.spans[0]["args"] == {"uri": "data:text/plain,hello"}
+
+    def test_repository(self, tmp_path):
+        """Test repository spans around config assembly and commits"""
+        repo = ProjectRepository(tmp_path / "repo")
+        try:
+            with tracing.capture() as trace:
+                repo.create_project("base", "base", [], config={"a": 1})
+                repo.create_project("app", "custom", ["base"], config={"b": 2})
+                repo.get_project_config("app")
+
+            names = {event["name"] for event in trace.spans}
+            assert {
+                "repository.create_project", "git.commit", "repository.get_project_config",
+                "repository.merge_layers", "repository.load_layer", "loader.load"
+            } <= names
+        finally:
+            repo.close()
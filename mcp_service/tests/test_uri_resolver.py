@@ -268,6 +268,7 @@ class TestURIResolver:
         # Second resolve should return cached content
         content2 = resolver.resolve(uri_ref)
         assert content2 == "Original content"  # Still original from cache
+        assert (resolver.cache_hits, resolver.cache_misses) == (1, 1)
 
     def test_clear_cache(self, resolver, temp_dir):
         """Test clearing the cache"""
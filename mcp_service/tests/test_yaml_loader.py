@@ -9,6 +9,7 @@ Tests cover:
 - URI detection and conversion
 - Handling different data types (dicts, lists, primitives)
 - Error handling for invalid files and YAML
+- Lazy (on-demand) subtree materialization
 """
 import pytest
 import tempfile
@@ -16,7 +17,10 @@ from pathlib import Path
 import yaml
 
 from ai_sdlc_config.loaders.yaml_loader import YAMLLoader
-from ai_sdlc_config.models.hierarchy_node import HierarchyNode, URIReference, URIScheme
+from ai_sdlc_config.models.hierarchy_node import (
+    HierarchyNode, LazyHierarchyNode, URIReference, URIScheme
+)
+from ai_sdlc_config.mergers.hierarchy_merger import HierarchyMerger
 
 
 class TestYAMLLoader:
@@ -408,3 +412,132 @@ agent2:
         assert loader._is_uri_reference_dict({"_ref": "test"})
         assert not loader._is_uri_reference_dict({"other": "test"})
         assert not loader._is_uri_reference_dict({"name": "test", "value": "test"})
+
+
+class TestLazyYAMLLoader:
+    """Test YAMLLoader in lazy mode"""
+
+    @pytest.fixture
+    def loader(self):
+        """Create a lazy YAMLLoader instance"""
+        return YAMLLoader(lazy=True)
+
+    @pytest.fixture
+    def yaml_content(self):
+        """Layer with several independent subtrees"""
+        return """
+system:
+  agents:
+    discovery:
+      model: claude-3-5-sonnet
+      prompt: "file:///prompts/discovery.md"
+    coder:
+      model: claude-3-5-sonnet
+  tools:
+    - pytest
+    - ruff
+corporate:
+  policies:
+    security:
+      uri: "file:///policies/security.md"
+      version: "2.0"
+"""
+
+    def test_root_is_lazy_until_accessed(self, loader, yaml_content):
+        """Test that nothing below the root is built on load"""
+        root = loader.load_from_string(yaml_content)
+
+        assert isinstance(root, LazyHierarchyNode)
+        assert not root.is_materialized()
+        assert root.is_container()
+        assert not root.is_materialized()
+
+    def test_path_access_materializes_only_visited_levels(self, loader, yaml_content):
+        """Test that get_node_by_path only builds nodes along the path"""
+        root = loader.load_from_string(yaml_content)
+
+        node = root.get_node_by_path("system.agents.discovery")
+
+        assert node.get_value_by_path("model") == "claude-3-5-sonnet"
+        assert root.is_materialized()
+        assert root.children["system"].is_materialized()
+        assert not root.children["corporate"].is_materialized()
+        assert not root.children["system"].children["agents"].children["coder"].is_materialized()
+
+    def test_lazy_matches_eager_structure(self, loader, yaml_content):
+        """Test that a fully materialized lazy tree equals the eager tree"""
+        lazy_root = loader.load_from_string(yaml_content)
+        eager_root = YAMLLoader().load_from_string(yaml_content)
+
+        assert lazy_root.to_dict() == eager_root.to_dict()
+        assert lazy_root.get_node_by_path("system.tools.1").value == "ruff"
+        assert lazy_root.get_node_by_path("system.tools.1").path == "system.tools[1]"
+
+    def test_uri_detection_in_lazy_mode(self, loader, yaml_content):
+        """Test that URI strings and URI dicts are still detected"""
+        root = loader.load_from_string(yaml_content)
+
+        prompt = root.get_value_by_path("system.agents.discovery.prompt")
+        policy = root.get_value_by_path("corporate.policies.security")
+
+        assert isinstance(prompt, URIReference)
+        assert isinstance(policy, URIReference)
+        assert policy.metadata["version"] == "2.0"
+
+    def test_deepcopy_keeps_subtree_lazy(self, loader, yaml_content):
+        """Test that copying a lazy node does not force materialization"""
+        import copy
+
+        root = loader.load_from_string(yaml_content)
+        clone = copy.deepcopy(root)
+
+        assert not root.is_materialized()
+        assert not clone.is_materialized()
+        assert clone.get_value_by_path("system.agents.coder.model") == "claude-3-5-sonnet"
+        assert not root.is_materialized()
+
+    def test_merge_leaves_untouched_subtrees_lazy(self, loader, yaml_content):
+        """Test that merging only materializes overlapping subtrees"""
+        base = loader.load_from_string(yaml_content, "base")
+        override = loader.load_from_string(
+            "system:\n  agents:\n    coder:\n      model: claude-3-7-sonnet\n",
+            "override"
+        )
+
+        merged = HierarchyMerger().merge([base, override])
+
+        assert merged.get_value_by_path("system.agents.coder.model") == "claude-3-7-sonnet"
+        assert merged.get_value_by_path("system.agents.discovery.model") == "claude-3-5-sonnet"
+        assert not merged.children["corporate"].is_materialized()
+        assert not base.children["corporate"].is_materialized()
+
+    def test_empty_containers_are_not_lazy(self, loader):
+        """Test that empty mappings produce plain nodes"""
+        root = loader.load_from_string("empty: {}\nvalue: 1\n")
+
+        assert not isinstance(root.children["empty"], LazyHierarchyNode)
+        assert root.get_value_by_path("value") == 1
+
+    def test_concurrent_first_access(self):
+        """Test that threads racing to materialize build children once and never see them empty"""
+        import threading
+        import time
+
+        calls = []
+
+        def materializer():
+            calls.append(node.is_materialized())
+            time.sleep(0.01)
+            return {"a": HierarchyNode(path="a", value=1)}
+
+        node = LazyHierarchyNode(path="", materializer=materializer, size=1)
+        seen = []
+        threads = [threading.Thread(target=lambda: seen.append(dict(node.children))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert calls == [False]
+        assert all(list(children) == ["a"] for children in seen)
+        assert len(seen) == 8
@@ -0,0 +1,124 @@
+"""
+Unit tests for yaml_patch module.
+
+# Validates: REQ-NFR-FEDERATE-001 (Hierarchical configuration composition)
+
+Tests cover:
+- Replacing scalar and block values in place
+- Inserting missing keys and intermediate mappings
+- Preserving comments and formatting outside the edit
+- Falling back on YAML the patcher can't handle
+"""
+import pytest
+import yaml
+
+from storage.yaml_patch import patch_yaml_text
+
+
+DOCUMENT = """\
+# Project configuration
+methodology:
+  testing:
+    min_coverage: 80  # corporate minimum
+    framework: pytest
+  stages:
+  - requirements
+  - design
+
+# Deployment settings
+deployment:
+    region: eu-west-1
+"""
+
+
+class TestPatchYamlText:
+    """Test patch_yaml_text function"""
+
+    def test_replace_scalar_keeps_comments(self):
+        """Test that a scalar update touches only its own line"""
+        patched = patch_yaml_text(DOCUMENT, {"methodology.testing.min_coverage": 95})
+
+        assert "    min_coverage: 95  # corporate minimum" in patched
+        assert patched.startswith("# Project configuration\n")
+        assert "# Deployment settings" in patched
+        changed = [
+            (old, new) for old, new in zip(DOCUMENT.splitlines(), patched.splitlines())
+            if old != new
+        ]
+        assert len(changed) == 1
+
+    def test_replace_block_value(self):
+        """Test replacing a mapping and a compact sequence"""
+        patched = patch_yaml_text(DOCUMENT, {
+            "methodology.stages": ["design", "code"],
+            "methodology.testing": {"framework": "unittest"}
+        })
+        data = yaml.safe_load(patched)
+
+        assert data["methodology"]["stages"] == ["design", "code"]
+        assert data["methodology"]["testing"] == {"framework": "unittest"}
+        assert data["deployment"] == {"region": "eu-west-1"}
+        assert "# Deployment settings" in patched
+
+    def test_insert_into_existing_mapping(self):
+        """Test inserting a key using the mapping's own indentation"""
+        patched = patch_yaml_text(DOCUMENT, {"deployment.replicas": 3})
+
+        assert "    replicas: 3" in patched
+        assert yaml.safe_load(patched)["deployment"] == {"region": "eu-west-1", "replicas": 3}
+
+    def test_insert_missing_path(self):
+        """Test creating intermediate mappings for a new path"""
+        patched = patch_yaml_text(DOCUMENT, {"methodology.security.scanning.enabled": True})
+        data = yaml.safe_load(patched)
+
+        assert data["methodology"]["security"] == {"scanning": {"enabled": True}}
+        assert data["methodology"]["testing"]["min_coverage"] == 80
+
+    def test_insert_into_empty_document(self):
+        """Test patching an empty file"""
+        patched = patch_yaml_text("", {"a.b": 1})
+
+        assert yaml.safe_load(patched) == {"a": {"b": 1}}
+
+    def test_sequential_updates(self):
+        """Test later updates see earlier ones"""
+        patched = patch_yaml_text(DOCUMENT, {"security": {}, "security.level": "high"})
+
+        assert yaml.safe_load(patched)["security"] == {"level": "high"}
+
+    def test_matches_full_rewrite(self):
+        """Test that patched and load-modify-dump results parse the same"""
+        updates = {
+            "methodology.testing.min_coverage": 90,
+            "methodology.stages": ["code"],
+            "deployment.region": "us-east-1",
+            "team.name": "payments"
+        }
+        expected = yaml.safe_load(DOCUMENT)
+        for path, value in updates.items():
+            current = expected
+            parts = path.split('.')
+            for part in parts[:-1]:
+                current = current.setdefault(part, {})
+            current[parts[-1]] = value
+
+        assert yaml.safe_load(patch_yaml_text(DOCUMENT, updates)) == expected
+
+    @pytest.mark.parametrize("text, updates", [
+        ("base: &base\n  a: 1\nother: *base\n", {"base.a": 2}),
+        ("a: &x 1\nb: *x\n", {"a": 2}),
+        ("a:\n  <<: {b: 1}\n", {"a.b": 2}),
+        ("a: {b: 1}\n", {"a.c": 2}),
+        ("a: 1\n", {"a.b": 2}),
+        ("a:\n", {"a.b": 2}),
+        ("---\na: 1\n", {"a": 2}),
+        ("'a': 1\n", {"a": 2}),
+        ("a:\n\tb: 1\n", {"a.b": 2}),
+        ("- a\n- b\n", {"a": 1}),
+        ("a: 1\n", {"yes": 1}),
+        ("a: 1\n", {"8080": 1}),
+    ])
+    def test_unsupported_falls_back(self, text, updates):
+        """Test that unsafe documents and keys return None"""
+        assert patch_yaml_text(text, updates) is None